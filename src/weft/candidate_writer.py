@@ -28,6 +28,8 @@ def get_next_candidate_number(
 ) -> int:
     """Get the next sequential candidate number.
 
+    The number is only a starting point; reserve_candidate_dir claims it.
+
     Args:
         repo_root: Repository root directory
         tool: Tool name (default: claude-code-cli)
@@ -55,6 +57,43 @@ def get_next_candidate_number(
     return max_num + 1
 
 
+def reserve_candidate_dir(
+    repo_root: Path,
+    tool: str = "claude-code-cli",
+    model: str = "sonnet",
+) -> Path:
+    """Create the next free candidate-NNN directory.
+
+    The directory is claimed with an exclusive mkdir, so concurrent writers
+    (threads or processes) never share a number: a writer that loses the
+    race moves on to the next one.
+
+    Args:
+        repo_root: Repository root directory
+        tool: Tool name (default: claude-code-cli)
+        model: Model variant (default: sonnet)
+
+    Returns:
+        Path to the newly created, empty candidate directory
+
+    Raises:
+        CandidateWriteError: If the directory cannot be created
+    """
+    candidates_dir = repo_root / ".weft" / "prompts" / "candidates" / tool / model
+    candidate_num = get_next_candidate_number(repo_root, tool, model)
+    while True:
+        candidate_dir = candidates_dir / f"candidate-{candidate_num:03d}"
+        try:
+            candidate_dir.mkdir(parents=True, exist_ok=False)
+            return candidate_dir
+        except FileExistsError:
+            candidate_num += 1
+        except OSError as exc:
+            raise CandidateWriteError(
+                f"Failed to create candidate directory: {exc}"
+            ) from exc
+
+
 def write_candidate(
     repo_root: Path,
     tool: str,
@@ -78,25 +117,8 @@ def write_candidate(
     Raises:
         CandidateWriteError: If writing fails
     """
-    # Get next candidate number
-    candidate_num = get_next_candidate_number(repo_root, tool, model)
-    candidate_name = f"candidate-{candidate_num:03d}"
-
-    # Create candidate directory
-    candidate_dir = (
-        repo_root / ".weft" / "prompts" / "candidates" / tool / model / candidate_name
-    )
-
-    try:
-        candidate_dir.mkdir(parents=True, exist_ok=False)
-    except FileExistsError:
-        raise CandidateWriteError(
-            f"Candidate directory already exists: {candidate_dir}"
-        )
-    except OSError as exc:
-        raise CandidateWriteError(
-            f"Failed to create candidate directory: {exc}"
-        ) from exc
+    candidate_dir = reserve_candidate_dir(repo_root, tool, model)
+    candidate_name = candidate_dir.name
 
     logger.info("Creating candidate prompts at: %s", candidate_dir)
 
@@ -40,6 +40,7 @@ def run_headless_session(
     expected_output: Path,
     sdk_settings_path: Path,
     agents: dict[str, AgentDefinition] | None = None,
+    timeout: float | None = None,
 ) -> Path:
     """Run headless Claude Code session via SDK.
 
@@ -53,12 +54,14 @@ def run_headless_session(
         expected_output: File that should be created by session
         sdk_settings_path: Path to SDK settings.json
         agents: Optional dict of agent definitions for programmatic registration
+        timeout: Optional limit in seconds for the session
 
     Returns:
         Path to output file
 
     Raises:
         ClaudeSessionError: If session fails or output missing
+        TimeoutError: If the session exceeds timeout
     """
     logger.info("Running headless SDK session...")
     logger.debug("Worktree: %s", worktree_path)
@@ -72,6 +75,7 @@ def run_headless_session(
             model=model,
             sdk_settings_path=sdk_settings_path,
             agents=agents,
+            timeout=timeout,
         )
         logger.info("Headless SDK session completed. Session ID: %s", session_id)
     except SDKRunnerError as exc:
@@ -285,8 +285,9 @@ def create_parser() -> argparse.ArgumentParser:
     )
     train_parser.add_argument(
         "variant",
-        choices=["sonnet", "opus", "haiku"],
-        help="Prompt variant to train (determines which prompts to load/write)",
+        choices=["sonnet", "opus", "haiku", "all"],
+        help="Prompt variant to train (determines which prompts to load/write); "
+        "'all' trains every variant from one shared training batch",
     )
     train_parser.add_argument(
         "--batch-size",
@@ -314,6 +315,96 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Delete and regenerate all trace summaries before training",
     )
+    train_parser.add_argument(
+        "--token-budget",
+        dest="token_budget",
+        type=int,
+        default=100_000,
+        help="Estimated token budget for training samples; the most informative "
+        "samples that fit are chosen (default: 100000)",
+    )
+    train_parser.add_argument(
+        "--candidates",
+        dest="candidates",
+        type=int,
+        default=1,
+        help="Number of candidates to generate concurrently from the same "
+        "training batch (default: 1, max: 10)",
+    )
+
+    # Optimize command
+    optimize_parser = subparsers.add_parser(
+        "optimize",
+        help="Evolve prompt candidates, scoring each by replaying held-out plans",
+    )
+    optimize_parser.add_argument(
+        "variant",
+        choices=["sonnet", "opus", "haiku"],
+        help="Prompt variant to optimize (also the model used to replay plans)",
+    )
+    optimize_parser.add_argument(
+        "--generations",
+        dest="generations",
+        type=int,
+        default=3,
+        help="Number of generations to breed (default: 3, max: 10)",
+    )
+    optimize_parser.add_argument(
+        "--population",
+        dest="population",
+        type=int,
+        default=4,
+        help="Candidates bred per generation (default: 4, max: 10)",
+    )
+    optimize_parser.add_argument(
+        "--holdout",
+        dest="holdout",
+        type=int,
+        default=2,
+        help="Most recent replayable plans held out from training and replayed "
+        "to score candidates (default: 2, max: 10)",
+    )
+    optimize_parser.add_argument(
+        "--max-concurrent",
+        dest="max_concurrent",
+        type=int,
+        default=4,
+        help="Maximum replays running at once (default: 4, max: 16)",
+    )
+    optimize_parser.add_argument(
+        "--eval-timeout",
+        dest="eval_timeout",
+        type=int,
+        default=1800,
+        help="Maximum seconds per plan replay, including judges and tests (default: 1800)",
+    )
+    optimize_parser.add_argument(
+        "--batch-size",
+        dest="batch_size",
+        type=int,
+        default=3,
+        help="Number of training samples per batch (default: 3, max: 10)",
+    )
+    optimize_parser.add_argument(
+        "--max-subagents",
+        dest="max_subagents",
+        type=int,
+        default=5,
+        help="Maximum number of subagents per candidate (default: 5, max: 10)",
+    )
+    optimize_parser.add_argument(
+        "--model",
+        dest="model",
+        default="x-ai/grok-4.1-fast",
+        help="OpenRouter model for generating candidates (default: x-ai/grok-4.1-fast)",
+    )
+    optimize_parser.add_argument(
+        "--token-budget",
+        dest="token_budget",
+        type=int,
+        default=100_000,
+        help="Estimated token budget for training samples (default: 100000)",
+    )
 
     return parser
 
@@ -508,12 +599,34 @@ def main(argv: Sequence[str] | None = None) -> int:
         max_subagents = args.max_subagents
         model = args.model
         regenerate_summaries = args.regenerate_summaries
+        token_budget = args.token_budget
+        candidates = args.candidates
         return run_train_command(
             variant=variant,
             batch_size=batch_size,
             max_subagents=max_subagents,
             model=model,
             regenerate_summaries=regenerate_summaries,
+            token_budget=token_budget,
+            candidates=candidates,
+        )
+
+    # Optimize command
+    if args.command == "optimize":
+        # Lazy import to avoid loading dspy and the SDK during tab completion
+        from .optimize_command import run_optimize_command
+
+        return run_optimize_command(
+            variant=args.variant,
+            generations=args.generations,
+            population=args.population,
+            holdout=args.holdout,
+            max_concurrent=args.max_concurrent,
+            eval_timeout=args.eval_timeout,
+            batch_size=args.batch_size,
+            max_subagents=args.max_subagents,
+            model=args.model,
+            token_budget=args.token_budget,
         )
 
     # Code command
@@ -48,7 +48,12 @@ from .session_manager import (
     create_session_directory,
     prune_old_sessions,
 )
-from .trace_capture import TraceCaptureError, capture_session_trace
+from .trace_capture import (
+    LIVE_TRACE_FILENAME,
+    TraceCaptureError,
+    capture_session_trace,
+    render_live_trace,
+)
 from .patch_utils import (
     EmptyPatchError,
     PatchCaptureError,
@@ -362,6 +367,56 @@ def _compute_prompt_fingerprint_for_session(
             return compute_prompt_fingerprint("Implement the plan in plan.md\n", [])
 
 
+def _capture_code_trace(
+    worktree_path: Path,
+    session_dir: Path,
+    execution_start: float,
+    execution_end: float,
+    session_id: str | None,
+    sdk_only: bool,
+) -> None:
+    """Capture the code session trace (non-fatal if it fails).
+
+    When the whole session ran through the SDK, the live recording written by
+    sdk_runner is rendered directly. After a CLI resume the CLI turns exist
+    only under ~/.claude/projects/, so post-hoc capture runs first and the
+    live recording is the fallback.
+
+    Args:
+        worktree_path: Path to the worktree directory
+        session_dir: Code session directory
+        execution_start: Session start time (seconds since epoch)
+        execution_end: Session end time (seconds since epoch)
+        session_id: SDK session ID, if known
+        sdk_only: True if the session never left the SDK (headless mode)
+    """
+    live_trace_path = session_dir / LIVE_TRACE_FILENAME
+    try:
+        trace_file = None
+        if not sdk_only:
+            trace_file = capture_session_trace(
+                worktree_path=worktree_path,
+                command="code",
+                run_dir=session_dir,
+                execution_start=execution_start,
+                execution_end=execution_end,
+                session_id=session_id,
+            )
+        if trace_file is None:
+            trace_file = render_live_trace(
+                live_trace_path=live_trace_path,
+                worktree_path=worktree_path,
+                command="code",
+                run_dir=session_dir,
+                execution_start=execution_start,
+            )
+        if trace_file:
+            logger.debug("Trace captured at: %s", trace_file)
+    except TraceCaptureError as exc:
+        logger.warning("Warning: Trace capture failed")
+        logger.debug("Trace capture error details: %s", exc)
+
+
 def run_code_command(
     plan_path: Path | str,
     tool: str = "claude-code",
@@ -643,6 +698,13 @@ def run_code_command(
         # Both are built from the same prompts source to ensure synchronization.
         agents = _build_agent_definitions(prompts, effective_model)
 
+        # Record the SDK conversation live; drop any recording from a previous run
+        live_trace_path = session_dir / LIVE_TRACE_FILENAME
+        try:
+            live_trace_path.unlink(missing_ok=True)
+        except OSError as exc:
+            logger.warning("Failed to remove previous live trace: %s", exc)
+
         try:
             session_id = run_sdk_session_sync(
                 worktree_path=worktree_path,
@@ -650,6 +712,7 @@ def run_code_command(
                 model=effective_model,
                 sdk_settings_path=sdk_settings_path,
                 agents=agents,
+                trace_path=live_trace_path,
             )
             logger.info("SDK session completed. Session ID: %s", session_id)
         except SDKRunnerError as exc:
@@ -690,6 +753,11 @@ def run_code_command(
             except PlanLifecycleError as exc:
                 logger.warning("Failed to update plan status: %s", exc)
 
+            _capture_code_trace(
+                worktree_path, session_dir, execution_start, time.time(), session_id,
+                sdk_only=True,
+            )
+
             logger.info(
                 "Session complete. Worktree remains at: %s\n"
                 "Session artifacts saved to: %s",
@@ -750,20 +818,10 @@ def run_code_command(
 
         # Capture conversation trace (non-fatal if it fails)
         if tool == "claude-code":
-            try:
-                trace_file = capture_session_trace(
-                    worktree_path=worktree_path,
-                    command="code",
-                    run_dir=session_dir,
-                    execution_start=execution_start,
-                    execution_end=execution_end,
-                    session_id=session_id,
-                )
-                if trace_file:
-                    logger.debug("Trace captured at: %s", trace_file)
-            except TraceCaptureError as exc:
-                logger.warning("Warning: Trace capture failed")
-                logger.debug("Trace capture error details: %s", exc)
+            _capture_code_trace(
+                worktree_path, session_dir, execution_start, execution_end, session_id,
+                sdk_only=False,
+            )
 
         if result.returncode != 0:
             logger.warning("%s session exited with code %d", tool, result.returncode)
@@ -788,20 +846,10 @@ def run_code_command(
 
         # Capture conversation trace even for interrupted sessions (non-fatal if it fails)
         if tool == "claude-code":
-            try:
-                trace_file = capture_session_trace(
-                    worktree_path=worktree_path,
-                    command="code",
-                    run_dir=session_dir,
-                    execution_start=execution_start,
-                    execution_end=execution_end,
-                    session_id=session_id,
-                )
-                if trace_file:
-                    logger.debug("Trace captured at: %s", trace_file)
-            except TraceCaptureError as exc:
-                logger.warning("Warning: Trace capture failed")
-                logger.debug("Trace capture error details: %s", exc)
+            _capture_code_trace(
+                worktree_path, session_dir, execution_start, execution_end, session_id,
+                sdk_only=False,
+            )
 
         return 130  # Standard exit code for SIGINT
     except Exception as exc:
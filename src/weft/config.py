@@ -3,6 +3,8 @@
 This module provides centralized configuration loading for weft, handling:
 - Model defaults for commands (plan, code, finalize)
 - Hooks configuration
+- Trace storage compression
+- Judge execution limits
 - Graceful error handling for missing or corrupted config files
 
 Model Selection Precedence Chain:
@@ -19,6 +21,14 @@ Example config.toml:
     [hooks.plan_file_created]
     command = "code-oss ${worktree_path}"
     enabled = true
+
+    [traces]
+    compression = "gzip"   # or "zstd" (needs zstandard), "none" (default)
+
+    [judges]
+    max_concurrent = 4     # judges running at once
+    timeout_seconds = 300  # per judge attempt
+    max_retries = 3        # retries on rate limits, 5xx errors and timeouts
 """
 
 from __future__ import annotations
@@ -43,6 +53,12 @@ CONFIG_PATH = Path.home() / ".weft" / "config.toml"
 # Valid model names
 VALID_MODELS = {"sonnet", "opus", "haiku"}
 
+# Valid [traces] compression values
+VALID_TRACE_COMPRESSIONS = {"none", "gzip", "zstd"}
+
+# [judges] settings and their minimum values
+JUDGE_SETTING_MINIMUMS = {"max_concurrent": 1, "timeout_seconds": 1, "max_retries": 0}
+
 
 def load_config() -> dict[str, Any]:
     """Load all configuration sections from ~/.weft/config.toml.
@@ -141,3 +157,70 @@ def get_model_defaults() -> dict[str, str]:
             result[key] = value
 
     return result
+
+
+def get_trace_compression() -> str | None:
+    """Load the trace storage format from the [traces] section of config.toml.
+
+    Returns:
+        "gzip" or "zstd" if traces should be stored compressed, or None for
+        uncompressed storage (the default, also used for invalid values)
+    """
+    config = load_config()
+    traces = config.get("traces", {})
+
+    if not isinstance(traces, dict):
+        logger.warning(
+            "[traces] section in config.toml should be a table, got %s",
+            type(traces).__name__,
+        )
+        return None
+
+    value = traces.get("compression", "none")
+    if value not in VALID_TRACE_COMPRESSIONS:
+        logger.warning(
+            "Config traces.compression has invalid value '%s'. "
+            "Valid values: %s. Storing traces uncompressed.",
+            value,
+            ", ".join(sorted(VALID_TRACE_COMPRESSIONS)),
+        )
+        return None
+
+    return None if value == "none" else value
+
+
+def get_judge_settings() -> dict[str, int | float]:
+    """Load judge execution limits from the [judges] section of config.toml.
+
+    Returns:
+        Dictionary with any of max_concurrent, timeout_seconds and
+        max_retries that are configured and valid; callers use their own
+        defaults for the rest
+    """
+    config = load_config()
+    judges = config.get("judges", {})
+
+    if not isinstance(judges, dict):
+        logger.warning(
+            "[judges] section in config.toml should be a table, got %s",
+            type(judges).__name__,
+        )
+        return {}
+
+    result: dict[str, int | float] = {}
+    for key, minimum in JUDGE_SETTING_MINIMUMS.items():
+        if key not in judges:
+            continue
+        value = judges[key]
+        valid_type = (int, float) if key == "timeout_seconds" else int
+        if isinstance(value, bool) or not isinstance(value, valid_type) or value < minimum:
+            logger.warning(
+                "Config judges.%s has invalid value %r (must be a number >= %d), ignoring",
+                key,
+                value,
+                minimum,
+            )
+            continue
+        result[key] = value
+
+    return result
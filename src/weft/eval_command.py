@@ -8,7 +8,10 @@ prompt optimization.
 from __future__ import annotations
 
 import json
+import os
 import shutil
+from collections.abc import Collection
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
@@ -16,17 +19,23 @@ from .feedback_collector import FeedbackCollectionError, collect_human_feedback
 from .fingerprint import compute_eval_fingerprint
 from .git_context import GitContextError, gather_git_context
 from .hooks import trigger_hook
+from .judge_cache import judge_input_keys
+from .judge_context import render_judge_changes
 from .judge_executor import JudgeExecutionError, JudgeResult, get_cache_dir, get_openrouter_api_key
-from .judge_loader import JudgeLoaderError, discover_judges
+from .judge_loader import JudgeConfig, JudgeLoaderError, discover_judges
 from .judge_orchestrator import JudgeOrchestrationError, execute_judges_parallel
 from .logging_config import get_logger
 from .plan_resolver import PlanResolver
 from .session_manager import SessionManagerError, create_session_directory
 from .test_runner import TestRunnerError, run_after_tests, run_before_tests
+from .trace_storage import trace_exists
 from .training_data_exporter import TrainingDataExportError, create_training_data
 
 logger = get_logger(__name__)
 
+# Judges that failed in the last run, kept out of the judge_*.json results
+FAILED_JUDGES_FILENAME = "failed_judges.json"
+
 
 def format_judge_markdown(result: JudgeResult) -> str:
     """Format a judge result as human-readable markdown.
@@ -82,35 +91,152 @@ def format_judge_results(results: list, plan_id: str, worktree_path: Path) -> st
     return "\n".join(lines)
 
 
+def _load_judge_output(json_path: Path, input_fingerprint: str) -> Optional[JudgeResult]:
+    """Load a saved judge result if it was produced from the current inputs.
+
+    Outputs saved before input fingerprints were recorded are trusted.
+
+    Returns:
+        The saved JudgeResult, or None if missing, unreadable or stale
+    """
+    try:
+        data = json.loads(json_path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("Ignoring unreadable judge output %s: %s", json_path, exc)
+        return None
+
+    recorded = data.get("input_fingerprint")
+    if recorded is not None and recorded != input_fingerprint:
+        logger.info("Judge output is stale (inputs changed): %s", data.get("judge_name"))
+        return None
+
+    return JudgeResult(
+        judge_name=data["judge_name"],
+        score=data["score"],
+        feedback=data["feedback"],
+        weight=data["weight"],
+    )
+
+
+def _write_text_atomic(path: Path, content: str) -> None:
+    """Write a file via a temporary sibling so readers never see it half-written."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def save_judge_result(
+    result: JudgeResult,
+    eval_dir: Path,
+    input_fingerprint: Optional[str] = None,
+) -> None:
+    """Save one judge's result to JSON and markdown files.
+
+    Args:
+        result: JudgeResult object
+        eval_dir: Directory where judge files should be saved
+        input_fingerprint: Judge cache key, recorded so a stale output can be
+                           detected when the judge or its inputs change
+    """
+    eval_dir.mkdir(parents=True, exist_ok=True)
+
+    # Save JSON
+    json_path = eval_dir / f"judge_{result.judge_name}.json"
+    json_data = {
+        "judge_name": result.judge_name,
+        "weight": result.weight,
+        "score": result.score,
+        "feedback": result.feedback,
+    }
+    if input_fingerprint is not None:
+        json_data["input_fingerprint"] = input_fingerprint
+    _write_text_atomic(json_path, json.dumps(json_data, indent=2))
+    logger.debug("Saved judge JSON: %s", json_path)
+
+    # Save markdown
+    md_path = eval_dir / f"judge_{result.judge_name}.md"
+    _write_text_atomic(md_path, format_judge_markdown(result))
+    logger.debug("Saved judge markdown: %s", md_path)
+
+
 def save_judge_results(
     results: list[JudgeResult],
     eval_dir: Path,
+    input_fingerprints: Optional[dict[str, str]] = None,
 ) -> None:
     """Save per-judge results to JSON and markdown files.
 
     Args:
         results: List of JudgeResult objects
         eval_dir: Directory where judge files should be saved
+        input_fingerprints: Judge cache key per judge name, recorded so stale
+                            outputs can be detected when inputs change
     """
-    eval_dir.mkdir(parents=True, exist_ok=True)
-
     for result in results:
-        # Save JSON
-        json_path = eval_dir / f"judge_{result.judge_name}.json"
-        json_data = {
-            "judge_name": result.judge_name,
-            "weight": result.weight,
-            "score": result.score,
-            "feedback": result.feedback,
-        }
-        json_path.write_text(json.dumps(json_data, indent=2), encoding="utf-8")
-        logger.debug("Saved judge JSON: %s", json_path)
+        save_judge_result(
+            result, eval_dir, (input_fingerprints or {}).get(result.judge_name)
+        )
+
+
+def load_judge_failures(eval_dir: Path) -> dict[str, dict]:
+    """Load the judges recorded as failed in an eval directory.
+
+    Returns:
+        Mapping of judge name to failure record (error, input_fingerprint,
+        failed_at); empty if none are recorded or the file is unreadable
+    """
+    path = eval_dir / FAILED_JUDGES_FILENAME
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("Ignoring unreadable judge failure record %s: %s", path, exc)
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_judge_failures(eval_dir: Path, failures: dict[str, dict]) -> None:
+    path = eval_dir / FAILED_JUDGES_FILENAME
+    if failures:
+        eval_dir.mkdir(parents=True, exist_ok=True)
+        _write_text_atomic(path, json.dumps(failures, indent=2, sort_keys=True))
+    else:
+        path.unlink(missing_ok=True)
+
+
+def record_judge_failure(
+    eval_dir: Path,
+    judge_name: str,
+    error: str,
+    input_fingerprint: Optional[str] = None,
+) -> None:
+    """Record that a judge failed, kept apart from the judge_*.json results.
+
+    Args:
+        eval_dir: Eval session directory
+        judge_name: Name of the failed judge
+        error: Final error message
+        input_fingerprint: Judge cache key of the failed attempt
+    """
+    failures = load_judge_failures(eval_dir)
+    failures[judge_name] = {
+        "error": error,
+        "input_fingerprint": input_fingerprint,
+        "failed_at": datetime.now(timezone.utc).isoformat(),
+    }
+    _write_judge_failures(eval_dir, failures)
+
 
-        # Save markdown
-        md_path = eval_dir / f"judge_{result.judge_name}.md"
-        md_content = format_judge_markdown(result)
-        md_path.write_text(md_content, encoding="utf-8")
-        logger.debug("Saved judge markdown: %s", md_path)
+def clear_judge_failures(eval_dir: Path, judge_names: Collection[str]) -> None:
+    """Forget recorded failures of the given judges."""
+    failures = load_judge_failures(eval_dir)
+    if any(name in failures for name in judge_names):
+        for name in judge_names:
+            failures.pop(name, None)
+        _write_judge_failures(eval_dir, failures)
 
 
 def run_eval_command(
@@ -122,7 +248,8 @@ def run_eval_command(
     """Run the eval command to evaluate code changes.
 
     Orchestrates:
-    1. Run LLM judges (skip if already done unless --force)
+    1. Run LLM judges (skip judges whose saved output matches the current
+       judge and changes unless --force; identical inputs hit the judge cache)
     2. Run before tests via Claude Code SDK (skip if already done unless --force)
     3. Run after tests via Claude Code SDK (skip if already done unless --force)
     4. Collect human feedback (skip if already done unless --force)
@@ -200,6 +327,22 @@ def run_eval_command(
         eval_fingerprint = compute_eval_fingerprint(discovered_judges)
         logger.debug("Eval fingerprint: %s", eval_fingerprint)
 
+        # Gather git context; judge inputs decide which saved outputs are current
+        try:
+            plan_content, git_changes = gather_git_context(worktree_path, plan_id=actual_plan_id)
+        except GitContextError as exc:
+            logger.error("Failed to gather git context: %s", exc)
+            return 1
+
+        logger.debug("Gathered plan content (%d chars)", len(plan_content))
+        logger.debug("Gathered %d changed file(s)", len(git_changes.files))
+
+        input_fingerprints = judge_input_keys(
+            discovered_judges,
+            plan_content,
+            render_judge_changes(discovered_judges, plan_content, git_changes),
+        )
+
         # Check which judge outputs already exist
         discovered_names = {j.name for j in discovered_judges}
         existing_outputs = {
@@ -214,39 +357,30 @@ def run_eval_command(
             stale_md.unlink(missing_ok=True)
             logger.info("Removed stale judge output: %s", stale_name)
 
-        # Determine which judges need to run
-        if force:
-            judges_to_run = discovered_judges
-        else:
-            judges_to_run = [j for j in discovered_judges if j.name not in existing_outputs]
+        clear_judge_failures(eval_dir, set(load_judge_failures(eval_dir)) - discovered_names)
 
+        # Reuse outputs whose recorded inputs match the current judge and changes
         judge_results: list[JudgeResult] = []
+        judges_to_run = []
+        for judge in discovered_judges:
+            saved = None if force else _load_judge_output(
+                eval_dir / f"judge_{judge.name}.json", input_fingerprints[judge.name]
+            )
+            if saved is not None:
+                judge_results.append(saved)
+            else:
+                judges_to_run.append(judge)
 
         if not judges_to_run:
             logger.info("Skipping judges (already run, use --force to re-run)")
-            # Load existing results
-            for judge in discovered_judges:
-                json_path = eval_dir / f"judge_{judge.name}.json"
-                if json_path.exists():
-                    data = json.loads(json_path.read_text(encoding="utf-8"))
-                    judge_results.append(
-                        JudgeResult(
-                            judge_name=data["judge_name"],
-                            score=data["score"],
-                            feedback=data["feedback"],
-                            weight=data["weight"],
-                        )
-                    )
         else:
-            # Gather git context
-            try:
-                plan_content, git_changes = gather_git_context(worktree_path, plan_id=actual_plan_id)
-            except GitContextError as exc:
-                logger.error("Failed to gather git context: %s", exc)
-                return 1
-
-            logger.debug("Gathered plan content (%d chars)", len(plan_content))
-            logger.debug("Gathered git changes (%d chars)", len(git_changes))
+            previously_failed = sorted(
+                {j.name for j in judges_to_run} & set(load_judge_failures(eval_dir))
+            )
+            if previously_failed:
+                logger.info(
+                    "Retrying judge(s) that failed last time: %s", ", ".join(previously_failed)
+                )
 
             # Get OpenRouter API key
             try:
@@ -258,37 +392,46 @@ def run_eval_command(
             # Get cache directory
             cache_dir = get_cache_dir()
 
-            # Execute judges
+            # Persist each result as soon as its judge finishes, so finished
+            # judges are not paid for again if another one fails
+            def on_result(result: JudgeResult) -> None:
+                try:
+                    save_judge_result(
+                        result, eval_dir, input_fingerprints[result.judge_name]
+                    )
+                    clear_judge_failures(eval_dir, [result.judge_name])
+                except OSError as exc:
+                    logger.warning("Failed to save result of judge '%s': %s", result.judge_name, exc)
+
+            def on_failure(judge: JudgeConfig, error: Exception) -> None:
+                try:
+                    record_judge_failure(
+                        eval_dir, judge.name, str(error), input_fingerprints[judge.name]
+                    )
+                except OSError as exc:
+                    logger.warning("Failed to record failure of judge '%s': %s", judge.name, exc)
+
+            # Execute judges (unchanged inputs are served by the judge cache)
             try:
-                judge_results = execute_judges_parallel(
+                new_results = execute_judges_parallel(
                     judges=judges_to_run,
                     plan_content=plan_content,
                     git_changes=git_changes,
                     api_key=api_key,
                     cache_dir=cache_dir,
+                    on_result=on_result,
+                    on_failure=on_failure,
                 )
             except JudgeOrchestrationError as exc:
                 logger.error("Judge execution failed: %s", exc)
+                logger.info(
+                    "Finished judge results are saved; re-run to execute only the "
+                    "missing or failed judges"
+                )
                 return 1
 
-            # Save judge results
-            save_judge_results(judge_results, eval_dir)
-
-            # If we only ran some judges, load the rest
-            if len(judges_to_run) < len(discovered_judges):
-                for judge in discovered_judges:
-                    if judge.name not in {r.judge_name for r in judge_results}:
-                        json_path = eval_dir / f"judge_{judge.name}.json"
-                        if json_path.exists():
-                            data = json.loads(json_path.read_text(encoding="utf-8"))
-                            judge_results.append(
-                                JudgeResult(
-                                    judge_name=data["judge_name"],
-                                    score=data["score"],
-                                    feedback=data["feedback"],
-                                    weight=data["weight"],
-                                )
-                            )
+            judge_results.extend(new_results)
+            judge_results.sort(key=lambda r: r.judge_name)
 
         # Display judge scores
         for result in judge_results:
@@ -413,7 +556,7 @@ def run_eval_command(
             # Check if code_trace.md is missing from training data but now available
             trace_in_training = training_data_dir / "code_trace.md"
             trace_in_session = code_session_dir / "trace.md"
-            if not trace_in_training.exists() and trace_in_session.exists():
+            if not trace_exists(trace_in_training) and trace_exists(trace_in_session):
                 logger.info("Code trace now available - updating training data...")
                 should_create = True
 
@@ -163,9 +163,12 @@ _GITIGNORE_MARKER = "# weft cache"
 _GITIGNORE_ENTRIES = """
 # weft cache and temporary files
 .weft/dspy_cache/
+.weft/objects/
 .weft/worktrees/
 .weft/runs/
 .weft/plan-traces/
+.weft/training_data/.staging/
+.weft/training_data/index.jsonl
 """
 
 
@@ -176,7 +179,8 @@ def update_gitignore(project_root: Path) -> None:
         project_root: Path to the project root directory.
 
     Note:
-        - If .gitignore exists and already contains the marker, no changes are made.
+        - If .gitignore exists and already contains the marker, only entries
+          added since (missing lines) are appended.
         - If .gitignore exists without marker, entries are appended.
         - If .gitignore doesn't exist, it is created with the entries.
     """
@@ -189,9 +193,23 @@ def update_gitignore(project_root: Path) -> None:
             logger.warning("Failed to read .gitignore: %s", exc)
             return
 
-        # Check if already present
+        # Check if already present; add entries introduced by newer versions
         if _GITIGNORE_MARKER in content:
-            logger.debug(".gitignore already contains weft cache entries")
+            present = {line.strip() for line in content.splitlines()}
+            missing = [
+                line for line in _GITIGNORE_ENTRIES.splitlines()
+                if line.startswith(".weft/") and line not in present
+            ]
+            if not missing:
+                logger.debug(".gitignore already contains weft cache entries")
+                return
+            try:
+                gitignore_path.write_text(
+                    content.rstrip() + "\n" + "\n".join(missing) + "\n", encoding="utf-8"
+                )
+                logger.info("Added %d new weft cache entries to .gitignore", len(missing))
+            except OSError as exc:
+                logger.warning("Failed to update .gitignore: %s", exc)
             return
 
         # Append to existing .gitignore
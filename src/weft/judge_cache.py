@@ -0,0 +1,203 @@
+"""Input-keyed cache for judge results.
+
+A judge's verdict depends only on its configuration (instructions, model,
+weight) and the plan and git changes it reads. This module caches each
+successful result under a hash of those inputs, so re-running an eval
+with --force, after pruning a session, or on another plan with identical
+changes costs no LM calls.
+
+Cache layout (shared by all repositories):
+    ~/.weft/judge_cache/<key[:2]>/<key>.json
+
+The same key is recorded as input_fingerprint in each judge_<name>.json,
+so eval can tell whether a saved result still matches the current judges
+and changes.
+
+Entries are evicted least-recently-used first (by mtime, refreshed on every
+hit) once the cache exceeds its size bound.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Optional
+
+from .judge_executor import JudgeResult
+from .judge_loader import JudgeConfig
+from .logging_config import get_logger
+from .summary_cache import content_hash
+
+logger = get_logger(__name__)
+
+# Default bound on total cache size; a judge result is typically 1-5KB
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# Bumped when the judge signature or result format changes, invalidating old entries
+JUDGE_CACHE_VERSION = "1"
+
+
+def get_judge_cache_dir() -> Path:
+    """Get the global judge result cache directory (~/.weft/judge_cache/)."""
+    return Path.home() / ".weft" / "judge_cache"
+
+
+def judge_cache_key(judge: JudgeConfig, plan_hash: str, changes_hash: str) -> str:
+    """Compute the cache key for one judge's verdict on one set of inputs.
+
+    The judge name is deliberately left out: renaming a judge file does not
+    change its verdict.
+
+    Args:
+        judge: Judge configuration
+        plan_hash: content_hash() of the plan content
+        changes_hash: content_hash() of the git changes
+
+    Returns:
+        Hex digest identifying the result
+    """
+    digest = hashlib.sha256()
+    parts = (
+        JUDGE_CACHE_VERSION,
+        content_hash(judge.instructions),
+        judge.model,
+        repr(float(judge.weight)),
+        plan_hash,
+        changes_hash,
+    )
+    for part in parts:
+        encoded = part.encode("utf-8")
+        # Length-prefix each part so boundaries are unambiguous
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+def judge_input_keys(
+    judges: list[JudgeConfig], plan_content: str, git_changes: str | Mapping[str, str]
+) -> dict[str, str]:
+    """Compute the cache key of every judge for the same plan.
+
+    Args:
+        judges: Judge configurations
+        plan_content: Full plan.md file content
+        git_changes: Git changes text shared by all judges, or the text
+                     each judge receives by judge name (see
+                     judge_context.render_judge_changes)
+
+    Returns:
+        Mapping of judge name to cache key
+    """
+    plan_hash = content_hash(plan_content)
+    if isinstance(git_changes, str):
+        git_changes = {judge.name: git_changes for judge in judges}
+    change_hashes = {text: content_hash(text) for text in set(git_changes.values())}
+    return {
+        judge.name: judge_cache_key(judge, plan_hash, change_hashes[git_changes[judge.name]])
+        for judge in judges
+    }
+
+
+class JudgeCache:
+    """Size-bounded, input-keyed store of judge results."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Cache directory (default: ~/.weft/judge_cache/)
+            max_bytes: Total size above which least recently used entries are evicted
+        """
+        self.cache_dir = cache_dir if cache_dir is not None else get_judge_cache_dir()
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str, judge: JudgeConfig) -> Optional[JudgeResult]:
+        """Return the cached result for a key, or None on a miss.
+
+        The result carries the given judge's current name and weight. A hit
+        refreshes the entry's mtime so eviction is least-recently-used.
+        """
+        path = self._entry_path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            score = float(data["score"])
+            feedback = str(data["feedback"])
+        except FileNotFoundError:
+            return None
+        except (OSError, UnicodeDecodeError, ValueError, TypeError, KeyError) as e:
+            logger.warning("Ignoring unreadable judge cache entry %s: %s", path, e)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        logger.debug("Judge cache hit for '%s': %s", judge.name, key[:12])
+        return JudgeResult(
+            judge_name=judge.name, score=score, feedback=feedback, weight=judge.weight
+        )
+
+    def put(self, key: str, result: JudgeResult) -> None:
+        """Store a result, then evict old entries if the cache is over its bound.
+
+        Failures are logged and otherwise ignored; the cache is an optimization.
+        """
+        path = self._entry_path(key)
+        document = json.dumps({"score": result.score, "feedback": result.feedback})
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(document)
+                os.replace(tmp_name, path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            logger.warning("Failed to write judge cache entry %s: %s", path, e)
+            return
+
+        logger.debug("Cached result of judge '%s': %s", result.judge_name, key[:12])
+        self.evict()
+
+    def evict(self) -> int:
+        """Evict least recently used entries until the cache fits its bound.
+
+        Returns:
+            Number of entries evicted
+        """
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return 0
+
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.debug("Failed to evict %s: %s", path, e)
+                continue
+            total -= size
+            evicted += 1
+
+        logger.debug("Evicted %d judge cache entr%s", evicted, "y" if evicted == 1 else "ies")
+        return evicted
@@ -176,7 +176,6 @@ def run_judge_command(plan_id: str, output_dir: Optional[str] = None) -> int:
             return 1
 
         logger.debug("Gathered plan content (%d chars)", len(plan_content))
-        logger.debug("Gathered git changes (%d chars)", len(git_changes))
 
         # Get OpenRouter API key
         try:
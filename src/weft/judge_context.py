@@ -0,0 +1,388 @@
+"""Token-budgeted git change context for judges.
+
+Judges used to receive the git status, the full `git diff HEAD` and the
+complete contents of every changed file, so a lockfile update or a
+generated file could dominate (and slow down) every judge call. Instead,
+changes are collected once per worktree as a GitChanges and rendered
+separately for each judge's token budget:
+
+1. Lockfiles, vendored or generated files and binary files are never
+   shown; they are listed with their line counts.
+2. Diffs (git's default 3 lines of context) of the remaining files are
+   added, files mentioned in the plan first, then smallest changes first.
+   New untracked files contribute their content instead.
+3. Leftover budget is spent on the full contents of changed files that are
+   not too large, in the same order.
+
+Whatever does not fit is listed as omitted, so a judge always knows which
+files changed.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+from .judge_loader import JudgeConfig
+from .logging_config import get_logger
+from .training_batch import CHARS_PER_TOKEN
+
+logger = get_logger(__name__)
+
+# Default token budget for a judge's git changes (judge front matter:
+# context_tokens)
+DEFAULT_CONTEXT_TOKENS = 60_000
+
+# Files larger than this are shown as diffs only, never in full
+MAX_CONTENT_BYTES = 256 * 1024
+
+# A diff is cut to fit the remaining budget only if at least this much
+# budget is left; otherwise the file is listed as omitted
+MIN_PARTIAL_DIFF_CHARS = 2_000
+
+# Only this many status lines are shown
+MAX_STATUS_LINES = 200
+
+LOCKFILE_NAMES = frozenset({
+    "package-lock.json",
+    "npm-shrinkwrap.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "bun.lockb",
+    "poetry.lock",
+    "uv.lock",
+    "Pipfile.lock",
+    "pdm.lock",
+    "Cargo.lock",
+    "Gemfile.lock",
+    "composer.lock",
+    "go.sum",
+    "mix.lock",
+    "pubspec.lock",
+    "Podfile.lock",
+    "flake.lock",
+})
+
+VENDORED_DIRS = frozenset({
+    "vendor",
+    "node_modules",
+    "third_party",
+    "third-party",
+    "dist",
+    "build",
+    ".venv",
+    "venv",
+    "__pycache__",
+})
+
+GENERATED_PATTERNS = (
+    "*.min.js",
+    "*.min.css",
+    "*.map",
+    "*_pb2.py",
+    "*_pb2_grpc.py",
+    "*.pb.go",
+    "*.generated.*",
+)
+
+_DIFF_HEADER = re.compile(r"^diff --git a/(.*) b/(.*)$")
+
+
+@dataclass
+class FileChange:
+    """One changed file in a worktree.
+
+    Attributes:
+        path: Path relative to the worktree (POSIX separators)
+        status: Two-character `git status --porcelain` code
+        diff: The file's section of `git diff HEAD` ("" for untracked files)
+        added: Lines added
+        removed: Lines removed
+        content: Full text of the file, if readable and at most
+                 MAX_CONTENT_BYTES
+        skip_reason: Why the file is never shown ("lockfile",
+                     "vendored or generated", "binary"), or None
+    """
+
+    path: str
+    status: str
+    diff: str = ""
+    added: int = 0
+    removed: int = 0
+    content: str | None = None
+    skip_reason: str | None = None
+
+    @property
+    def untracked(self) -> bool:
+        """Whether the file is new and not yet known to git."""
+        return self.status == "??"
+
+
+@dataclass
+class GitChanges:
+    """Git changes of a worktree, rendered per judge by render()."""
+
+    status: str
+    files: list[FileChange] = field(default_factory=list)
+
+    def render(self, token_budget: int = DEFAULT_CONTEXT_TOKENS, plan_content: str = "") -> str:
+        """Render the changes as judge context within a token budget.
+
+        Args:
+            token_budget: Approximate token budget for the rendered context
+            plan_content: Plan text; files it mentions are shown first
+
+        Returns:
+            Git status, diffs, file contents and a list of omitted files
+        """
+        status_lines = self.status.splitlines()
+        if len(status_lines) > MAX_STATUS_LINES:
+            extra = len(status_lines) - MAX_STATUS_LINES
+            status_lines = status_lines[:MAX_STATUS_LINES] + [f"... ({extra} more)"]
+        status_text = "\n".join(status_lines) if status_lines else "(no changes)"
+        remaining = token_budget * CHARS_PER_TOKEN - len(status_text)
+
+        shown = sorted(
+            (f for f in self.files if f.skip_reason is None),
+            key=lambda f: (not _mentioned(f.path, plan_content), f.added + f.removed, f.path),
+        )
+        omitted = [
+            f"- {f.path} ({f.skip_reason}, +{f.added} -{f.removed} lines)"
+            for f in self.files if f.skip_reason is not None
+        ]
+
+        diffs: list[str] = []
+        contents: list[str] = []
+
+        # Diffs first (new files contribute their content instead)
+        for change in shown:
+            if change.untracked:
+                if change.content is None:
+                    omitted.append(f"- {change.path} (new file, too large or unreadable)")
+                    continue
+                block = f"\n--- {change.path} (new file) ---\n{change.content}"
+                if len(block) <= remaining:
+                    contents.append(block)
+                    remaining -= len(block)
+                else:
+                    omitted.append(
+                        f"- {change.path} (new file, +{change.added} lines; over token budget)"
+                    )
+                continue
+
+            if not change.diff:
+                continue
+            if len(change.diff) <= remaining:
+                diffs.append(change.diff)
+                remaining -= len(change.diff)
+            elif remaining >= MIN_PARTIAL_DIFF_CHARS:
+                diffs.append(_truncate_lines(change.diff, remaining))
+                remaining = 0
+            else:
+                omitted.append(
+                    f"- {change.path} (+{change.added} -{change.removed} lines; over token budget)"
+                )
+
+        # Then full contents with whatever budget is left
+        for change in shown:
+            if change.untracked or change.content is None:
+                continue
+            block = f"\n--- {change.path} ---\n{change.content}"
+            if len(block) <= remaining:
+                contents.append(block)
+                remaining -= len(block)
+
+        sections = ["=== Git Status ===\n" + status_text]
+        sections.append("\n=== Git Diff ===\n" + ("\n".join(diffs) if diffs else "(no changes)"))
+        if contents:
+            sections.append("\n=== Changed File Contents ===")
+            sections.extend(contents)
+        if omitted:
+            sections.append("\n=== Omitted From Context ===\n" + "\n".join(omitted))
+        return "\n".join(sections)
+
+
+def _mentioned(path: str, plan_content: str) -> bool:
+    """Check whether the plan mentions a file by path or file name."""
+    if not plan_content:
+        return False
+    return path in plan_content or PurePosixPath(path).name in plan_content
+
+
+def _truncate_lines(text: str, max_chars: int) -> str:
+    """Cut text at a line boundary to at most about max_chars, noting the cut."""
+    lines = text.splitlines()
+    kept: list[str] = []
+    size = 0
+    for line in lines:
+        if size + len(line) + 1 > max_chars - 80:
+            break
+        kept.append(line)
+        size += len(line) + 1
+    kept.append(f"... ({len(lines) - len(kept)} more diff lines omitted to fit the token budget)")
+    return "\n".join(kept)
+
+
+def classify_path(path: str) -> str | None:
+    """Return why a path is never shown to judges, or None if it is.
+
+    Returns:
+        "lockfile", "vendored or generated", or None
+    """
+    pure = PurePosixPath(path)
+    if pure.name in LOCKFILE_NAMES:
+        return "lockfile"
+    if any(part in VENDORED_DIRS for part in pure.parts[:-1]):
+        return "vendored or generated"
+    if any(fnmatch.fnmatch(pure.name, pattern) for pattern in GENERATED_PATTERNS):
+        return "vendored or generated"
+    return None
+
+
+def _git(worktree_path: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=worktree_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def _split_diff(diff_output: str) -> dict[str, str]:
+    """Split `git diff` output into per-file sections keyed by new path."""
+    sections: dict[str, str] = {}
+    current: list[str] = []
+    path = None
+    for line in diff_output.splitlines():
+        match = _DIFF_HEADER.match(line)
+        if match:
+            if path is not None:
+                sections[path] = "\n".join(current)
+            path, current = match.group(2), []
+        current.append(line)
+    if path is not None:
+        sections[path] = "\n".join(current)
+    return sections
+
+
+def _parse_numstat(numstat_output: str) -> dict[str, tuple[int, int] | None]:
+    """Parse `git diff --numstat` into (added, removed) per path; None for binary."""
+    stats: dict[str, tuple[int, int] | None] = {}
+    for line in numstat_output.splitlines():
+        parts = line.split("\t")
+        if len(parts) != 3:
+            continue
+        added, removed, path = parts
+        stats[path] = None if added == "-" else (int(added), int(removed))
+    return stats
+
+
+def _status_path(line: str) -> str:
+    """Extract the (new) path from a `git status --porcelain` line."""
+    # Renames are reported as "R  old -> new"
+    if " -> " in line:
+        return line.split(" -> ", 1)[1].strip()
+    return line[3:].strip()
+
+
+def _read_content(file_path: Path) -> tuple[str | None, bool]:
+    """Read a changed file for judge context.
+
+    Returns:
+        Tuple of (content or None if missing, too large or unreadable,
+        whether the file is binary)
+    """
+    try:
+        if not file_path.is_file() or file_path.stat().st_size > MAX_CONTENT_BYTES:
+            return None, False
+        data = file_path.read_bytes()
+    except OSError as e:
+        logger.warning("Could not read file %s: %s", file_path, e)
+        return None, False
+    if b"\0" in data[:8192]:
+        return None, True
+    try:
+        return data.decode("utf-8"), False
+    except UnicodeDecodeError:
+        return None, True
+
+
+def collect_git_changes(worktree_path: Path) -> GitChanges:
+    """Collect the changes of a worktree relative to HEAD.
+
+    Args:
+        worktree_path: Path to the worktree directory
+
+    Returns:
+        GitChanges with one FileChange per path in `git status`
+
+    Raises:
+        subprocess.CalledProcessError: If git commands fail
+    """
+    status_output = _git(worktree_path, "status", "--porcelain").rstrip()
+    diffs = _split_diff(_git(worktree_path, "diff", "HEAD"))
+    stats = _parse_numstat(_git(worktree_path, "diff", "HEAD", "--numstat"))
+
+    files = []
+    for line in status_output.splitlines():
+        if not line.strip():
+            continue
+        path = _status_path(line)
+        change = FileChange(path=path, status=line[:2], diff=diffs.get(path, ""))
+        skip_reason = classify_path(path)
+
+        stat = stats.get(path, (0, 0))
+        binary = stat is None
+        if stat is not None:
+            change.added, change.removed = stat
+
+        if skip_reason is None and not binary:
+            content, binary = _read_content(worktree_path / path)
+            change.content = content
+            if change.untracked and content is not None:
+                change.added = len(content.splitlines())
+        if binary and skip_reason is None:
+            skip_reason = "binary"
+
+        change.skip_reason = skip_reason
+        files.append(change)
+
+    logger.debug(
+        "Collected %d changed file(s), %d omitted from judge context",
+        len(files),
+        sum(1 for f in files if f.skip_reason is not None),
+    )
+    return GitChanges(status=status_output, files=files)
+
+
+def render_judge_changes(
+    judges: list[JudgeConfig], plan_content: str, git_changes: str | GitChanges
+) -> dict[str, str]:
+    """Render the git changes each judge receives.
+
+    Args:
+        judges: Judge configurations
+        plan_content: Full plan.md file content
+        git_changes: Collected changes, rendered within each judge's
+                     context_tokens budget, or an already rendered string
+                     given to every judge unchanged
+
+    Returns:
+        Mapping of judge name to git changes text
+    """
+    if isinstance(git_changes, str):
+        return {judge.name: git_changes for judge in judges}
+
+    rendered: dict[int, str] = {}
+    by_judge: dict[str, str] = {}
+    for judge in judges:
+        budget = judge.context_tokens or DEFAULT_CONTEXT_TOKENS
+        if budget not in rendered:
+            rendered[budget] = git_changes.render(budget, plan_content)
+        by_judge[judge.name] = rendered[budget]
+    return by_judge
+
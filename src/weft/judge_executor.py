@@ -13,6 +13,7 @@ import dspy
 
 from .home_env import HomeEnvError, load_home_env
 from .judge_loader import JudgeConfig
+from .lm_pool import configure_dspy_cache, get_lm
 from .logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -56,56 +57,59 @@ class JudgeSignatureBase(dspy.Signature):
     feedback: str = dspy.OutputField(desc="Detailed feedback and recommendations")
 
 
-def configure_dspy_cache(cache_dir: Path) -> None:
-    """Configure DSPy to use the specified cache directory.
-
-    Args:
-        cache_dir: Directory for disk cache
-
-    Note:
-        This configures DSPy's global cache settings. Must be called before
-        any LM operations to ensure cache is used.
-    """
-    # Ensure cache directory exists
-    cache_dir.mkdir(parents=True, exist_ok=True)
-
-    # Configure DSPy cache to use the specified directory
-    dspy.configure_cache(
-        enable_disk_cache=True,
-        enable_memory_cache=True,
-        disk_cache_dir=str(cache_dir),
-    )
-
-    logger.debug("Configured DSPy cache at %s", cache_dir)
-
-
-def create_lm(model: str, api_key: str, cache_dir: Path) -> dspy.LM:
-    """Create a DSPy LM instance for OpenRouter.
+def create_lm(model: str, api_key: str, cache_dir: Path, num_retries: int = 3) -> dspy.LM:
+    """Get a DSPy LM instance for OpenRouter from the process-wide pool.
 
     Args:
         model: OpenRouter model tag (e.g., "x-ai/grok-4.1-fast")
         api_key: OpenRouter API key
         cache_dir: Directory for disk cache
+        num_retries: Retries LiteLLM makes on transient errors (0 when the
+                     caller retries itself)
 
     Returns:
-        Configured DSPy LM instance
+        Configured DSPy LM instance, shared with other callers using the
+        same model, key and settings
 
     Raises:
         JudgeExecutionError: If LM creation fails
     """
     try:
-        # Configure DSPy cache to use the specified directory
+        # Configure DSPy cache to use the specified directory (once per process)
         configure_dspy_cache(cache_dir)
 
-        # Create LM with OpenRouter via LiteLLM
-        lm = dspy.LM(f"openrouter/{model}", api_key=api_key, max_tokens=64000)
-
-        logger.debug("Created DSPy LM with model %s", model)
-        return lm
+        # Reuse the pooled LM for OpenRouter via LiteLLM
+        return get_lm(model, api_key, max_tokens=64000, num_retries=num_retries)
     except Exception as e:
         raise JudgeExecutionError(f"Failed to create DSPy LM: {e}") from e
 
 
+def _to_judge_result(judge: JudgeConfig, prediction: dspy.Prediction) -> JudgeResult:
+    """Extract and validate a judge's score and feedback from its prediction.
+
+    Raises:
+        JudgeExecutionError: If the score is outside 0.0-1.0
+    """
+    score = float(prediction.score)
+    feedback = str(prediction.feedback)
+
+    # Validate score range
+    if not (0.0 <= score <= 1.0):
+        raise JudgeExecutionError(
+            f"Judge '{judge.name}' returned invalid score {score} "
+            "(must be between 0.0 and 1.0)"
+        )
+
+    logger.info("Judge '%s' completed: score=%.2f", judge.name, score)
+
+    return JudgeResult(
+        judge_name=judge.name,
+        score=score,
+        feedback=feedback,
+        weight=judge.weight,
+    )
+
+
 def execute_judge(
     judge: JudgeConfig, plan_content: str, git_changes: str, api_key: str, cache_dir: Path
 ) -> JudgeResult:
@@ -142,26 +146,48 @@ def execute_judge(
         with dspy.context(lm=lm):
             result = predictor(plan_content=plan_content, git_changes=git_changes)
 
-        # Extract score and feedback
-        score = float(result.score)
-        feedback = str(result.feedback)
+        return _to_judge_result(judge, result)
 
-        # Validate score range
-        if not (0.0 <= score <= 1.0):
-            raise JudgeExecutionError(
-                f"Judge '{judge.name}' returned invalid score {score} "
-                "(must be between 0.0 and 1.0)"
-            )
+    except Exception as e:
+        raise JudgeExecutionError(
+            f"Failed to execute judge '{judge.name}': {e}"
+        ) from e
 
-        logger.info("Judge '%s' completed: score=%.2f", judge.name, score)
 
-        return JudgeResult(
-            judge_name=judge.name,
-            score=score,
-            feedback=feedback,
-            weight=judge.weight,
-        )
+async def execute_judge_async(
+    judge: JudgeConfig, plan_content: str, git_changes: str, api_key: str, cache_dir: Path
+) -> JudgeResult:
+    """Execute a single judge using DSPy's async predict path.
+
+    Async counterpart of execute_judge for the judge orchestrator. The LM
+    makes no retries of its own; the orchestrator retries transient errors
+    with backoff. The original LM error is kept as the __cause__ of the
+    raised JudgeExecutionError so callers can inspect its status code.
+
+    Args:
+        judge: Judge configuration with instructions and model
+        plan_content: Full plan.md file content
+        git_changes: Git diff, status, and changed file contents
+        api_key: OpenRouter API key
+        cache_dir: Directory for disk cache
+
+    Returns:
+        JudgeResult with score and feedback
+
+    Raises:
+        JudgeExecutionError: If judge execution fails
+    """
+    logger.info("Executing judge '%s' with model %s", judge.name, judge.model)
+
+    try:
+        lm = create_lm(judge.model, api_key, cache_dir, num_retries=0)
+        predictor = dspy.Predict(JudgeSignatureBase.with_instructions(judge.instructions))
+        with dspy.context(lm=lm):
+            result = await predictor.acall(plan_content=plan_content, git_changes=git_changes)
+        return _to_judge_result(judge, result)
 
+    except JudgeExecutionError:
+        raise
     except Exception as e:
         raise JudgeExecutionError(
             f"Failed to execute judge '{judge.name}': {e}"
@@ -16,6 +16,9 @@ from .logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Smallest allowed context_tokens in judge front matter
+MIN_CONTEXT_TOKENS = 1_000
+
 
 class JudgeLoaderError(Exception):
     """Raised when a judge file cannot be loaded or parsed."""
@@ -33,6 +36,8 @@ class JudgeConfig:
         model: OpenRouter model tag (e.g., "x-ai/grok-4.1-fast")
         instructions: Judge instructions in markdown format
         file_path: Path to the judge file
+        context_tokens: Token budget for the git changes shown to this judge
+                        (None = judge_context.DEFAULT_CONTEXT_TOKENS)
     """
 
     name: str
@@ -40,6 +45,7 @@ class JudgeConfig:
     model: str
     instructions: str
     file_path: Path
+    context_tokens: int | None = None
 
 
 def parse_judge_file(file_path: Path) -> JudgeConfig:
@@ -121,6 +127,20 @@ def parse_judge_file(file_path: Path) -> JudgeConfig:
     if not model.strip():
         raise JudgeLoaderError(f"Invalid 'model' in {file_path}: Cannot be empty")
 
+    # Validate optional context budget
+    context_tokens = frontmatter.get("context_tokens")
+    if context_tokens is not None:
+        if isinstance(context_tokens, bool) or not isinstance(context_tokens, int):
+            raise JudgeLoaderError(
+                f"Invalid 'context_tokens' in {file_path}: Expected integer, "
+                f"got {type(context_tokens).__name__}"
+            )
+        if context_tokens < MIN_CONTEXT_TOKENS:
+            raise JudgeLoaderError(
+                f"Invalid 'context_tokens' in {file_path}: Must be at least "
+                f"{MIN_CONTEXT_TOKENS}, got {context_tokens}"
+            )
+
     # Extract judge name from filename
     name = file_path.stem  # Remove .md extension
 
@@ -145,6 +165,7 @@ def parse_judge_file(file_path: Path) -> JudgeConfig:
         model=model,
         instructions=instructions,
         file_path=file_path,
+        context_tokens=context_tokens,
     )
 
 
@@ -1,19 +1,42 @@
 """Parallel judge execution orchestrator.
 
-Executes multiple judges concurrently and collects results.
+Executes multiple judges concurrently and collects results. Judges whose
+inputs are unchanged since a previous run are answered from the judge
+result cache (see judge_cache) without any LM call.
+
+The remaining judges run as asyncio tasks on DSPy's async predict path,
+at most max_concurrent at a time. Each attempt has its own timeout, and
+rate limits (429), server errors (5xx) and timeouts are retried with
+jittered exponential backoff. A failing judge never cancels the others, so
+a flaky network costs the slowest judge's retries rather than a restart
+of the whole batch.
 """
 
 from __future__ import annotations
 
-import concurrent.futures
+import asyncio
+import random
 from pathlib import Path
+from typing import Callable
 
-from .judge_executor import JudgeExecutionError, JudgeResult, execute_judge
+from .config import get_judge_settings
+from .judge_cache import JudgeCache, judge_input_keys
+from .judge_context import GitChanges, render_judge_changes
+from .judge_executor import JudgeExecutionError, JudgeResult, execute_judge_async
 from .judge_loader import JudgeConfig
 from .logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Defaults, overridable in the [judges] section of config.toml
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_TIMEOUT_SECONDS = 300.0
+DEFAULT_MAX_RETRIES = 3
+
+# Backoff before retry n is uniform in [0, min(cap, base * 2**n)] ("full jitter")
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 60.0
+
 
 class JudgeOrchestrationError(Exception):
     """Raised when judge orchestration fails."""
@@ -21,86 +44,234 @@ class JudgeOrchestrationError(Exception):
     pass
 
 
+def is_retryable(exc: BaseException) -> bool:
+    """Check whether a judge failure is transient.
+
+    Timeouts and errors carrying an HTTP status code of 408, 429 or 5xx
+    (as LiteLLM's exceptions do) anywhere in the exception chain count as
+    transient.
+    """
+    seen = set()
+    current: BaseException | None = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, TimeoutError):
+            return True
+        status = getattr(current, "status_code", None)
+        if isinstance(status, int) and (status in (408, 429) or status >= 500):
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return the jittered delay in seconds before retry number attempt (0-based)."""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt))
+
+
+async def _run_judge(
+    judge: JudgeConfig,
+    plan_content: str,
+    git_changes: str,
+    api_key: str,
+    cache_dir: Path,
+    semaphore: asyncio.Semaphore,
+    timeout: float,
+    max_retries: int,
+) -> JudgeResult:
+    """Run one judge with a per-attempt timeout, retrying transient failures.
+
+    The concurrency slot is released while backing off.
+
+    Raises:
+        JudgeExecutionError: If the judge fails permanently or runs out of retries
+    """
+    attempt = 0
+    while True:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    execute_judge_async(judge, plan_content, git_changes, api_key, cache_dir),
+                    timeout,
+                )
+            except TimeoutError as e:
+                error = JudgeExecutionError(f"Timed out after {timeout:g}s")
+                error.__cause__ = e
+            except JudgeExecutionError as e:
+                error = e
+
+        if attempt >= max_retries or not is_retryable(error):
+            raise error
+
+        delay = backoff_delay(attempt)
+        attempt += 1
+        logger.warning(
+            "Judge '%s' failed (%s); retry %d/%d in %.1fs",
+            judge.name, error, attempt, max_retries, delay,
+        )
+        await asyncio.sleep(delay)
+
+
+async def _run_judges(
+    judges: list[JudgeConfig],
+    plan_content: str,
+    changes_by_judge: dict[str, str],
+    api_key: str,
+    cache_dir: Path,
+    max_concurrent: int,
+    timeout: float,
+    max_retries: int,
+    on_complete: Callable[[JudgeConfig, JudgeResult | Exception], None],
+) -> list[JudgeResult | BaseException]:
+    """Run judges concurrently; outcomes are returned in input order.
+
+    on_complete is called with each judge's result or exception as soon as
+    that judge finishes, before the others are done.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def run(judge: JudgeConfig) -> JudgeResult:
+        try:
+            result = await _run_judge(
+                judge, plan_content, changes_by_judge[judge.name], api_key, cache_dir,
+                semaphore, timeout, max_retries,
+            )
+        except Exception as e:
+            on_complete(judge, e)
+            raise
+        on_complete(judge, result)
+        return result
+
+    return await asyncio.gather(*(run(judge) for judge in judges), return_exceptions=True)
+
+
 def execute_judges_parallel(
     judges: list[JudgeConfig],
     plan_content: str,
-    git_changes: str,
+    git_changes: str | GitChanges,
     api_key: str,
     cache_dir: Path,
-    max_workers: int | None = None,
+    max_concurrent: int | None = None,
+    cache: JudgeCache | None = None,
+    timeout: float | None = None,
+    max_retries: int | None = None,
+    on_result: Callable[[JudgeResult], None] | None = None,
+    on_failure: Callable[[JudgeConfig, Exception], None] | None = None,
+    total_timeout: float | None = None,
 ) -> list[JudgeResult]:
     """Execute all judges in parallel.
 
-    Uses ThreadPoolExecutor for concurrent execution. Fails fast on first error.
+    Cached results are looked up first; only the remaining judges are run.
+    Every judge runs to completion even if others fail. Each result is
+    cached and handed to on_result as soon as its judge finishes, so a
+    caller can persist it before the batch is done and a re-run only pays
+    for the failures.
+
+    Limits not given here come from the [judges] section of config.toml,
+    then from the module defaults.
 
     Args:
         judges: List of judge configurations to execute
         plan_content: Full plan.md file content
-        git_changes: Git diff, status, and changed file contents
+        git_changes: Collected git changes, rendered within each judge's
+                     token budget, or a git changes text shared by all judges
         api_key: OpenRouter API key
         cache_dir: Directory for disk cache
-        max_workers: Maximum number of concurrent workers (None = default)
+        max_concurrent: Maximum number of judges running at once
+        cache: Judge result cache to consult (default: ~/.weft/judge_cache/)
+        timeout: Seconds allowed per judge attempt
+        max_retries: Retries per judge on rate limits, 5xx errors and timeouts
+        on_result: Called with each result (cached ones included) as it
+                   becomes available
+        on_failure: Called with each failed judge and its final exception
+        total_timeout: Seconds allowed for the whole batch, retries and
+                       backoff included; judges still running then are
+                       cancelled
 
     Returns:
         List of JudgeResult objects from all judges
 
     Raises:
-        JudgeOrchestrationError: If any judge fails to execute
+        JudgeOrchestrationError: If any judge fails to execute or the batch
+                                 exceeds total_timeout
     """
     if not judges:
         raise JudgeOrchestrationError("No judges to execute")
 
-    logger.info("Executing %d judge(s) in parallel", len(judges))
+    settings = get_judge_settings()
+    if max_concurrent is None:
+        max_concurrent = int(settings.get("max_concurrent", DEFAULT_MAX_CONCURRENT))
+    if timeout is None:
+        timeout = float(settings.get("timeout_seconds", DEFAULT_TIMEOUT_SECONDS))
+    if max_retries is None:
+        max_retries = int(settings.get("max_retries", DEFAULT_MAX_RETRIES))
+
+    if cache is None:
+        cache = JudgeCache()
+    changes_by_judge = render_judge_changes(judges, plan_content, git_changes)
+    for name, changes in changes_by_judge.items():
+        logger.debug("Judge '%s' context: %d chars of git changes", name, len(changes))
+    keys = judge_input_keys(judges, plan_content, changes_by_judge)
 
     results: list[JudgeResult] = []
+    pending: list[JudgeConfig] = []
+    for judge in judges:
+        cached = cache.get(keys[judge.name], judge)
+        if cached is not None:
+            results.append(cached)
+            if on_result is not None:
+                on_result(cached)
+        else:
+            pending.append(judge)
+
+    if results:
+        logger.info("Reusing %d cached judge result(s)", len(results))
+    if not pending:
+        results.sort(key=lambda r: r.judge_name)
+        return results
+
+    logger.info(
+        "Executing %d judge(s), at most %d at a time", len(pending), max_concurrent
+    )
+
+    def on_complete(judge: JudgeConfig, outcome: JudgeResult | Exception) -> None:
+        if isinstance(outcome, JudgeResult):
+            cache.put(keys[judge.name], outcome)
+            logger.debug("Judge '%s' completed successfully", judge.name)
+            if on_result is not None:
+                on_result(outcome)
+        elif on_failure is not None:
+            on_failure(judge, outcome)
+
+    batch = _run_judges(
+        pending, plan_content, changes_by_judge, api_key, cache_dir,
+        max_concurrent, timeout, max_retries, on_complete,
+    )
+    if total_timeout is not None:
+        batch = asyncio.wait_for(batch, total_timeout)
+    try:
+        outcomes = asyncio.run(batch)
+    except TimeoutError as e:
+        raise JudgeOrchestrationError(
+            f"Judges did not finish within {total_timeout:g}s"
+        ) from e
+
     errors: list[str] = []
+    for judge, outcome in zip(pending, outcomes, strict=True):
+        if isinstance(outcome, JudgeResult):
+            results.append(outcome)
+        elif isinstance(outcome, JudgeExecutionError):
+            errors.append(f"Judge '{judge.name}' failed: {outcome}")
+        elif isinstance(outcome, Exception):
+            errors.append(f"Unexpected error executing judge '{judge.name}': {outcome}")
+        else:
+            # KeyboardInterrupt and friends are not judge failures
+            raise outcome
 
-    # Use ThreadPoolExecutor for parallel execution
-    # DSPy operations are I/O bound (API calls), so threads work well
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all judge executions
-        future_to_judge = {
-            executor.submit(
-                execute_judge,
-                judge,
-                plan_content,
-                git_changes,
-                api_key,
-                cache_dir,
-            ): judge
-            for judge in judges
-        }
-
-        # Collect results as they complete
-        # Using as_completed() allows us to fail fast on first error
-        for future in concurrent.futures.as_completed(future_to_judge):
-            judge = future_to_judge[future]
-            try:
-                result = future.result()
-                results.append(result)
-                logger.debug("Judge '%s' completed successfully", judge.name)
-            except JudgeExecutionError as e:
-                # Fail fast: cancel remaining futures and raise error
-                error_msg = f"Judge '{judge.name}' failed: {e}"
-                logger.error(error_msg)
-
-                # Cancel all pending futures before raising
-                for future in future_to_judge.keys():
-                    if not future.done():
-                        future.cancel()
-
-                raise JudgeOrchestrationError(error_msg) from e
-            except Exception as e:
-                # Unexpected error: also fail fast
-                error_msg = f"Unexpected error executing judge '{judge.name}': {e}"
-                logger.error(error_msg)
-
-                # Cancel all pending futures before raising
-                for future in future_to_judge.keys():
-                    if not future.done():
-                        future.cancel()
-
-                raise JudgeOrchestrationError(error_msg) from e
+    if errors:
+        for error_msg in errors:
+            logger.error(error_msg)
+        raise JudgeOrchestrationError("; ".join(errors))
 
     # Sort results by judge name for consistent output
     results.sort(key=lambda r: r.judge_name)
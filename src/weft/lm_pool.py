@@ -0,0 +1,91 @@
+"""Process-wide pool of DSPy LM clients.
+
+Judges and the trace summarizer talk to OpenRouter through dspy.LM.
+Building a fresh LM for every call, and reconfiguring the global DSPy cache
+each time, repeats setup work and swaps the cache out from under calls
+running in other threads. Instead:
+
+- the DSPy cache is configured once per process (again only if a different
+  cache directory is requested), and
+- LMs are pooled by model, API key and settings, so every caller with the
+  same configuration shares one instance. LiteLLM keeps its HTTP clients
+  per process, so calls through a shared LM reuse connections.
+
+Apart from its call history, dspy.LM keeps no per-request state, so pooled
+instances are safe to share between threads and asyncio tasks. Callers that
+read token usage from the history (the prompt trainer) create their own LM
+instead.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+import dspy
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_lock = threading.Lock()
+_pool: dict[tuple[str, str, str], dspy.LM] = {}
+_configured_cache_dir: Path | None = None
+
+
+def configure_dspy_cache(cache_dir: Path) -> None:
+    """Configure DSPy to use the specified cache directory.
+
+    Only the first call for a directory does any work; later calls in the
+    same process return immediately.
+
+    Args:
+        cache_dir: Directory for disk cache
+
+    Note:
+        This configures DSPy's global cache settings. Must be called before
+        any LM operations to ensure cache is used.
+    """
+    global _configured_cache_dir
+
+    with _lock:
+        if _configured_cache_dir == cache_dir:
+            return
+
+        # Ensure cache directory exists
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Configure DSPy cache to use the specified directory
+        dspy.configure_cache(
+            enable_disk_cache=True,
+            enable_memory_cache=True,
+            disk_cache_dir=str(cache_dir),
+        )
+        _configured_cache_dir = cache_dir
+
+    logger.debug("Configured DSPy cache at %s", cache_dir)
+
+
+def get_lm(model: str, api_key: str, **settings: Any) -> dspy.LM:
+    """Return the pooled OpenRouter LM for a model, API key and settings.
+
+    Args:
+        model: OpenRouter model tag (e.g., "x-ai/grok-4.1-fast")
+        api_key: OpenRouter API key
+        **settings: Further dspy.LM arguments (max_tokens, temperature,
+                    extra_body, cache, num_retries, ...); LMs are only
+                    shared between callers passing the same settings
+
+    Returns:
+        Shared dspy.LM instance
+    """
+    key = (model, api_key, json.dumps(settings, sort_keys=True, default=repr))
+    with _lock:
+        lm = _pool.get(key)
+        if lm is None:
+            lm = dspy.LM(f"openrouter/{model}", api_key=api_key, **settings)
+            _pool[key] = lm
+            logger.debug("Created pooled DSPy LM for %s (%d pooled)", model, len(_pool))
+    return lm
@@ -0,0 +1,172 @@
+"""Content-addressed object store for training data artifacts.
+
+Many training samples carry identical artifacts: prompts/ directories
+shared by every sample recorded with the same prompt_fingerprint, plans
+re-evaluated under several plan IDs, and so on. To avoid storing each copy
+separately, artifact files in a sample directory are hardlinked to a single
+blob in the object store:
+
+    .weft/objects/<sha256[:2]>/<sha256>
+
+Because samples still contain ordinary files (hardlinks), every reader
+resolves blobs transparently. A blob's reference count is its link count
+minus the store's own link, so garbage collection removes blobs whose
+count has dropped to zero after samples were deleted or recreated.
+
+Stored files are shared between samples and must never be modified in
+place; weft only ever replaces or deletes them. Where hardlinks are not
+supported (e.g. across filesystems) files are simply left as copies.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Sample files deduplicated through the store (glob patterns relative to the
+# sample directory). Per-sample results like feedback and judges are unique.
+DEDUPED_PATTERNS = (
+    "plan.md",
+    "ai_changes.patch",
+    "code_trace.md*",
+    "code_trace.ndjson",
+    "code_trace.index.json",
+    "prompts/**/*.md",
+)
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ObjectStoreError(Exception):
+    """Raised when the object store cannot be used."""
+
+    pass
+
+
+def get_objects_dir(repo_root: Path) -> Path:
+    """Return the object store directory (.weft/objects/)."""
+    return repo_root / ".weft" / "objects"
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def blob_path(repo_root: Path, digest: str) -> Path:
+    """Return the store path of the blob with the given digest."""
+    return get_objects_dir(repo_root) / digest[:2] / digest
+
+
+def store_file(repo_root: Path, path: Path) -> bool:
+    """Deduplicate a file through the object store.
+
+    If a blob with the same content exists, the file is atomically replaced
+    by a hardlink to it; otherwise the file itself becomes the blob.
+
+    Args:
+        repo_root: Repository root directory
+        path: Regular file to deduplicate
+
+    Returns:
+        True if the file now shares storage with the blob, False if
+        hardlinking is unsupported here (the file is left unchanged)
+
+    Raises:
+        ObjectStoreError: If the file cannot be read
+    """
+    try:
+        digest = hash_file(path)
+    except OSError as exc:
+        raise ObjectStoreError(f"Failed to hash {path}: {exc}") from exc
+
+    blob = blob_path(repo_root, digest)
+    try:
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, blob)
+            return True
+        except FileExistsError:
+            pass
+
+        if os.path.samefile(path, blob):
+            return True
+
+        # Link next to the file, then swap it in so the file never disappears
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.obj-tmp")
+        tmp_path.unlink(missing_ok=True)
+        try:
+            os.link(blob, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return True
+    except OSError as exc:
+        logger.debug("Not deduplicating %s: %s", path, exc)
+        return False
+
+
+def dedupe_sample(repo_root: Path, sample_dir: Path) -> int:
+    """Deduplicate a training sample's shareable artifacts.
+
+    Args:
+        repo_root: Repository root directory
+        sample_dir: Training sample directory
+
+    Returns:
+        Number of files stored
+    """
+    stored = 0
+    for pattern in DEDUPED_PATTERNS:
+        for path in sample_dir.glob(pattern):
+            if not path.is_file() or path.is_symlink():
+                continue
+            try:
+                if store_file(repo_root, path):
+                    stored += 1
+            except ObjectStoreError as exc:
+                logger.warning("%s", exc)
+    logger.debug("Stored %d artifact(s) of %s in the object store", stored, sample_dir.name)
+    return stored
+
+
+def garbage_collect(repo_root: Path) -> tuple[int, int]:
+    """Remove blobs no longer referenced by any sample.
+
+    Args:
+        repo_root: Repository root directory
+
+    Returns:
+        Tuple of (blobs removed, bytes freed)
+    """
+    objects_dir = get_objects_dir(repo_root)
+    if not objects_dir.exists():
+        return 0, 0
+
+    removed = 0
+    freed = 0
+    for blob in objects_dir.glob("*/*"):
+        try:
+            stat = blob.stat()
+            if stat.st_nlink > 1:
+                continue
+            blob.unlink()
+        except OSError as exc:
+            logger.debug("Failed to collect %s: %s", blob, exc)
+            continue
+        removed += 1
+        freed += stat.st_size
+
+    if removed:
+        logger.info("Removed %d unreferenced object(s), %d bytes", removed, freed)
+    return removed, freed
@@ -0,0 +1,237 @@
+"""Optimize command: evolutionary prompt optimization.
+
+Where `weft train` generates a candidate for a human to evaluate, `weft
+optimize` closes the loop: it breeds candidates with the prompt trainer,
+scores each by replaying held-out plans headlessly (see prompt_optimizer),
+and keeps the Pareto front of score versus execution time over several
+generations.
+"""
+
+from __future__ import annotations
+
+from .judge_executor import JudgeExecutionError, get_cache_dir, get_openrouter_api_key
+from .judge_loader import JudgeLoaderError, discover_judges
+from .logging_config import get_logger
+from .prompt_loader import PromptLoadingError, load_current_prompts_for_training
+from .prompt_optimizer import (
+    DEFAULT_EVAL_TIMEOUT_SECONDS,
+    DEFAULT_MAX_CONCURRENT,
+    find_holdout_plans,
+    run_optimization,
+)
+from .repo_utils import RepoUtilsError, find_repo_root
+from .train_command import MIN_TOKEN_BUDGET
+from .training_batch import DEFAULT_TOKEN_BUDGET
+from .training_data_loader import TrainingDataLoadError, load_training_batch
+from .training_manifest import load_manifest
+
+logger = get_logger(__name__)
+
+# Limits on the search size; every candidate costs one replay per held-out plan
+MAX_GENERATIONS = 10
+MAX_POPULATION = 10
+MAX_HOLDOUT = 10
+MAX_CONCURRENT_LIMIT = 16
+
+
+class OptimizeCommandError(Exception):
+    """Raised when the optimize command fails."""
+
+    pass
+
+
+def _validate_parameters(
+    variant: str,
+    generations: int,
+    population: int,
+    holdout: int,
+    max_concurrent: int,
+    eval_timeout: int,
+    batch_size: int,
+    max_subagents: int,
+    token_budget: int,
+) -> None:
+    """Validate command parameters.
+
+    Raises:
+        OptimizeCommandError: If parameters are invalid
+    """
+    valid_variants = {"sonnet", "opus", "haiku"}
+    if variant not in valid_variants:
+        raise OptimizeCommandError(
+            f"Invalid variant: '{variant}'. Valid options: {', '.join(sorted(valid_variants))}"
+        )
+
+    limits = {
+        "batch_size": (batch_size, 10),
+        "max_subagents": (max_subagents, 10),
+        "generations": (generations, MAX_GENERATIONS),
+        "population": (population, MAX_POPULATION),
+        "holdout": (holdout, MAX_HOLDOUT),
+        "max_concurrent": (max_concurrent, MAX_CONCURRENT_LIMIT),
+    }
+    for name, (value, maximum) in limits.items():
+        if value < 1:
+            raise OptimizeCommandError(f"Invalid {name}: {value}. Must be at least 1.")
+        if value > maximum:
+            raise OptimizeCommandError(f"Invalid {name}: {value}. Maximum is {maximum}.")
+
+    if eval_timeout < 60:
+        raise OptimizeCommandError(
+            f"Invalid eval_timeout: {eval_timeout}. Must be at least 60 seconds."
+        )
+
+    if token_budget < MIN_TOKEN_BUDGET:
+        raise OptimizeCommandError(
+            f"Invalid token_budget: {token_budget}. Must be at least {MIN_TOKEN_BUDGET}."
+        )
+
+
+def run_optimize_command(
+    variant: str,
+    generations: int = 3,
+    population: int = 4,
+    holdout: int = 2,
+    max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+    eval_timeout: int = DEFAULT_EVAL_TIMEOUT_SECONDS,
+    batch_size: int = 3,
+    max_subagents: int = 5,
+    model: str = "x-ai/grok-4.1-fast",
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> int:
+    """Run the optimize command.
+
+    Args:
+        variant: Prompt variant to optimize (sonnet, opus, haiku); also the
+                 Claude Code model used to replay plans
+        generations: Number of generations to breed (default: 3)
+        population: Candidates bred per generation (default: 4)
+        holdout: Number of most recent replayable plans held out for
+                 evaluation and excluded from training (default: 2)
+        max_concurrent: Maximum concurrent replays (default: 4)
+        eval_timeout: Maximum seconds per plan replay (session, judges and tests)
+        batch_size: Number of training samples per batch (default: 3)
+        max_subagents: Maximum subagents per candidate (default: 5)
+        model: OpenRouter model for the prompt trainer
+        token_budget: Token budget for training samples in the trainer prompt
+
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    try:
+        _validate_parameters(
+            variant, generations, population, holdout, max_concurrent,
+            eval_timeout, batch_size, max_subagents, token_budget,
+        )
+
+        try:
+            repo_root = find_repo_root()
+        except RepoUtilsError as exc:
+            logger.error("Failed to find repository root: %s", exc)
+            return 1
+
+        logger.info("Starting prompt optimization...")
+        logger.info("  Variant: %s", variant)
+        logger.info("  Generations: %d", generations)
+        logger.info("  Population: %d", population)
+        logger.info("  Held-out plans: %d", holdout)
+        logger.info("  Max concurrent replays: %d", max_concurrent)
+        logger.info("  Trainer model: %s", model)
+
+        plans = find_holdout_plans(repo_root, load_manifest(repo_root), holdout)
+        if not plans:
+            logger.error(
+                "No replayable training samples found (plan.md needs a git_sha "
+                "that exists in this repository)"
+            )
+            return 1
+        if len(plans) < holdout:
+            logger.warning("Only %d replayable plan(s) available", len(plans))
+        for plan in plans:
+            logger.info("  Held out: %s", plan.plan_id)
+
+        try:
+            training_samples = load_training_batch(
+                repo_root,
+                batch_size,
+                model=model,
+                token_budget=token_budget,
+                exclude={plan.plan_id for plan in plans},
+            )
+        except TrainingDataLoadError as exc:
+            logger.error("Failed to load training data: %s", exc)
+            return 1
+
+        try:
+            baseline = load_current_prompts_for_training(
+                repo_root, tool="claude-code-cli", model=variant
+            )
+        except PromptLoadingError as exc:
+            logger.error("Failed to load current prompts: %s", exc)
+            return 1
+
+        judges_dir = repo_root / ".weft" / "judges"
+        try:
+            judges = discover_judges(judges_dir)
+        except JudgeLoaderError as exc:
+            logger.error("Failed to load judges: %s", exc)
+            return 1
+        if not judges:
+            logger.error("No judges found in %s", judges_dir)
+            return 1
+
+        try:
+            api_key = get_openrouter_api_key()
+        except JudgeExecutionError as exc:
+            logger.error("%s", exc)
+            return 1
+
+        front, evaluated = run_optimization(
+            repo_root=repo_root,
+            baseline=baseline,
+            training_samples=training_samples,
+            plans=plans,
+            judges=judges,
+            api_key=api_key,
+            cache_dir=get_cache_dir(),
+            variant=variant,
+            trainer_model=model,
+            generations=generations,
+            population=population,
+            max_subagents=max_subagents,
+            token_budget=token_budget,
+            max_concurrent=max_concurrent,
+            timeout=eval_timeout,
+        )
+
+        # Report results
+        print()
+        print("=" * 72)
+        print("Optimization Complete")
+        print("=" * 72)
+        print()
+        print(f"Evaluated {len(evaluated)} prompt set(s) on {len(plans)} held-out plan(s)")
+        print()
+        print("Pareto front (score vs. execution time):")
+        for candidate in front:
+            location = candidate.candidate_dir or "prompts/active/"
+            print(
+                f"  {candidate.name:<14} score {candidate.score:.2f}  "
+                f"{candidate.execution_seconds:7.0f}s  {location}"
+            )
+        print()
+        print("Per-plan results are in each candidate's evaluation.json.")
+        print("Copy a front candidate to prompts/active/ to use it.")
+        print()
+
+        return 0
+
+    except OptimizeCommandError as exc:
+        logger.error("%s", exc)
+        return 1
+    except KeyboardInterrupt:
+        logger.info("Optimization cancelled by user.")
+        return 1
+    except Exception as exc:
+        logger.exception("Unexpected error during optimization: %s", exc)
+        return 1
@@ -0,0 +1,601 @@
+"""Evolutionary prompt optimization with replay-based evaluation.
+
+Implements the loop behind `weft optimize`:
+
+1. Evaluate the active prompts on held-out plans (the initial front)
+2. Each generation, breed children from the current Pareto front with the
+   prompt trainer (one trainer call per child, run concurrently)
+3. Score every child by replaying each held-out plan headlessly: a fresh
+   worktree at the plan's git_sha, a Claude Code SDK session with the
+   child's prompts, then the existing judges and test runner
+4. Keep the Pareto front on score (higher is better) versus execution time
+   (lower is better), among candidates whose replays all completed
+
+All replays of a generation share one bounded pool, so at most
+max_concurrent replays run at once and every replay (coding session,
+judges and test run) is cut off after eval_timeout seconds; a
+generation's wall time is therefore bounded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from claude_agent_sdk import AgentDefinition
+
+from .candidate_writer import write_candidate
+from .git_context import gather_git_changes
+from .host_runner import get_weft_src_dir
+from .judge_executor import JudgeResult
+from .judge_loader import JudgeConfig
+from .config import get_judge_settings
+from .judge_orchestrator import DEFAULT_TIMEOUT_SECONDS, execute_judges_parallel
+from .logging_config import get_logger
+from .prompt_trainer import MAX_CANDIDATE_WORKERS, run_prompt_trainer
+from .sdk_runner import run_sdk_session
+from .test_runner import get_plan_git_sha, run_tests_via_sdk, validate_git_sha
+from .training_types import CandidatePrompts, PromptSnapshot, TrainingSample
+from .worktree.file_sync import WorktreeFileCleanup, sync_files_to_worktree
+
+logger = get_logger(__name__)
+
+# Default cap on concurrent replays across all candidates of a generation
+DEFAULT_MAX_CONCURRENT = 4
+
+# Default limit on one replayed coding session
+DEFAULT_EVAL_TIMEOUT_SECONDS = 30 * 60
+
+# Name of the active prompts in the population
+BASELINE_NAME = "active"
+
+# Serializes `git worktree add/remove`, which lock shared repository metadata
+_WORKTREE_LOCK = threading.Lock()
+
+
+class PromptOptimizerError(Exception):
+    """Raised when prompt optimization cannot proceed."""
+
+    pass
+
+
+@dataclass
+class HeldOutPlan:
+    """A plan replayed to evaluate candidates (never used for training).
+
+    Attributes:
+        plan_id: Plan identifier (its training sample directory name)
+        plan_content: Full plan.md content
+        git_sha: Commit the plan was written against
+    """
+
+    plan_id: str
+    plan_content: str
+    git_sha: str
+
+
+@dataclass
+class PlanEvaluation:
+    """Result of replaying one held-out plan with a candidate's prompts.
+
+    Attributes:
+        plan_id: Plan that was replayed
+        score: Combined judge and test score from 0.0 to 1.0 (0.0 on error)
+        execution_seconds: Wall time of the coding session
+        judge_score: Weighted judge score, if judges ran
+        tests_passed: Passing tests after the session, if tests ran
+        tests_total: Total tests after the session, if tests ran
+        error: Why the replay failed, if it did
+    """
+
+    plan_id: str
+    score: float
+    execution_seconds: float
+    judge_score: Optional[float] = None
+    tests_passed: Optional[int] = None
+    tests_total: Optional[int] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class CandidateEvaluation:
+    """A member of the population and its replay results.
+
+    Attributes:
+        name: "active" or the candidate-NNN directory name
+        prompts: The candidate's prompt set
+        generation: Generation that produced it (0 for the active prompts)
+        parent: Name of the candidate it was bred from
+        candidate_dir: Where the candidate was written, if it was
+        plans: One evaluation per held-out plan
+    """
+
+    name: str
+    prompts: PromptSnapshot
+    generation: int
+    parent: Optional[str] = None
+    candidate_dir: Optional[Path] = None
+    plans: list[PlanEvaluation] = field(default_factory=list)
+
+    @property
+    def score(self) -> float:
+        """Mean score over the held-out plans."""
+        if not self.plans:
+            return 0.0
+        return sum(p.score for p in self.plans) / len(self.plans)
+
+    @property
+    def failed(self) -> bool:
+        """Whether any replay of the candidate errored."""
+        return any(p.error is not None for p in self.plans)
+
+    @property
+    def execution_seconds(self) -> float:
+        """Mean coding session wall time over the held-out plans."""
+        if not self.plans:
+            return 0.0
+        return sum(p.execution_seconds for p in self.plans) / len(self.plans)
+
+    def to_dict(self) -> dict:
+        """Serialize the evaluation (without prompt contents)."""
+        return {
+            "name": self.name,
+            "generation": self.generation,
+            "parent": self.parent,
+            "score": self.score,
+            "execution_seconds": self.execution_seconds,
+            "plans": [vars(p) for p in self.plans],
+        }
+
+
+def find_holdout_plans(
+    repo_root: Path, entries: list[dict], count: int
+) -> list[HeldOutPlan]:
+    """Choose the most recent training samples that can be replayed.
+
+    A sample is replayable if its plan.md records a git_sha that exists in
+    the repository.
+
+    Args:
+        repo_root: Repository root directory
+        entries: Training manifest entries
+        count: Number of plans to hold out
+
+    Returns:
+        Up to count held-out plans, newest first
+    """
+    training_data_dir = repo_root / ".weft" / "training_data"
+    plans: list[HeldOutPlan] = []
+    newest_first = sorted(
+        entries, key=lambda e: (e.get("created_at") or "", e["plan_id"]), reverse=True
+    )
+    for entry in newest_first:
+        if len(plans) >= count:
+            break
+        plan_path = training_data_dir / entry["plan_id"] / "plan.md"
+        if not plan_path.exists():
+            continue
+        git_sha = get_plan_git_sha(plan_path)
+        if not git_sha or not validate_git_sha(repo_root, git_sha):
+            logger.debug("Sample %s cannot be replayed (no valid git_sha)", entry["plan_id"])
+            continue
+        try:
+            plan_content = plan_path.read_text(encoding="utf-8")
+        except OSError as exc:
+            logger.warning("Failed to read plan %s: %s", plan_path, exc)
+            continue
+        plans.append(HeldOutPlan(entry["plan_id"], plan_content, git_sha))
+    return plans
+
+
+def snapshot_from_candidate(candidate: CandidatePrompts) -> PromptSnapshot:
+    """Convert a trainer candidate into a prompt snapshot."""
+    return PromptSnapshot(main_prompt=candidate.main_prompt, subagents=candidate.subagents)
+
+
+def combine_scores(
+    judge_results: list[JudgeResult], test_results: Optional[dict]
+) -> tuple[float, float]:
+    """Combine judge results and test results into one score.
+
+    The weighted judge score and the test pass rate count equally; if no
+    tests ran, the judge score stands alone.
+
+    Returns:
+        Tuple of (weighted judge score, combined score)
+    """
+    total_weight = sum(r.weight for r in judge_results)
+    judge_score = (
+        sum(r.score * r.weight for r in judge_results) / total_weight if total_weight > 0 else 0.0
+    )
+    total_tests = (test_results or {}).get("total_tests") or 0
+    if total_tests <= 0:
+        return judge_score, judge_score
+    pass_rate = (test_results.get("passed_tests") or 0) / total_tests
+    return judge_score, (judge_score + pass_rate) / 2
+
+
+def pareto_front(candidates: list[CandidateEvaluation]) -> list[CandidateEvaluation]:
+    """Return the candidates not dominated on (score, execution time).
+
+    A candidate is dominated if another scores at least as high and runs at
+    least as fast, and is strictly better in one of the two. Candidates with
+    a failed replay are left out: a replay that fails early scores 0.0 in
+    next to no time, which nothing could dominate.
+
+    Returns:
+        Non-dominated candidates, highest score first (empty if every
+        candidate has a failed replay)
+    """
+    eligible = [c for c in candidates if not c.failed]
+    front = [
+        c for c in eligible
+        if not any(
+            o.score >= c.score
+            and o.execution_seconds <= c.execution_seconds
+            and (o.score > c.score or o.execution_seconds < c.execution_seconds)
+            for o in eligible
+        )
+    ]
+    return sorted(front, key=lambda c: (-c.score, c.execution_seconds, c.name))
+
+
+def _build_agents(prompts: PromptSnapshot, model: str) -> dict[str, AgentDefinition]:
+    return {
+        subagent.name: AgentDefinition(
+            description=subagent.description,
+            prompt=subagent.prompt,
+            model=model,
+        )
+        for subagent in prompts.subagents
+    }
+
+
+def _create_replay_worktree(repo_root: Path, git_sha: str) -> Path:
+    worktree_path = repo_root / ".weft" / "temp-worktrees" / f"optimize-{uuid.uuid4().hex[:8]}"
+    worktree_path.parent.mkdir(parents=True, exist_ok=True)
+    with _WORKTREE_LOCK:
+        result = subprocess.run(
+            ["git", "worktree", "add", "--detach", str(worktree_path), git_sha],
+            cwd=repo_root,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    if result.returncode != 0:
+        raise PromptOptimizerError(
+            f"Failed to create worktree at {git_sha}: {result.stderr}"
+        )
+    return worktree_path
+
+
+def _remove_replay_worktree(repo_root: Path, worktree_path: Path) -> None:
+    with _WORKTREE_LOCK:
+        subprocess.run(
+            ["git", "worktree", "remove", "--force", str(worktree_path)],
+            cwd=repo_root,
+            capture_output=True,
+            check=False,
+        )
+
+
+def evaluate_on_plan(
+    repo_root: Path,
+    prompts: PromptSnapshot,
+    plan: HeldOutPlan,
+    model: str,
+    judges: list[JudgeConfig],
+    api_key: str,
+    cache_dir: Path,
+    output_dir: Optional[Path] = None,
+    timeout: float = DEFAULT_EVAL_TIMEOUT_SECONDS,
+) -> PlanEvaluation:
+    """Replay a held-out plan with a prompt set and score the result.
+
+    The whole replay, from worktree creation to the test run, must finish
+    within timeout seconds: the coding session, the judges (retries
+    included) and the test run each get the time that is left.
+
+    Never raises: a failed replay scores 0.0 and records the error.
+
+    Args:
+        repo_root: Repository root directory
+        prompts: Prompt set to run the coding session with
+        plan: Plan to replay
+        model: Claude Code model variant (sonnet, opus, haiku)
+        judges: Judges to score the changes with
+        api_key: OpenRouter API key for the judges
+        cache_dir: DSPy cache directory
+        output_dir: Where to save judge and test results (optional)
+        timeout: Maximum seconds for the whole replay
+
+    Returns:
+        The plan evaluation
+    """
+    deadline = time.monotonic() + timeout
+
+    def remaining() -> float:
+        left = deadline - time.monotonic()
+        if left <= 0:
+            raise TimeoutError
+        return left
+
+    execution_seconds = 0.0
+    worktree_path: Optional[Path] = None
+    file_sync_cleanup = WorktreeFileCleanup()
+    try:
+        worktree_path = _create_replay_worktree(repo_root, plan.git_sha)
+        sync_files_to_worktree(repo_root, worktree_path, file_sync_cleanup)
+        plan_md_path = worktree_path / "plan.md"
+        plan_md_path.write_text(plan.plan_content, encoding="utf-8")
+
+        # Check the deadline before the session coroutine exists
+        session_timeout = remaining()
+        start = time.monotonic()
+        try:
+            asyncio.run(asyncio.wait_for(
+                run_sdk_session(
+                    worktree_path=worktree_path,
+                    prompt_content=prompts.main_prompt,
+                    model=model,
+                    sdk_settings_path=get_weft_src_dir() / "sdk_settings.json",
+                    agents=_build_agents(prompts, model),
+                ),
+                timeout=session_timeout,
+            ))
+        finally:
+            execution_seconds = time.monotonic() - start
+
+        # Judge only the agent's changes, as eval does after `weft code` cleans up
+        file_sync_cleanup.cleanup()
+        plan_md_path.unlink(missing_ok=True)
+        git_changes = gather_git_changes(worktree_path)
+
+        judge_timeout = float(
+            get_judge_settings().get("timeout_seconds", DEFAULT_TIMEOUT_SECONDS)
+        )
+        judges_budget = remaining()
+        judge_results = execute_judges_parallel(
+            judges=judges,
+            plan_content=plan.plan_content,
+            git_changes=git_changes,
+            api_key=api_key,
+            cache_dir=cache_dir,
+            timeout=min(judge_timeout, judges_budget),
+            total_timeout=judges_budget,
+        )
+        test_output = (output_dir or worktree_path) / f"test_results_{plan.plan_id}.json"
+        test_results = run_tests_via_sdk(worktree_path, test_output, model, timeout=remaining())
+
+        if output_dir is not None:
+            judges_path = output_dir / f"judges_{plan.plan_id}.json"
+            judges_path.write_text(
+                json.dumps([vars(r) for r in judge_results], indent=2), encoding="utf-8"
+            )
+
+        judge_score, score = combine_scores(judge_results, test_results)
+        return PlanEvaluation(
+            plan_id=plan.plan_id,
+            score=score,
+            execution_seconds=execution_seconds,
+            judge_score=judge_score,
+            tests_passed=test_results.get("passed_tests"),
+            tests_total=test_results.get("total_tests"),
+        )
+    except Exception as exc:
+        error = "timed out" if isinstance(exc, TimeoutError) else str(exc)
+        logger.warning("Replay of %s failed: %s", plan.plan_id, error)
+        return PlanEvaluation(
+            plan_id=plan.plan_id,
+            score=0.0,
+            execution_seconds=execution_seconds,
+            error=error,
+        )
+    finally:
+        file_sync_cleanup.cleanup()
+        if worktree_path is not None:
+            _remove_replay_worktree(repo_root, worktree_path)
+
+
+def evaluate_population(
+    repo_root: Path,
+    candidates: list[CandidateEvaluation],
+    plans: list[HeldOutPlan],
+    model: str,
+    judges: list[JudgeConfig],
+    api_key: str,
+    cache_dir: Path,
+    max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+    timeout: float = DEFAULT_EVAL_TIMEOUT_SECONDS,
+) -> None:
+    """Replay every held-out plan for every candidate, filling in their plans.
+
+    All (candidate, plan) replays share one pool of max_concurrent workers.
+    Results are saved to each written candidate's evaluation/ directory.
+    """
+    jobs = [(candidate, plan) for candidate in candidates for plan in plans]
+    logger.info(
+        "Evaluating %d candidate(s) on %d plan(s): %d replay(s), %d at a time",
+        len(candidates),
+        len(plans),
+        len(jobs),
+        max_concurrent,
+    )
+
+    results: dict[tuple[str, str], PlanEvaluation] = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrent)) as executor:
+        futures = {}
+        for candidate, plan in jobs:
+            output_dir = None
+            if candidate.candidate_dir is not None:
+                output_dir = candidate.candidate_dir / "evaluation"
+                output_dir.mkdir(parents=True, exist_ok=True)
+            future = executor.submit(
+                evaluate_on_plan,
+                repo_root, candidate.prompts, plan, model, judges,
+                api_key, cache_dir, output_dir, timeout,
+            )
+            futures[future] = (candidate.name, plan.plan_id)
+
+        for completed, future in enumerate(as_completed(futures), start=1):
+            evaluation = future.result()
+            results[futures[future]] = evaluation
+            logger.info(
+                "  [%d/%d] %s on %s: score %.2f in %.0fs%s",
+                completed,
+                len(jobs),
+                futures[future][0],
+                evaluation.plan_id,
+                evaluation.score,
+                evaluation.execution_seconds,
+                f" ({evaluation.error})" if evaluation.error else "",
+            )
+
+    for candidate in candidates:
+        candidate.plans = [results[(candidate.name, plan.plan_id)] for plan in plans]
+        if candidate.candidate_dir is not None:
+            try:
+                (candidate.candidate_dir / "evaluation.json").write_text(
+                    json.dumps(candidate.to_dict(), indent=2), encoding="utf-8"
+                )
+            except OSError as exc:
+                logger.warning("Failed to save evaluation for %s: %s", candidate.name, exc)
+
+
+def breed_children(
+    repo_root: Path,
+    parents: list[CandidateEvaluation],
+    count: int,
+    generation: int,
+    training_samples: list[TrainingSample],
+    max_subagents: int,
+    model: str,
+    variant: str,
+    cache_dir: Path,
+    token_budget: Optional[int],
+) -> list[CandidateEvaluation]:
+    """Generate and write count children from the parents, concurrently.
+
+    Parents are used round-robin, best first. A failed trainer call is
+    logged and yields no child.
+
+    Returns:
+        The written children (not yet evaluated)
+    """
+    def breed(parent: CandidateEvaluation) -> CandidateEvaluation:
+        candidate, _ = run_prompt_trainer(
+            training_samples=training_samples,
+            current_prompts=parent.prompts,
+            max_subagents=max_subagents,
+            model=model,
+            cache_dir=cache_dir,
+            token_budget=token_budget,
+        )
+        candidate_dir = write_candidate(repo_root, "claude-code-cli", variant, candidate)
+        return CandidateEvaluation(
+            name=candidate_dir.name,
+            prompts=snapshot_from_candidate(candidate),
+            generation=generation,
+            parent=parent.name,
+            candidate_dir=candidate_dir,
+        )
+
+    children: list[CandidateEvaluation] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(count, MAX_CANDIDATE_WORKERS))) as executor:
+        futures = [executor.submit(breed, parents[i % len(parents)]) for i in range(count)]
+        for future in as_completed(futures):
+            try:
+                children.append(future.result())
+            except Exception as exc:
+                logger.error("Failed to generate a candidate: %s", exc)
+    return sorted(children, key=lambda c: c.name)
+
+
+def run_optimization(
+    repo_root: Path,
+    baseline: PromptSnapshot,
+    training_samples: list[TrainingSample],
+    plans: list[HeldOutPlan],
+    judges: list[JudgeConfig],
+    api_key: str,
+    cache_dir: Path,
+    variant: str,
+    trainer_model: str,
+    generations: int,
+    population: int,
+    max_subagents: int,
+    token_budget: Optional[int],
+    max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+    timeout: float = DEFAULT_EVAL_TIMEOUT_SECONDS,
+) -> tuple[list[CandidateEvaluation], list[CandidateEvaluation]]:
+    """Run the evolutionary loop.
+
+    Args:
+        repo_root: Repository root directory
+        baseline: Active prompts (generation 0)
+        training_samples: Training batch given to the prompt trainer
+        plans: Held-out plans to replay
+        judges: Judges to score replays with
+        api_key: OpenRouter API key
+        cache_dir: DSPy cache directory
+        variant: Claude Code model variant (sonnet, opus, haiku)
+        trainer_model: OpenRouter model for the prompt trainer
+        generations: Number of generations to breed
+        population: Children per generation
+        max_subagents: Maximum subagents per candidate
+        token_budget: Token budget for the serialized training samples
+        max_concurrent: Maximum concurrent replays
+        timeout: Maximum seconds per replay
+
+    Returns:
+        Tuple of (final Pareto front, every evaluated candidate)
+    """
+    def evaluate(candidates: list[CandidateEvaluation]) -> None:
+        evaluate_population(
+            repo_root, candidates, plans, variant, judges, api_key, cache_dir,
+            max_concurrent=max_concurrent, timeout=timeout,
+        )
+
+    baseline_eval = CandidateEvaluation(name=BASELINE_NAME, prompts=baseline, generation=0)
+    logger.info("Generation 0: evaluating the active prompts")
+    evaluate([baseline_eval])
+    evaluated = [baseline_eval]
+    front = [baseline_eval]
+
+    for generation in range(1, generations + 1):
+        logger.info(
+            "Generation %d/%d: breeding %d candidate(s) from %d parent(s)",
+            generation,
+            generations,
+            population,
+            len(front),
+        )
+        children = breed_children(
+            repo_root, front, population, generation, training_samples,
+            max_subagents, trainer_model, variant, cache_dir, token_budget,
+        )
+        if not children:
+            logger.warning("Generation %d produced no candidates", generation)
+            continue
+
+        generation_start = time.monotonic()
+        evaluate(children)
+        evaluated.extend(children)
+        # If every replay failed, keep breeding from the previous parents
+        front = pareto_front(front + children) or front
+        logger.info(
+            "Generation %d evaluated in %.0fs; front: %s",
+            generation,
+            time.monotonic() - generation_start,
+            ", ".join(f"{c.name} ({c.score:.2f}, {c.execution_seconds:.0f}s)" for c in front),
+        )
+
+    return front, evaluated
@@ -6,12 +6,16 @@ candidate prompt sets for the Claude Code CLI workflow.
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Callable
 
 import dspy
 
-from .judge_executor import configure_dspy_cache, get_openrouter_api_key
+from .judge_executor import get_openrouter_api_key
+from .lm_pool import configure_dspy_cache
 from .logging_config import get_logger
+from .training_batch import CHARS_PER_TOKEN, DEFAULT_TOKEN_BUDGET, estimate_tokens
 from .training_types import (
     CandidatePrompts,
     PromptSnapshot,
@@ -21,6 +25,9 @@ from .training_types import (
 
 logger = get_logger(__name__)
 
+# Upper bound on concurrent trainer calls for --candidates
+MAX_CANDIDATE_WORKERS = 8
+
 
 class PromptTrainerError(Exception):
     """Raised when prompt training fails."""
@@ -179,10 +186,80 @@ class PromptTrainerSignature(dspy.Signature):
     )
 
 
-def _serialize_training_samples(samples: list[TrainingSample]) -> str:
-    """Serialize training samples to JSON string."""
+# Fields trimmed, in this order, when samples exceed the token budget. Human
+# feedback is what training learns from most, so it is never trimmed.
+_TRIM_ORDER = (
+    "code_trace",
+    "plan_content",
+    "test_results_before",
+    "test_results_after",
+    "judge_results",
+)
+_TRIM_MARKER = " [... truncated to fit token budget]"
+
+
+def _trim_field(samples: list[dict], field: str, excess: int) -> int:
+    """Shorten one field across samples by about excess characters, longest first.
+
+    Finds the largest per-sample length cap that removes enough text, so
+    short values are left intact and long ones are cut to the same length.
+
+    Returns:
+        Number of characters removed
+    """
+    lengths = [len(sample.get(field) or "") for sample in samples]
+    total = sum(lengths)
+    target = max(total - excess, 0)
+
+    def trimmed_total(cap: int) -> int:
+        return sum(
+            length if length <= cap else cap + len(_TRIM_MARKER) for length in lengths
+        )
+
+    low, high = 0, max(lengths, default=0)
+    while low < high:
+        cap = (low + high + 1) // 2
+        if trimmed_total(cap) <= target:
+            low = cap
+        else:
+            high = cap - 1
+
+    for sample, length in zip(samples, lengths, strict=True):
+        if length > low:
+            sample[field] = sample[field][:low] + _TRIM_MARKER
+    return total - trimmed_total(low)
+
+
+def _serialize_training_samples(
+    samples: list[TrainingSample],
+    token_budget: int | None = None,
+) -> str:
+    """Serialize training samples to JSON string.
+
+    If token_budget is given and the samples exceed it, the longest text
+    fields are trimmed (see _TRIM_ORDER) until they fit.
+    """
     import json
-    return json.dumps([s.model_dump() for s in samples], indent=2)
+    dumped = [s.model_dump() for s in samples]
+    serialized = json.dumps(dumped, indent=2)
+    if token_budget is None or estimate_tokens(serialized) <= token_budget:
+        return serialized
+
+    excess = len(serialized) - token_budget * CHARS_PER_TOKEN
+    for field in _TRIM_ORDER:
+        if excess <= 0:
+            break
+        excess -= _trim_field(dumped, field, excess)
+
+    serialized = json.dumps(dumped, indent=2)
+    logger.info(
+        "Trimmed training samples to ~%d tokens (budget %d)",
+        estimate_tokens(serialized),
+        token_budget,
+    )
+    if estimate_tokens(serialized) > token_budget:
+        logger.warning("Training samples still exceed the token budget after trimming")
+    return serialized
 
 
 def _serialize_current_prompts(prompts: PromptSnapshot) -> str:
@@ -191,12 +268,96 @@ def _serialize_current_prompts(prompts: PromptSnapshot) -> str:
     return json.dumps(prompts.model_dump(), indent=2)
 
 
+def _create_trainer_lm(model: str, api_key: str, seed: int | None = None) -> dspy.LM:
+    """Create the high-reasoning LM used for prompt training.
+
+    Unlike the judge and summarizer LMs, trainer LMs are not pooled: token
+    usage is read from the LM's call history, so every trainer call needs
+    an LM of its own.
+
+    Args:
+        model: OpenRouter model tag
+        api_key: OpenRouter API key
+        seed: Sampling seed; distinct seeds make parallel candidates diverge
+    """
+    # Enable reasoning for models that support it (like Grok, GPT-5)
+    # Disable cache - we want fresh responses for training
+    extra_body: dict = {"reasoning": {"effort": "high"}}
+    if seed is not None:
+        extra_body["seed"] = seed
+    return dspy.LM(
+        f"openrouter/{model}",
+        api_key=api_key,
+        max_tokens=64000,
+        temperature=1.0,
+        extra_body=extra_body,
+        cache=False,
+    )
+
+
+def _generate_candidate(
+    lm: dspy.LM,
+    training_samples_json: str,
+    current_prompts_json: str,
+    max_subagents: int,
+) -> tuple[CandidatePrompts, dict[str, int]]:
+    """Make one prompt trainer call and parse its candidate.
+
+    Returns:
+        Tuple of (CandidatePrompts, token_usage_dict)
+    """
+    # Create signature with instructions
+    InstructedSignature = PromptTrainerSignature.with_instructions(
+        PROMPT_TRAINER_INSTRUCTIONS
+    )
+
+    # Create predictor and run with JSONAdapter for structured output
+    predictor = dspy.Predict(InstructedSignature)
+    with dspy.context(lm=lm, adapter=dspy.JSONAdapter()):
+        result = predictor(
+            training_samples_json=training_samples_json,
+            current_prompts_json=current_prompts_json,
+            max_subagents=max_subagents,
+        )
+
+    # Parse outputs - subagents are now directly returned as list[SubagentDefinition]
+    main_prompt = str(result.main_prompt)
+    subagents = result.subagents if result.subagents else []
+    # Ensure subagents are SubagentDefinition instances
+    if subagents and not isinstance(subagents[0], SubagentDefinition):
+        # Convert dicts to SubagentDefinition if needed
+        subagents = [
+            SubagentDefinition(**s) if isinstance(s, dict) else s
+            for s in subagents
+        ]
+    analysis_summary = str(result.analysis_summary)
+
+    # Ensure we don't exceed max_subagents
+    if len(subagents) > max_subagents:
+        logger.warning(
+            "DSPy returned %d subagents, limiting to %d",
+            len(subagents),
+            max_subagents,
+        )
+        subagents = subagents[:max_subagents]
+
+    candidate = CandidatePrompts(
+        main_prompt=main_prompt,
+        subagents=subagents,
+        analysis_summary=analysis_summary,
+    )
+
+    # Get token usage from LM history
+    return candidate, _extract_token_usage(lm)
+
+
 def run_prompt_trainer(
     training_samples: list[TrainingSample],
     current_prompts: PromptSnapshot,
     max_subagents: int,
     model: str,
     cache_dir: Path,
+    token_budget: int | None = DEFAULT_TOKEN_BUDGET,
 ) -> tuple[CandidatePrompts, dict[str, int]]:
     """Run the prompt trainer and return candidate + token usage.
 
@@ -206,6 +367,8 @@ def run_prompt_trainer(
         max_subagents: Maximum number of subagents to generate
         model: OpenRouter model tag (e.g., x-ai/grok-4.1-fast)
         cache_dir: Directory for DSPy cache
+        token_budget: Token budget for the serialized training samples
+                      (None = unlimited)
 
     Returns:
         Tuple of (CandidatePrompts, token_usage_dict)
@@ -227,68 +390,19 @@ def run_prompt_trainer(
         configure_dspy_cache(cache_dir)
 
         # Create LM with specified OpenRouter model
-        # Enable reasoning for models that support it (like Grok, GPT-5)
-        # Disable cache - we want fresh responses for training
-        lm = dspy.LM(
-            f"openrouter/{model}",
-            api_key=api_key,
-            max_tokens=64000,
-            temperature=1.0,
-            extra_body={"reasoning": {"effort": "high"}},
-            cache=False,
-        )
-
-        # Create signature with instructions
-        InstructedSignature = PromptTrainerSignature.with_instructions(
-            PROMPT_TRAINER_INSTRUCTIONS
-        )
+        lm = _create_trainer_lm(model, api_key)
 
         # Serialize inputs
-        training_samples_json = _serialize_training_samples(training_samples)
+        training_samples_json = _serialize_training_samples(training_samples, token_budget)
         current_prompts_json = _serialize_current_prompts(current_prompts)
 
-        # Create predictor and run with JSONAdapter for structured output
-        predictor = dspy.Predict(InstructedSignature)
-        with dspy.context(lm=lm, adapter=dspy.JSONAdapter()):
-            result = predictor(
-                training_samples_json=training_samples_json,
-                current_prompts_json=current_prompts_json,
-                max_subagents=max_subagents,
-            )
-
-        # Parse outputs - subagents are now directly returned as list[SubagentDefinition]
-        main_prompt = str(result.main_prompt)
-        subagents = result.subagents if result.subagents else []
-        # Ensure subagents are SubagentDefinition instances
-        if subagents and not isinstance(subagents[0], SubagentDefinition):
-            # Convert dicts to SubagentDefinition if needed
-            subagents = [
-                SubagentDefinition(**s) if isinstance(s, dict) else s
-                for s in subagents
-            ]
-        analysis_summary = str(result.analysis_summary)
-
-        # Ensure we don't exceed max_subagents
-        if len(subagents) > max_subagents:
-            logger.warning(
-                "DSPy returned %d subagents, limiting to %d",
-                len(subagents),
-                max_subagents,
-            )
-            subagents = subagents[:max_subagents]
-
-        candidate = CandidatePrompts(
-            main_prompt=main_prompt,
-            subagents=subagents,
-            analysis_summary=analysis_summary,
+        candidate, token_usage = _generate_candidate(
+            lm, training_samples_json, current_prompts_json, max_subagents
         )
 
-        # Get token usage from LM history
-        token_usage = _extract_token_usage(lm)
-
         logger.info(
             "Prompt training complete. Generated %d subagents.",
-            len(subagents),
+            len(candidate.subagents),
         )
 
         return candidate, token_usage
@@ -297,6 +411,91 @@ def run_prompt_trainer(
         raise PromptTrainerError(f"Prompt training failed: {exc}") from exc
 
 
+def run_prompt_trainer_candidates(
+    training_samples: list[TrainingSample],
+    current_prompts: PromptSnapshot,
+    max_subagents: int,
+    model: str,
+    cache_dir: Path,
+    num_candidates: int,
+    token_budget: int | None = DEFAULT_TOKEN_BUDGET,
+    on_candidate: Callable[[int, CandidatePrompts, dict[str, int]], None] | None = None,
+) -> list[tuple[CandidatePrompts, dict[str, int]]]:
+    """Generate several candidates concurrently from one training batch.
+
+    The inputs are serialized once and shared; each candidate is a separate
+    LM call with its own sampling seed, run on a thread pool so the wall
+    time for N candidates is close to that of one. A failed call is logged
+    and skipped.
+
+    Args:
+        training_samples: List of training samples to analyze
+        current_prompts: Current prompts (PromptSnapshot) to improve upon
+        max_subagents: Maximum number of subagents to generate
+        model: OpenRouter model tag (e.g., x-ai/grok-4.1-fast)
+        cache_dir: Directory for DSPy cache
+        num_candidates: Number of candidates to generate
+        token_budget: Token budget for the serialized training samples
+                      (None = unlimited)
+        on_candidate: Called as (index, candidate, token_usage) as soon as
+                      each candidate completes, e.g. to write it out
+
+    Returns:
+        List of (CandidatePrompts, token_usage_dict) for the successful
+        calls, in seed order
+
+    Raises:
+        PromptTrainerError: If no candidate could be generated
+    """
+    logger.info(
+        "Running prompt trainer with %d samples, max %d subagents, %d candidates",
+        len(training_samples),
+        max_subagents,
+        num_candidates,
+    )
+
+    try:
+        api_key = get_openrouter_api_key()
+        configure_dspy_cache(cache_dir)
+        training_samples_json = _serialize_training_samples(training_samples, token_budget)
+        current_prompts_json = _serialize_current_prompts(current_prompts)
+    except Exception as exc:
+        raise PromptTrainerError(f"Prompt training failed: {exc}") from exc
+
+    def generate(index: int) -> tuple[CandidatePrompts, dict[str, int]]:
+        # A lone candidate keeps the provider's default sampling
+        lm = _create_trainer_lm(model, api_key, seed=index if num_candidates > 1 else None)
+        candidate, token_usage = _generate_candidate(
+            lm, training_samples_json, current_prompts_json, max_subagents
+        )
+        if on_candidate is not None:
+            on_candidate(index, candidate, token_usage)
+        return candidate, token_usage
+
+    results: dict[int, tuple[CandidatePrompts, dict[str, int]]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(num_candidates, MAX_CANDIDATE_WORKERS))) as executor:
+        futures = {executor.submit(generate, index): index for index in range(num_candidates)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as exc:
+                logger.error("Candidate %d/%d failed: %s", index + 1, num_candidates, exc)
+                continue
+            logger.info(
+                "Candidate %d/%d complete (%d subagents)",
+                index + 1,
+                num_candidates,
+                len(results[index][0].subagents),
+            )
+
+    if not results:
+        raise PromptTrainerError(
+            f"Prompt training failed: all {num_candidates} candidate(s) failed"
+        )
+    return [results[index] for index in sorted(results)]
+
+
 def _extract_token_usage(lm: dspy.LM) -> dict[str, int]:
     """Extract token usage from DSPy LM history.
 
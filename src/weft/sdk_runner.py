@@ -19,6 +19,8 @@ import json
 import os
 import re
 import tempfile
+from dataclasses import asdict, is_dataclass
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
@@ -29,7 +31,10 @@ from claude_agent_sdk import (
     ResultMessage,
     AssistantMessage,
     TextBlock,
+    ThinkingBlock,
+    ToolResultBlock,
     ToolUseBlock,
+    UserMessage,
     PermissionResultAllow,
     PermissionResultDeny,
     ToolPermissionContext,
@@ -37,6 +42,7 @@ from claude_agent_sdk import (
 
 from .logging_config import get_logger
 from .judge_executor import get_cache_dir
+from .trace_capture import LiveTraceWriter, TraceCaptureError
 
 logger = get_logger(__name__)
 
@@ -118,12 +124,77 @@ async def _can_use_tool_callback(
     return PermissionResultAllow()
 
 
+def _content_block_to_dict(block: Any) -> dict[str, Any]:
+    """Convert an SDK content block to Claude Code's JSONL block shape."""
+    if isinstance(block, TextBlock):
+        return {"type": "text", "text": block.text}
+    if isinstance(block, ThinkingBlock):
+        return {"type": "thinking", "thinking": block.thinking}
+    if isinstance(block, ToolUseBlock):
+        return {"type": "tool_use", "id": block.id, "name": block.name, "input": block.input}
+    if isinstance(block, ToolResultBlock):
+        return {
+            "type": "tool_result",
+            "tool_use_id": block.tool_use_id,
+            "content": block.content,
+            "is_error": block.is_error,
+        }
+    if is_dataclass(block):
+        return {"type": type(block).__name__, **asdict(block)}
+    return {"type": "unknown", "value": str(block)}
+
+
+def _trace_record(message: Any) -> dict[str, Any] | None:
+    """Convert an SDK message to a live trace record.
+
+    Records mirror the Claude Code JSONL message format so trace_capture
+    can render them with the same pipeline. Messages produced inside a
+    subagent carry parent_tool_use_id, which becomes the agentId.
+
+    Args:
+        message: Message received from ClaudeSDKClient.receive_response()
+
+    Returns:
+        Record dict, or None for message types that are not traced
+    """
+    timestamp = datetime.now(timezone.utc).isoformat()
+
+    if isinstance(message, ResultMessage):
+        return {
+            "type": "result",
+            "timestamp": timestamp,
+            "session_id": message.session_id,
+            "num_turns": message.num_turns,
+            "total_cost_usd": message.total_cost_usd,
+            "is_error": message.is_error,
+        }
+
+    if isinstance(message, (AssistantMessage, UserMessage)):
+        role = "assistant" if isinstance(message, AssistantMessage) else "user"
+        content = message.content
+        if not isinstance(content, str):
+            content = [_content_block_to_dict(block) for block in content]
+        parent_tool_use_id = getattr(message, "parent_tool_use_id", None)
+        record: dict[str, Any] = {
+            "type": role,
+            "timestamp": timestamp,
+            "isSidechain": parent_tool_use_id is not None,
+            "message": {"role": role, "content": content},
+        }
+        if parent_tool_use_id is not None:
+            record["agentId"] = parent_tool_use_id
+        return record
+
+    return None
+
+
 async def run_sdk_session(
     worktree_path: Path,
     prompt_content: str,
     model: str,
     sdk_settings_path: Path,
     agents: dict[str, AgentDefinition] | None = None,
+    trace_path: Path | None = None,
 ) -> str:
     """Run SDK session and capture session ID.
 
@@ -140,6 +211,8 @@ async def run_sdk_session(
                 If None, agents are only available via filesystem discovery.
                 Note: SDK does not discover filesystem agents in .claude/agents/,
                 so programmatic registration is required for SDK execution.
+        trace_path: Optional NDJSON file to record the conversation to as
+                messages arrive (see trace_capture.render_live_trace).
 
     Returns:
         Session ID from the ResultMessage.
@@ -199,6 +272,20 @@ async def run_sdk_session(
 
         session_id: str | None = None
 
+        # Record the conversation as it happens (non-fatal if it cannot be opened)
+        trace_writer: LiveTraceWriter | None = None
+        if trace_path is not None:
+            try:
+                trace_writer = LiveTraceWriter(trace_path)
+                trace_writer.write({
+                    "type": "user",
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "isSidechain": False,
+                    "message": {"role": "user", "content": prompt_content},
+                })
+            except TraceCaptureError as exc:
+                logger.warning("Live trace recording disabled: %s", exc)
+
         try:
             async with ClaudeSDKClient(options=options) as client:
                 # Send the query
@@ -206,6 +293,11 @@ async def run_sdk_session(
 
                 # Receive all messages until ResultMessage
                 async for message in client.receive_response():
+                    if trace_writer is not None:
+                        record = _trace_record(message)
+                        if record is not None:
+                            trace_writer.write(record)
+
                     if isinstance(message, ResultMessage):
                         session_id = message.session_id
                         logger.info(
@@ -236,6 +328,9 @@ async def run_sdk_session(
         except Exception as exc:
             raise SDKRunnerError(f"SDK session failed: {exc}") from exc
         finally:
+            if trace_writer is not None:
+                trace_writer.close()
+
             # Restore original NO_PROXY value to ensure environment is not polluted
             # This guarantees cleanup even if SDK session raises exceptions
             if original_no_proxy is None:
@@ -268,6 +363,8 @@ def run_sdk_session_sync(
     model: str,
     sdk_settings_path: Path,
     agents: dict[str, AgentDefinition] | None = None,
+    trace_path: Path | None = None,
+    timeout: float | None = None,
 ) -> str:
     """Synchronous wrapper for run_sdk_session.
 
@@ -282,22 +379,28 @@ def run_sdk_session_sync(
                 If None, agents are only available via filesystem discovery.
                 Note: SDK does not discover filesystem agents in .claude/agents/,
                 so programmatic registration is required for SDK execution.
+        trace_path: Optional NDJSON file to record the conversation to.
+        timeout: Optional limit in seconds; the session is cancelled when
+                 it runs out.
 
     Returns:
         Session ID from the ResultMessage.
 
     Raises:
         SDKRunnerError: If the session fails or session ID cannot be captured.
+        TimeoutError: If the session exceeds timeout.
     """
-    return asyncio.run(
-        run_sdk_session(
-            worktree_path=worktree_path,
-            prompt_content=prompt_content,
-            model=model,
-            sdk_settings_path=sdk_settings_path,
-            agents=agents,
-        )
+    session = run_sdk_session(
+        worktree_path=worktree_path,
+        prompt_content=prompt_content,
+        model=model,
+        sdk_settings_path=sdk_settings_path,
+        agents=agents,
+        trace_path=trace_path,
     )
+    if timeout is not None:
+        session = asyncio.wait_for(session, timeout)
+    return asyncio.run(session)
 
 
 if __name__ == "__main__":
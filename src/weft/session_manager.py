@@ -10,7 +10,11 @@ Directory structure:
 ├── plan/
 │   └── trace.md                    # Plan session trace
 ├── code/                            # Code session
-│   ├── trace.md
+│   ├── trace.md                    # trace.md.gz/.zst if [traces] compression is set
+│   ├── trace.ndjson                # Structured sidecar: one record per message
+│   ├── trace.index.json            # Sidecar index of tool calls and sections
+│   ├── trace_state.json            # Checkpoint for incremental re-capture
+│   ├── sdk_trace.ndjson            # Live recording of the SDK phase
 │   └── prompts/
 └── eval/                            # Eval outputs
     ├── test_results_before.json
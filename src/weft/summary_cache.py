@@ -0,0 +1,219 @@
+"""Content-addressed cache for trace summaries.
+
+Summaries are expensive LLM calls, but they depend only on the trace
+content, the summarization prompt and the model. This module caches each
+finished summary under a hash of those three inputs, so identical traces
+in different samples (or repositories) and copied or touched training data
+never trigger a re-summary.
+
+Cache layout (shared by all repositories):
+    ~/.weft/summary_cache/<key[:2]>/<key>.md
+
+Each generated code_trace_summary.md gets a code_trace_summary.json next to
+it recording the key and input hashes, so freshness is decided by content
+rather than modification times.
+
+Entries are evicted least-recently-used first (by mtime, refreshed on every
+hit) once the cache exceeds its size bound.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Default bound on total cache size; a summary is typically 5-10KB
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Bumped when the cached document format changes, invalidating old entries
+SUMMARY_CACHE_VERSION = "1"
+
+
+def get_summary_cache_dir() -> Path:
+    """Get the global trace summary cache directory (~/.weft/summary_cache/)."""
+    return Path.home() / ".weft" / "summary_cache"
+
+
+def content_hash(content: str) -> str:
+    """Return the SHA-256 hex digest of text content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def summary_cache_key(trace_hash: str, prompt: str, model: str) -> str:
+    """Compute the cache key for a summary.
+
+    Args:
+        trace_hash: content_hash() of the full trace
+        prompt: Summarization prompt instructions
+        model: OpenRouter model tag used for summarization
+
+    Returns:
+        Hex digest identifying the summary
+    """
+    digest = hashlib.sha256()
+    for part in (SUMMARY_CACHE_VERSION, trace_hash, content_hash(prompt), model):
+        encoded = part.encode("utf-8")
+        # Length-prefix each part so boundaries are unambiguous
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+def summary_metadata_path(summary_path: Path) -> Path:
+    """Return the provenance file path for a summary (code_trace_summary.json)."""
+    return summary_path.with_suffix(".json")
+
+
+def read_summary_metadata(summary_path: Path) -> Optional[dict]:
+    """Load a summary's provenance record.
+
+    Returns:
+        Dict with cache_key, trace_sha256, prompt_sha256 and model, or None
+        for summaries written before provenance was recorded
+    """
+    path = summary_metadata_path(summary_path)
+    try:
+        metadata = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        logger.debug("Ignoring unreadable summary metadata %s: %s", path, e)
+        return None
+    return metadata if isinstance(metadata, dict) else None
+
+
+def write_summary_metadata(
+    summary_path: Path, key: str, trace_hash: str, prompt: str, model: str
+) -> None:
+    """Record which inputs produced a summary.
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    metadata = {
+        "cache_key": key,
+        "trace_sha256": trace_hash,
+        "prompt_sha256": content_hash(prompt),
+        "model": model,
+    }
+    summary_metadata_path(summary_path).write_text(
+        json.dumps(metadata, indent=2) + "\n", encoding="utf-8"
+    )
+
+
+class SummaryCache:
+    """Size-bounded, content-addressed store of trace summary documents."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Cache directory (default: ~/.weft/summary_cache/)
+            max_bytes: Total size above which least recently used entries are evicted
+        """
+        self.cache_dir = cache_dir if cache_dir is not None else get_summary_cache_dir()
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.md"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached summary for a key, or None on a miss.
+
+        A hit refreshes the entry's mtime so eviction is least-recently-used.
+        """
+        path = self._entry_path(key)
+        try:
+            summary = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning("Failed to read cached summary %s: %s", path, e)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        logger.debug("Summary cache hit: %s", key[:12])
+        return summary
+
+    def put(self, key: str, summary: str) -> None:
+        """Store a summary, then evict old entries if the cache is over its bound.
+
+        Failures are logged and otherwise ignored; the cache is an optimization.
+        """
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(summary)
+                os.replace(tmp_name, path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            logger.warning("Failed to write summary cache entry %s: %s", path, e)
+            return
+
+        logger.debug("Cached summary %s", key[:12])
+        self.evict()
+
+    def discard(self, key: str) -> bool:
+        """Remove a single entry.
+
+        Returns:
+            True if an entry was removed
+        """
+        try:
+            self._entry_path(key).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning("Failed to remove cached summary %s: %s", key[:12], e)
+            return False
+
+    def evict(self) -> int:
+        """Evict least recently used entries until the cache fits its bound.
+
+        Returns:
+            Number of entries evicted
+        """
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.md"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return 0
+
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.debug("Failed to evict %s: %s", path, e)
+                continue
+            total -= size
+            evicted += 1
+
+        logger.debug("Evicted %d summary cache entr%s", evicted, "y" if evicted == 1 else "ies")
+        return evicted
@@ -167,6 +167,7 @@ def run_tests_via_sdk(
     worktree_path: Path,
     output_file: Path,
     model: str,
+    timeout: Optional[float] = None,
 ) -> dict[str, Any]:
     """Run tests in a worktree using Claude Code SDK.
 
@@ -174,12 +175,14 @@ def run_tests_via_sdk(
         worktree_path: Path to the worktree where tests should run
         output_file: Path where test_results.json should be created
         model: Model to use for Claude Code SDK
+        timeout: Optional limit in seconds for the test session
 
     Returns:
         Validated test results dictionary
 
     Raises:
         TestRunnerError: If SDK fails or output is invalid
+        TimeoutError: If the test session exceeds timeout
     """
     src_dir = get_weft_src_dir()
     sdk_settings_path = src_dir / "sdk_settings.json"
@@ -200,6 +203,7 @@ def run_tests_via_sdk(
             model=model,
             expected_output=expected_output,
             sdk_settings_path=sdk_settings_path,
+            timeout=timeout,
         )
     except ClaudeSessionError as exc:
         raise TestRunnerError(f"Test execution via SDK failed: {exc}") from exc
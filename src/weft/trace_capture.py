@@ -11,75 +11,107 @@ See docs/adr/001-trace-capture-claude-dependency.md for details.
 from __future__ import annotations
 
 import json
+import os
 import time
 from datetime import datetime, timezone
+from itertools import chain
 from pathlib import Path
-from typing import Tuple, Optional, List
+from typing import Iterable, Iterator, Tuple, Optional, List
 
+from .config import get_trace_compression
 from .logging_config import get_logger
+from .trace_index import ProjectIndex, get_claude_projects_dir
+from .trace_parser import ErrorScanner, SIDECAR_VERSION, read_sidecar_index, sidecar_paths
+from .trace_storage import (
+    TraceStorageError,
+    content_size,
+    read_trace_bytes,
+    stored_compression,
+    trace_writer,
+    write_trace_bytes,
+)
 
 logger = get_logger(__name__)
 
 # Retention period for trace directories (30 days)
 TRACE_RETENTION_DAYS = 30
 
+# Checkpoint written next to trace.md so re-captures only parse new JSONL lines
+TRACE_STATE_FILENAME = "trace_state.json"
+TRACE_STATE_VERSION = 1
+
+# NDJSON trace recorded from the SDK message stream while a session runs
+LIVE_TRACE_FILENAME = "sdk_trace.ndjson"
+LIVE_TRACE_BUFFER_SIZE = 64 * 1024
+
 
 class TraceCaptureError(Exception):
     """Raised when trace capture operations fail."""
     pass
 
 
-def find_project_folder(worktree_path: Path, execution_window: Tuple[float, float]) -> Optional[Path]:
+def find_project_folder(
+    worktree_path: Path,
+    execution_window: Tuple[float, float],
+    session_id: Optional[str] = None,
+    index: Optional[ProjectIndex] = None,
+) -> Optional[Path]:
     """Find the Claude Code project folder matching the worktree path.
 
-    Searches ~/.claude/projects/ for folders containing JSONL files modified
-    within the execution window. Uses filesystem modification time to find
-    the matching session.
+    Looks the folder up in the persistent trace index first (exact folder
+    name, then JSONL header cwd or session ID). Only if that fails does it
+    fall back to scanning ~/.claude/projects/ for folders containing JSONL
+    files modified within the execution window.
 
     Args:
         worktree_path: Path to the worktree directory
         execution_window: Tuple of (start_time, end_time) in seconds since epoch
+        session_id: Optional session ID to match against indexed JSONL headers
+        index: Optional loaded ProjectIndex (loaded and saved here if omitted)
 
     Returns:
         Path to the matching project folder, or None if not found
     """
-    claude_projects = Path.home() / ".claude" / "projects"
+    claude_projects = get_claude_projects_dir()
 
     if not claude_projects.exists():
         logger.debug("Claude projects directory not found: %s", claude_projects)
         return None
 
+    owns_index = index is None
+    if index is None:
+        index = ProjectIndex.load(claude_projects)
+    try:
+        folder = index.find_folder(worktree_path, session_id=session_id)
+    finally:
+        if owns_index:
+            index.save()
+
+    if folder is not None:
+        return folder
+
+    return _find_project_folder_by_mtime(claude_projects, execution_window)
+
+
+def _find_project_folder_by_mtime(
+    claude_projects: Path, execution_window: Tuple[float, float]
+) -> Optional[Path]:
+    """Scan all project folders for JSONL files modified within the window.
+
+    Last-resort fallback for sessions whose JSONL headers do not identify the
+    worktree. This is the slow path the trace index exists to avoid.
+
+    Args:
+        claude_projects: Claude Code projects directory
+        execution_window: Tuple of (start_time, end_time) in seconds since epoch
+
+    Returns:
+        Path to the matching project folder, or None if not found
+    """
     start_time, end_time = execution_window
-    logger.debug("Searching for project folder with files modified between %s and %s",
+    logger.debug("Index lookup failed, trying time-based search between %s and %s",
                  datetime.fromtimestamp(start_time), datetime.fromtimestamp(end_time))
 
-    # Convert worktree path to expected folder name format
-    # Claude Code strips leading /, then replaces /, ., _ with -, then prefixes with -
-    # Example: /home/user/weft/.weft/worktrees/foo -> -home-user-weft--weft-worktrees-foo
-    worktree_str = str(worktree_path.resolve())
-    expected_folder_name = "-" + worktree_str.lstrip("/").replace("/", "-").replace(".", "-").replace("_", "-")
-
-    logger.debug("Worktree path: %s", worktree_str)
-    logger.debug("Expected folder name: %s", expected_folder_name)
-
-    # List all available folders for debugging
-    available_folders = [f.name for f in claude_projects.iterdir() if f.is_dir()]
-    logger.debug("Available project folders (%d): %s", len(available_folders), available_folders)
-
-    # Try exact match first
-    expected_folder = claude_projects / expected_folder_name
-    logger.debug("Checking for exact match at: %s", expected_folder)
-    if expected_folder.exists() and expected_folder.is_dir():
-        # Check if it has any JSONL files (don't check timestamps for exact match)
-        # The JSONL files continue to be modified after creation, so mtime is unreliable
-        jsonl_files = list(expected_folder.glob("*.jsonl"))
-        logger.debug("Found %d JSONL files in exact match folder", len(jsonl_files))
-        if jsonl_files:
-            logger.debug("Found matching project folder (exact match): %s", expected_folder)
-            return expected_folder
-
-    # Fall back to searching all folders
-    logger.debug("Exact match failed, trying time-based search")
     for folder in claude_projects.iterdir():
         if not folder.is_dir():
             continue
@@ -163,42 +195,122 @@ def match_session_files(jsonl_files: List[Path], worktree_path: Path) -> Optiona
     return None
 
 
-def parse_jsonl_file(file_path: Path) -> List[dict]:
-    """Parse a JSONL file into a list of message objects.
+def iter_jsonl_messages(
+    file_path: Path,
+    session_id: Optional[str] = None,
+    offsets: Optional[dict[str, int]] = None,
+) -> Iterator[dict]:
+    """Stream message objects from a JSONL file one line at a time.
+
+    When session_id is given, lines that do not contain the session ID bytes
+    are rejected before json.loads, and only messages whose sessionId matches
+    are yielded. Memory use is bounded by the longest line, not the file size.
+
+    When offsets is given, reading starts at offsets[str(file_path)] (default 0)
+    and the entry is updated in place with the byte offset just past the last
+    complete line consumed. An unterminated final line that does not parse is
+    treated as still being written and left for the next read.
 
     Args:
         file_path: Path to the JSONL file
+        session_id: Optional session ID to filter messages by
+        offsets: Optional mapping of file path to byte offset (updated in place)
 
-    Returns:
-        List of message dictionaries
+    Yields:
+        Message dictionaries
+
+    Raises:
+        TraceCaptureError: If the file cannot be read
     """
-    messages = []
+    needle = session_id.encode("utf-8") if session_id else None
+    key = str(file_path)
+    position = offsets.get(key, 0) if offsets is not None else 0
+    yielded = 0
 
     try:
-        with file_path.open("r", encoding="utf-8") as f:
+        with file_path.open("rb") as f:
+            if position:
+                f.seek(position)
             for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
+                complete = line.endswith(b"\n")
+
+                # Cheap byte-level pre-check: most lines in a shared project
+                # folder belong to other sessions and never need decoding
+                if needle is not None and needle not in line:
+                    if not complete:
+                        break
+                    position += len(line)
+                    if offsets is not None:
+                        offsets[key] = position
                     continue
 
-                try:
-                    message = json.loads(line)
-                    messages.append(message)
-                except json.JSONDecodeError as e:
-                    logger.warning("Invalid JSON on line %d of %s: %s", line_num, file_path, e)
+                stripped = line.strip()
+                message = None
+                if stripped:
+                    try:
+                        message = json.loads(stripped)
+                    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                        if not complete:
+                            break
+                        logger.warning("Invalid JSON on line %d of %s: %s", line_num, file_path, e)
+
+                position += len(line)
+                if offsets is not None:
+                    offsets[key] = position
+
+                if message is None:
+                    continue
+                if session_id is not None and (
+                    not isinstance(message, dict) or message.get("sessionId") != session_id
+                ):
                     continue
+
+                yielded += 1
+                yield message
     except OSError as e:
         raise TraceCaptureError(f"Failed to read JSONL file {file_path}: {e}") from e
 
-    logger.debug("Parsed %d message(s) from %s", len(messages), file_path)
-    return messages
+    logger.debug("Read %d message(s) from %s", yielded, file_path)
+
 
+def iter_session_messages(
+    jsonl_files: Iterable[Path],
+    session_id: str,
+    offsets: Optional[dict[str, int]] = None,
+) -> Iterator[dict]:
+    """Stream messages belonging to one session across several JSONL files.
 
-def filter_and_clean_messages(messages: List[dict]) -> dict[str, List[dict]]:
+    Args:
+        jsonl_files: JSONL file paths, in the order messages should be emitted
+        session_id: Session ID to filter messages by
+        offsets: Optional per-file byte offsets (see iter_jsonl_messages)
+
+    Yields:
+        Message dictionaries from the target session
+    """
+    for jsonl_file in jsonl_files:
+        yield from iter_jsonl_messages(jsonl_file, session_id, offsets)
+
+
+def parse_jsonl_file(file_path: Path) -> List[dict]:
+    """Parse a JSONL file into a list of message objects.
+
+    Args:
+        file_path: Path to the JSONL file
+
+    Returns:
+        List of message dictionaries
+    """
+    return list(iter_jsonl_messages(file_path))
+
+
+def filter_and_clean_messages(messages: Iterable[dict]) -> dict[str, List[dict]]:
     """Filter out file history snapshots and group messages by agent.
 
+    Consumes messages in a single pass, so it accepts a streaming iterator.
+
     Args:
-        messages: List of raw message dictionaries
+        messages: Iterable of raw message dictionaries
 
     Returns:
         Dictionary mapping agent ID to list of messages (main conversation uses "main" key)
@@ -252,6 +364,10 @@ def truncate_content(content: str, max_chars: int = 200) -> str:
 def clean_tool_results(messages: List[dict]) -> List[dict]:
     """Truncate large tool result content.
 
+    Rendering truncates lazily (see _format_message), so trace capture no
+    longer calls this. Only messages that actually contain an oversized tool
+    result are copied; all others are returned as-is.
+
     Args:
         messages: List of message dictionaries
 
@@ -259,33 +375,34 @@ def clean_tool_results(messages: List[dict]) -> List[dict]:
         List of messages with truncated tool results
     """
     cleaned = []
-
     for message in messages:
-        message_copy = message.copy()
-
         if message.get("type") == "user":
             msg_content = message.get("message", {}).get("content", [])
+            truncated = _truncate_tool_results(msg_content)
+            if truncated is not msg_content:
+                message = {**message, "message": {**message["message"], "content": truncated}}
+        cleaned.append(message)
+    return cleaned
 
-            if isinstance(msg_content, list):
-                cleaned_content = []
-                for item in msg_content:
-                    item_copy = item.copy() if isinstance(item, dict) else item
-
-                    if isinstance(item_copy, dict) and item_copy.get("type") == "tool_result":
-                        content_str = item_copy.get("content", "")
-                        if isinstance(content_str, str) and len(content_str) > 200:
-                            item_copy["content"] = truncate_content(content_str)
-
-                    cleaned_content.append(item_copy)
 
-                # Update the message copy with cleaned content
-                if "message" not in message_copy:
-                    message_copy["message"] = {}
-                message_copy["message"]["content"] = cleaned_content
+def _is_oversized_result(item: object) -> bool:
+    """Return True for a tool_result block whose string content needs truncating."""
+    return (
+        isinstance(item, dict)
+        and item.get("type") == "tool_result"
+        and isinstance(item.get("content"), str)
+        and len(item["content"]) > 200
+    )
 
-        cleaned.append(message_copy)
 
-    return cleaned
+def _truncate_tool_results(content: object) -> object:
+    """Return content with oversized tool results truncated, or content itself if none are."""
+    if not isinstance(content, list) or not any(_is_oversized_result(item) for item in content):
+        return content
+    return [
+        {**item, "content": truncate_content(item["content"])} if _is_oversized_result(item) else item
+        for item in content
+    ]
 
 
 def generate_markdown(grouped_messages: dict[str, List[dict]], session_metadata: dict) -> str:
@@ -298,47 +415,84 @@ def generate_markdown(grouped_messages: dict[str, List[dict]], session_metadata:
     Returns:
         Formatted markdown string
     """
-    lines = []
+    return "\n".join(
+        line for _, lines in _iter_sections(grouped_messages, session_metadata) for line in lines
+    )
 
-    # Header
-    lines.append("# Conversation Trace")
-    lines.append("")
-    lines.append("## Session Metadata")
-    lines.append("")
-    lines.append(f"- **Session ID**: {session_metadata.get('session_id', 'unknown')}")
-    lines.append(f"- **Command**: {session_metadata.get('command', 'unknown')}")
-    lines.append(f"- **Timestamp**: {session_metadata.get('timestamp', 'unknown')}")
-    lines.append(f"- **Worktree**: {session_metadata.get('worktree', 'unknown')}")
-    lines.append(f"- **Git Branch**: {session_metadata.get('git_branch', 'unknown')}")
-    lines.append("")
 
-    # Main conversation
-    lines.append("## Main Conversation")
-    lines.append("")
+def _iter_sections(
+    grouped_messages: dict[str, List[dict]],
+    session_metadata: dict,
+    truncate: bool = True,
+) -> Iterator[Tuple[str, Iterator[str]]]:
+    """Lazily render the conversation as (agent_id, lines) sections.
 
-    main_messages = grouped_messages.get("main", [])
-    for message in main_messages:
-        lines.extend(_format_message(message))
+    The "main" section includes the trace header. Joining every section's
+    lines with newlines yields the full markdown document. Lines are produced
+    one message at a time, so the document is never held in memory.
+
+    Args:
+        grouped_messages: Dictionary mapping agent ID to messages
+        session_metadata: Metadata about the session
+        truncate: Truncate large tool results while rendering
+
+    Yields:
+        (agent_id, markdown line iterator) tuples, main conversation first
+    """
+    yield "main", chain(
+        _render_header(session_metadata),
+        _iter_message_lines(grouped_messages.get("main", []), truncate),
+    )
 
     # Subagent conversations
     for agent_id, messages in grouped_messages.items():
         if agent_id == "main":
             continue
+        yield agent_id, chain(
+            _render_subagent_heading(agent_id), _iter_message_lines(messages, truncate)
+        )
 
-        lines.append(f"## Subagent: agent-{agent_id}")
-        lines.append("")
 
-        for message in messages:
-            lines.extend(_format_message(message))
+def _render_header(session_metadata: dict) -> List[str]:
+    """Render the trace header and the opening of the main conversation."""
+    return [
+        "# Conversation Trace",
+        "",
+        "## Session Metadata",
+        "",
+        f"- **Session ID**: {session_metadata.get('session_id', 'unknown')}",
+        f"- **Command**: {session_metadata.get('command', 'unknown')}",
+        f"- **Timestamp**: {session_metadata.get('timestamp', 'unknown')}",
+        f"- **Worktree**: {session_metadata.get('worktree', 'unknown')}",
+        f"- **Git Branch**: {session_metadata.get('git_branch', 'unknown')}",
+        "",
+        "## Main Conversation",
+        "",
+    ]
+
+
+def _render_subagent_heading(agent_id: str) -> List[str]:
+    """Render the heading lines that open a subagent section."""
+    return [f"## Subagent: agent-{agent_id}", ""]
+
 
-    return "\n".join(lines)
+def _render_messages(messages: List[dict]) -> List[str]:
+    """Render a list of messages as markdown lines."""
+    return list(_iter_message_lines(messages))
 
 
-def _format_message(message: dict) -> List[str]:
+def _iter_message_lines(messages: Iterable[dict], truncate: bool = True) -> Iterator[str]:
+    """Lazily render messages as markdown lines."""
+    for message in messages:
+        yield from _format_message(message, truncate)
+
+
+def _format_message(message: dict, truncate: bool = True) -> List[str]:
     """Format a single message as markdown lines.
 
     Args:
         message: Message dictionary
+        truncate: Truncate large tool results (see truncate_content)
 
     Returns:
         List of markdown lines
@@ -360,9 +514,12 @@ def _format_message(message: dict) -> List[str]:
                     if item.get("type") == "text":
                         lines.append(item.get("text", ""))
                     elif item.get("type") == "tool_result":
+                        content = item.get("content", "")
+                        if truncate and isinstance(content, str):
+                            content = truncate_content(content)
                         lines.append(f"**Tool Result** (ID: {item.get('tool_use_id', 'unknown')})")
                         lines.append("```")
-                        lines.append(str(item.get("content", "")))
+                        lines.append(str(content))
                         lines.append("```")
 
     elif msg_type == "assistant":
@@ -524,50 +681,64 @@ def capture_session_trace(
                  datetime.fromtimestamp(execution_window[0]).isoformat(),
                  datetime.fromtimestamp(execution_window[1]).isoformat())
 
-    # Find project folder
-    project_folder = find_project_folder(worktree_path, execution_window)
-    if not project_folder:
-        logger.warning("Could not find Claude Code project folder for worktree %s", worktree_path)
-        return None
+    # Look up project folder, files and session via the persistent index
+    index = ProjectIndex.load()
+    try:
+        project_folder = find_project_folder(
+            worktree_path, execution_window, session_id=session_id, index=index
+        )
+        if not project_folder:
+            logger.warning("Could not find Claude Code project folder for worktree %s", worktree_path)
+            return None
 
-    logger.debug("Found project folder: %s", project_folder)
+        logger.debug("Found project folder: %s", project_folder)
 
-    # Collect JSONL files
-    jsonl_files = collect_jsonl_files(project_folder)
-    if not jsonl_files:
-        logger.warning("No JSONL files found in project folder %s", project_folder)
-        return None
+        jsonl_files = index.session_files(project_folder)
+        if not jsonl_files:
+            logger.warning("No JSONL files found in project folder %s", project_folder)
+            return None
 
-    logger.debug("Found %d JSONL files to check", len(jsonl_files))
+        logger.debug("Found %d JSONL files to check", len(jsonl_files))
 
-    # Use provided session_id or match from files
-    if not session_id:
-        session_id = match_session_files(jsonl_files, worktree_path)
+        # Use provided session_id or match from cached JSONL headers
         if not session_id:
-            logger.warning("Could not match session for worktree %s", worktree_path)
-            return None
+            session_id = index.match_session(project_folder, worktree_path)
+            if not session_id:
+                logger.warning("Could not match session for worktree %s", worktree_path)
+                return None
+    finally:
+        index.save()
 
-    # Parse all JSONL files for this session
-    all_messages = []
-    for jsonl_file in jsonl_files:
-        messages = parse_jsonl_file(jsonl_file)
-        # Filter to messages from this session
-        session_messages = [m for m in messages if m.get("sessionId") == session_id]
-        all_messages.extend(session_messages)
+    trace_file = run_dir / "trace.md"
+    offsets: dict[str, int] = {}
+
+    # Resume from the checkpoint of a previous capture of the same session
+    state = _load_trace_state(run_dir, session_id, trace_file)
+    if state is not None:
+        offsets = {path: info["offset"] for path, info in state["files"].items()}
+        new_messages = filter_and_clean_messages(
+            iter_session_messages(jsonl_files, session_id, offsets)
+        )
+
+        sidecar = _load_sidecar_records(trace_file)
+        sections = _append_to_trace(trace_file, state["sections"], new_messages)
+        if sidecar is not None:
+            _append_sidecar(trace_file, *sidecar, new_messages, sections)
+        _save_trace_state(run_dir, session_id, trace_file, sections, offsets)
+        logger.info("Trace updated incrementally: %s", trace_file)
+        return trace_file
 
-    if not all_messages:
+    # Stream only this session's messages from all JSONL files
+    session_messages = iter_session_messages(jsonl_files, session_id, offsets)
+    first_message = next(session_messages, None)
+    if first_message is None:
         logger.warning("No messages found for session %s", session_id)
         return None
 
-    # Filter and group messages
-    grouped_messages = filter_and_clean_messages(all_messages)
-
-    # Clean tool results
-    for agent_id in grouped_messages:
-        grouped_messages[agent_id] = clean_tool_results(grouped_messages[agent_id])
+    # Filter and group messages (tool results are truncated while rendering)
+    grouped_messages = filter_and_clean_messages(chain([first_message], session_messages))
 
     # Extract metadata from first message
-    first_message = all_messages[0] if all_messages else {}
     session_metadata = {
         "session_id": session_id,
         "command": command,
@@ -576,14 +747,616 @@ def capture_session_trace(
         "git_branch": first_message.get("gitBranch", "unknown"),
     }
 
-    # Generate markdown
-    markdown_content = generate_markdown(grouped_messages, session_metadata)
+    # Stream markdown to the trace file, then write its structured sidecar
+    sections, scan_states, errors = _write_trace(
+        trace_file, grouped_messages, session_metadata, get_trace_compression()
+    )
+    _write_sidecar(
+        trace_file, grouped_messages, session_metadata, sections, scan_states, errors
+    )
+    _save_trace_state(run_dir, session_id, trace_file, sections, offsets)
+    logger.info("Trace captured successfully: %s", trace_file)
+    return trace_file
+
+
+def _write_trace(
+    trace_file: Path,
+    grouped_messages: dict[str, List[dict]],
+    session_metadata: dict,
+    compression: Optional[str] = None,
+) -> Tuple[List[list], List[list], List[str]]:
+    """Stream the rendered trace to trace.md, recording where each section ends.
+
+    Lines are rendered lazily and written through a buffered (optionally
+    compressing) writer, so the markdown document is never built in memory.
+    Errors are scanned from the same lines as they are written. Any existing
+    checkpoint and sidecar index are removed first, since they no longer
+    describe the file being written.
+
+    Args:
+        trace_file: Path to trace.md (logical path when stored compressed)
+        grouped_messages: Messages grouped by agent ID
+        session_metadata: Metadata rendered in the trace header
+        compression: Storage format ("gzip", "zstd"), or None for plain markdown
+
+    Returns:
+        ([agent_id, end_offset] pairs for the checkpoint, [agent_id, scan state]
+        pairs at each section end, errors found in the trace)
+
+    Raises:
+        TraceCaptureError: If the trace file cannot be written
+    """
+    sections = []
+    scan_states = []
+    scanner = ErrorScanner()
+    size = 0
+    separator = b""
+
+    _remove_trace_state(trace_file.parent)
+    _remove_sidecar_index(trace_file)
+    try:
+        with trace_writer(trace_file, compression) as f:
+            for agent_id, lines in _iter_sections(grouped_messages, session_metadata):
+                for line in lines:
+                    encoded = separator + line.encode("utf-8")
+                    f.write(encoded)
+                    size += len(encoded)
+                    separator = b"\n"
+                    scanner.feed_text(line)
+                sections.append([agent_id, size])
+                scan_states.append([agent_id, scanner.state()])
+    except TraceStorageError as e:
+        raise TraceCaptureError(f"Failed to write trace file {trace_file}: {e}") from e
+
+    return sections, scan_states, scanner.finish()
+
+
+def _sidecar_record(agent_id: str, message: dict) -> dict:
+    """Reduce a message to the fields the sidecar keeps, truncated as rendered."""
+    content = message.get("message", {}).get("content", [])
+    if message.get("type") == "user":
+        content = _truncate_tool_results(content)
+    return {
+        "agent_id": agent_id,
+        "type": message.get("type", "unknown"),
+        "timestamp": message.get("timestamp", ""),
+        "content": content,
+    }
+
+
+def _record_message(record: dict) -> dict:
+    """Expand a sidecar record back into the message shape _format_message renders."""
+    return {
+        "type": record.get("type", "unknown"),
+        "timestamp": record.get("timestamp", ""),
+        "message": {"content": record.get("content", [])},
+    }
+
+
+def _write_sidecar(
+    trace_file: Path,
+    grouped_messages: dict[str, List[dict]],
+    session_metadata: dict,
+    sections: List[list],
+    scan_states: List[list],
+    errors: List[str],
+) -> None:
+    """Write the structured sidecar (NDJSON messages plus index) for a trace.
+
+    Records are streamed in document order and index entries are collected
+    as they are written. Failures are logged and leave the trace without a
+    sidecar, so readers fall back to parsing the markdown.
+
+    Args:
+        trace_file: Path to the trace.md just written
+        grouped_messages: Messages grouped by agent ID
+        session_metadata: Metadata rendered in the trace header
+        sections: [agent_id, end_offset] pairs from _write_trace
+        scan_states: [agent_id, scan state] pairs from _write_trace
+        errors: Errors found while writing the trace
+    """
+    messages_path, _ = sidecar_paths(trace_file)
+    tool_calls: List[list] = []
+    tool_results: List[list] = []
+    try:
+        with messages_path.open("wb", buffering=LIVE_TRACE_BUFFER_SIZE) as f:
+            for agent_id, _ in sections:
+                for message in grouped_messages.get(agent_id, []):
+                    record = _sidecar_record(agent_id, message)
+                    _add_index_entries(f.tell(), record, tool_calls, tool_results)
+                    f.write((json.dumps(record, default=str) + "\n").encode("utf-8"))
+    except OSError as e:
+        logger.warning("Failed to write trace sidecar %s: %s", messages_path, e)
+        return
+
+    _write_sidecar_index(
+        trace_file, session_metadata, sections, tool_calls, tool_results, scan_states, errors
+    )
+
+
+def _add_index_entries(
+    offset: int, record: dict, tool_calls: List[list], tool_results: List[list]
+) -> None:
+    """Append [name, offset] / [tool_use_id, offset] entries for a record's tool blocks."""
+    content = record.get("content")
+    if not isinstance(content, list):
+        return
+    for block in content:
+        if not isinstance(block, dict):
+            continue
+        if record.get("type") == "assistant" and block.get("type") == "tool_use":
+            tool_calls.append([block.get("name", "unknown"), offset])
+        elif record.get("type") == "user" and block.get("type") == "tool_result":
+            tool_results.append([block.get("tool_use_id", "unknown"), offset])
+
+
+def _load_sidecar_records(
+    trace_file: Path,
+) -> Optional[Tuple[dict, dict[str, List[Tuple[int, dict]]]]]:
+    """Load a trace's sidecar records so an incremental capture can extend it.
+
+    Returns:
+        (sidecar index, records grouped by agent ID with their byte offsets),
+        or None if the trace has no valid sidecar
+    """
+    index = read_sidecar_index(trace_file)
+    if index is None:
+        return None
+
+    messages_path, _ = sidecar_paths(trace_file)
+    grouped_records: dict[str, List[Tuple[int, dict]]] = {"main": []}
+    try:
+        with messages_path.open("rb") as f:
+            offset = 0
+            for line in f:
+                record = json.loads(line)
+                grouped_records.setdefault(record["agent_id"], []).append((offset, record))
+                offset += len(line)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.debug("Ignoring unreadable trace sidecar %s: %s", messages_path, e)
+        return None
+
+    return index, grouped_records
+
+
+def _append_sidecar(
+    trace_file: Path,
+    index: dict,
+    grouped_records: dict[str, List[Tuple[int, dict]]],
+    new_messages: dict[str, List[dict]],
+    sections: List[list],
+) -> None:
+    """Append newly captured messages to the sidecar and rewrite its index.
+
+    Existing records keep their offsets; new ones are appended to the NDJSON
+    file in the order _append_to_trace adds them to trace.md. The error scan
+    resumes from the state saved at the end of the first changed section, so
+    only new records and the sections after them are scanned again.
+
+    Args:
+        trace_file: Path to the updated trace.md
+        index: Previous sidecar index from _load_sidecar_records
+        grouped_records: Existing records from _load_sidecar_records
+        new_messages: New messages grouped by agent ID
+        sections: Updated [agent_id, end_offset] pairs from _append_to_trace
+    """
+    if not any(new_messages.values()):
+        return
+
+    messages_path, _ = sidecar_paths(trace_file)
+    added: dict[str, List[dict]] = {}
+    try:
+        with messages_path.open("ab") as f:
+            for agent_id, messages in new_messages.items():
+                records = grouped_records.setdefault(agent_id, [])
+                for message in messages:
+                    record = _sidecar_record(agent_id, message)
+                    records.append((f.tell(), record))
+                    added.setdefault(agent_id, []).append(record)
+                    f.write((json.dumps(record, default=str) + "\n").encode("utf-8"))
+    except OSError as e:
+        logger.warning("Failed to append to trace sidecar %s: %s", messages_path, e)
+        return
+
+    # Index entries in document order
+    tool_calls: List[list] = []
+    tool_results: List[list] = []
+    for agent_id, _ in sections:
+        for offset, record in grouped_records.get(agent_id, []):
+            _add_index_entries(offset, record, tool_calls, tool_results)
+
+    # Errors from re-rendering the (already truncated) records, which
+    # reproduces trace.md line for line. Sections keep their order and new
+    # subagents come last, so the saved states line up with sections.
+    saved_states = index["error_scan"]
+    first_changed = next(
+        (i for i, (agent_id, _) in enumerate(sections) if agent_id in added), len(sections)
+    )
+    resume = min(first_changed, len(saved_states) - 1)
+    scanner = ErrorScanner.from_state(saved_states[resume][1])
+    scan_states = saved_states[:resume]
+    for i, (agent_id, _) in enumerate(sections[resume:], start=resume):
+        if i == resume:
+            lines = _iter_message_lines(
+                (_record_message(record) for record in added.get(agent_id, [])), truncate=False
+            )
+        else:
+            lines = chain(
+                _render_subagent_heading(agent_id),
+                _iter_message_lines(
+                    (_record_message(record) for _, record in grouped_records[agent_id]),
+                    truncate=False,
+                ),
+            )
+        for line in lines:
+            scanner.feed_text(line)
+        scan_states.append([agent_id, scanner.state()])
+
+    _write_sidecar_index(
+        trace_file, index["metadata"], sections, tool_calls, tool_results,
+        scan_states, scanner.finish(),
+    )
+
+
+def _write_sidecar_index(
+    trace_file: Path,
+    session_metadata: dict,
+    sections: List[list],
+    tool_calls: List[list],
+    tool_results: List[list],
+    scan_states: List[list],
+    errors: List[str],
+) -> None:
+    """Write the sidecar index; it is written last, so it marks the sidecar complete."""
+    messages_path, index_path = sidecar_paths(trace_file)
+
+    subagent_ranges = []
+    for i, (agent_id, end) in enumerate(sections):
+        if agent_id != "main":
+            # Skip the "\n" separator and the "## Subagent: agent-<id>" line
+            heading = _render_subagent_heading(agent_id)[0]
+            start = sections[i - 1][1] + 1 + len(heading.encode("utf-8")) + 1
+            subagent_ranges.append([agent_id, start, end])
+
+    try:
+        index = {
+            "version": SIDECAR_VERSION,
+            "trace_size": content_size(trace_file),
+            "messages_size": messages_path.stat().st_size,
+            "metadata": session_metadata,
+            "sections": subagent_ranges,
+            "tool_calls": tool_calls,
+            "tool_results": tool_results,
+            "errors": errors,
+            "error_scan": scan_states,
+        }
+        index_path.write_text(json.dumps(index, default=str), encoding="utf-8")
+    except (OSError, TraceStorageError) as e:
+        logger.warning("Failed to write trace sidecar index %s: %s", index_path, e)
+
+
+def _remove_sidecar_index(trace_file: Path) -> None:
+    """Delete the sidecar index before trace.md is modified, so readers never trust a stale one."""
+    _, index_path = sidecar_paths(trace_file)
+    try:
+        index_path.unlink(missing_ok=True)
+    except OSError as e:
+        raise TraceCaptureError(f"Failed to remove trace sidecar index {index_path}: {e}") from e
+
+
+class LiveTraceWriter:
+    """Buffered, append-only NDJSON writer for traces recorded during a session.
+
+    Records use the same shape as Claude Code's JSONL messages (type, timestamp,
+    isSidechain, agentId, message.content), so render_live_trace can reuse the
+    post-hoc rendering pipeline. Write failures are logged once and disable the
+    writer; recording must never interrupt the session being recorded.
+    """
+
+    def __init__(self, path: Path, buffer_size: int = LIVE_TRACE_BUFFER_SIZE):
+        """Open the trace file for appending.
+
+        Args:
+            path: NDJSON file to append records to
+            buffer_size: Write buffer size in bytes
+
+        Raises:
+            TraceCaptureError: If the file cannot be opened
+        """
+        self.path = path
+        try:
+            self._file = path.open("a", encoding="utf-8", buffering=buffer_size)
+        except OSError as e:
+            raise TraceCaptureError(f"Failed to open live trace {path}: {e}") from e
+
+    def write(self, record: dict) -> None:
+        """Append one record as a single JSON line."""
+        if self._file is None:
+            return
+        try:
+            self._file.write(json.dumps(record, default=str) + "\n")
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Disabling live trace recording after write failure: %s", e)
+            self.close()
+
+    def flush(self) -> None:
+        """Flush buffered records to disk."""
+        if self._file is None:
+            return
+        try:
+            self._file.flush()
+        except OSError as e:
+            logger.warning("Failed to flush live trace %s: %s", self.path, e)
+
+    def close(self) -> None:
+        """Flush and close the file. Safe to call more than once."""
+        if self._file is None:
+            return
+        file, self._file = self._file, None
+        try:
+            file.close()
+        except OSError as e:
+            logger.warning("Failed to close live trace %s: %s", self.path, e)
+
+    def __enter__(self) -> "LiveTraceWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def render_live_trace(
+    live_trace_path: Path,
+    worktree_path: Path,
+    command: str,
+    run_dir: Path,
+    execution_start: float,
+) -> Optional[Path]:
+    """Render a live-recorded NDJSON trace to trace.md.
+
+    Preferred over capture_session_trace when the whole session ran through
+    the SDK, because it needs no search of ~/.claude/projects/.
+
+    Args:
+        live_trace_path: NDJSON file written by LiveTraceWriter
+        worktree_path: Path to the worktree directory
+        command: Command type ("plan" or "code")
+        run_dir: Directory where trace should be stored
+        execution_start: Session start time (seconds since epoch)
+
+    Returns:
+        Path to the created trace file, or None if the live trace is missing or empty
+
+    Raises:
+        TraceCaptureError: If the live trace cannot be read or trace.md cannot be written
+    """
+    if not live_trace_path.exists():
+        logger.debug("No live trace at %s", live_trace_path)
+        return None
+
+    session_id = "unknown"
+    messages = []
+    for record in iter_jsonl_messages(live_trace_path):
+        if not isinstance(record, dict):
+            continue
+        if record.get("type") == "result":
+            session_id = record.get("session_id") or session_id
+        elif record.get("type") in ("user", "assistant"):
+            messages.append(record)
+
+    if not messages:
+        logger.warning("Live trace %s contains no messages", live_trace_path)
+        return None
+
+    grouped_messages = filter_and_clean_messages(messages)
+
+    session_metadata = {
+        "session_id": session_id,
+        "command": command,
+        "timestamp": datetime.fromtimestamp(execution_start).isoformat(),
+        "worktree": str(worktree_path),
+        "git_branch": messages[0].get("gitBranch", "unknown"),
+    }
 
-    # Write to trace file
     trace_file = run_dir / "trace.md"
+    sections, scan_states, errors = _write_trace(
+        trace_file, grouped_messages, session_metadata, get_trace_compression()
+    )
+    _write_sidecar(
+        trace_file, grouped_messages, session_metadata, sections, scan_states, errors
+    )
+    logger.info("Trace rendered from live recording: %s", trace_file)
+    return trace_file
+
+
+def _load_trace_state(run_dir: Path, session_id: str, trace_file: Path) -> Optional[dict]:
+    """Load the incremental capture checkpoint if it is still valid.
+
+    The checkpoint is valid only if it belongs to the same session, trace.md
+    is exactly as large as when the checkpoint was written, and every
+    recorded JSONL file is the same file (inode) and has not shrunk.
+
+    Args:
+        run_dir: Directory containing trace.md
+        session_id: Session ID being captured
+        trace_file: Path to trace.md
+
+    Returns:
+        Checkpoint dict, or None if a full capture is required
+    """
+    state_file = run_dir / TRACE_STATE_FILENAME
     try:
-        trace_file.write_text(markdown_content, encoding="utf-8")
-        logger.info("Trace captured successfully: %s", trace_file)
-        return trace_file
+        state = json.loads(state_file.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        logger.debug("Ignoring unreadable trace checkpoint %s: %s", state_file, e)
+        return None
+
+    if state.get("version") != TRACE_STATE_VERSION or state.get("session_id") != session_id:
+        logger.debug("Trace checkpoint does not match session %s", session_id)
+        return None
+
+    try:
+        if content_size(trace_file) != state["trace_size"]:
+            logger.debug("Trace file changed since checkpoint, recapturing in full")
+            return None
+        for path, info in state["files"].items():
+            stat = os.stat(path)
+            if stat.st_ino != info["ino"] or stat.st_size < info["offset"]:
+                logger.debug("JSONL file %s was replaced or truncated, recapturing in full", path)
+                return None
+    except (OSError, TraceStorageError, KeyError, TypeError) as e:
+        logger.debug("Trace checkpoint is stale: %s", e)
+        return None
+
+    logger.debug("Resuming trace capture from checkpoint %s", state_file)
+    return state
+
+
+def _save_trace_state(
+    run_dir: Path,
+    session_id: str,
+    trace_file: Path,
+    sections: List[list],
+    offsets: dict[str, int],
+) -> None:
+    """Write the incremental capture checkpoint next to trace.md (non-fatal)."""
+    files = {}
+    for path, offset in offsets.items():
+        try:
+            files[path] = {"offset": offset, "ino": os.stat(path).st_ino}
+        except OSError:
+            continue
+
+    try:
+        state = {
+            "version": TRACE_STATE_VERSION,
+            "session_id": session_id,
+            "trace_size": content_size(trace_file),
+            "sections": sections,
+            "files": files,
+        }
+        (run_dir / TRACE_STATE_FILENAME).write_text(json.dumps(state), encoding="utf-8")
+    except (OSError, TraceStorageError) as e:
+        logger.warning("Failed to write trace checkpoint in %s: %s", run_dir, e)
+
+
+def _remove_trace_state(run_dir: Path) -> None:
+    """Delete the checkpoint before trace.md is modified, so a crash forces a full capture."""
+    try:
+        (run_dir / TRACE_STATE_FILENAME).unlink(missing_ok=True)
     except OSError as e:
-        raise TraceCaptureError(f"Failed to write trace file {trace_file}: {e}") from e
+        raise TraceCaptureError(f"Failed to remove trace checkpoint in {run_dir}: {e}") from e
+
+
+def _append_to_trace(
+    trace_file: Path,
+    sections: List[list],
+    new_messages: dict[str, List[dict]],
+) -> List[list]:
+    """Splice newly captured messages into an existing trace.md.
+
+    New messages go at the end of their agent's section; unseen subagents get
+    new sections at the end of the file. Only the bytes after the first
+    insertion point are rewritten, so the common case of new main-conversation
+    messages with no subagent sections, or of new subagents only, is a pure
+    append. Compressed traces are spliced in memory and rewritten whole.
+
+    Args:
+        trace_file: Path to the existing trace.md
+        sections: Checkpointed [agent_id, end_offset] pairs
+        new_messages: New messages grouped by agent ID
+
+    Returns:
+        Updated [agent_id, end_offset] pairs
+
+    Raises:
+        TraceCaptureError: If trace.md cannot be updated
+    """
+    new_messages = {agent_id: msgs for agent_id, msgs in new_messages.items() if msgs}
+    if not new_messages:
+        logger.debug("No new messages since last capture")
+        return sections
+
+    known = [agent_id for agent_id, _ in sections]
+    first_changed = next(
+        (i for i, agent_id in enumerate(known) if agent_id in new_messages), len(sections)
+    )
+    insert_at = sections[first_changed][1] if first_changed < len(sections) else sections[-1][1]
+
+    _remove_trace_state(trace_file.parent)
+    _remove_sidecar_index(trace_file)
+    compression = stored_compression(trace_file)
+    try:
+        if compression is None:
+            with trace_file.open("r+b") as f:
+                f.seek(insert_at)
+                new_tail, updated = _splice_sections(
+                    f.read(), insert_at, sections, first_changed, new_messages
+                )
+                f.seek(insert_at)
+                f.write(new_tail)
+                f.truncate()
+        else:
+            # Compressed traces cannot be patched in place; splice in memory
+            data = read_trace_bytes(trace_file)
+            new_tail, updated = _splice_sections(
+                data[insert_at:], insert_at, sections, first_changed, new_messages
+            )
+            write_trace_bytes(trace_file, data[:insert_at] + new_tail, compression)
+    except (OSError, TraceStorageError) as e:
+        raise TraceCaptureError(f"Failed to update trace file {trace_file}: {e}") from e
+
+    logger.debug("Appended %d new message group(s) to %s",
+                 len(new_messages), trace_file)
+    return updated
+
+
+def _splice_sections(
+    tail: bytes,
+    insert_at: int,
+    sections: List[list],
+    first_changed: int,
+    new_messages: dict[str, List[dict]],
+) -> Tuple[bytes, List[list]]:
+    """Build the bytes that replace a trace from insert_at onward.
+
+    Args:
+        tail: Existing trace bytes from insert_at to the end
+        insert_at: Offset of the first insertion point
+        sections: Checkpointed [agent_id, end_offset] pairs
+        first_changed: Index of the first section receiving new messages
+        new_messages: Non-empty new message lists grouped by agent ID
+
+    Returns:
+        (replacement tail bytes, updated [agent_id, end_offset] pairs)
+    """
+    known = {agent_id for agent_id, _ in sections}
+    parts: List[bytes] = []
+    updated = [list(section) for section in sections[:first_changed]]
+    written = 0
+    previous_end = insert_at
+    for i in range(first_changed, len(sections)):
+        agent_id, end = sections[i]
+        if i > first_changed:
+            # Old bytes: separator plus the section's existing content
+            parts.append(tail[previous_end - insert_at:end - insert_at])
+            written += end - previous_end
+        if agent_id in new_messages:
+            added = ("\n" + "\n".join(_render_messages(new_messages[agent_id]))).encode("utf-8")
+            parts.append(added)
+            written += len(added)
+        updated.append([agent_id, insert_at + written])
+        previous_end = end
+
+    for agent_id, messages in new_messages.items():
+        if agent_id in known:
+            continue
+        lines = _render_subagent_heading(agent_id) + _render_messages(messages)
+        added = ("\n" + "\n".join(lines)).encode("utf-8")
+        parts.append(added)
+        written += len(added)
+        updated.append([agent_id, insert_at + written])
+
+    return b"".join(parts), updated
@@ -0,0 +1,413 @@
+"""Persistent index of Claude Code project folders for trace capture.
+
+Trace capture needs to map a worktree path (and optionally a session ID) to
+the Claude Code project folder under ~/.claude/projects/ and the JSONL files
+inside it. Scanning that directory is slow when it holds thousands of
+folders, so this module keeps an on-disk index at ~/.weft/trace_index.json.
+
+Index structure:
+{
+  "version": 1,
+  "root_mtime_ns": <mtime of ~/.claude/projects or null>,
+  "projects": {
+    "<folder name>": {
+      "dirs": {"<relative dir>": <mtime_ns or null>, ...},
+      "files": {"<relative path>.jsonl": {"cwd": "...", "session_id": "..."} | null}
+    }
+  }
+}
+
+Invalidation relies on directory mtimes: adding or removing a file updates
+the mtime of its parent directory, so a folder is rescanned only when one of
+its recorded directories changed. File headers (the cwd and sessionId of the
+first JSONL line) never change once written, so they are reused across
+rescans. Appending to a JSONL file does not invalidate anything.
+
+WARNING: Like trace_capture.py, this relies on undocumented Claude Code
+internals. See docs/adr/001-trace-capture-claude-dependency.md for details.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the on-disk layout changes; older indexes are discarded
+INDEX_VERSION = 1
+
+# Directory mtimes this close to "now" are not trusted, because a file created
+# within the same timestamp tick after our scan would not change the mtime
+RACY_MTIME_SECONDS = 2.0
+
+
+def get_claude_projects_dir() -> Path:
+    """Get the Claude Code projects directory (~/.claude/projects)."""
+    return Path.home() / ".claude" / "projects"
+
+
+def get_trace_index_path() -> Path:
+    """Get the trace index file path (~/.weft/trace_index.json)."""
+    return Path.home() / ".weft" / "trace_index.json"
+
+
+def expected_folder_name(worktree_path: Path) -> str:
+    """Convert a worktree path to Claude Code's project folder name.
+
+    Claude Code strips leading /, then replaces /, ., _ with -, then prefixes with -
+    Example: /home/user/weft/.weft/worktrees/foo -> -home-user-weft--weft-worktrees-foo
+
+    Args:
+        worktree_path: Path to the worktree directory
+
+    Returns:
+        Expected project folder name
+    """
+    worktree_str = str(worktree_path.resolve())
+    return "-" + worktree_str.lstrip("/").replace("/", "-").replace(".", "-").replace("_", "-")
+
+
+def read_jsonl_header(jsonl_file: Path) -> Optional[dict]:
+    """Read the cwd and sessionId from the first line of a JSONL file.
+
+    Args:
+        jsonl_file: Path to the JSONL file
+
+    Returns:
+        Dict with "cwd" and "session_id" keys (empty strings when the fields
+        are absent), or None if the first line is missing, incomplete or
+        invalid. None results are not cached, so the header is re-read later.
+    """
+    try:
+        with jsonl_file.open("rb") as f:
+            first_line = f.readline()
+    except OSError as e:
+        logger.debug("Failed to read JSONL header %s: %s", jsonl_file, e)
+        return None
+
+    # An unterminated line may still be in the middle of being written
+    if not first_line.endswith(b"\n"):
+        return None
+
+    try:
+        data = json.loads(first_line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        logger.debug("Invalid JSON on first line of %s", jsonl_file)
+        return None
+
+    if not isinstance(data, dict):
+        return None
+
+    return {
+        "cwd": str(data.get("cwd", "")),
+        "session_id": str(data.get("sessionId", "")),
+    }
+
+
+def _stable_mtime_ns(path: Path, now: float) -> Optional[int]:
+    """Return a directory's mtime, or None if it is too recent to trust."""
+    mtime_ns = os.stat(path).st_mtime_ns
+    if now - mtime_ns / 1e9 < RACY_MTIME_SECONDS:
+        return None
+    return mtime_ns
+
+
+def _entry_matches(entry: dict, worktree_str: str, session_id: Optional[str]) -> bool:
+    """Check whether any file header in an index entry matches the cwd or session ID."""
+    for header in entry["files"].values():
+        if not header:
+            continue
+        if header["cwd"] == worktree_str or (session_id and header["session_id"] == session_id):
+            return True
+    return False
+
+
+class ProjectIndex:
+    """Persistent, incrementally updated index of Claude Code project folders."""
+
+    def __init__(self, projects_dir: Path, index_path: Path, data: Optional[dict] = None):
+        """Initialize the index.
+
+        Args:
+            projects_dir: Claude Code projects directory (~/.claude/projects)
+            index_path: Path of the persisted index file
+            data: Previously persisted index data, or None for an empty index
+        """
+        self._projects_dir = projects_dir
+        self._index_path = index_path
+        self._data = data if data is not None else self._empty()
+        self._dirty = False
+
+    @staticmethod
+    def _empty() -> dict:
+        return {"version": INDEX_VERSION, "root_mtime_ns": None, "projects": {}}
+
+    @classmethod
+    def load(
+        cls,
+        projects_dir: Optional[Path] = None,
+        index_path: Optional[Path] = None,
+    ) -> "ProjectIndex":
+        """Load the persisted index, starting empty if it is missing or invalid.
+
+        Args:
+            projects_dir: Claude Code projects directory (default: ~/.claude/projects)
+            index_path: Index file path (default: ~/.weft/trace_index.json)
+
+        Returns:
+            ProjectIndex instance
+        """
+        projects_dir = projects_dir or get_claude_projects_dir()
+        index_path = index_path or get_trace_index_path()
+
+        data = None
+        try:
+            raw = json.loads(index_path.read_text(encoding="utf-8"))
+            if isinstance(raw, dict) and raw.get("version") == INDEX_VERSION:
+                data = raw
+            else:
+                logger.debug("Discarding trace index with unexpected version: %s", index_path)
+        except FileNotFoundError:
+            logger.debug("No trace index at %s", index_path)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.debug("Discarding unreadable trace index %s: %s", index_path, e)
+
+        return cls(projects_dir, index_path, data)
+
+    def save(self) -> None:
+        """Persist the index if it changed.
+
+        The file is written atomically (temp file + rename). Failures are
+        logged and ignored because the index is only an optimization.
+        """
+        if not self._dirty:
+            return
+
+        try:
+            self._index_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self._index_path.parent, prefix=".trace_index_", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self._data, f)
+                os.replace(tmp_name, self._index_path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            logger.warning("Failed to save trace index %s: %s", self._index_path, e)
+            return
+
+        self._dirty = False
+        logger.debug("Saved trace index to %s", self._index_path)
+
+    def find_folder(self, worktree_path: Path, session_id: Optional[str] = None) -> Optional[Path]:
+        """Find the project folder for a worktree or session.
+
+        Tries, in order:
+        1. The folder named after the worktree path (only that folder is refreshed)
+        2. Already-indexed folders whose files match the worktree cwd or session ID
+        3. A refresh of all stale folders, then the same match
+
+        Args:
+            worktree_path: Path to the worktree directory
+            session_id: Optional session ID to match against JSONL headers
+
+        Returns:
+            Path to the project folder, or None if not found
+        """
+        if not self._projects_dir.is_dir():
+            logger.debug("Claude projects directory not found: %s", self._projects_dir)
+            return None
+
+        worktree_str = str(worktree_path.resolve())
+        folder_name = expected_folder_name(worktree_path)
+        logger.debug("Looking up project folder %s in trace index", folder_name)
+
+        entry = self._refresh_folder(self._projects_dir / folder_name)
+        if entry is not None and entry["files"]:
+            logger.debug("Found project folder (exact match): %s", folder_name)
+            return self._projects_dir / folder_name
+
+        # Headers never change, so a cached match only needs its folder refreshed
+        for name in self._matching_folders(worktree_str, session_id):
+            entry = self._refresh_folder(self._projects_dir / name)
+            if entry is not None and _entry_matches(entry, worktree_str, session_id):
+                logger.debug("Found project folder (indexed match): %s", name)
+                return self._projects_dir / name
+
+        self._refresh_all()
+        for name in self._matching_folders(worktree_str, session_id):
+            logger.debug("Found project folder (refreshed match): %s", name)
+            return self._projects_dir / name
+
+        logger.debug("No project folder found in trace index")
+        return None
+
+    def session_files(self, folder: Path) -> list[Path]:
+        """List JSONL files in a project folder, sorted by modification time.
+
+        Args:
+            folder: Project folder path
+
+        Returns:
+            JSONL file paths sorted by mtime (oldest first)
+        """
+        entry = self._refresh_folder(folder)
+        if entry is None:
+            return []
+
+        files_with_mtime = []
+        for rel_path in entry["files"]:
+            path = folder / rel_path
+            try:
+                files_with_mtime.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+
+        files_with_mtime.sort(key=lambda item: item[0])
+        return [path for _, path in files_with_mtime]
+
+    def match_session(self, folder: Path, worktree_path: Path) -> Optional[str]:
+        """Find the session ID whose JSONL header cwd matches the worktree.
+
+        Equivalent to trace_capture.match_session_files, but uses cached
+        headers instead of opening every file.
+
+        Args:
+            folder: Project folder path
+            worktree_path: Path to the worktree directory
+
+        Returns:
+            Session ID of the oldest matching file, or None
+        """
+        entry = self._refresh_folder(folder)
+        if entry is None:
+            return None
+
+        worktree_str = str(worktree_path.resolve())
+        for path in self.session_files(folder):
+            header = entry["files"].get(str(path.relative_to(folder)))
+            if header and header["cwd"] == worktree_str and header["session_id"]:
+                logger.debug("Matched session %s in file %s", header["session_id"], path)
+                return header["session_id"]
+
+        return None
+
+    def _matching_folders(self, worktree_str: str, session_id: Optional[str]) -> list[str]:
+        """Return indexed folder names with a file matching the cwd or session ID."""
+        return [
+            name
+            for name, entry in self._data["projects"].items()
+            if _entry_matches(entry, worktree_str, session_id)
+        ]
+
+    def _refresh_all(self) -> None:
+        """Refresh every stale folder and drop folders that no longer exist."""
+        now = time.time()
+        try:
+            root_mtime_ns = _stable_mtime_ns(self._projects_dir, now)
+        except OSError:
+            return
+
+        projects = self._data["projects"]
+        if root_mtime_ns is None or root_mtime_ns != self._data["root_mtime_ns"]:
+            try:
+                names = {entry.name for entry in os.scandir(self._projects_dir) if entry.is_dir()}
+            except OSError as e:
+                logger.debug("Failed to list %s: %s", self._projects_dir, e)
+                return
+            for removed in set(projects) - names:
+                del projects[removed]
+                self._dirty = True
+            if root_mtime_ns != self._data["root_mtime_ns"]:
+                self._data["root_mtime_ns"] = root_mtime_ns
+                self._dirty = True
+        else:
+            names = set(projects)
+
+        for name in names:
+            self._refresh_folder(self._projects_dir / name)
+
+    def _refresh_folder(self, folder: Path) -> Optional[dict]:
+        """Return an up-to-date index entry for a folder, rescanning if stale.
+
+        Args:
+            folder: Project folder path
+
+        Returns:
+            Index entry dict, or None if the folder does not exist
+        """
+        projects = self._data["projects"]
+        entry = projects.get(folder.name)
+
+        if entry is not None and self._is_fresh(folder, entry):
+            self._fill_missing_headers(folder, entry)
+            return entry
+
+        if not folder.is_dir():
+            if entry is not None:
+                del projects[folder.name]
+                self._dirty = True
+            return None
+
+        entry = self._scan_folder(folder, entry)
+        projects[folder.name] = entry
+        self._dirty = True
+        return entry
+
+    @staticmethod
+    def _is_fresh(folder: Path, entry: dict) -> bool:
+        """Check whether none of the folder's recorded directories changed."""
+        for rel_dir, mtime_ns in entry["dirs"].items():
+            if mtime_ns is None:
+                return False
+            try:
+                if os.stat(folder / rel_dir).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _fill_missing_headers(self, folder: Path, entry: dict) -> None:
+        """Retry reading headers that were incomplete at the last scan."""
+        for rel_path, header in entry["files"].items():
+            if header is None:
+                header = read_jsonl_header(folder / rel_path)
+                if header is not None:
+                    entry["files"][rel_path] = header
+                    self._dirty = True
+
+    def _scan_folder(self, folder: Path, previous: Optional[dict]) -> dict:
+        """Walk a folder and build its index entry, reusing known headers."""
+        logger.debug("Indexing project folder %s", folder.name)
+        now = time.time()
+        previous_files = previous["files"] if previous else {}
+        dirs: dict[str, Optional[int]] = {}
+        files: dict[str, Optional[dict]] = {}
+
+        for dirpath, _dirnames, filenames in os.walk(folder):
+            rel_dir = os.path.relpath(dirpath, folder)
+            try:
+                dirs[rel_dir] = _stable_mtime_ns(Path(dirpath), now)
+            except OSError:
+                dirs[rel_dir] = None
+            for filename in filenames:
+                if not filename.endswith(".jsonl"):
+                    continue
+                rel_path = os.path.normpath(os.path.join(rel_dir, filename))
+                header = previous_files.get(rel_path)
+                if header is None:
+                    header = read_jsonl_header(folder / rel_path)
+                files[rel_path] = header
+
+        logger.debug("Indexed %d JSONL file(s) in %s", len(files), folder.name)
+        return {"dirs": dirs, "files": files}
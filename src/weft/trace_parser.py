@@ -14,9 +14,11 @@ from __future__ import annotations
 import json
 import re
 from dataclasses import dataclass
-from typing import Optional
+from pathlib import Path
+from typing import Iterable, Optional
 
 from .logging_config import get_logger
+from .trace_storage import TraceStorageError, content_size, open_trace
 
 logger = get_logger(__name__)
 
@@ -46,11 +48,470 @@ class TraceMetadata:
     git_branch: str
 
 
+@dataclass
+class ParsedTrace:
+    """Everything the single-pass parser extracts from a trace."""
+    metadata: TraceMetadata
+    tool_calls: list[ToolCall]
+    tool_results: list[ToolResult]
+    subagent_sections: dict[str, str]
+    errors: list[str]
+
+
 class TraceParseError(Exception):
     """Raised when trace parsing fails."""
     pass
 
 
+# Header fields written by trace_capture.generate_markdown, in output order
+_METADATA_FIELDS = (
+    ("session_id", "**Session ID**:"),
+    ("command", "**Command**:"),
+    ("timestamp", "**Timestamp**:"),
+    ("worktree", "**Worktree**:"),
+    ("git_branch", "**Git Branch**:"),
+)
+
+_MESSAGE_HEADER = re.compile(r'^### \[([^\]]+)\]')
+_SUBAGENT_HEADER = re.compile(r'^## Subagent: agent-(\S+)\s*$')
+_TOOL_CALL = re.compile(r'^\*\*Tool: (.+?)\*\*\s*$')
+_TOOL_RESULT = re.compile(r'^\*\*Tool Result\*\* \(ID: ([^\)]+)\)')
+_ERROR_MESSAGE = re.compile(r'(?:Error|ERROR|Failed|FAILED):\s*.{10,200}')
+_PYTEST_FAILURE = re.compile(r'FAILED\s+\S+::\S+')
+
+# Only the section headers trace_capture emits end a subagent section; headings
+# inside assistant text (e.g. "## Issues Found") belong to the section
+_STRUCTURAL_HEADERS = ("## Session Metadata", "## Main Conversation")
+
+# Per-category caps on collected errors
+_MAX_TRACEBACKS = 5
+_MAX_ERROR_MESSAGES = 10
+_MAX_PYTEST_FAILURES = 5
+_MAX_TOOL_ERRORS = 5
+
+# Parser states
+_TEXT = 0
+_EXPECT_TOOL_JSON = 1
+_TOOL_JSON = 2
+_EXPECT_RESULT_FENCE = 3
+_RESULT = 4
+_EXPECT_THINKING_FENCE = 5
+_THINKING = 6
+
+# Structured sidecar written next to each trace by trace_capture: an NDJSON
+# file with one record per rendered message, and an index with byte offsets
+# of tool calls (into the NDJSON) and subagent sections (into the markdown),
+# plus the error scan state at the end of each section
+SIDECAR_VERSION = 2
+SIDECAR_MESSAGES_SUFFIX = ".ndjson"
+SIDECAR_INDEX_SUFFIX = ".index.json"
+
+
+class ErrorScanner:
+    """Collects error spans from trace lines fed in document order.
+
+    Lets trace_capture record the errors parse_trace would find while it
+    streams the markdown out, without parsing it back.
+    """
+
+    def __init__(self) -> None:
+        self.tracebacks: list[str] = []
+        self.error_messages: list[str] = []
+        self.pytest_failures: list[str] = []
+        self.tool_errors: list[str] = []
+        self._traceback_lines: Optional[list[str]] = None
+        self._pytest_lines: Optional[list[str]] = None
+        self._tool_error_lines: Optional[list[str]] = None
+
+    def feed(self, line: str) -> None:
+        """Scan one line (without its trailing newline)."""
+        if self._traceback_lines is not None:
+            if not line or line.startswith("###"):
+                self.tracebacks.append("\n".join(self._traceback_lines))
+                self._traceback_lines = None
+            else:
+                self._traceback_lines.append(line)
+        if self._traceback_lines is None and len(self.tracebacks) < _MAX_TRACEBACKS:
+            tb_start = line.find("Traceback (most recent call last):")
+            if tb_start != -1:
+                self._traceback_lines = [line[tb_start:]]
+
+        if self._pytest_lines is not None:
+            if line.startswith(("FAILED", "PASSED", "=====")):
+                self.pytest_failures.append("\n".join(self._pytest_lines))
+                self._pytest_lines = None
+            else:
+                self._pytest_lines.append(line)
+        if self._pytest_lines is None and len(self.pytest_failures) < _MAX_PYTEST_FAILURES:
+            pytest_match = _PYTEST_FAILURE.search(line)
+            if pytest_match:
+                self._pytest_lines = [line[pytest_match.start():]]
+
+        if self._tool_error_lines is not None:
+            if not line or line.startswith("```"):
+                if self._tool_error_lines:
+                    self.tool_errors.append("\n".join(self._tool_error_lines))
+                self._tool_error_lines = None
+            else:
+                self._tool_error_lines.append(line)
+        elif "tool_use_error" in line and len(self.tool_errors) < _MAX_TOOL_ERRORS:
+            self._tool_error_lines = []
+
+        if len(self.error_messages) < _MAX_ERROR_MESSAGES and ":" in line:
+            for match in _ERROR_MESSAGE.finditer(line):
+                self.error_messages.append(match.group(0))
+
+    def feed_text(self, text: str) -> None:
+        """Scan a rendered chunk that may contain embedded newlines."""
+        for line in text.split("\n"):
+            self.feed(line)
+
+    def state(self) -> dict:
+        """Return a JSON-serializable snapshot of the scan so far.
+
+        A scanner restored with from_state continues exactly where this one
+        was, so an appended trace is scanned from its first change onward.
+        """
+        return {
+            "tracebacks": list(self.tracebacks),
+            "error_messages": list(self.error_messages),
+            "pytest_failures": list(self.pytest_failures),
+            "tool_errors": list(self.tool_errors),
+            "open_spans": [
+                None if lines is None else list(lines)
+                for lines in (self._traceback_lines, self._pytest_lines, self._tool_error_lines)
+            ],
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> ErrorScanner:
+        """Restore a scanner from a snapshot taken with state()."""
+        scanner = cls()
+        scanner.tracebacks = list(state["tracebacks"])
+        scanner.error_messages = list(state["error_messages"])
+        scanner.pytest_failures = list(state["pytest_failures"])
+        scanner.tool_errors = list(state["tool_errors"])
+        scanner._traceback_lines, scanner._pytest_lines, scanner._tool_error_lines = (
+            None if lines is None else list(lines) for lines in state["open_spans"]
+        )
+        return scanner
+
+    def finish(self) -> list[str]:
+        """Close any open spans and return deduplicated, capped errors."""
+        if self._traceback_lines is not None:
+            self.tracebacks.append("\n".join(self._traceback_lines))
+            self._traceback_lines = None
+        if self._pytest_lines is not None:
+            self.pytest_failures.append("\n".join(self._pytest_lines))
+            self._pytest_lines = None
+        if self._tool_error_lines:
+            self.tool_errors.append("\n".join(self._tool_error_lines))
+        self._tool_error_lines = None
+
+        return _dedupe_errors(
+            self.tracebacks[:_MAX_TRACEBACKS]
+            + self.error_messages[:_MAX_ERROR_MESSAGES]
+            + self.pytest_failures[:_MAX_PYTEST_FAILURES]
+            + self.tool_errors[:_MAX_TOOL_ERRORS]
+        )
+
+
+def parse_trace(content: str) -> ParsedTrace:
+    """Parse a trace in a single linear pass.
+
+    A line-oriented state machine tracks the fenced blocks trace_capture
+    emits (tool call JSON, tool results, thinking), so headers and markers
+    inside tool output are never mistaken for trace structure. Metadata,
+    tool calls, tool results, subagent sections and error spans are all
+    collected in the same pass.
+
+    Args:
+        content: Full trace markdown content
+
+    Returns:
+        ParsedTrace with all extracted data
+    """
+    metadata: dict[str, str] = {}
+    tool_calls: list[ToolCall] = []
+    tool_results: list[ToolResult] = []
+    subagent_sections: dict[str, str] = {}
+
+    scanner = ErrorScanner()
+
+    state = _TEXT
+    timestamp: Optional[str] = None
+    pending_name = ""
+    block_lines: list[str] = []
+    section_id: Optional[str] = None
+    section_lines: list[str] = []
+
+    def close_section() -> None:
+        if section_id is not None:
+            subagent_sections[section_id] = "\n".join(section_lines).strip()
+
+    for line in content.split("\n"):
+        scanner.feed(line)
+
+        # --- Metadata (first occurrence of each field wins) ---
+        if "**" in line and len(metadata) < len(_METADATA_FIELDS):
+            for key, marker in _METADATA_FIELDS:
+                if key not in metadata:
+                    marker_pos = line.find(marker)
+                    if marker_pos != -1:
+                        value = line[marker_pos + len(marker):].strip()
+                        if value:
+                            metadata[key] = value
+
+        # --- Structure ---
+        if state == _TOOL_JSON:
+            if line.startswith("```"):
+                try:
+                    parameters = json.loads("\n".join(block_lines))
+                except (json.JSONDecodeError, ValueError):
+                    parameters = {}
+                if not isinstance(parameters, dict):
+                    parameters = {}
+                tool_calls.append(ToolCall(
+                    name=pending_name,
+                    parameters=parameters,
+                    timestamp=timestamp,
+                ))
+                state = _TEXT
+            else:
+                block_lines.append(line)
+        elif state == _RESULT:
+            if line.startswith("```"):
+                tool_results.append(ToolResult(
+                    tool_use_id=pending_name,
+                    content="\n".join(block_lines),
+                ))
+                state = _TEXT
+            else:
+                block_lines.append(line)
+        elif state == _THINKING:
+            if line.startswith("```"):
+                state = _TEXT
+        elif state == _EXPECT_TOOL_JSON and line == "```json":
+            state = _TOOL_JSON
+            block_lines = []
+        elif state == _EXPECT_RESULT_FENCE and line == "```":
+            state = _RESULT
+            block_lines = []
+        elif state == _EXPECT_THINKING_FENCE and line == "```":
+            state = _THINKING
+        else:
+            # Plain text, including a line that did not open an expected fence
+            state = _TEXT
+            if line.startswith("**Tool"):
+                tool_match = _TOOL_CALL.match(line)
+                if tool_match:
+                    pending_name = tool_match.group(1)
+                    state = _EXPECT_TOOL_JSON
+                else:
+                    result_match = _TOOL_RESULT.match(line)
+                    if result_match:
+                        pending_name = result_match.group(1)
+                        state = _EXPECT_RESULT_FENCE
+            elif line == "**Thinking:**":
+                state = _EXPECT_THINKING_FENCE
+            elif line.startswith("### ["):
+                header_match = _MESSAGE_HEADER.match(line)
+                if header_match:
+                    timestamp = header_match.group(1)
+            elif line.startswith("## "):
+                subagent_match = _SUBAGENT_HEADER.match(line)
+                if subagent_match:
+                    close_section()
+                    section_id = subagent_match.group(1)
+                    section_lines = []
+                    continue
+                if line.rstrip() in _STRUCTURAL_HEADERS:
+                    close_section()
+                    section_id = None
+                    continue
+
+        if section_id is not None:
+            section_lines.append(line)
+
+    close_section()
+    errors = scanner.finish()
+
+    parsed = ParsedTrace(
+        metadata=TraceMetadata(**{
+            key: metadata.get(key, "unknown") for key, _ in _METADATA_FIELDS
+        }),
+        tool_calls=tool_calls,
+        tool_results=tool_results,
+        subagent_sections=subagent_sections,
+        errors=errors,
+    )
+    logger.debug(
+        "Parsed trace: %d tool call(s), %d tool result(s), %d subagent section(s), %d error(s)",
+        len(tool_calls), len(tool_results), len(subagent_sections), len(errors),
+    )
+    return parsed
+
+
+def _dedupe_errors(errors: list[str]) -> list[str]:
+    """Deduplicate errors by their first 200 characters, preserving order."""
+    seen = set()
+    unique_errors = []
+    for error in errors:
+        error_normalized = error.strip()[:200]
+        if error_normalized not in seen:
+            seen.add(error_normalized)
+            unique_errors.append(error.strip())
+    return unique_errors
+
+
+def sidecar_paths(trace_path: Path) -> tuple[Path, Path]:
+    """Return the (messages, index) paths of a trace's structured sidecar.
+
+    Args:
+        trace_path: Path to the trace markdown file (e.g. trace.md)
+
+    Returns:
+        Tuple of NDJSON messages path and index path
+    """
+    return (
+        trace_path.with_suffix(SIDECAR_MESSAGES_SUFFIX),
+        trace_path.with_suffix(SIDECAR_INDEX_SUFFIX),
+    )
+
+
+def read_sidecar_index(trace_path: Path) -> Optional[dict]:
+    """Load a trace's sidecar index if it still describes the trace.
+
+    The index is valid only if its version matches and both the trace and
+    the NDJSON messages file are exactly the sizes recorded when it was
+    written. Legacy traces have no sidecar.
+
+    Args:
+        trace_path: Path to the trace markdown file
+
+    Returns:
+        Index dict, or None if the trace must be parsed from markdown
+    """
+    messages_path, index_path = sidecar_paths(trace_path)
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+        if (
+            index.get("version") != SIDECAR_VERSION
+            or content_size(trace_path) != index["trace_size"]
+            or messages_path.stat().st_size != index["messages_size"]
+        ):
+            logger.debug("Trace sidecar for %s is stale", trace_path)
+            return None
+    except FileNotFoundError:
+        return None
+    except (OSError, TraceStorageError, json.JSONDecodeError, AttributeError, KeyError) as e:
+        logger.debug("Ignoring unreadable trace sidecar for %s: %s", trace_path, e)
+        return None
+    return index
+
+
+def _read_sidecar_sections(trace_path: Path, index: dict) -> dict[str, str]:
+    """Slice subagent sections out of the trace using indexed byte ranges."""
+    sections: dict[str, str] = {}
+    with open_trace(trace_path) as f:
+        for agent_id, start, end in index["sections"]:
+            f.seek(start)
+            sections[agent_id] = f.read(end - start).decode("utf-8").strip()
+    return sections
+
+
+def _read_sidecar_records(messages_path: Path, offsets: Iterable[int]) -> dict[int, dict]:
+    """Read the NDJSON message records starting at the given byte offsets."""
+    records: dict[int, dict] = {}
+    with messages_path.open("rb") as f:
+        for offset in sorted(set(offsets)):
+            f.seek(offset)
+            records[offset] = json.loads(f.readline())
+    return records
+
+
+def _unique_records(entries: list, records: dict[int, dict]) -> list[dict]:
+    """Return the records referenced by [key, offset] index entries, once each, in order."""
+    seen: set[int] = set()
+    unique = []
+    for _, offset in entries:
+        if offset not in seen:
+            seen.add(offset)
+            unique.append(records[offset])
+    return unique
+
+
+def _content_blocks(record: dict, block_type: str) -> list[dict]:
+    """Return a record's content blocks of the given type."""
+    content = record.get("content")
+    if not isinstance(content, list):
+        return []
+    return [b for b in content if isinstance(b, dict) and b.get("type") == block_type]
+
+
+def load_trace_sidecar(trace_path: Path) -> Optional[ParsedTrace]:
+    """Build a ParsedTrace from a trace's structured sidecar.
+
+    Metadata and errors come straight from the index; tool calls and results
+    are decoded only from the NDJSON records the index points at; subagent
+    sections are sliced from the markdown by byte range. No markdown is
+    parsed.
+
+    Args:
+        trace_path: Path to the trace markdown file
+
+    Returns:
+        ParsedTrace, or None if the trace has no valid sidecar (legacy trace)
+    """
+    index = read_sidecar_index(trace_path)
+    if index is None:
+        return None
+
+    messages_path, _ = sidecar_paths(trace_path)
+    try:
+        records = _read_sidecar_records(
+            messages_path,
+            [offset for _, offset in index["tool_calls"]]
+            + [offset for _, offset in index["tool_results"]],
+        )
+        subagent_sections = _read_sidecar_sections(trace_path, index)
+        metadata = TraceMetadata(**{
+            key: index["metadata"].get(key) or "unknown" for key, _ in _METADATA_FIELDS
+        })
+    except (OSError, TraceStorageError, ValueError, KeyError, TypeError) as e:
+        logger.debug("Falling back to markdown parsing for %s: %s", trace_path, e)
+        return None
+
+    # Index entries are in document order; a message with several tool
+    # blocks appears once per block but is expanded only once
+    tool_calls: list[ToolCall] = []
+    for record in _unique_records(index["tool_calls"], records):
+        for block in _content_blocks(record, "tool_use"):
+            parameters = block.get("input")
+            tool_calls.append(ToolCall(
+                name=block.get("name", "unknown"),
+                parameters=parameters if isinstance(parameters, dict) else {},
+                timestamp=record.get("timestamp") or None,
+            ))
+
+    tool_results: list[ToolResult] = []
+    for record in _unique_records(index["tool_results"], records):
+        for block in _content_blocks(record, "tool_result"):
+            tool_results.append(ToolResult(
+                tool_use_id=block.get("tool_use_id", "unknown"),
+                content=str(block.get("content", "")),
+            ))
+
+    logger.debug("Loaded trace structure from sidecar for %s", trace_path)
+    return ParsedTrace(
+        metadata=metadata,
+        tool_calls=tool_calls,
+        tool_results=tool_results,
+        subagent_sections=subagent_sections,
+        errors=list(index["errors"]),
+    )
+
+
 def parse_trace_metadata(content: str) -> TraceMetadata:
     """Extract session metadata from the trace header.
 
@@ -58,49 +519,9 @@ def parse_trace_metadata(content: str) -> TraceMetadata:
         content: Full trace markdown content
 
     Returns:
-        TraceMetadata with extracted fields
-
-    Raises:
-        TraceParseError: If required metadata fields are missing
+        TraceMetadata with extracted fields ('unknown' for missing fields)
     """
-    metadata = {}
-
-    # Extract Session ID
-    session_match = re.search(r'\*\*Session ID\*\*:\s*(.+)', content)
-    if session_match:
-        metadata['session_id'] = session_match.group(1).strip()
-    else:
-        metadata['session_id'] = 'unknown'
-
-    # Extract Command
-    command_match = re.search(r'\*\*Command\*\*:\s*(.+)', content)
-    if command_match:
-        metadata['command'] = command_match.group(1).strip()
-    else:
-        metadata['command'] = 'unknown'
-
-    # Extract Timestamp
-    timestamp_match = re.search(r'\*\*Timestamp\*\*:\s*(.+)', content)
-    if timestamp_match:
-        metadata['timestamp'] = timestamp_match.group(1).strip()
-    else:
-        metadata['timestamp'] = 'unknown'
-
-    # Extract Worktree
-    worktree_match = re.search(r'\*\*Worktree\*\*:\s*(.+)', content)
-    if worktree_match:
-        metadata['worktree'] = worktree_match.group(1).strip()
-    else:
-        metadata['worktree'] = 'unknown'
-
-    # Extract Git Branch
-    branch_match = re.search(r'\*\*Git Branch\*\*:\s*(.+)', content)
-    if branch_match:
-        metadata['git_branch'] = branch_match.group(1).strip()
-    else:
-        metadata['git_branch'] = 'unknown'
-
-    return TraceMetadata(**metadata)
+    return parse_trace(content).metadata
 
 
 def parse_tool_calls(content: str) -> list[ToolCall]:
@@ -112,56 +533,15 @@ def parse_tool_calls(content: str) -> list[ToolCall]:
     { ... parameters ... }
     ```
 
+    Each call carries the timestamp of the message it appears in.
+
     Args:
         content: Full trace markdown content
 
     Returns:
         List of ToolCall objects
     """
-    tool_calls = []
-
-    # Pattern to match tool calls: **Tool: Name** followed by json block
-    # The timestamp is on the preceding ### line
-    pattern = r'### \[([^\]]+)\][^\n]*\n\n(?:.*?)\*\*Tool: (\w+)\*\*\n```json\n(.*?)\n```'
-    matches = re.findall(pattern, content, re.DOTALL)
-
-    for timestamp, tool_name, params_json in matches:
-        try:
-            parameters = json.loads(params_json)
-        except (json.JSONDecodeError, ValueError):
-            parameters = {}
-
-        tool_calls.append(ToolCall(
-            name=tool_name,
-            parameters=parameters,
-            timestamp=timestamp,
-        ))
-
-    # Also match tool calls without preceding timestamp context
-    simple_pattern = r'\*\*Tool: (\w+)\*\*\n```json\n(.*?)\n```'
-    simple_matches = re.findall(simple_pattern, content, re.DOTALL)
-
-    # Only add if we haven't already captured it
-    for tool_name, params_json in simple_matches:
-        try:
-            parameters = json.loads(params_json)
-        except (json.JSONDecodeError, ValueError):
-            parameters = {}
-
-        # Check if we already have this tool call (by comparing parameters)
-        already_exists = any(
-            tc.name == tool_name and tc.parameters == parameters
-            for tc in tool_calls
-        )
-        if not already_exists:
-            tool_calls.append(ToolCall(
-                name=tool_name,
-                parameters=parameters,
-                timestamp=None,
-            ))
-
-    logger.debug("Parsed %d tool call(s)", len(tool_calls))
-    return tool_calls
+    return parse_trace(content).tool_calls
 
 
 def parse_tool_results(content: str) -> list[ToolResult]:
@@ -181,54 +561,35 @@ def parse_tool_results(content: str) -> list[ToolResult]:
     Returns:
         List of ToolResult objects
     """
-    tool_results = []
-
-    # Pattern to match tool results
-    pattern = r'\*\*Tool Result\*\* \(ID: ([^\)]+)\)\n```\n(.*?)\n```'
-    matches = re.findall(pattern, content, re.DOTALL)
+    return parse_trace(content).tool_results
 
-    for tool_use_id, result_content in matches:
-        tool_results.append(ToolResult(
-            tool_use_id=tool_use_id,
-            content=result_content,
-        ))
 
-    logger.debug("Parsed %d tool result(s)", len(tool_results))
-    return tool_results
-
-
-def parse_subagent_sections(content: str) -> dict[str, str]:
+def parse_subagent_sections(content: str, trace_path: Optional[Path] = None) -> dict[str, str]:
     """Extract subagent conversation sections from the trace.
 
     Each subagent section starts with:
     ## Subagent: agent-<id>
 
+    and runs until the next section header emitted by trace_capture.py.
+
+    When trace_path has a valid structured sidecar, sections are sliced from
+    the file by their indexed byte ranges instead of parsing content.
+
     Args:
         content: Full trace markdown content
+        trace_path: Optional path to the trace file, used to locate its sidecar
 
     Returns:
         Dictionary mapping agent ID to section content
     """
-    subagent_sections = {}
-
-    # Split on subagent headers
-    # Pattern: ## Subagent: agent-<id>
-    pattern = r'## Subagent: agent-([a-f0-9]+)\n'
-    parts = re.split(pattern, content)
-
-    # parts will be: [main_content, agent_id_1, section_1, agent_id_2, section_2, ...]
-    if len(parts) > 1:
-        # Process pairs of (agent_id, section_content)
-        for i in range(1, len(parts), 2):
-            if i + 1 < len(parts):
-                agent_id = parts[i]
-                section_content = parts[i + 1]
-                # Extract just the section until the next ## header
-                next_section = re.split(r'\n## ', section_content, maxsplit=1)
-                subagent_sections[agent_id] = next_section[0].strip()
-
-    logger.debug("Parsed %d subagent section(s)", len(subagent_sections))
-    return subagent_sections
+    if trace_path is not None:
+        index = read_sidecar_index(trace_path)
+        if index is not None:
+            try:
+                return _read_sidecar_sections(trace_path, index)
+            except (OSError, TraceStorageError, ValueError, KeyError, TypeError) as e:
+                logger.debug("Falling back to markdown parsing for %s: %s", trace_path, e)
+    return parse_trace(content).subagent_sections
 
 
 def detect_errors(content: str) -> list[str]:
@@ -246,39 +607,7 @@ def detect_errors(content: str) -> list[str]:
     Returns:
         List of error message strings
     """
-    errors = []
-
-    # Python tracebacks
-    traceback_pattern = r'Traceback \(most recent call last\):.*?(?=\n\n|\n###|\Z)'
-    traceback_matches = re.findall(traceback_pattern, content, re.DOTALL)
-    errors.extend(traceback_matches[:5])  # Limit to first 5
-
-    # Error messages
-    error_pattern = r'(?:Error|ERROR|Failed|FAILED):\s*.{10,200}'
-    error_matches = re.findall(error_pattern, content)
-    errors.extend(error_matches[:10])  # Limit to first 10
-
-    # pytest failures
-    pytest_pattern = r'FAILED\s+\S+::\S+.*?(?=\n(?:FAILED|PASSED|=====|\Z))'
-    pytest_matches = re.findall(pytest_pattern, content, re.DOTALL)
-    errors.extend(pytest_matches[:5])  # Limit to first 5
-
-    # Tool errors (from tool results)
-    tool_error_pattern = r'tool_use_error[^\n]*\n(.*?)(?=\n\n|\n```|\Z)'
-    tool_error_matches = re.findall(tool_error_pattern, content, re.DOTALL)
-    errors.extend(tool_error_matches[:5])  # Limit to first 5
-
-    # Deduplicate while preserving order
-    seen = set()
-    unique_errors = []
-    for error in errors:
-        error_normalized = error.strip()[:200]  # Use first 200 chars for dedup
-        if error_normalized not in seen:
-            seen.add(error_normalized)
-            unique_errors.append(error.strip())
-
-    logger.debug("Detected %d unique error(s)", len(unique_errors))
-    return unique_errors
+    return parse_trace(content).errors
 
 
 def count_tools_by_type(tool_calls: list[ToolCall]) -> dict[str, int]:
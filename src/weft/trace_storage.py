@@ -0,0 +1,403 @@
+"""Transparent compressed storage for trace files.
+
+Traces (session trace.md and training data code_trace.md) are addressed by
+their logical markdown path everywhere in weft. On disk a trace may be
+stored as-is or compressed next to that path:
+
+    trace.md        # uncompressed
+    trace.md.gz     # gzip
+    trace.md.zst    # zstd (requires the optional `zstandard` package)
+
+Writers pick the format from the [traces] section of ~/.weft/config.toml
+(see config.get_trace_compression) and remove any other stored variant, so
+exactly one exists. Readers resolve whichever variant is present.
+
+Streamed zstd traces end with a skippable frame recording their
+uncompressed size, which a streamed frame's header cannot hold, so
+content_size never has to decompress a trace. Decompressors skip it.
+"""
+
+from __future__ import annotations
+
+import gzip
+import shutil
+import struct
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+from .logging_config import get_logger
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None  # type: ignore[assignment]
+
+logger = get_logger(__name__)
+
+# Stored-file suffix for each supported compression format
+COMPRESSION_SUFFIXES = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+# gzip level 6 is zlib's default trade-off; traces are written once, read often
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+# Buffer for streamed trace writes
+WRITE_BUFFER_SIZE = 256 * 1024
+
+# Skippable zstd frame appended to streamed traces: magic, payload length
+# (8), uncompressed content size
+_ZSTD_SIZE_FRAME = struct.Struct("<IIQ")
+_ZSTD_SIZE_FRAME_MAGIC = 0x184D2A5E
+
+
+class TraceStorageError(Exception):
+    """Raised when a stored trace cannot be read or written."""
+    pass
+
+
+def is_available(compression: str) -> bool:
+    """Return True if the given compression format can be used here."""
+    if compression == "zstd":
+        return zstandard is not None
+    return compression in COMPRESSION_SUFFIXES
+
+
+def _variants(path: Path) -> list[Path]:
+    """Return every stored form of a logical trace path, uncompressed first."""
+    return [path] + [
+        path.with_name(path.name + suffix) for suffix in COMPRESSION_SUFFIXES.values()
+    ]
+
+
+def _compression_of(stored_path: Path) -> Optional[str]:
+    """Return the compression format of a stored path, or None if uncompressed."""
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if stored_path.name.endswith(suffix):
+            return compression
+    return None
+
+
+def find_trace(path: Path) -> Optional[Path]:
+    """Find the stored file for a logical trace path.
+
+    Args:
+        path: Logical trace path (e.g. .../code_trace.md)
+
+    Returns:
+        Path of the stored (possibly compressed) file, or None if no variant exists
+    """
+    for candidate in _variants(path):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def trace_exists(path: Path) -> bool:
+    """Return True if any stored variant of the logical trace path exists."""
+    return find_trace(path) is not None
+
+
+def stored_compression(path: Path) -> Optional[str]:
+    """Return the compression format a logical trace is stored in.
+
+    Returns:
+        "gzip", "zstd", or None if the trace is uncompressed or missing
+    """
+    stored = find_trace(path)
+    return _compression_of(stored) if stored is not None else None
+
+
+def open_trace(path: Path) -> BinaryIO:
+    """Open a stored trace for binary reading, decompressing transparently.
+
+    The returned file object supports seek (emulated by decompression for
+    compressed traces).
+
+    Args:
+        path: Logical trace path
+
+    Returns:
+        Readable binary file object
+
+    Raises:
+        FileNotFoundError: If no stored variant exists
+        TraceStorageError: If the trace is zstd-compressed and zstandard is missing
+    """
+    stored = find_trace(path)
+    if stored is None:
+        raise FileNotFoundError(f"Trace not found: {path}")
+
+    compression = _compression_of(stored)
+    if compression == "gzip":
+        return gzip.open(stored, "rb")
+    if compression == "zstd":
+        if zstandard is None:
+            raise TraceStorageError(
+                f"Trace {stored} is zstd-compressed but the 'zstandard' package is not installed"
+            )
+        return zstandard.open(stored, "rb")
+    return stored.open("rb")
+
+
+def _decompression_errors() -> tuple[type[Exception], ...]:
+    errors: tuple[type[Exception], ...] = (EOFError, gzip.BadGzipFile, zlib.error)
+    if zstandard is not None:
+        errors += (zstandard.ZstdError,)
+    return errors
+
+
+def read_trace_bytes(path: Path) -> bytes:
+    """Read a stored trace's uncompressed content.
+
+    Args:
+        path: Logical trace path
+
+    Returns:
+        Uncompressed trace bytes
+
+    Raises:
+        FileNotFoundError: If no stored variant exists
+        TraceStorageError: If the stored file cannot be decompressed
+    """
+    try:
+        with open_trace(path) as f:
+            return f.read()
+    except _decompression_errors() as e:
+        raise TraceStorageError(f"Corrupt compressed trace {path}: {e}") from e
+
+
+def read_trace_text(path: Path) -> str:
+    """Read a stored trace's uncompressed content as UTF-8 text."""
+    return read_trace_bytes(path).decode("utf-8")
+
+
+def trace_mtime(path: Path) -> float:
+    """Return the modification time of a stored trace.
+
+    Raises:
+        FileNotFoundError: If no stored variant exists
+    """
+    stored = find_trace(path)
+    if stored is None:
+        raise FileNotFoundError(f"Trace not found: {path}")
+    return stored.stat().st_mtime
+
+
+def content_size(path: Path) -> int:
+    """Return the uncompressed size of a stored trace without decompressing it.
+
+    Compressed traces written here are single gzip members (whose trailer
+    records the size modulo 2**32) or single zstd frames, whose header
+    records the size unless the frame was streamed; streamed frames are
+    followed by a skippable frame recording it. Only zstd traces streamed
+    by older versions are decompressed to be measured.
+
+    Args:
+        path: Logical trace path
+
+    Returns:
+        Uncompressed size in bytes
+
+    Raises:
+        FileNotFoundError: If no stored variant exists
+        TraceStorageError: If the size cannot be determined
+    """
+    stored = find_trace(path)
+    if stored is None:
+        raise FileNotFoundError(f"Trace not found: {path}")
+
+    compression = _compression_of(stored)
+    if compression is None:
+        return stored.stat().st_size
+    if compression == "gzip":
+        with stored.open("rb") as f:
+            f.seek(-4, 2)
+            return int.from_bytes(f.read(4), "little")
+    if zstandard is None:
+        raise TraceStorageError(
+            f"Trace {stored} is zstd-compressed but the 'zstandard' package is not installed"
+        )
+    with stored.open("rb") as f:
+        size = zstandard.frame_content_size(f.read(18))
+        if size >= 0:
+            return size
+        if f.seek(0, 2) >= _ZSTD_SIZE_FRAME.size:
+            f.seek(-_ZSTD_SIZE_FRAME.size, 2)
+            magic, length, size = _ZSTD_SIZE_FRAME.unpack(f.read(_ZSTD_SIZE_FRAME.size))
+            if magic == _ZSTD_SIZE_FRAME_MAGIC and length == 8:
+                return size
+
+    # Streamed without a size frame; count while decompressing
+    size = 0
+    with open_trace(path) as f:
+        while chunk := f.read(WRITE_BUFFER_SIZE):
+            size += len(chunk)
+    return size
+
+
+def _compress(data: bytes, compression: Optional[str]) -> bytes:
+    if compression == "gzip":
+        # mtime=0 keeps output deterministic for identical traces
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return data
+
+
+def _resolve_compression(compression: Optional[str]) -> Optional[str]:
+    """Map a requested format to one usable here, falling back to gzip."""
+    if compression is None or compression == "none":
+        return None
+    if compression not in COMPRESSION_SUFFIXES:
+        raise TraceStorageError(f"Unknown trace compression: {compression}")
+    if not is_available(compression):
+        logger.warning("%s trace compression unavailable, using gzip", compression)
+        return "gzip"
+    return compression
+
+
+def stored_path_for(path: Path, compression: Optional[str]) -> Path:
+    """Return the stored file path a trace would be written to.
+
+    Args:
+        path: Logical trace path
+        compression: "gzip", "zstd", or None/"none" for uncompressed
+
+    Raises:
+        TraceStorageError: If the compression format is unknown
+    """
+    compression = _resolve_compression(compression)
+    if compression is None:
+        return path
+    return path.with_name(path.name + COMPRESSION_SUFFIXES[compression])
+
+
+def _remove_other_variants(path: Path, keep: Path) -> None:
+    for candidate in _variants(path):
+        if candidate != keep:
+            candidate.unlink(missing_ok=True)
+
+
+def write_trace_bytes(path: Path, data: bytes, compression: Optional[str]) -> Path:
+    """Store trace content, replacing any previously stored variant.
+
+    Args:
+        path: Logical trace path
+        data: Uncompressed trace bytes
+        compression: "gzip", "zstd", or None/"none" for uncompressed
+
+    Returns:
+        Path of the stored file
+
+    Raises:
+        TraceStorageError: If the compression format is unknown or writing fails
+    """
+    stored = stored_path_for(path, compression)
+    try:
+        stored.write_bytes(_compress(data, _compression_of(stored)))
+        _remove_other_variants(path, stored)
+    except OSError as e:
+        raise TraceStorageError(f"Failed to write trace {stored}: {e}") from e
+    return stored
+
+
+class _CountingWriter:
+    """Pass writes through to a stream, counting the bytes written."""
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self.stream = stream
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        return self.stream.write(data)
+
+
+@contextmanager
+def trace_writer(
+    path: Path,
+    compression: Optional[str],
+    buffer_size: int = WRITE_BUFFER_SIZE,
+) -> Iterator[BinaryIO]:
+    """Stream trace content to storage through a buffered (compressing) writer.
+
+    Any previously stored variant is removed once the new file is complete.
+
+    Args:
+        path: Logical trace path
+        compression: "gzip", "zstd", or None/"none" for uncompressed
+        buffer_size: Write buffer size in bytes
+
+    Yields:
+        Binary file object accepting uncompressed trace bytes
+
+    Raises:
+        TraceStorageError: If the compression format is unknown or writing fails
+    """
+    stored = stored_path_for(path, compression)
+    compression = _compression_of(stored)
+    try:
+        raw = stored.open("wb", buffering=buffer_size)
+    except OSError as e:
+        raise TraceStorageError(f"Failed to write trace {stored}: {e}") from e
+
+    try:
+        if compression == "gzip":
+            # mtime=0 keeps output deterministic for identical traces
+            with gzip.GzipFile(
+                filename="", mode="wb", fileobj=raw, compresslevel=GZIP_LEVEL, mtime=0
+            ) as writer:
+                yield writer
+        elif compression == "zstd":
+            with zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(
+                raw, closefd=False
+            ) as writer:
+                counter = _CountingWriter(writer)
+                yield counter
+            raw.write(_ZSTD_SIZE_FRAME.pack(_ZSTD_SIZE_FRAME_MAGIC, 8, counter.size))
+        else:
+            yield raw
+        raw.close()
+        _remove_other_variants(path, stored)
+    except OSError as e:
+        raise TraceStorageError(f"Failed to write trace {stored}: {e}") from e
+    finally:
+        raw.close()
+
+
+def copy_trace(source: Path, dest: Path, compression: Optional[str]) -> Path:
+    """Copy a stored trace to a new logical path, converting its format if needed.
+
+    A trace already stored in the requested format is copied byte-for-byte.
+
+    Args:
+        source: Logical path of the trace to copy
+        dest: Logical destination path
+        compression: Storage format for the copy ("gzip", "zstd", or None/"none")
+
+    Returns:
+        Path of the stored copy
+
+    Raises:
+        FileNotFoundError: If the source trace does not exist
+        TraceStorageError: If reading or writing fails
+    """
+    stored_source = find_trace(source)
+    if stored_source is None:
+        raise FileNotFoundError(f"Trace not found: {source}")
+
+    stored_dest = stored_path_for(dest, compression)
+    if _compression_of(stored_source) == _compression_of(stored_dest):
+        try:
+            shutil.copy2(stored_source, stored_dest)
+            _remove_other_variants(dest, stored_dest)
+        except OSError as e:
+            raise TraceStorageError(f"Failed to copy trace to {stored_dest}: {e}") from e
+        return stored_dest
+
+    return write_trace_bytes(dest, read_trace_bytes(source), compression)
@@ -2,25 +2,38 @@
 
 This module generates compressed trace summaries for training data,
 reducing 266KB-688KB traces to ~5-10KB while preserving information
-valuable for DSPy prompt optimization.
+valuable for DSPy prompt optimization. Very large traces are summarized
+hierarchically (map-reduce over the main conversation and subagent sections).
 """
 
 from __future__ import annotations
 
+import concurrent.futures
+import json
+import re
+import threading
 from pathlib import Path
 
 import dspy
 
-from .judge_executor import configure_dspy_cache, get_cache_dir, get_openrouter_api_key
+from .judge_executor import get_cache_dir, get_openrouter_api_key
+from .lm_pool import configure_dspy_cache, get_lm
 from .logging_config import get_logger
+from .summary_cache import (
+    SummaryCache,
+    content_hash,
+    read_summary_metadata,
+    summary_cache_key,
+    write_summary_metadata,
+)
+from .trace_storage import TraceStorageError, read_trace_text, trace_exists, trace_mtime
 from .trace_parser import (
+    ParsedTrace,
     count_tools_by_type,
-    detect_errors,
     extract_bash_commands,
     extract_file_paths,
-    parse_subagent_sections,
-    parse_tool_calls,
-    parse_trace_metadata,
+    load_trace_sidecar,
+    parse_trace,
 )
 
 logger = get_logger(__name__)
@@ -31,10 +44,16 @@ class TraceSummarizationError(Exception):
     pass
 
 
-def extract_structural_data(trace_content: str) -> dict:
+def extract_structural_data(
+    trace_content: str,
+    parsed: ParsedTrace | None = None,
+    trace_path: Path | None = None,
+) -> dict:
     """Extract structural summary from trace content.
 
-    Uses trace_parser to build a structural summary containing:
+    Reads the trace's structured sidecar when trace_path has one, and falls
+    back to trace_parser's single-pass markdown parser for legacy traces.
+    The summary contains:
     - Tool counts by type
     - Files read (unique paths)
     - Files modified/created
@@ -43,27 +62,20 @@ def extract_structural_data(trace_content: str) -> dict:
 
     Args:
         trace_content: Full trace markdown content
+        parsed: Already-parsed trace, to avoid parsing trace_content again
+        trace_path: Optional path to the trace file, used to locate its sidecar
 
     Returns:
         Dictionary with structural data
     """
-    # Parse tool calls
-    tool_calls = parse_tool_calls(trace_content)
-
-    # Count tools by type
-    tool_counts = count_tools_by_type(tool_calls)
+    if parsed is None and trace_path is not None:
+        parsed = load_trace_sidecar(trace_path)
+    if parsed is None:
+        parsed = parse_trace(trace_content)
 
-    # Extract file paths
+    tool_calls = parsed.tool_calls
     file_paths = extract_file_paths(tool_calls)
-
-    # Extract bash commands
-    bash_commands = extract_bash_commands(tool_calls)
-
-    # Detect errors
-    errors = detect_errors(trace_content)
-
-    # Parse metadata
-    metadata = parse_trace_metadata(trace_content)
+    metadata = parsed.metadata
 
     return {
         'metadata': {
@@ -73,15 +85,15 @@ def extract_structural_data(trace_content: str) -> dict:
             'worktree': metadata.worktree,
             'git_branch': metadata.git_branch,
         },
-        'tool_counts': tool_counts,
+        'tool_counts': count_tools_by_type(tool_calls),
         'files': {
             'read': sorted(file_paths['read']),
             'modified': sorted(file_paths['modified']),
             'created': sorted(file_paths['created']),
         },
-        'bash_commands': bash_commands,
-        'error_count': len(errors),
-        'errors': errors[:5],  # Limit to first 5 errors
+        'bash_commands': extract_bash_commands(tool_calls),
+        'error_count': len(parsed.errors),
+        'errors': parsed.errors[:5],  # Limit to first 5 errors
     }
 
 
@@ -114,17 +126,243 @@ class TraceSummarizationSignature(dspy.Signature):
     )
 
 
+class TraceChunkSummarySignature(dspy.Signature):
+    """Signature for summarizing one part of a large trace (map phase)."""
+
+    chunk_label: str = dspy.InputField(
+        desc="Which part of the trace this is (main conversation part or subagent)"
+    )
+    chunk_content: str = dspy.InputField(
+        desc="Trace markdown for this part"
+    )
+
+    partial_summary: str = dspy.OutputField(
+        desc="Summary of this part, preserving subagent feedback verbatim"
+    )
+
+
+# Traces larger than this are summarized hierarchically: each chunk is
+# summarized in parallel (map), then the partial summaries are merged (reduce)
+HIERARCHICAL_THRESHOLD_CHARS = 300_000
+
+# Target size of each map-phase chunk
+MAP_CHUNK_CHARS = 100_000
+
+# Maximum concurrent map-phase LM calls
+MAX_MAP_WORKERS = 8
+
+# Maximum concurrent summarization LM calls across all threads. Batch loading
+# summarizes several traces at once, each mapping its chunks in parallel, so
+# the limit is shared by every caller rather than set per pool.
+MAX_CONCURRENT_LM_CALLS = 10
+_LM_CALL_SLOTS = threading.BoundedSemaphore(MAX_CONCURRENT_LM_CALLS)
+
+# Appended to the summarization prompt for the reduce call
+_REDUCE_NOTE = """
+
+## Note: Hierarchical Summary
+
+This trace was too large to summarize in one pass. The trace content and
+subagent sections you are given are ordered partial summaries of each part
+of the trace, not the raw trace. Merge them into a single narrative summary,
+keeping verbatim subagent feedback exactly as quoted in the partial summaries.
+"""
+
+# Message headers written by trace_capture; chunks are only split before them
+_MESSAGE_BOUNDARY = re.compile(r'^(?=### \[)', re.MULTILINE)
+
+
+def _load_chunk_summarization_prompt() -> str:
+    """Load the map-phase prompt used for hierarchical summarization."""
+    prompt_path = Path(__file__).parent / "prompts" / "trace_chunk_summarization.md"
+    if not prompt_path.exists():
+        raise TraceSummarizationError(
+            f"Chunk summarization prompt not found: {prompt_path}"
+        )
+    return prompt_path.read_text(encoding="utf-8")
+
+
+def _summary_prompts() -> str:
+    """Return every prompt that shapes a summary, for cache keys and freshness."""
+    return _load_summarization_prompt() + "\n" + _load_chunk_summarization_prompt()
+
+
+def _create_lm(model: str) -> dspy.LM:
+    """Get the pooled summarization LM, configuring the DSPy cache."""
+    api_key = get_openrouter_api_key()
+    configure_dspy_cache(get_cache_dir())
+    return get_lm(model, api_key, max_tokens=16000, temperature=0.3)
+
+
+def _chunk_text(text: str, max_chars: int) -> list[str]:
+    """Split text into chunks of at most max_chars at message boundaries.
+
+    A single message longer than max_chars is split mid-message.
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for piece in _MESSAGE_BOUNDARY.split(text):
+        if not piece:
+            continue
+        if current and size + len(piece) > max_chars:
+            chunks.append("".join(current))
+            current, size = [], 0
+        if len(piece) > max_chars:
+            chunks.extend(piece[i:i + max_chars] for i in range(0, len(piece), max_chars))
+            continue
+        current.append(piece)
+        size += len(piece)
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+def _main_conversation(trace_content: str, subagent_sections: dict[str, str]) -> str:
+    """Return the main conversation: the trace up to its first subagent section."""
+    if not subagent_sections:
+        return trace_content
+    first_agent = next(iter(subagent_sections))
+    end = trace_content.find(f"\n## Subagent: agent-{first_agent}\n")
+    return trace_content if end < 0 else trace_content[:end]
+
+
+def _plan_chunks(
+    trace_content: str,
+    subagent_sections: dict[str, str],
+    max_chars: int = MAP_CHUNK_CHARS,
+) -> tuple[list[tuple[str, str]], list[tuple[str, str, str]]]:
+    """Split a trace into map-phase chunks.
+
+    The main conversation is cut into consecutive chunks at message
+    boundaries; each subagent section (from parse_subagent_sections) is its
+    own chunk, split further only if it exceeds max_chars.
+
+    Args:
+        trace_content: Full trace markdown content
+        subagent_sections: Dictionary mapping agent ID to section content
+        max_chars: Maximum chunk size in characters
+
+    Returns:
+        Tuple of (main chunks as (label, content), subagent chunks as
+        (agent_id, label, content)), both in trace order
+    """
+    main_parts = _chunk_text(_main_conversation(trace_content, subagent_sections), max_chars)
+    main_chunks = [
+        (f"Main conversation, part {i} of {len(main_parts)}", part)
+        for i, part in enumerate(main_parts, 1)
+    ]
+
+    subagent_chunks = []
+    for agent_id, content in subagent_sections.items():
+        parts = _chunk_text(content, max_chars) or [content]
+        for i, part in enumerate(parts, 1):
+            label = f"Subagent agent-{agent_id}"
+            if len(parts) > 1:
+                label += f", part {i} of {len(parts)}"
+            subagent_chunks.append((agent_id, label, part))
+
+    return main_chunks, subagent_chunks
+
+
+def _predict(predictor: dspy.Predict, lm: dspy.LM, **inputs: str) -> dspy.Prediction:
+    """Run one summarization LM call, waiting for a free slot in the shared limit."""
+    with _LM_CALL_SLOTS, dspy.context(lm=lm):
+        return predictor(**inputs)
+
+
+def _summarize_chunks(chunks: list[tuple[str, str]], lm: dspy.LM) -> list[str]:
+    """Summarize chunks concurrently (map phase), returning summaries in input order.
+
+    Raises:
+        Exception: The first chunk failure, after cancelling pending chunks
+    """
+    predictor = dspy.Predict(
+        TraceChunkSummarySignature.with_instructions(_load_chunk_summarization_prompt())
+    )
+
+    def summarize(label: str, content: str) -> str:
+        result = _predict(predictor, lm, chunk_label=label, chunk_content=content)
+        logger.debug("Summarized %s", label)
+        return str(result.partial_summary)
+
+    # LM calls are I/O bound, so threads work well
+    workers = max(1, min(MAX_MAP_WORKERS, len(chunks)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(summarize, label, content) for label, content in chunks]
+        try:
+            return [future.result() for future in futures]
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def _generate_hierarchical_summary(
+    trace_content: str,
+    subagent_sections: dict[str, str],
+    lm: dspy.LM,
+    structural_json: str,
+    instructions: str,
+) -> str:
+    """Summarize a large trace by map-reduce over its chunks."""
+    main_chunks, subagent_chunks = _plan_chunks(trace_content, subagent_sections)
+    logger.info(
+        "Summarizing trace hierarchically: %d main chunk(s), %d subagent chunk(s)",
+        len(main_chunks),
+        len(subagent_chunks),
+    )
+
+    # Map: every chunk, main and subagent alike, runs concurrently
+    chunks = main_chunks + [(label, content) for _, label, content in subagent_chunks]
+    partials = _summarize_chunks(chunks, lm)
+    main_partials = partials[:len(main_chunks)]
+    subagent_partials = partials[len(main_chunks):]
+
+    # Reduce: merge the partial summaries with the full prompt
+    main_text = "\n\n".join(
+        f"## {label}\n\n{summary}"
+        for (label, _), summary in zip(main_chunks, main_partials, strict=True)
+    )
+    subagent_text = "\n\n".join(
+        f"## Subagent: agent-{agent_id}\n\n### {label}\n\n{summary}"
+        for (agent_id, label, _), summary in zip(subagent_chunks, subagent_partials, strict=True)
+    )
+
+    predictor = dspy.Predict(
+        TraceSummarizationSignature.with_instructions(instructions + _REDUCE_NOTE)
+    )
+    result = _predict(
+        predictor,
+        lm,
+        trace_content=main_text,
+        subagent_sections=subagent_text if subagent_text else "No subagent sections found.",
+        structural_data=structural_json,
+    )
+    return str(result.narrative_summary)
+
+
 def generate_narrative_summary(
     trace_content: str,
     subagent_sections: dict[str, str],
     model: str,
+    structural_data: dict | None = None,
+    hierarchical: bool | None = None,
 ) -> str:
     """Generate narrative summary using DSPy.
 
+    Traces over HIERARCHICAL_THRESHOLD_CHARS are summarized hierarchically:
+    the main conversation chunks and subagent sections are summarized in
+    parallel, then merged by a final call, so latency scales with the
+    largest chunk rather than the whole trace.
+
     Args:
         trace_content: Full trace markdown content
         subagent_sections: Dictionary mapping agent ID to section content
         model: OpenRouter model tag for DSPy calls
+        structural_data: Output of extract_structural_data, if already computed
+        hierarchical: Force (True) or disable (False) hierarchical mode;
+            None chooses by trace size
 
     Returns:
         Narrative summary as markdown text
@@ -134,50 +372,46 @@ def generate_narrative_summary(
     """
     logger.info("Generating narrative summary with model %s", model)
 
-    try:
-        # Get API key
-        api_key = get_openrouter_api_key()
-
-        # Configure DSPy cache
-        cache_dir = get_cache_dir()
-        configure_dspy_cache(cache_dir)
+    if hierarchical is None:
+        hierarchical = len(trace_content) > HIERARCHICAL_THRESHOLD_CHARS
 
-        # Format subagent sections for input
-        subagent_text = ""
-        for agent_id, content in subagent_sections.items():
-            subagent_text += f"\n## Subagent: agent-{agent_id}\n\n{content}\n"
+    try:
+        lm = _create_lm(model)
 
         # Extract structural data for context
-        structural_data = extract_structural_data(trace_content)
-        import json
+        if structural_data is None:
+            structural_data = extract_structural_data(trace_content)
         structural_json = json.dumps(structural_data, indent=2)
 
         # Load summarization prompt
         instructions = _load_summarization_prompt()
 
-        # Create LM with specified model
-        lm = dspy.LM(
-            f"openrouter/{model}",
-            api_key=api_key,
-            max_tokens=16000,
-            temperature=0.3,
-        )
-
-        # Create signature with instructions
-        InstructedSignature = TraceSummarizationSignature.with_instructions(
-            instructions
-        )
+        if hierarchical:
+            narrative = _generate_hierarchical_summary(
+                trace_content, subagent_sections, lm, structural_json, instructions
+            )
+        else:
+            # Format subagent sections for input
+            subagent_text = ""
+            for agent_id, content in subagent_sections.items():
+                subagent_text += f"\n## Subagent: agent-{agent_id}\n\n{content}\n"
+
+            # Create signature with instructions
+            InstructedSignature = TraceSummarizationSignature.with_instructions(
+                instructions
+            )
 
-        # Create predictor and run
-        predictor = dspy.Predict(InstructedSignature)
-        with dspy.context(lm=lm):
-            result = predictor(
+            # Create predictor and run
+            predictor = dspy.Predict(InstructedSignature)
+            result = _predict(
+                predictor,
+                lm,
                 trace_content=trace_content,
                 subagent_sections=subagent_text if subagent_text else "No subagent sections found.",
                 structural_data=structural_json,
             )
+            narrative = str(result.narrative_summary)
 
-        narrative = str(result.narrative_summary)
         logger.debug("Generated narrative summary (%d chars)", len(narrative))
 
         return narrative
@@ -188,6 +422,130 @@ def generate_narrative_summary(
         ) from exc
 
 
+# Model name recorded for extractive summaries. Bump the version when the
+# extraction changes so existing extractive summaries are regenerated.
+EXTRACTIVE_MODEL = "extractive-v1"
+
+# Target size of a whole extractive summary document, matching LLM summaries
+EXTRACTIVE_TARGET_CHARS = 10_000
+
+# Floor on the extracted-text budget, so traces with a very large structural
+# section still keep subagent feedback and final turns
+EXTRACTIVE_MIN_NARRATIVE_CHARS = 4_000
+
+# Share of the extracted-text budget given to subagent feedback
+EXTRACTIVE_FEEDBACK_SHARE = 0.6
+
+# Number of final main-agent turns kept by the extractive summary
+FINAL_ASSISTANT_TURNS = 3
+
+_ASSISTANT_HEADER = re.compile(r'^### \[[^\]]*\] Assistant\s*$')
+
+
+def _assistant_texts(section: str) -> list[str]:
+    """Return the prose of each assistant message in a trace section.
+
+    Tool call JSON and thinking blocks are dropped; only the text the agent
+    wrote is kept.
+    """
+    texts = []
+    for piece in _MESSAGE_BOUNDARY.split(section):
+        lines = piece.split("\n")
+        if not lines or not _ASSISTANT_HEADER.match(lines[0]):
+            continue
+
+        kept = []
+        skip_block = False
+        in_block = False
+        for line in lines[1:]:
+            if in_block:
+                if not skip_block:
+                    kept.append(line)
+                if line.startswith("```"):
+                    in_block = False
+                    skip_block = False
+                continue
+            if line.startswith("```"):
+                in_block = True
+                if not skip_block:
+                    kept.append(line)
+                continue
+            if line.startswith("**Tool: ") or line == "**Thinking:**":
+                # The fenced block that follows is tool input or thinking
+                skip_block = True
+                continue
+            if line.strip():
+                skip_block = False
+            kept.append(line)
+
+        text = "\n".join(kept).strip()
+        if text:
+            texts.append(text)
+    return texts
+
+
+def _clip(text: str, limit: int) -> str:
+    """Truncate text to about limit characters, marking the cut."""
+    if len(text) <= limit:
+        return text
+    return text[:max(limit, 0)].rstrip() + "\n\n[... truncated]"
+
+
+def generate_extractive_summary(
+    trace_content: str,
+    subagent_sections: dict[str, str],
+    budget: int,
+) -> str:
+    """Build a summary from the trace text itself, without an LM.
+
+    Keeps each subagent's final report verbatim and the main agent's last
+    FINAL_ASSISTANT_TURNS messages, clipped to fit the character budget.
+
+    Args:
+        trace_content: Full trace markdown content
+        subagent_sections: Dictionary mapping agent ID to section content
+        budget: Approximate number of characters available
+
+    Returns:
+        Extracted summary as markdown text
+    """
+    lines = []
+    feedback_budget = int(budget * EXTRACTIVE_FEEDBACK_SHARE) if subagent_sections else 0
+
+    lines.append("### Subagent Feedback")
+    lines.append("")
+    if subagent_sections:
+        share = feedback_budget // len(subagent_sections)
+        for agent_id, content in subagent_sections.items():
+            texts = _assistant_texts(content)
+            lines.append(f"#### agent-{agent_id}")
+            lines.append("")
+            if texts:
+                for line in _clip(texts[-1], share).split("\n"):
+                    lines.append(f"> {line}" if line else ">")
+            else:
+                lines.append("No report found.")
+            lines.append("")
+    else:
+        lines.append("No subagent sections found.")
+        lines.append("")
+
+    turns = _assistant_texts(_main_conversation(trace_content, subagent_sections))
+    turns = turns[-FINAL_ASSISTANT_TURNS:]
+    lines.append("### Final Assistant Turns")
+    lines.append("")
+    if turns:
+        share = (budget - feedback_budget) // len(turns)
+        for turn in turns:
+            lines.append(_clip(turn, share))
+            lines.append("")
+    else:
+        lines.append("No assistant messages found.")
+        lines.append("")
+
+    return "\n".join(lines)
+
+
 def _format_structural_section(structural_data: dict) -> str:
     """Format structural data as markdown section.
 
@@ -287,16 +645,28 @@ def _format_structural_section(structural_data: dict) -> str:
     return "\n".join(lines)
 
 
-def create_trace_summary(trace_path: Path, model: str) -> Path:
+def create_trace_summary(
+    trace_path: Path,
+    model: str | None,
+    cache: SummaryCache | None = None,
+) -> Path:
     """Generate a compressed trace summary.
 
     Main entry point for trace summarization. Reads the full trace,
     extracts structural data, generates a narrative summary, and
     writes the combined summary alongside the original trace.
 
+    Summaries are looked up in the content-addressed summary cache first
+    (keyed by trace content, summarization prompt and model), so identical
+    traces are only ever summarized once.
+
+    With model=None, a deterministic extractive summary is built locally
+    instead of calling an LM.
+
     Args:
-        trace_path: Path to the code_trace.md file
-        model: OpenRouter model tag for DSPy calls
+        trace_path: Path to the code_trace.md file (may be stored compressed)
+        model: OpenRouter model tag for DSPy calls, or None for an extractive summary
+        cache: Summary cache to consult (default: ~/.weft/summary_cache/)
 
     Returns:
         Path to the created summary file (code_trace_summary.md)
@@ -306,13 +676,13 @@ def create_trace_summary(trace_path: Path, model: str) -> Path:
     """
     logger.info("Creating trace summary for %s", trace_path)
 
-    if not trace_path.exists():
+    if not trace_exists(trace_path):
         raise TraceSummarizationError(f"Trace file not found: {trace_path}")
 
-    # Read trace content
+    # Read trace content (decompressed transparently if stored compressed)
     try:
-        trace_content = trace_path.read_text(encoding="utf-8")
-    except OSError as exc:
+        trace_content = read_trace_text(trace_path)
+    except (OSError, TraceStorageError, UnicodeDecodeError) as exc:
         raise TraceSummarizationError(
             f"Failed to read trace file: {exc}"
         ) from exc
@@ -320,18 +690,81 @@ def create_trace_summary(trace_path: Path, model: str) -> Path:
     original_size = len(trace_content)
     logger.debug("Original trace size: %d bytes", original_size)
 
-    # Extract structural data
-    structural_data = extract_structural_data(trace_content)
+    summary_path = trace_path.parent / "code_trace_summary.md"
+    prompts = _summary_prompts()
+    trace_hash = content_hash(trace_content)
+    summary_model = model if model is not None else EXTRACTIVE_MODEL
+    key = summary_cache_key(trace_hash, prompts, summary_model)
+    if cache is None:
+        cache = SummaryCache()
+
+    summary_content = cache.get(key)
+    if summary_content is not None:
+        logger.info("Reusing cached trace summary for %s", trace_path)
+    else:
+        summary_content = _build_summary(trace_path, trace_content, model)
+        cache.put(key, summary_content)
+
+    # Write summary file and its provenance record
+    try:
+        summary_path.write_text(summary_content, encoding="utf-8")
+        write_summary_metadata(summary_path, key, trace_hash, prompts, summary_model)
+        logger.info("Wrote trace summary to %s", summary_path)
+    except OSError as exc:
+        raise TraceSummarizationError(
+            f"Failed to write summary file: {exc}"
+        ) from exc
+
+    return summary_path
+
+
+def _build_summary(trace_path: Path, trace_content: str, model: str | None) -> str:
+    """Build the summary document for a trace.
+
+    The document combines structural data with an LLM narrative, or with an
+    extractive summary when model is None.
 
-    # Parse subagent sections
-    subagent_sections = parse_subagent_sections(trace_content)
+    Raises:
+        TraceSummarizationError: If narrative generation fails
+    """
+    original_size = len(trace_content)
+
+    # Parse once (from the sidecar when present); structural data and
+    # subagent sections share the result
+    parsed = load_trace_sidecar(trace_path) or parse_trace(trace_content)
+    structural_data = extract_structural_data(trace_content, parsed)
+    subagent_sections = parsed.subagent_sections
     logger.debug("Found %d subagent section(s)", len(subagent_sections))
 
+    if model is None:
+        structural_section = _format_structural_section(structural_data)
+        narrative = generate_extractive_summary(
+            trace_content,
+            subagent_sections,
+            budget=max(
+                EXTRACTIVE_TARGET_CHARS - len(structural_section),
+                EXTRACTIVE_MIN_NARRATIVE_CHARS,
+            ),
+        )
+        return "\n".join([
+            "# Trace Summary",
+            "",
+            "This is an extractive summary of the full conversation trace,",
+            "generated locally without an LLM.",
+            "Original trace preserved in `code_trace.md`.",
+            "",
+            structural_section,
+            "## Extracted Summary",
+            "",
+            narrative,
+        ])
+
     # Generate narrative summary
     narrative = generate_narrative_summary(
         trace_content=trace_content,
         subagent_sections=subagent_sections,
         model=model,
+        structural_data=structural_data,
     )
 
     # Format structural section
@@ -360,35 +793,54 @@ def create_trace_summary(trace_path: Path, model: str) -> Path:
         100 * (1 - summary_size / original_size) if original_size > 0 else 0,
     )
 
-    # Write summary file
-    summary_path = trace_path.parent / "code_trace_summary.md"
-    try:
-        summary_path.write_text(summary_content, encoding="utf-8")
-        logger.info("Wrote trace summary to %s", summary_path)
-    except OSError as exc:
-        raise TraceSummarizationError(
-            f"Failed to write summary file: {exc}"
-        ) from exc
+    return summary_content
 
-    return summary_path
 
+def needs_regeneration(
+    trace_path: Path,
+    summary_path: Path,
+    model: str | None = None,
+) -> bool:
+    """Check if summary needs regeneration.
 
-def needs_regeneration(trace_path: Path, summary_path: Path) -> bool:
-    """Check if summary needs regeneration based on file modification times.
+    Summaries written with a provenance record (code_trace_summary.json) are
+    stale only if the trace content or the summarization prompt changed, so
+    copying or touching training data never forces a re-summary. Older
+    summaries without one fall back to comparing modification times.
+
+    An extractive summary is also stale when an LM model is requested (so it
+    is upgraded to an LLM summary) or when it was built by an older version
+    of the extractive summarizer.
 
     Args:
-        trace_path: Path to the code_trace.md file
+        trace_path: Path to the code_trace.md file (may be stored compressed)
         summary_path: Path to the code_trace_summary.md file
+        model: Model the caller would summarize with (None for extractive)
 
     Returns:
-        True if summary doesn't exist or is older than trace
+        True if summary doesn't exist or no longer matches the trace
     """
     if not summary_path.exists():
         return True
 
+    metadata = read_summary_metadata(summary_path)
+    if metadata is None:
+        try:
+            return trace_mtime(trace_path) > summary_path.stat().st_mtime
+        except OSError:
+            return True
+
+    summary_model = metadata.get("model")
+    if isinstance(summary_model, str) and summary_model.startswith("extractive"):
+        if model is not None or summary_model != EXTRACTIVE_MODEL:
+            return True
+
     try:
-        trace_mtime = trace_path.stat().st_mtime
-        summary_mtime = summary_path.stat().st_mtime
-        return trace_mtime > summary_mtime
-    except OSError:
+        trace_hash = content_hash(read_trace_text(trace_path))
+        prompt_hash = content_hash(_summary_prompts())
+    except (OSError, TraceStorageError, TraceSummarizationError, UnicodeDecodeError):
         return True
+    return (
+        metadata.get("trace_sha256") != trace_hash
+        or metadata.get("prompt_sha256") != prompt_hash
+    )
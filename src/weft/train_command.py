@@ -4,23 +4,30 @@ This module orchestrates the training workflow:
 1. Load training data from eval command results
 2. Load current active prompts
 3. Run DSPy prompt trainer to generate candidates
-4. Save candidates to prompts/candidates/
+4. Save candidates to prompts/candidates/ (several concurrently with --candidates)
+
+Training variant "all" loads and summarizes the batch once and trains every
+variant against it concurrently.
 """
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 
-from .candidate_writer import CandidateWriteError, write_candidate
+from .candidate_writer import write_candidate
 from .judge_executor import get_cache_dir
 from .logging_config import get_logger
 from .prompt_loader import PromptLoadingError, load_current_prompts_for_training
-from .prompt_trainer import PromptTrainerError, run_prompt_trainer
+from .prompt_trainer import PromptTrainerError, run_prompt_trainer_candidates
 from .repo_utils import RepoUtilsError, find_repo_root
+from .training_batch import DEFAULT_TOKEN_BUDGET
 from .training_data_loader import (
     TrainingDataLoadError,
     delete_trace_summaries,
     load_training_batch,
 )
+from .training_types import CandidatePrompts, PromptSnapshot
 
 logger = get_logger(__name__)
 
@@ -31,18 +38,37 @@ class TrainCommandError(Exception):
     pass
 
 
-def _validate_parameters(variant: str, batch_size: int, max_subagents: int) -> None:
+# Smallest accepted --token-budget; below this not even one summary fits
+MIN_TOKEN_BUDGET = 1000
+
+# Prompt variants that can be trained; ALL_VARIANTS trains each in one run
+VARIANTS = ("sonnet", "opus", "haiku")
+ALL_VARIANTS = "all"
+
+# Largest accepted --candidates; each candidate is a full high-reasoning call
+MAX_CANDIDATES = 10
+
+
+def _validate_parameters(
+    variant: str,
+    batch_size: int,
+    max_subagents: int,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    candidates: int = 1,
+) -> None:
     """Validate command parameters.
 
     Args:
-        variant: Prompt variant (sonnet, opus, haiku)
+        variant: Prompt variant (sonnet, opus, haiku, or all)
         batch_size: Number of training samples per batch
         max_subagents: Maximum subagents to generate
+        token_budget: Token budget for training samples
+        candidates: Number of candidates to generate
 
     Raises:
         TrainCommandError: If parameters are invalid
     """
-    valid_variants = {"sonnet", "opus", "haiku"}
+    valid_variants = {*VARIANTS, ALL_VARIANTS}
     if variant not in valid_variants:
         raise TrainCommandError(
             f"Invalid variant: '{variant}'. Valid options: {', '.join(sorted(valid_variants))}"
@@ -66,6 +92,20 @@ def _validate_parameters(variant: str, batch_size: int, max_subagents: int) -> N
             f"Invalid max_subagents: {max_subagents}. Maximum is 10."
         )
 
+    if token_budget < MIN_TOKEN_BUDGET:
+        raise TrainCommandError(
+            f"Invalid token_budget: {token_budget}. Must be at least {MIN_TOKEN_BUDGET}."
+        )
+
+    if candidates < 1:
+        raise TrainCommandError(
+            f"Invalid candidates: {candidates}. Must be at least 1."
+        )
+    if candidates > MAX_CANDIDATES:
+        raise TrainCommandError(
+            f"Invalid candidates: {candidates}. Maximum is {MAX_CANDIDATES}."
+        )
+
 
 def run_train_command(
     variant: str,
@@ -73,22 +113,27 @@ def run_train_command(
     max_subagents: int = 5,
     model: str = "x-ai/grok-4.1-fast",
     regenerate_summaries: bool = False,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    candidates: int = 1,
 ) -> int:
-    """Run the train command to generate a candidate prompt set.
+    """Run the train command to generate candidate prompt sets.
 
     Args:
-        variant: Prompt variant to train (sonnet, opus, haiku)
+        variant: Prompt variant to train (sonnet, opus, haiku), or "all" to
+                 train every variant from one shared training batch
         batch_size: Number of training samples per batch (default: 3)
         max_subagents: Maximum subagents to generate (default: 5)
         model: OpenRouter model tag for DSPy calls (default: x-ai/grok-4.1-fast)
         regenerate_summaries: Delete existing trace summaries before loading (default: False)
+        token_budget: Token budget for training samples in the trainer prompt
+        candidates: Number of candidates to generate concurrently (default: 1)
 
     Returns:
         Exit code (0 for success, 1 for failure)
     """
     try:
         # Validate parameters
-        _validate_parameters(variant, batch_size, max_subagents)
+        _validate_parameters(variant, batch_size, max_subagents, token_budget, candidates)
 
         # Find repo root
         try:
@@ -102,6 +147,8 @@ def run_train_command(
         logger.info("  Batch size: %d", batch_size)
         logger.info("  Max subagents: %d", max_subagents)
         logger.info("  Model: %s", model)
+        logger.info("  Token budget: %d", token_budget)
+        logger.info("  Candidates: %d", candidates)
 
         # Delete existing summaries if requested
         if regenerate_summaries:
@@ -112,7 +159,9 @@ def run_train_command(
         # Load training batch with trace summarization
         logger.info("Loading training data...")
         try:
-            training_samples = load_training_batch(repo_root, batch_size, model=model)
+            training_samples = load_training_batch(
+                repo_root, batch_size, model=model, token_budget=token_budget
+            )
         except TrainingDataLoadError as exc:
             logger.error("Failed to load training data: %s", exc)
             return 1
@@ -121,51 +170,85 @@ def run_train_command(
         for sample in training_samples:
             logger.info("  - %s", sample.plan_id)
 
-        # Load current prompts for the specified variant
+        # Load current prompts for each variant being trained
+        variants = list(VARIANTS) if variant == ALL_VARIANTS else [variant]
         logger.info("Loading current prompts...")
-        try:
-            current_prompts = load_current_prompts_for_training(
-                repo_root, tool="claude-code-cli", model=variant
+        snapshots: dict[str, PromptSnapshot] = {}
+        for name in variants:
+            try:
+                snapshots[name] = load_current_prompts_for_training(
+                    repo_root, tool="claude-code-cli", model=name
+                )
+            except PromptLoadingError as exc:
+                logger.error("Failed to load current prompts: %s", exc)
+                return 1
+            logger.info(
+                "Loaded current %s prompts: 1 main + %d subagent(s)",
+                name,
+                len(snapshots[name].subagents),
             )
-        except PromptLoadingError as exc:
-            logger.error("Failed to load current prompts: %s", exc)
-            return 1
-
-        logger.info(
-            "Loaded current prompts: 1 main + %d subagent(s)",
-            len(current_prompts.subagents),
-        )
 
         # Get cache directory
         cache_dir = get_cache_dir()
         logger.debug("Using cache directory: %s", cache_dir)
 
-        # Run prompt trainer
-        logger.info("Running DSPy prompt trainer...")
-        try:
-            candidate, token_usage = run_prompt_trainer(
+        def train_variant(name: str) -> list[tuple[Path, CandidatePrompts, dict[str, int]]]:
+            # Write each candidate as soon as it completes
+            # (a failed write counts as a failed candidate)
+            candidate_dirs: dict[int, Path] = {}
+
+            def save_candidate(index: int, candidate: CandidatePrompts, _usage: dict) -> None:
+                candidate_dirs[index] = write_candidate(
+                    repo_root=repo_root,
+                    tool="claude-code-cli",
+                    model=name,
+                    candidate=candidate,
+                )
+
+            results = run_prompt_trainer_candidates(
                 training_samples=training_samples,
-                current_prompts=current_prompts,
+                current_prompts=snapshots[name],
                 max_subagents=max_subagents,
                 model=model,
                 cache_dir=cache_dir,
+                num_candidates=candidates,
+                token_budget=token_budget,
+                on_candidate=save_candidate,
             )
-        except PromptTrainerError as exc:
-            logger.error("Prompt training failed: %s", exc)
+            written = [candidate_dirs[index] for index in sorted(candidate_dirs)]
+            return [
+                (candidate_dir, candidate, usage)
+                for candidate_dir, (candidate, usage) in zip(written, results, strict=True)
+            ]
+
+        # Run the prompt trainer for all variants at once; they share the
+        # training batch loaded above
+        logger.info("Running DSPy prompt trainer...")
+        outcomes: dict[str, list[tuple[Path, CandidatePrompts, dict[str, int]]]] = {}
+        with ThreadPoolExecutor(max_workers=len(variants)) as executor:
+            futures = {executor.submit(train_variant, name): name for name in variants}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    outcomes[name] = future.result()
+                except PromptTrainerError as exc:
+                    logger.error("Prompt training failed for %s: %s", name, exc)
+        if not outcomes:
             return 1
 
-        # Write candidate to the variant directory
-        logger.info("Writing candidate prompts...")
-        try:
-            candidate_dir = write_candidate(
-                repo_root=repo_root,
-                tool="claude-code-cli",
-                model=variant,
-                candidate=candidate,
+        token_usage = {
+            key: sum(
+                usage.get(key, 0)
+                for results in outcomes.values()
+                for _, _, usage in results
             )
-        except CandidateWriteError as exc:
-            logger.error("Failed to write candidate: %s", exc)
-            return 1
+            for key in ("input_tokens", "output_tokens", "reasoning_tokens", "total_tokens")
+        }
+        written = [
+            (candidate_dir, candidate)
+            for name in variants
+            for candidate_dir, candidate, _ in outcomes.get(name, [])
+        ]
 
         # Report results
         print()
@@ -173,35 +256,49 @@ def run_train_command(
         print("Training Complete")
         print("=" * 72)
         print()
-        print(f"Candidate saved to: {candidate_dir}")
-        print(f"Generated {len(candidate.subagents)} subagent(s):")
-        for subagent in candidate.subagents:
-            print(f"  - {subagent.name}")
-        print()
+        for name in variants:
+            if name not in outcomes:
+                print(f"Training failed for {name} (see log)")
+                print()
+                continue
+            for candidate_dir, candidate, _ in outcomes[name]:
+                print(f"Candidate saved to: {candidate_dir}")
+                print(f"Generated {len(candidate.subagents)} subagent(s):")
+                for subagent in candidate.subagents:
+                    print(f"  - {subagent.name}")
+                print()
+            if len(outcomes[name]) < candidates:
+                failed = candidates - len(outcomes[name])
+                print(f"{failed} of {candidates} {name} candidate(s) failed (see log)")
+                print()
         print("Token Usage:")
         print(f"  Input tokens:     {token_usage['input_tokens']:,}")
         print(f"  Output tokens:    {token_usage['output_tokens']:,}")
         print(f"  Reasoning tokens: {token_usage.get('reasoning_tokens', 0):,}")
         print(f"  Total tokens:     {token_usage['total_tokens']:,}")
         print()
-        print("Analysis Summary:")
-        print("-" * 72)
-        # Print first 500 chars of analysis summary
-        summary = candidate.analysis_summary
-        if len(summary) > 500:
-            print(summary[:500] + "...")
-            print(f"(Full analysis in {candidate_dir}/ANALYSIS.md)")
-        else:
-            print(summary)
-        print("-" * 72)
-        print()
+        for candidate_dir, candidate in written:
+            if len(written) > 1:
+                print(f"Analysis Summary ({candidate_dir.parent.name}/{candidate_dir.name}):")
+            else:
+                print("Analysis Summary:")
+            print("-" * 72)
+            # Print first 500 chars of analysis summary
+            summary = candidate.analysis_summary
+            if len(summary) > 500:
+                print(summary[:500] + "...")
+                print(f"(Full analysis in {candidate_dir}/ANALYSIS.md)")
+            else:
+                print(summary)
+            print("-" * 72)
+            print()
         print("Next steps:")
         print("  1. Review the generated prompts in the candidate directory")
         print("  2. Test the candidate prompts manually")
         print("  3. If satisfactory, copy to prompts/active/ to use")
         print()
 
-        return 0
+        return 0 if len(outcomes) == len(variants) else 1
 
     except TrainCommandError as exc:
         logger.error("%s", exc)
@@ -0,0 +1,176 @@
+"""Token-budgeted selection of training batches.
+
+Chooses which training samples go into a prompt-training batch. Samples are
+ranked by how informative they are for improving prompts (low judge scores,
+failing tests, recent, and not near-duplicates of already chosen samples),
+then packed greedily until the batch's estimated token count reaches the
+budget.
+
+Selection works from training manifest entries and file sizes only, so no
+sample content is read or summarized for samples that are not chosen.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Default token budget for the training samples in the trainer prompt
+DEFAULT_TOKEN_BUDGET = 100_000
+
+# Rough tokenizer-independent estimate (English prose and code average ~4)
+CHARS_PER_TOKEN = 4
+
+# Assumed size of a trace summary that has not been generated yet
+# (summaries target ~5-10KB)
+SUMMARY_ESTIMATE_CHARS = 10_000
+
+# Informativeness weights
+FAILING_TESTS_WEIGHT = 0.5
+RECENCY_WEIGHT = 0.25
+# Penalty per already selected sample produced by the same prompts
+DUPLICATE_PENALTY = 0.3
+
+# Files serialized into a TrainingSample (besides prompts and judges)
+_SAMPLE_FILES = (
+    "plan.md",
+    "human_feedback.md",
+    "test_results_before.json",
+    "test_results_after.json",
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def estimate_sample_tokens(sample_dir: Path, entry: Optional[dict] = None) -> int:
+    """Estimate a training sample's serialized token count from file sizes.
+
+    The trace contributes its summary size when a summary exists, the
+    summary target size when the trace has not been summarized yet.
+
+    Args:
+        sample_dir: Path to the training sample directory
+        entry: The sample's manifest entry, if loaded
+
+    Returns:
+        Estimated token count
+    """
+    chars = sum(_size(sample_dir / name) for name in _SAMPLE_FILES)
+    chars += sum(_size(path) for path in sample_dir.glob("judge_*.json"))
+    chars += sum(_size(path) for path in sample_dir.glob("prompts/*.md"))
+
+    summary_size = _size(sample_dir / "code_trace_summary.md")
+    if summary_size:
+        chars += summary_size
+    elif entry is None or entry.get("trace_size"):
+        chars += SUMMARY_ESTIMATE_CHARS
+    return chars // CHARS_PER_TOKEN
+
+
+def score_entry(entry: dict, recency: float) -> float:
+    """Score how informative a sample is for prompt training.
+
+    Args:
+        entry: Manifest entry (see training_manifest)
+        recency: 0.0 for the oldest sample up to 1.0 for the newest
+
+    Returns:
+        Score; higher is more informative
+    """
+    scores = [
+        score for score in (entry.get("judge_scores") or {}).values()
+        if isinstance(score, (int, float))
+    ]
+    # Samples the judges disliked show what the prompts get wrong
+    score = 1.0 - min(scores) if scores else 0.5
+    if (entry.get("tests_failed") or 0) > 0:
+        score += FAILING_TESTS_WEIGHT
+    return score + RECENCY_WEIGHT * recency
+
+
+def select_batch(
+    entries: list[dict],
+    training_data_dir: Path,
+    batch_size: int,
+    token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET,
+) -> list[dict]:
+    """Pick the most informative samples that fit the token budget.
+
+    Samples are chosen greedily by score, re-ranking after each pick so that
+    samples sharing a prompt fingerprint with already chosen ones are
+    penalized. A sample that does not fit the remaining budget is skipped in
+    favor of smaller ones. The single best sample is always chosen, even if
+    it alone exceeds the budget (serialization trims it to fit).
+
+    Args:
+        entries: Manifest entries of candidate samples
+        training_data_dir: Directory containing the sample directories
+        batch_size: Maximum number of samples
+        token_budget: Maximum estimated tokens for the batch (None = unlimited)
+
+    Returns:
+        Chosen entries, in selection order
+    """
+    if not entries or batch_size < 1:
+        return []
+
+    # Rank creation times so recency is independent of clock units
+    timestamps = sorted({entry.get("created_at") or "" for entry in entries})
+    age_rank = {timestamp: i for i, timestamp in enumerate(timestamps)}
+    span = max(len(timestamps) - 1, 1)
+    base_scores = {
+        entry["plan_id"]: score_entry(entry, age_rank[entry.get("created_at") or ""] / span)
+        for entry in entries
+    }
+
+    remaining = {entry["plan_id"]: entry for entry in entries}
+    estimates = {
+        plan_id: estimate_sample_tokens(training_data_dir / plan_id, entry)
+        for plan_id, entry in remaining.items()
+    }
+    fingerprint_counts: dict[Optional[str], int] = {}
+    selected: list[dict] = []
+    used_tokens = 0
+
+    def rank(plan_id: str) -> tuple[float, str]:
+        fingerprint = remaining[plan_id].get("prompt_fingerprint")
+        penalty = DUPLICATE_PENALTY * fingerprint_counts.get(fingerprint, 0)
+        return (penalty - base_scores[plan_id], plan_id)
+
+    while remaining and len(selected) < batch_size:
+        fitting = [
+            plan_id for plan_id in remaining
+            if token_budget is None
+            or not selected
+            or used_tokens + estimates[plan_id] <= token_budget
+        ]
+        if not fitting:
+            break
+
+        entry = remaining.pop(min(fitting, key=rank))
+        used_tokens += estimates[entry["plan_id"]]
+        fingerprint = entry.get("prompt_fingerprint")
+        fingerprint_counts[fingerprint] = fingerprint_counts.get(fingerprint, 0) + 1
+        selected.append(entry)
+
+    logger.info(
+        "Selected %d training sample(s), ~%d estimated tokens%s",
+        len(selected),
+        used_tokens,
+        f" (budget {token_budget})" if token_budget is not None else "",
+    )
+    return selected
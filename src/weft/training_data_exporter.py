@@ -6,21 +6,36 @@ expected to be committed to git.
 
 Training data includes:
 - plan.md - copy of the plan
-- code_trace.md - trace from code session
+- code_trace.md - trace from code session (code_trace.md.gz/.zst when
+  [traces] compression is configured)
+- code_trace.ndjson / code_trace.index.json - structured trace sidecar (if captured)
 - test_results_before.json / test_results_after.json - test execution results
 - human_feedback.md - human feedback on the implementation
 - judge_<name>.json / judge_<name>.md - per-judge results
+
+Each created sample is also recorded in the training data manifest
+(.weft/training_data/index.jsonl, see training_manifest), and artifacts
+shared between samples (prompts, plans, patches, traces) are hardlinked to
+blobs in the content-addressed object store (.weft/objects/, see
+object_store) so identical copies take no extra disk space.
 """
 
 from __future__ import annotations
 
 import json
+import os
+import secrets
 import shutil
-import tempfile
+import time
 from pathlib import Path
 from typing import Optional
 
+from .config import get_trace_compression
 from .logging_config import get_logger
+from .object_store import dedupe_sample, garbage_collect
+from .trace_parser import sidecar_paths
+from .trace_storage import TraceStorageError, copy_trace, trace_exists
+from .training_manifest import TrainingManifestError, update_manifest_entry
 
 logger = get_logger(__name__)
 
@@ -74,14 +89,19 @@ def copy_code_trace(
     source = repo_root / ".weft" / "sessions" / plan_id / "code" / "trace.md"
     dest = staging_dir / "code_trace.md"
 
-    if not source.exists():
+    if not trace_exists(source):
         return "Code trace not found. Training example will be incomplete."
 
     try:
-        shutil.copy2(source, dest)
-        logger.debug("Copied code trace to staging")
+        # Stored in the configured format (code_trace.md[.gz|.zst])
+        stored = copy_trace(source, dest, get_trace_compression())
+        # Structured sidecar travels with the trace; it is optional (legacy traces)
+        for sidecar_source, sidecar_dest in zip(sidecar_paths(source), sidecar_paths(dest), strict=True):
+            if sidecar_source.exists():
+                shutil.copy2(sidecar_source, sidecar_dest)
+        logger.debug("Copied code trace to staging as %s", stored.name)
         return None
-    except OSError as exc:
+    except (OSError, TraceStorageError) as exc:
         raise TrainingDataExportError(f"Failed to copy code trace: {exc}") from exc
 
 
@@ -317,7 +337,8 @@ def validate_training_data(training_data_dir: Path) -> list[str]:
 
     for filename, is_required in required_files:
         filepath = training_data_dir / filename
-        if not filepath.exists():
+        exists = trace_exists(filepath) if filename == "code_trace.md" else filepath.exists()
+        if not exists:
             if is_required:
                 warnings.append(f"Missing required file: {filename}")
             else:
@@ -336,13 +357,79 @@ def validate_training_data(training_data_dir: Path) -> list[str]:
     return warnings
 
 
+# Staging directories live next to the samples so the commit is a single
+# same-filesystem rename. Hidden, so sample discovery never sees them, and
+# gitignored by `weft init`, so a crashed export is never committed.
+STAGING_DIRNAME = ".staging"
+
+# Staging directories older than this are abandoned even if their creating
+# process cannot be checked
+STALE_STAGING_SECONDS = 24 * 60 * 60
+
+
+def _process_alive(pid: int) -> bool:
+    """Return True if a process with this PID may still be running."""
+    if os.name != "posix":
+        # Signal 0 is only a liveness probe on POSIX
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def cleanup_abandoned_staging(repo_root: Path) -> int:
+    """Remove staging directories left behind by crashed exports.
+
+    A staging directory (<plan_id>.<pid>.<random>) is abandoned when the
+    process that created it is gone, or when it is older than
+    STALE_STAGING_SECONDS.
+
+    Args:
+        repo_root: Repository root directory
+
+    Returns:
+        Number of staging directories removed
+    """
+    staging_root = repo_root / ".weft" / "training_data" / STAGING_DIRNAME
+    if not staging_root.exists():
+        return 0
+
+    removed = 0
+    now = time.time()
+    for staging_dir in staging_root.iterdir():
+        parts = staging_dir.name.rsplit(".", 2)
+        pid = int(parts[1]) if len(parts) == 3 and parts[1].isdigit() else None
+        try:
+            age = now - staging_dir.stat().st_mtime
+        except OSError:
+            continue
+        if pid == os.getpid():
+            continue
+        if pid is not None and _process_alive(pid) and age < STALE_STAGING_SECONDS:
+            continue
+        if pid is None and age < STALE_STAGING_SECONDS:
+            continue
+
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        logger.info("Removed abandoned training data staging directory %s", staging_dir.name)
+        removed += 1
+    return removed
+
+
 def create_training_data(plan_id: str, repo_root: Path, eval_fingerprint: str) -> Path:
     """Create permanent training data from evaluation results.
 
     Uses staging directory pattern for atomic operations:
-    1. Collect all artifacts in temp directory
-    2. Only copy to training_data/ if all steps succeed
-    3. If any step fails, clean up temp directory and raise
+    1. Collect all artifacts in .weft/training_data/.staging/<plan_id>.<pid>.<random>/
+    2. Only if all steps succeed, rename it to training_data/<plan_id> (a
+       single atomic rename on the same filesystem, no second copy)
+    3. If any step fails, remove the staging directory and raise
+
+    Staging directories abandoned by crashed exports are removed first.
 
     Args:
         plan_id: Plan identifier
@@ -364,10 +451,20 @@ def create_training_data(plan_id: str, repo_root: Path, eval_fingerprint: str) -
 
     logger.info("Creating training data for %s...", plan_id)
 
-    # Use staging directory for atomic commit
-    with tempfile.TemporaryDirectory() as staging:
-        staging_path = Path(staging)
+    cleanup_abandoned_staging(repo_root)
+    staging_root = training_data_dir.parent / STAGING_DIRNAME
+    try:
+        staging_root.mkdir(parents=True, exist_ok=True)
+        # Unlike mkdtemp, mkdir honors the umask, so the committed sample
+        # gets ordinary directory permissions
+        staging_path = staging_root / f"{plan_id}.{os.getpid()}.{secrets.token_hex(4)}"
+        staging_path.mkdir()
+    except OSError as exc:
+        raise TrainingDataExportError(
+            f"Failed to create staging directory: {exc}"
+        ) from exc
 
+    try:
         # Copy all files to staging
         copy_plan_file(plan_id, repo_root, staging_path)
 
@@ -405,14 +502,27 @@ def create_training_data(plan_id: str, repo_root: Path, eval_fingerprint: str) -
                 raise TrainingDataExportError(warn)
             logger.warning(warn)
 
-        # Atomic commit: copy staging to training_data
+        # Atomic commit: rename staging into place
         try:
-            training_data_dir.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copytree(staging_path, training_data_dir)
+            os.rename(staging_path, training_data_dir)
             logger.info("Training data created at: %s", training_data_dir)
         except OSError as exc:
             raise TrainingDataExportError(
                 f"Failed to create training data directory: {exc}"
             ) from exc
+    except BaseException:
+        shutil.rmtree(staging_path, ignore_errors=True)
+        raise
+
+    # Share identical artifacts with other samples, and drop blobs only
+    # referenced by a sample this one replaced
+    dedupe_sample(repo_root, training_data_dir)
+    garbage_collect(repo_root)
+
+    # Index the new sample; a missing entry is recreated on the next load
+    try:
+        update_manifest_entry(repo_root, plan_id)
+    except TrainingManifestError as exc:
+        logger.warning("Failed to update training manifest: %s", exc)
 
     return training_data_dir
@@ -10,15 +10,25 @@ over full code_trace.md files to reduce context size for prompt optimization.
 
 from __future__ import annotations
 
+import concurrent.futures
 import json
+from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import Collection, Optional
 
 from .logging_config import get_logger
+from .summary_cache import SummaryCache, read_summary_metadata, summary_metadata_path
+from .trace_storage import TraceStorageError, read_trace_text, trace_exists
+from .training_batch import DEFAULT_TOKEN_BUDGET, select_batch
+from .training_manifest import filter_manifest, load_manifest
 from .training_types import PromptSnapshot, SubagentDefinition, TrainingSample
 
 logger = get_logger(__name__)
 
+# Upper bound on concurrent sample loads (and thus summarization LLM calls);
+# matches the maximum train --batch-size so a full batch runs at once
+MAX_LOAD_WORKERS = 10
+
 
 class TrainingDataLoadError(Exception):
     """Raised when training data loading fails."""
@@ -33,13 +43,18 @@ def _get_or_create_summary(
     """Get trace summary, generating it if needed.
 
     Handles lazy generation of trace summaries:
-    1. If code_trace_summary.md exists and is newer than code_trace.md: use it
-    2. If code_trace.md exists but no summary (or stale): generate summary
+    1. If code_trace_summary.md exists and still matches code_trace.md: use it
+    2. If code_trace.md exists but no summary (or stale): generate summary,
+       reusing a cached summary of identical content if one exists
     3. If neither exists: return empty string
 
+    Without a model the summary is extractive (built locally, no LM calls);
+    an extractive summary is replaced once a model is provided.
+
     Args:
         sample_dir: Path to the training sample directory
-        model: OpenRouter model for summarization. If None, skips generation.
+        model: OpenRouter model for summarization. If None, builds an
+               extractive summary instead.
 
     Returns:
         Trace summary content, or empty string if no trace available
@@ -54,12 +69,14 @@ def _get_or_create_summary(
         needs_regeneration,
     )
 
+    # code_trace.md may be stored compressed (code_trace.md.gz / .zst)
     trace_path = sample_dir / "code_trace.md"
     summary_path = sample_dir / "code_trace_summary.md"
+    has_trace = trace_exists(trace_path)
 
     # Check if summary exists and is up to date
     if summary_path.exists():
-        if not trace_path.exists():
+        if not has_trace:
             # Summary exists but no trace - use summary
             try:
                 return summary_path.read_text(encoding="utf-8")
@@ -68,7 +85,7 @@ def _get_or_create_summary(
                 return ""
 
         # Both exist - check if regeneration is needed
-        if not needs_regeneration(trace_path, summary_path):
+        if not needs_regeneration(trace_path, summary_path, model):
             # Summary is up to date
             logger.debug("Using existing trace summary for %s", sample_dir.name)
             try:
@@ -77,16 +94,20 @@ def _get_or_create_summary(
                 logger.warning("Failed to read trace summary: %s", exc)
                 # Fall through to regenerate
 
-    # Need to generate summary (or use full trace if no model)
-    if not trace_path.exists():
+    if not has_trace:
         return ""
 
     if model is None:
-        # No model provided - fall back to full trace
-        logger.debug("No model provided, using full trace for %s", sample_dir.name)
+        # No model provided - summarize locally without network calls
+        logger.debug("No model provided, extracting summary for %s", sample_dir.name)
         try:
-            return trace_path.read_text(encoding="utf-8")
-        except OSError as exc:
+            summary_path = create_trace_summary(trace_path, None)
+            return summary_path.read_text(encoding="utf-8")
+        except (TraceSummarizationError, OSError) as exc:
+            logger.warning("Extractive summary failed, using full trace: %s", exc)
+        try:
+            return read_trace_text(trace_path)
+        except (OSError, TraceStorageError, UnicodeDecodeError) as exc:
             logger.warning("Failed to read trace file: %s", exc)
             return ""
 
@@ -188,6 +209,9 @@ def _load_metadata_from_training_data(
 def discover_training_samples(repo_root: Path) -> list[str]:
     """Discover available training sample plan_ids.
 
+    Reads the training data manifest (.weft/training_data/index.jsonl)
+    rather than opening every sample directory.
+
     Args:
         repo_root: Repository root directory
 
@@ -204,14 +228,10 @@ def discover_training_samples(repo_root: Path) -> list[str]:
             f"Training data directory not found: {training_data_dir}"
         )
 
-    # Find all subdirectories (each is a plan_id)
-    plan_ids = []
-    for item in training_data_dir.iterdir():
-        if item.is_dir():
-            plan_ids.append(item.name)
+    plan_ids = [entry["plan_id"] for entry in load_manifest(repo_root)]
 
     logger.debug("Discovered %d training sample(s)", len(plan_ids))
-    return sorted(plan_ids)
+    return plan_ids
 
 
 def _format_judge_results(training_sample_dir: Path) -> str:
@@ -250,25 +270,153 @@ def _format_judge_results(training_sample_dir: Path) -> str:
     return "\n\n---\n\n".join(results) if results else "Failed to parse judge results."
 
 
-def load_training_sample(
+# Text files read into TrainingSample fields, by field name
+_REQUIRED_FILES = {
+    "human_feedback": "human_feedback.md",
+    "test_results_after": "test_results_after.json",
+}
+_OPTIONAL_FILES = {
+    "plan_content": "plan.md",
+    "test_results_before": "test_results_before.json",
+}
+
+
+class LazyTrainingSample:
+    """A training sample whose content is read from disk on first access.
+
+    Exposes the same attributes as TrainingSample. plan_id and the metadata
+    fields (tool, model, fingerprints) are available immediately; the text
+    fields, prompts and trace summary are each read (or generated) the first
+    time they are accessed and then kept. Listing and filtering samples
+    therefore costs no file reads beyond metadata.
+
+    Accessing a required field whose file cannot be read raises
+    TrainingDataLoadError, as does a failed trace summary when a
+    summarization model was given.
+    """
+
+    def __init__(
+        self,
+        sample_dir: Path,
+        model: Optional[str] = None,
+        metadata: Optional[tuple[str, Optional[str], Optional[str], Optional[str]]] = None,
+    ):
+        """Initialize the sample.
+
+        Args:
+            sample_dir: Path to the training sample directory
+            model: OpenRouter model for trace summarization (see _get_or_create_summary)
+            metadata: (tool, model, prompt_fingerprint, eval_fingerprint) if
+                already known, e.g. from the training data manifest
+        """
+        self.sample_dir = sample_dir
+        self.plan_id = sample_dir.name
+        self._summary_model = model
+        if metadata is None:
+            metadata = _load_metadata_from_training_data(sample_dir)
+        self.tool, self.model, self.prompt_fingerprint, self.eval_fingerprint = metadata
+
+    def __repr__(self) -> str:
+        return f"LazyTrainingSample(plan_id={self.plan_id!r})"
+
+    def _read_required(self, field: str) -> str:
+        filename = _REQUIRED_FILES[field]
+        try:
+            return (self.sample_dir / filename).read_text(encoding="utf-8")
+        except OSError as exc:
+            raise TrainingDataLoadError(
+                f"Failed to read {filename} for {self.plan_id}: {exc}"
+            ) from exc
+
+    def _read_optional(self, field: str) -> str:
+        filepath = self.sample_dir / _OPTIONAL_FILES[field]
+        if not filepath.exists():
+            return ""
+        try:
+            return filepath.read_text(encoding="utf-8")
+        except OSError as exc:
+            logger.warning("Failed to read optional file %s: %s", filepath.name, exc)
+            return ""
+
+    @cached_property
+    def plan_content(self) -> str:
+        return self._read_optional("plan_content")
+
+    @cached_property
+    def human_feedback(self) -> str:
+        return self._read_required("human_feedback")
+
+    @cached_property
+    def test_results_before(self) -> str:
+        return self._read_optional("test_results_before")
+
+    @cached_property
+    def test_results_after(self) -> str:
+        return self._read_required("test_results_after")
+
+    @cached_property
+    def code_trace(self) -> str:
+        # Prioritizes code_trace_summary.md over full trace
+        return _get_or_create_summary(self.sample_dir, self._summary_model)
+
+    @cached_property
+    def judge_results(self) -> str:
+        return _format_judge_results(self.sample_dir)
+
+    @cached_property
+    def used_prompts(self) -> Optional[PromptSnapshot]:
+        return _load_prompts_from_training_data(self.sample_dir)
+
+    def load(self) -> TrainingSample:
+        """Read every field and return an eager TrainingSample.
+
+        Raises:
+            TrainingDataLoadError: If a required field cannot be loaded
+        """
+        return TrainingSample(
+            plan_id=self.plan_id,
+            plan_content=self.plan_content,
+            code_trace=self.code_trace,
+            human_feedback=self.human_feedback,
+            judge_results=self.judge_results,
+            test_results_before=self.test_results_before,
+            test_results_after=self.test_results_after,
+            used_prompts=self.used_prompts,
+            tool=self.tool,
+            model=self.model,
+            prompt_fingerprint=self.prompt_fingerprint,
+            eval_fingerprint=self.eval_fingerprint,
+        )
+
+    def model_dump(self) -> dict:
+        """Return the sample as a dict, like TrainingSample.model_dump()."""
+        return self.load().model_dump()
+
+
+def open_training_sample(
     repo_root: Path,
     plan_id: str,
     model: Optional[str] = None,
-) -> TrainingSample:
-    """Load a complete training sample by plan_id.
+    entry: Optional[dict] = None,
+) -> LazyTrainingSample:
+    """Open a training sample without reading its content.
+
+    Only checks that the required files exist; content is read on access.
 
     Args:
         repo_root: Repository root directory
         plan_id: Identifier for the training sample
         model: OpenRouter model for trace summarization (from train --model).
                If provided, enables lazy summary generation.
+        entry: The sample's training manifest entry, if already loaded; its
+               metadata is used instead of reading metadata.json
 
     Returns:
-        TrainingSample with all loaded data
+        LazyTrainingSample for the sample
 
     Raises:
-        TrainingDataLoadError: If required files are missing, cannot be read,
-                               or if summarization fails when model is provided
+        TrainingDataLoadError: If the sample directory, a required file or
+                               the judge results are missing
     """
     training_sample_dir = repo_root / ".weft" / "training_data" / plan_id
 
@@ -277,122 +425,185 @@ def load_training_sample(
             f"Training sample directory not found: {training_sample_dir}"
         )
 
-    # Required files
-    required_files = {
-        "human_feedback.md": "human_feedback",
-        "test_results_after.json": "test_results_after",
-    }
-
-    # Optional files (excluding code_trace which is handled separately)
-    optional_files = {
-        "plan.md": "plan_content",
-        "test_results_before.json": "test_results_before",
-    }
-
-    data: dict[str, str] = {"plan_id": plan_id}
-
-    # Load required files
-    for filename, field in required_files.items():
-        filepath = training_sample_dir / filename
-        if not filepath.exists():
+    for filename in _REQUIRED_FILES.values():
+        if not (training_sample_dir / filename).exists():
             raise TrainingDataLoadError(
                 f"Required file missing for {plan_id}: {filename}"
             )
-        try:
-            data[field] = filepath.read_text(encoding="utf-8")
-        except OSError as exc:
-            raise TrainingDataLoadError(
-                f"Failed to read {filename} for {plan_id}: {exc}"
-            ) from exc
-
-    # Load optional files
-    for filename, field in optional_files.items():
-        filepath = training_sample_dir / filename
-        if filepath.exists():
-            try:
-                data[field] = filepath.read_text(encoding="utf-8")
-            except OSError as exc:
-                logger.warning("Failed to read optional file %s: %s", filename, exc)
-                data[field] = ""
-        else:
-            data[field] = ""
-
-    # Load code trace with summary support
-    # Prioritizes code_trace_summary.md over full trace
-    data["code_trace"] = _get_or_create_summary(training_sample_dir, model)
 
-    # Load prompts (optional)
-    used_prompts = _load_prompts_from_training_data(training_sample_dir)
-
-    # Load metadata (optional)
-    tool, metadata_model, prompt_fingerprint, eval_fingerprint = _load_metadata_from_training_data(
-        training_sample_dir
-    )
-
-    # Check for at least one judge result
-    judge_files = list(training_sample_dir.glob("judge_*.json"))
-    if not judge_files:
+    # Check for at least one judge result (the manifest already knows)
+    has_judges = bool(entry.get("judge_scores")) if entry is not None else None
+    if has_judges is None:
+        has_judges = next(training_sample_dir.glob("judge_*.json"), None) is not None
+    if not has_judges:
         raise TrainingDataLoadError(
             f"No judge results found for {plan_id}. "
             f"Expected judge_*.json files in {training_sample_dir}"
         )
 
-    # Format judge results
-    data["judge_results"] = _format_judge_results(training_sample_dir)
+    metadata = None
+    if entry is not None:
+        metadata = (
+            entry.get("tool") or "claude-code",
+            entry.get("model"),
+            entry.get("prompt_fingerprint"),
+            entry.get("eval_fingerprint"),
+        )
+    return LazyTrainingSample(training_sample_dir, model=model, metadata=metadata)
+
+
+def list_training_samples(
+    repo_root: Path,
+    summary_model: Optional[str] = None,
+    **criteria,
+) -> list[LazyTrainingSample]:
+    """List training samples from the manifest without reading their content.
+
+    Samples that are incomplete on disk are logged and skipped.
+
+    Args:
+        repo_root: Repository root directory
+        summary_model: OpenRouter model for trace summarization when
+                       code_trace is accessed
+        **criteria: Filters passed to training_manifest.filter_manifest
+                    (tool, model, prompt_fingerprint, eval_fingerprint, min_score)
 
+    Returns:
+        LazyTrainingSample objects sorted by plan_id
+    """
+    samples = []
+    for entry in filter_manifest(load_manifest(repo_root), **criteria):
+        try:
+            samples.append(
+                open_training_sample(repo_root, entry["plan_id"], summary_model, entry)
+            )
+        except TrainingDataLoadError as exc:
+            logger.warning("Skipping sample %s: %s", entry["plan_id"], exc)
+    return samples
+
+
+def load_training_sample(
+    repo_root: Path,
+    plan_id: str,
+    model: Optional[str] = None,
+) -> TrainingSample:
+    """Load a complete training sample by plan_id.
+
+    Args:
+        repo_root: Repository root directory
+        plan_id: Identifier for the training sample
+        model: OpenRouter model for trace summarization (from train --model).
+               If provided, enables lazy summary generation.
+
+    Returns:
+        TrainingSample with all loaded data
+
+    Raises:
+        TrainingDataLoadError: If required files are missing, cannot be read,
+                               or if summarization fails when model is provided
+    """
+    sample = open_training_sample(repo_root, plan_id, model=model).load()
     logger.debug("Loaded training sample: %s", plan_id)
-    return TrainingSample(
-        **data,
-        used_prompts=used_prompts,
-        tool=tool,
-        model=metadata_model,
-        prompt_fingerprint=prompt_fingerprint,
-        eval_fingerprint=eval_fingerprint,
-    )
+    return sample
+
+
+def _load_selected_sample(
+    repo_root: Path, plan_id: str, model: Optional[str], entry: dict
+) -> TrainingSample:
+    return open_training_sample(repo_root, plan_id, model=model, entry=entry).load()
 
 
 def load_training_batch(
     repo_root: Path,
     batch_size: int = 3,
     model: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET,
+    exclude: Collection[str] = (),
 ) -> list[TrainingSample]:
     """Load a batch of training samples.
 
+    The most informative samples that fit the token budget are chosen from
+    the training manifest (see training_batch.select_batch). They are loaded
+    on a bounded thread pool so missing trace summaries for the whole batch
+    are generated concurrently. A sample that fails to load is logged and
+    skipped without affecting the others.
+
     Args:
         repo_root: Repository root directory
         batch_size: Maximum number of samples to load (default: 3)
         model: OpenRouter model for trace summarization (from train --model).
                If provided, enables lazy summary generation.
+        max_workers: Maximum concurrent sample loads (default: MAX_LOAD_WORKERS)
+        token_budget: Estimated token budget for the batch (None = unlimited)
+        exclude: Plan IDs never to select (e.g. plans held out for evaluation)
 
     Returns:
-        List of TrainingSample objects
+        List of TrainingSample objects, most informative first
 
     Raises:
         TrainingDataLoadError: If no training samples are available
     """
-    plan_ids = discover_training_samples(repo_root)
+    training_data_dir = repo_root / ".weft" / "training_data"
+    if not training_data_dir.exists():
+        raise TrainingDataLoadError(
+            f"Training data directory not found: {training_data_dir}"
+        )
 
-    if not plan_ids:
+    entries = [entry for entry in load_manifest(repo_root) if entry["plan_id"] not in exclude]
+    if not entries:
         raise TrainingDataLoadError(
             "No training samples found. Run 'weft eval' first to generate training data."
         )
 
-    # Limit to batch_size
-    selected_ids = plan_ids[:batch_size]
+    selected = {
+        entry["plan_id"]: entry
+        for entry in select_batch(entries, training_data_dir, batch_size, token_budget)
+    }
+    # Most informative first, as select_batch chose them
+    selected_ids = list(selected)
     logger.info(
         "Loading %d training sample(s) from %d available",
         len(selected_ids),
-        len(plan_ids),
+        len(entries),
     )
 
-    samples = []
-    for plan_id in selected_ids:
-        try:
-            sample = load_training_sample(repo_root, plan_id, model=model)
-            samples.append(sample)
-        except TrainingDataLoadError as exc:
-            logger.warning("Skipping sample %s: %s", plan_id, exc)
-            continue
+    # Samples are loaded concurrently: a cold load is dominated by blocking
+    # LLM summarization calls, which are I/O bound, so threads work well
+    if max_workers is None:
+        max_workers = MAX_LOAD_WORKERS
+    workers = max(1, min(max_workers, len(selected_ids)))
+
+    loaded: dict[str, TrainingSample] = {}
+    completed = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        future_to_plan_id = {
+            executor.submit(_load_selected_sample, repo_root, plan_id, model, selected[plan_id]): plan_id
+            for plan_id in selected_ids
+        }
+
+        # Failures are isolated per sample; the rest of the batch still loads
+        for future in concurrent.futures.as_completed(future_to_plan_id):
+            plan_id = future_to_plan_id[future]
+            completed += 1
+            try:
+                loaded[plan_id] = future.result()
+                logger.info("  [%d/%d] Loaded %s", completed, len(selected_ids), plan_id)
+            except TrainingDataLoadError as exc:
+                logger.warning(
+                    "  [%d/%d] Skipping sample %s: %s", completed, len(selected_ids), plan_id, exc
+                )
+            except Exception as exc:
+                logger.warning(
+                    "  [%d/%d] Skipping sample %s after unexpected error: %s",
+                    completed,
+                    len(selected_ids),
+                    plan_id,
+                    exc,
+                )
+
+    # Keep the selection order regardless of completion order
+    samples = [loaded[plan_id] for plan_id in selected_ids if plan_id in loaded]
 
     if not samples:
         raise TrainingDataLoadError(
@@ -405,6 +616,9 @@ def load_training_batch(
 def delete_trace_summaries(repo_root: Path) -> int:
     """Delete all existing trace summaries for regeneration.
 
+    Cached copies of the deleted summaries are evicted from the summary
+    cache as well, so they are actually regenerated.
+
     Args:
         repo_root: Repository root directory
 
@@ -416,6 +630,7 @@ def delete_trace_summaries(repo_root: Path) -> int:
     if not training_data_dir.exists():
         return 0
 
+    cache = SummaryCache()
     deleted = 0
     for sample_dir in training_data_dir.iterdir():
         if not sample_dir.is_dir():
@@ -423,8 +638,13 @@ def delete_trace_summaries(repo_root: Path) -> int:
 
         summary_path = sample_dir / "code_trace_summary.md"
         if summary_path.exists():
+            # Drop the cached copy too, or the summary would be restored from cache
+            metadata = read_summary_metadata(summary_path)
+            if metadata is not None and isinstance(metadata.get("cache_key"), str):
+                cache.discard(metadata["cache_key"])
             try:
                 summary_path.unlink()
+                summary_metadata_path(summary_path).unlink(missing_ok=True)
                 logger.debug("Deleted summary: %s", summary_path)
                 deleted += 1
             except OSError as exc:
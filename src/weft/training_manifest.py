@@ -0,0 +1,343 @@
+"""Manifest of training samples in .weft/training_data/.
+
+Training, listing and filtering need a handful of facts about every sample
+(fingerprints, judge scores, test counts, trace size). Reading them from
+each sample directory means opening metadata.json, every judge_*.json and
+the test results of hundreds of samples. Instead, create_training_data
+records one summary line per sample in:
+
+    .weft/training_data/index.jsonl
+
+Each line is a JSON object:
+
+    {"plan_id": "...", "tool": "claude-code", "model": "opus",
+     "prompt_fingerprint": "16b06dd1", "eval_fingerprint": "3d55fe1e",
+     "judge_scores": {"code-reuse": 0.9}, "tests_passed": 10,
+     "tests_failed": 0, "tests_total": 10, "trace_size": 271021,
+     "recorded_at": "2024-12-10T00:00:00Z", "created_at": "...",
+     "source_stamp": "..."}
+
+The manifest is a local cache derived from the committed samples, so it is
+gitignored rather than committed alongside them. It is reconciled with the
+samples on load: samples added without it (e.g. pulled from git) are
+indexed, entries for removed samples are dropped, and a sample whose
+metadata, judge results, test results or trace changed since it was indexed
+(e.g. by `git pull` or `weft eval --force`) is re-indexed. Only those files'
+modification times and sizes are checked; unchanged samples are not read.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from .logging_config import get_logger
+from .trace_storage import (
+    COMPRESSION_SUFFIXES,
+    TraceStorageError,
+    content_size,
+    trace_exists,
+)
+
+logger = get_logger(__name__)
+
+MANIFEST_FILENAME = "index.jsonl"
+
+# Files a manifest entry is derived from, besides judge_*.json; the trace
+# counts in every stored (possibly compressed) form
+_SOURCE_FILENAMES = frozenset(
+    {"metadata.json", "test_results_after.json", "code_trace.md"}
+    | {"code_trace.md" + suffix for suffix in COMPRESSION_SUFFIXES.values()}
+)
+
+
+class TrainingManifestError(Exception):
+    """Raised when the training data manifest cannot be written."""
+
+    pass
+
+
+def get_training_data_dir(repo_root: Path) -> Path:
+    """Return the training data directory (.weft/training_data/)."""
+    return repo_root / ".weft" / "training_data"
+
+
+def get_manifest_path(repo_root: Path) -> Path:
+    """Return the manifest path (.weft/training_data/index.jsonl)."""
+    return get_training_data_dir(repo_root) / MANIFEST_FILENAME
+
+
+def _read_json(path: Path) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("Failed to read %s: %s", path, exc)
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def source_stamp(sample_dir: Path) -> str:
+    """Fingerprint the names, sizes and mtimes of a sample's source files.
+
+    Args:
+        sample_dir: Path to the training sample directory
+
+    Returns:
+        Short hex digest that changes whenever a source file is added,
+        removed or rewritten ("" if the directory cannot be listed)
+    """
+    digest = hashlib.sha256()
+    try:
+        with os.scandir(sample_dir) as it:
+            stats = sorted(
+                (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+                for entry in it
+                if entry.is_file()
+                and (
+                    entry.name in _SOURCE_FILENAMES
+                    or (entry.name.startswith("judge_") and entry.name.endswith(".json"))
+                )
+            )
+    except OSError:
+        return ""
+    for name, mtime_ns, size in stats:
+        digest.update(f"{name}\0{mtime_ns}\0{size}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def build_manifest_entry(sample_dir: Path) -> dict:
+    """Summarize a training sample directory as a manifest entry.
+
+    Missing or unreadable files leave the corresponding fields empty.
+
+    Args:
+        sample_dir: Path to the training sample directory
+
+    Returns:
+        Manifest entry dictionary
+    """
+    metadata = _read_json(sample_dir / "metadata.json") or {}
+
+    judge_scores = {}
+    for judge_file in sorted(sample_dir.glob("judge_*.json")):
+        judge_data = _read_json(judge_file)
+        if judge_data is None:
+            continue
+        name = judge_data.get("judge_name", judge_file.stem[len("judge_"):])
+        judge_scores[name] = judge_data.get("score")
+
+    test_results = _read_json(sample_dir / "test_results_after.json") or {}
+
+    trace_path = sample_dir / "code_trace.md"
+    trace_size = None
+    if trace_exists(trace_path):
+        try:
+            trace_size = content_size(trace_path)
+        except (OSError, TraceStorageError) as exc:
+            logger.warning("Failed to size trace %s: %s", trace_path, exc)
+
+    # The session's recording time is the same in every clone; the
+    # directory mtime is only a fallback for samples without one
+    created_at = metadata.get("recorded_at")
+    if not created_at:
+        try:
+            created_at = datetime.fromtimestamp(
+                sample_dir.stat().st_mtime, tz=timezone.utc
+            ).isoformat()
+        except OSError:
+            created_at = None
+
+    return {
+        "plan_id": sample_dir.name,
+        "tool": metadata.get("tool", "claude-code"),
+        "model": metadata.get("model"),
+        "prompt_fingerprint": metadata.get("prompt_fingerprint"),
+        "eval_fingerprint": metadata.get("eval_fingerprint"),
+        "judge_scores": judge_scores,
+        "tests_passed": test_results.get("passed_tests"),
+        "tests_failed": test_results.get("failed_tests"),
+        "tests_total": test_results.get("total_tests"),
+        "trace_size": trace_size,
+        "recorded_at": metadata.get("recorded_at"),
+        "created_at": created_at,
+        "source_stamp": source_stamp(sample_dir),
+    }
+
+
+def _read_entries(manifest_path: Path) -> Optional[dict[str, dict]]:
+    """Read manifest entries keyed by plan_id (later lines win), or None if missing."""
+    try:
+        text = manifest_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    except OSError as exc:
+        logger.warning("Failed to read training manifest %s: %s", manifest_path, exc)
+        return None
+
+    entries: dict[str, dict] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            logger.debug("Skipping corrupt manifest line in %s", manifest_path)
+            continue
+        if isinstance(entry, dict) and isinstance(entry.get("plan_id"), str):
+            entries[entry["plan_id"]] = entry
+    return entries
+
+
+def _write_entries(manifest_path: Path, entries: dict[str, dict]) -> None:
+    """Atomically rewrite the manifest, sorted by plan_id.
+
+    Raises:
+        TrainingManifestError: If the manifest cannot be written
+    """
+    lines = [
+        json.dumps(entries[plan_id], sort_keys=True) + "\n"
+        for plan_id in sorted(entries)
+    ]
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=manifest_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.writelines(lines)
+            os.replace(tmp_name, manifest_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError as exc:
+        raise TrainingManifestError(
+            f"Failed to write training manifest {manifest_path}: {exc}"
+        ) from exc
+
+
+def _sample_names(training_data_dir: Path) -> set[str]:
+    """List sample directory names without reading into them.
+
+    Hidden directories (such as the exporter's .staging/) are not samples.
+    """
+    with os.scandir(training_data_dir) as it:
+        return {
+            entry.name for entry in it
+            if entry.is_dir() and not entry.name.startswith(".")
+        }
+
+
+def load_manifest(repo_root: Path) -> list[dict]:
+    """Load the training data manifest, reconciling it with the directory.
+
+    Samples without an entry or whose source files changed are (re-)indexed
+    and entries for removed samples are dropped; the manifest is rewritten
+    only if something changed.
+
+    Args:
+        repo_root: Repository root directory
+
+    Returns:
+        Manifest entries sorted by plan_id (empty if there is no training data)
+    """
+    training_data_dir = get_training_data_dir(repo_root)
+    if not training_data_dir.is_dir():
+        return []
+
+    manifest_path = get_manifest_path(repo_root)
+    entries = _read_entries(manifest_path)
+    changed = entries is None
+    if entries is None:
+        entries = {}
+
+    names = _sample_names(training_data_dir)
+    for plan_id in names:
+        sample_dir = training_data_dir / plan_id
+        entry = entries.get(plan_id)
+        if entry is not None and entry.get("source_stamp") == source_stamp(sample_dir):
+            continue
+        entries[plan_id] = build_manifest_entry(sample_dir)
+        changed = True
+    for plan_id in entries.keys() - names:
+        del entries[plan_id]
+        changed = True
+
+    if changed:
+        logger.debug("Updating training manifest (%d sample(s))", len(entries))
+        try:
+            _write_entries(manifest_path, entries)
+        except TrainingManifestError as exc:
+            # The in-memory manifest is still correct; just slower next time
+            logger.warning("%s", exc)
+
+    return [entries[plan_id] for plan_id in sorted(entries)]
+
+
+def update_manifest_entry(repo_root: Path, plan_id: str) -> dict:
+    """Index (or re-index) one training sample.
+
+    Args:
+        repo_root: Repository root directory
+        plan_id: Identifier of the sample to index
+
+    Returns:
+        The sample's new manifest entry
+
+    Raises:
+        TrainingManifestError: If the manifest cannot be written
+    """
+    manifest_path = get_manifest_path(repo_root)
+    entries = _read_entries(manifest_path) or {}
+    entry = build_manifest_entry(get_training_data_dir(repo_root) / plan_id)
+    entries[plan_id] = entry
+    _write_entries(manifest_path, entries)
+    logger.debug("Indexed training sample %s", plan_id)
+    return entry
+
+
+def filter_manifest(
+    entries: list[dict],
+    tool: Optional[str] = None,
+    model: Optional[str] = None,
+    prompt_fingerprint: Optional[str] = None,
+    eval_fingerprint: Optional[str] = None,
+    min_score: Optional[float] = None,
+) -> list[dict]:
+    """Select manifest entries matching all given criteria.
+
+    Args:
+        entries: Manifest entries (from load_manifest)
+        tool: Only samples recorded with this tool
+        model: Only samples recorded with this model
+        prompt_fingerprint: Only samples produced by these prompts
+        eval_fingerprint: Only samples judged by this judge set
+        min_score: Only samples whose lowest judge score is at least this
+
+    Returns:
+        Matching entries, in input order
+    """
+    selected = []
+    for entry in entries:
+        if tool is not None and entry.get("tool") != tool:
+            continue
+        if model is not None and entry.get("model") != model:
+            continue
+        if prompt_fingerprint is not None and entry.get("prompt_fingerprint") != prompt_fingerprint:
+            continue
+        if eval_fingerprint is not None and entry.get("eval_fingerprint") != eval_fingerprint:
+            continue
+        if min_score is not None:
+            scores = [
+                score for score in (entry.get("judge_scores") or {}).values()
+                if isinstance(score, (int, float))
+            ]
+            if not scores or min(scores) < min_score:
+                continue
+        selected.append(entry)
+    return selected
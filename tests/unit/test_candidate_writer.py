@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
@@ -179,6 +181,33 @@ class TestWriteCandidate:
         path3 = write_candidate(tmp_path, "claude-code-cli", "sonnet", sample_candidate)
         assert path3.name == "candidate-003"
 
+    def test_write_candidate_concurrent_numbering(
+        self, tmp_path: Path, sample_candidate: CandidatePrompts, monkeypatch
+    ) -> None:
+        """Concurrent writers that see the same next number get distinct directories."""
+        import weft.candidate_writer as candidate_writer
+
+        # Every writer computes its starting number before any directory exists
+        barrier = threading.Barrier(4)
+        original = candidate_writer.get_next_candidate_number
+
+        def racing_next_number(*args, **kwargs) -> int:
+            number = original(*args, **kwargs)
+            barrier.wait(timeout=5)
+            return number
+
+        monkeypatch.setattr(candidate_writer, "get_next_candidate_number", racing_next_number)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            paths = list(executor.map(
+                lambda _: write_candidate(tmp_path, "claude-code-cli", "sonnet", sample_candidate),
+                range(4),
+            ))
+
+        assert sorted(p.name for p in paths) == [
+            "candidate-001", "candidate-002", "candidate-003", "candidate-004"
+        ]
+
     def test_write_candidate_empty_subagents(self, tmp_path: Path) -> None:
         """Handles candidate with no subagents."""
         candidate = CandidatePrompts(
@@ -9,7 +9,9 @@ import pytest
 
 from weft.config import (
     VALID_MODELS,
+    get_judge_settings,
     get_model_defaults,
+    get_trace_compression,
     load_config,
 )
 
@@ -251,6 +253,54 @@ code_model = "sonnet"
         assert "Valid models:" in caplog.text
 
 
+class TestGetTraceCompression:
+    """Tests for get_trace_compression function."""
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [("gzip", "gzip"), ("zstd", "zstd"), ("none", None), ("lz4", None)],
+    )
+    def test_get_trace_compression_values(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, value: str, expected: str | None
+    ) -> None:
+        """Test [traces] compression values, with invalid ones falling back to none."""
+        monkeypatch.setattr("weft.config.CONFIG_PATH", tmp_path / "config.toml")
+        (tmp_path / "config.toml").write_text(f'[traces]\ncompression = "{value}"\n')
+
+        assert get_trace_compression() == expected
+
+    def test_get_trace_compression_missing_config(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test traces are stored uncompressed when nothing is configured."""
+        monkeypatch.setattr("weft.config.CONFIG_PATH", tmp_path / "nonexistent" / "config.toml")
+
+        assert get_trace_compression() is None
+
+
+class TestGetJudgeSettings:
+    """Tests for get_judge_settings function."""
+
+    def test_get_judge_settings_skips_invalid_values(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test valid [judges] limits are returned and invalid ones dropped."""
+        monkeypatch.setattr("weft.config.CONFIG_PATH", tmp_path / "config.toml")
+        (tmp_path / "config.toml").write_text(
+            "[judges]\nmax_concurrent = 0\ntimeout_seconds = 90.5\nmax_retries = 2\n"
+        )
+
+        assert get_judge_settings() == {"timeout_seconds": 90.5, "max_retries": 2}
+
+    def test_get_judge_settings_missing_config(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test defaults apply when nothing is configured."""
+        monkeypatch.setattr("weft.config.CONFIG_PATH", tmp_path / "nonexistent" / "config.toml")
+
+        assert get_judge_settings() == {}
+
+
 class TestValidModels:
     """Tests for VALID_MODELS constant."""
 
@@ -14,7 +14,18 @@ from weft.eval_command import (
     run_eval_command,
     save_judge_results,
 )
-from weft.judge_executor import JudgeResult
+from weft.judge_executor import JudgeExecutionError, JudgeResult
+from weft.judge_orchestrator import JudgeOrchestrationError
+
+
+def _reporting(results: list[JudgeResult]):
+    """Fake execute_judges_parallel that reports each result like the real one."""
+    def fake(*args, on_result=None, **kwargs):
+        for result in results:
+            if on_result is not None:
+                on_result(result)
+        return results
+    return fake
 
 
 def test_format_judge_results() -> None:
@@ -302,7 +313,7 @@ Test judge instructions.
     ]
 
     # Mock test runner and feedback collector to avoid SDK calls
-    with patch("weft.eval_command.execute_judges_parallel", return_value=mock_results):
+    with patch("weft.eval_command.execute_judges_parallel", side_effect=_reporting(mock_results)):
         with patch("weft.eval_command.get_openrouter_api_key", return_value="test_key"):
             with patch("weft.eval_command.run_before_tests", return_value=None):
                 with patch("weft.eval_command.run_after_tests", return_value={
@@ -484,7 +495,7 @@ class TestEvalCommandIdempotency:
             weight=0.5,
         )
 
-        with patch("weft.eval_command.execute_judges_parallel", return_value=[new_result]):
+        with patch("weft.eval_command.execute_judges_parallel", side_effect=_reporting([new_result])):
             with patch("weft.eval_command.get_openrouter_api_key", return_value="test_key"):
                 with patch("weft.eval_command.run_before_tests", return_value=None):
                     with patch("weft.eval_command.run_after_tests", return_value={
@@ -498,6 +509,78 @@ class TestEvalCommandIdempotency:
         json_data = json.loads(judge_json.read_text())
         assert json_data["score"] == 0.95, "Force should have overwritten the old result"
 
+    def test_reruns_judges_when_input_fingerprint_is_stale(self, tmp_path: Path, monkeypatch) -> None:
+        """A saved output recorded for other inputs is re-run and re-fingerprinted."""
+        tmp_path = _setup_eval_environment(tmp_path)
+        monkeypatch.chdir(tmp_path)
+
+        eval_dir = tmp_path / ".weft" / "sessions" / "test-plan" / "eval"
+        eval_dir.mkdir(parents=True)
+        judge_json = eval_dir / "judge_test-judge.json"
+        judge_json.write_text(json.dumps({
+            "judge_name": "test-judge",
+            "score": 0.50,
+            "weight": 0.5,
+            "feedback": "Judged older changes",
+            "input_fingerprint": "0" * 64,
+        }))
+
+        new_result = JudgeResult(
+            judge_name="test-judge", score=0.9, feedback="Current changes", weight=0.5,
+        )
+        mock_execute = MagicMock(side_effect=_reporting([new_result]))
+
+        with patch("weft.eval_command.execute_judges_parallel", mock_execute):
+            with patch("weft.eval_command.get_openrouter_api_key", return_value="test_key"):
+                with patch("weft.eval_command.run_before_tests", return_value=None):
+                    with patch("weft.eval_command.run_after_tests", return_value={
+                        "command": "test", "exit_code": 0, "total_tests": 1,
+                        "passed_tests": 1, "failed_tests": 0,
+                    }):
+                        with patch("weft.eval_command.collect_human_feedback", return_value=None):
+                            run_eval_command("test-plan")
+
+        assert [j.name for j in mock_execute.call_args.kwargs["judges"]] == ["test-judge"]
+        json_data = json.loads(judge_json.read_text())
+        assert json_data["score"] == 0.9
+        assert len(json_data["input_fingerprint"]) == 64
+        assert json_data["input_fingerprint"] != "0" * 64
+
+    def test_partial_judge_failure_keeps_finished_results(self, tmp_path: Path, monkeypatch) -> None:
+        """Finished judges are saved and a re-run only executes the failed one."""
+        tmp_path = _setup_eval_environment(tmp_path)
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / ".weft" / "judges" / "other-judge.md").write_text(
+            "---\nweight: 0.5\nmodel: x-ai/grok-4.1-fast\n---\n\nOther instructions.\n"
+        )
+        eval_dir = tmp_path / ".weft" / "sessions" / "test-plan" / "eval"
+
+        def failing_run(judges, on_result=None, on_failure=None, **kwargs):
+            on_result(JudgeResult("other-judge", score=0.7, feedback="Fine", weight=0.5))
+            on_failure(judges[1], JudgeExecutionError("rate limited"))
+            raise JudgeOrchestrationError("Judge 'test-judge' failed: rate limited")
+
+        with patch("weft.eval_command.execute_judges_parallel", side_effect=failing_run):
+            with patch("weft.eval_command.get_openrouter_api_key", return_value="test_key"):
+                assert run_eval_command("test-plan") == 1
+
+        assert json.loads((eval_dir / "judge_other-judge.json").read_text())["score"] == 0.7
+        failures = json.loads((eval_dir / "failed_judges.json").read_text())
+        assert failures["test-judge"]["error"] == "rate limited"
+
+        mock_execute = MagicMock(side_effect=_reporting([
+            JudgeResult("test-judge", score=0.9, feedback="Good", weight=0.5),
+        ]))
+        with patch("weft.eval_command.execute_judges_parallel", mock_execute):
+            with patch("weft.eval_command.get_openrouter_api_key", return_value="test_key"):
+                with patch("weft.eval_command.run_before_tests", return_value=None):
+                    with patch("weft.eval_command.run_after_tests", return_value=None):
+                        with patch("weft.eval_command.collect_human_feedback", return_value=None):
+                            run_eval_command("test-plan")
+
+        assert [j.name for j in mock_execute.call_args.kwargs["judges"]] == ["test-judge"]
+        assert not (eval_dir / "failed_judges.json").exists()
+
     def test_skips_tests_when_results_exist(self, tmp_path: Path, monkeypatch) -> None:
         """Test execution is skipped when result files already exist."""
         tmp_path = _setup_eval_environment(tmp_path)
@@ -518,7 +601,7 @@ class TestEvalCommandIdempotency:
             judge_name="test-judge", score=0.85, feedback="Test", weight=0.5
         )]
 
-        with patch("weft.eval_command.execute_judges_parallel", return_value=mock_results):
+        with patch("weft.eval_command.execute_judges_parallel", side_effect=_reporting(mock_results)):
             with patch("weft.eval_command.get_openrouter_api_key", return_value="test_key"):
                 with patch("weft.eval_command.run_before_tests", return_value=None):
                     with patch("weft.eval_command.run_after_tests", mock_after_tests):
@@ -549,7 +632,7 @@ class TestEvalCommandIdempotency:
             judge_name="test-judge", score=0.85, feedback="Test", weight=0.5
         )]
 
-        with patch("weft.eval_command.execute_judges_parallel", return_value=mock_results):
+        with patch("weft.eval_command.execute_judges_parallel", side_effect=_reporting(mock_results)):
             with patch("weft.eval_command.get_openrouter_api_key", return_value="test_key"):
                 with patch("weft.eval_command.run_before_tests", return_value=None):
                     with patch("weft.eval_command.run_after_tests", return_value={
@@ -592,7 +675,7 @@ class TestEvalCompleteHook:
         def mock_trigger_hook(hook_name: str, context: dict) -> None:
             hook_calls.append((hook_name, context.copy()))
 
-        with patch("weft.eval_command.execute_judges_parallel", return_value=mock_results):
+        with patch("weft.eval_command.execute_judges_parallel", side_effect=_reporting(mock_results)):
             with patch("weft.eval_command.get_openrouter_api_key", return_value="test_key"):
                 with patch("weft.eval_command.run_before_tests", return_value=None):
                     with patch("weft.eval_command.run_after_tests", return_value={
@@ -656,7 +739,7 @@ class TestEvalCompleteHook:
         def mock_trigger_hook(hook_name: str, context: dict) -> None:
             hook_calls.append((hook_name, context.copy()))
 
-        with patch("weft.eval_command.execute_judges_parallel", return_value=mock_results):
+        with patch("weft.eval_command.execute_judges_parallel", side_effect=_reporting(mock_results)):
             with patch("weft.eval_command.get_openrouter_api_key", return_value="test_key"):
                 with patch("weft.eval_command.run_before_tests", return_value=None):
                     with patch("weft.eval_command.run_after_tests", return_value={
@@ -700,7 +783,7 @@ class TestEvalCompleteHook:
         def mock_trigger_hook(hook_name: str, context: dict) -> None:
             hook_calls.append((hook_name, context.copy()))
 
-        with patch("weft.eval_command.execute_judges_parallel", return_value=mock_results):
+        with patch("weft.eval_command.execute_judges_parallel", side_effect=_reporting(mock_results)):
             with patch("weft.eval_command.get_openrouter_api_key", return_value="test_key"):
                 with patch("weft.eval_command.run_before_tests", return_value=None):
                     with patch("weft.eval_command.run_after_tests", return_value={
@@ -747,7 +830,7 @@ class TestEvalCompleteHook:
             """Simulate a hook that raises an exception."""
             raise RuntimeError("Hook execution failed unexpectedly")
 
-        with patch("weft.eval_command.execute_judges_parallel", return_value=mock_results):
+        with patch("weft.eval_command.execute_judges_parallel", side_effect=_reporting(mock_results)):
             with patch("weft.eval_command.get_openrouter_api_key", return_value="test_key"):
                 with patch("weft.eval_command.run_before_tests", return_value=None):
                     with patch("weft.eval_command.run_after_tests", return_value={
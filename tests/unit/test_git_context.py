@@ -31,7 +31,8 @@ def test_gather_git_context_basic(tmp_path: Path) -> None:
     test_file = worktree / "test.py"
     test_file.write_text("def test():\n    pass\n")
 
-    plan_content, git_changes = gather_git_context(worktree)
+    plan_content, changes = gather_git_context(worktree)
+    git_changes = changes.render()
 
     assert "Test Plan" in plan_content
     assert "Objectives here" in plan_content
@@ -56,7 +57,8 @@ def test_gather_git_context_no_changes(tmp_path: Path) -> None:
     subprocess.run(["git", "add", "plan.md"], cwd=worktree, check=True)
     subprocess.run(["git", "commit", "-m", "initial"], cwd=worktree, check=True, capture_output=True)
 
-    plan_content, git_changes = gather_git_context(worktree)
+    plan_content, changes = gather_git_context(worktree)
+    git_changes = changes.render()
 
     assert "Test Plan" in plan_content
     assert "no changes" in git_changes.lower()
@@ -103,7 +105,8 @@ def test_gather_git_context_with_diff(tmp_path: Path) -> None:
     test_file.write_text("def hello():\n    print('hello')\n")
     subprocess.run(["git", "add", "test.py"], cwd=worktree, check=True)
 
-    plan_content, git_changes = gather_git_context(worktree)
+    plan_content, changes = gather_git_context(worktree)
+    git_changes = changes.render()
 
     assert "Git Diff" in git_changes
     assert "+def hello()" in git_changes or "def hello()" in git_changes
@@ -131,7 +134,8 @@ def test_gather_git_context_changed_file_contents(tmp_path: Path) -> None:
     test_content = "# This is a test module\n\ndef calculate(x):\n    return x * 2\n"
     test_file.write_text(test_content)
 
-    plan_content, git_changes = gather_git_context(worktree)
+    plan_content, changes = gather_git_context(worktree)
+    git_changes = changes.render()
 
     assert "Changed File Contents" in git_changes
     assert "module.py" in git_changes
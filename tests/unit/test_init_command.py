@@ -16,6 +16,7 @@ from weft.init_command import (
     load_version_file,
     prompt_yes_no,
     run_init_command,
+    update_gitignore,
 )
 
 
@@ -666,3 +667,17 @@ def test_init_from_subdirectory(git_repo):
     # .weft should be at repo root, not in subdirectory
     assert (git_repo.path / ".weft").exists()
     assert not (subdir / ".weft").exists()
+
+
+def test_update_gitignore_adds_new_entries_once(tmp_path) -> None:
+    """A .gitignore from an older version gets only the missing entries."""
+    gitignore = tmp_path / ".gitignore"
+    gitignore.write_text("node_modules/\n# weft cache and temporary files\n.weft/dspy_cache/\n")
+
+    update_gitignore(tmp_path)
+    update_gitignore(tmp_path)
+
+    lines = gitignore.read_text().splitlines()
+    assert lines.count(".weft/dspy_cache/") == 1
+    assert lines.count(".weft/training_data/.staging/") == 1
+    assert lines[0] == "node_modules/"
@@ -0,0 +1,69 @@
+"""Unit tests for judge_cache module."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from weft.judge_cache import JudgeCache, judge_cache_key, judge_input_keys
+from weft.judge_executor import JudgeResult
+from weft.judge_loader import JudgeConfig
+from weft.summary_cache import content_hash
+
+
+def _judge(name: str = "quality", **overrides) -> JudgeConfig:
+    fields = {
+        "name": name,
+        "weight": 0.5,
+        "model": "x-ai/grok-4.1-fast",
+        "instructions": "Judge the code.",
+        "file_path": Path(f"{name}.md"),
+    }
+    fields.update(overrides)
+    return JudgeConfig(**fields)
+
+
+def test_key_depends_on_every_input() -> None:
+    """Changing the judge config or either input yields a different key."""
+    plan_hash, changes_hash = content_hash("plan"), content_hash("changes")
+    key = judge_cache_key(_judge(), plan_hash, changes_hash)
+
+    assert key == judge_cache_key(_judge(name="renamed"), plan_hash, changes_hash)
+    assert key != judge_cache_key(_judge(instructions="Other."), plan_hash, changes_hash)
+    assert key != judge_cache_key(_judge(model="other/model"), plan_hash, changes_hash)
+    assert key != judge_cache_key(_judge(weight=0.7), plan_hash, changes_hash)
+    assert key != judge_cache_key(_judge(), content_hash("other plan"), changes_hash)
+    assert key != judge_cache_key(_judge(), plan_hash, content_hash("other changes"))
+
+
+def test_get_and_put_round_trip(tmp_path: Path) -> None:
+    """Stored results come back under the requesting judge's name and weight."""
+    cache = JudgeCache(tmp_path)
+    key = judge_input_keys([_judge()], "plan", "changes")["quality"]
+
+    assert cache.get(key, _judge()) is None
+    cache.put(key, JudgeResult("quality", score=0.8, feedback="Good", weight=0.5))
+
+    assert cache.get(key, _judge(name="renamed")) == JudgeResult(
+        "renamed", score=0.8, feedback="Good", weight=0.5
+    )
+
+
+def test_corrupt_entry_is_a_miss(tmp_path: Path) -> None:
+    """Unreadable entries are ignored rather than raising."""
+    cache = JudgeCache(tmp_path)
+    key = "ab" + "0" * 62
+    (tmp_path / "ab").mkdir()
+    (tmp_path / "ab" / f"{key}.json").write_text("{not json")
+
+    assert cache.get(key, _judge()) is None
+
+
+def test_evicts_when_over_bound(tmp_path: Path) -> None:
+    """Putting past the size bound evicts older entries."""
+    cache = JudgeCache(tmp_path, max_bytes=300)
+    keys = [judge_input_keys([_judge()], str(i), "changes")["quality"] for i in range(3)]
+    for key in keys:
+        cache.put(key, JudgeResult("quality", score=0.5, feedback="x" * 100, weight=0.5))
+
+    assert sum(cache.get(key, _judge()) is not None for key in keys) < 3
+    assert cache.get(keys[-1], _judge()) is not None
@@ -0,0 +1,107 @@
+"""Tests for judge_context module."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from tests.helpers import GitRepo
+from weft.judge_context import (
+    FileChange,
+    GitChanges,
+    classify_path,
+    collect_git_changes,
+    render_judge_changes,
+)
+from weft.judge_loader import JudgeConfig
+
+
+def _commit(git_repo: GitRepo, files: dict[str, bytes | str]) -> None:
+    for name, content in files.items():
+        path = git_repo.path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, bytes):
+            path.write_bytes(content)
+        else:
+            path.write_text(content)
+    git_repo.run("add", "-A")
+    git_repo.run("commit", "-m", "initial")
+
+
+def test_classify_path() -> None:
+    """Lockfiles and vendored or generated paths are recognized."""
+    assert classify_path("frontend/package-lock.json") == "lockfile"
+    assert classify_path("uv.lock") == "lockfile"
+    assert classify_path("vendor/lib/util.go") == "vendored or generated"
+    assert classify_path("static/app.min.js") == "vendored or generated"
+    assert classify_path("src/app.py") is None
+    assert classify_path("docs/build.md") is None
+
+
+def test_collect_omits_noise_and_keeps_source(git_repo: GitRepo) -> None:
+    """Source diffs and new files are shown; lockfiles, vendored and binary files are listed."""
+    _commit(git_repo, {
+        "app.py": "def main():\n    return 1\n",
+        "uv.lock": "lock v1\n",
+        "vendor/dep.py": "x = 1\n",
+        "logo.png": b"\x89PNG\0\0data",
+    })
+    (git_repo.path / "app.py").write_text("def main():\n    return 2\n")
+    (git_repo.path / "uv.lock").write_text("lock v2\n" * 500)
+    (git_repo.path / "vendor" / "dep.py").write_text("x = 2\n")
+    (git_repo.path / "logo.png").write_bytes(b"\x89PNG\0\0other")
+    (git_repo.path / "new.py").write_text("NEW = True\n")
+
+    changes = collect_git_changes(git_repo.path)
+    rendered = changes.render()
+
+    assert "+    return 2" in rendered
+    assert "--- new.py (new file) ---\nNEW = True" in rendered
+    assert "lock v2" not in rendered
+    assert "- uv.lock (lockfile, +500 -1 lines)" in rendered
+    assert "- vendor/dep.py (vendored or generated" in rendered
+    assert "- logo.png (binary" in rendered
+
+
+def test_render_prioritizes_plan_files_within_budget() -> None:
+    """Files the plan mentions are shown first; what does not fit is listed."""
+    big_diff = "diff --git a/other.py b/other.py\n" + "+x\n" * 3_000
+    changes = GitChanges(
+        status=" M core.py\n M other.py",
+        files=[
+            FileChange("other.py", " M", diff=big_diff, added=3_000),
+            FileChange("core.py", " M", diff="diff --git a/core.py b/core.py\n+y", added=1,
+                       content="y\n" * 10_000),
+        ],
+    )
+
+    rendered = changes.render(token_budget=400, plan_content="Update core.py")
+
+    assert "+y" in rendered
+    assert "--- core.py ---" not in rendered  # full content does not fit
+    assert "- other.py (+3000 -0 lines; over token budget)" in rendered
+    assert len(rendered) < 400 * 4 + 200
+
+    # Without the plan mention the smaller change still comes first, and a
+    # larger budget fits part of the big diff
+    rendered = changes.render(token_budget=2_000)
+    assert rendered.index("core.py b/core.py") < rendered.index("other.py b/other.py")
+    assert "more diff lines omitted to fit the token budget" in rendered
+
+
+def test_render_judge_changes_uses_each_judge_budget(tmp_path: Path) -> None:
+    """Judges share renders per budget; a plain string goes to every judge as is."""
+    def judge(name: str, context_tokens: int | None) -> JudgeConfig:
+        return JudgeConfig(name, 0.5, "m", "i", tmp_path / f"{name}.md", context_tokens)
+
+    changes = GitChanges(
+        status=" M a.py",
+        files=[FileChange("a.py", " M", diff="diff --git a/a.py b/a.py\n" + "+a\n" * 2_000,
+                          added=2_000)],
+    )
+    judges = [judge("small", 1_000), judge("default", None), judge("also-default", None)]
+
+    by_judge = render_judge_changes(judges, "plan", changes)
+
+    assert len(by_judge["small"]) < len(by_judge["default"])
+    assert by_judge["default"] is by_judge["also-default"]
+    assert render_judge_changes(judges, "plan", "text") == {j.name: "text" for j in judges}
@@ -36,6 +36,18 @@ It can be multiple lines.
     assert config.file_path == judge_file
 
 
+def test_parse_judge_file_context_tokens(tmp_path: Path) -> None:
+    """Test the optional context_tokens budget is parsed and validated."""
+    judge_file = tmp_path / "budgeted.md"
+    judge_file.write_text("---\nweight: 0.5\nmodel: m\ncontext_tokens: 8000\n---\n\nJudge.\n")
+
+    assert parse_judge_file(judge_file).context_tokens == 8000
+
+    judge_file.write_text("---\nweight: 0.5\nmodel: m\ncontext_tokens: 10\n---\n\nJudge.\n")
+    with pytest.raises(JudgeLoaderError, match="context_tokens"):
+        parse_judge_file(judge_file)
+
+
 def test_parse_judge_file_missing_weight(tmp_path: Path) -> None:
     """Test parsing judge file with missing weight field."""
     judge_file = tmp_path / "test-judge.md"
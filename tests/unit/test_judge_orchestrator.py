@@ -2,94 +2,234 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
+from weft import judge_orchestrator
+from weft.judge_cache import JudgeCache
 from weft.judge_executor import JudgeExecutionError, JudgeResult
 from weft.judge_loader import JudgeConfig
 from weft.judge_orchestrator import (
     JudgeOrchestrationError,
     execute_judges_parallel,
+    is_retryable,
 )
 
 
-def test_execute_judges_parallel_fail_fast(tmp_path: Path) -> None:
-    """Test that orchestrator fails fast on first judge error."""
-    judge1 = JudgeConfig(
-        name="judge-1",
-        weight=0.5,
-        model="x-ai/grok-4.1-fast",
-        instructions="Judge 1 instructions",
-        file_path=tmp_path / "judge-1.md",
-    )
+class _StatusError(Exception):
+    """Stand-in for a LiteLLM API error."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
 
-    judge2 = JudgeConfig(
-        name="judge-2",
-        weight=0.5,
-        model="x-ai/grok-4.1-fast",
-        instructions="Judge 2 instructions",
-        file_path=tmp_path / "judge-2.md",
+
+def _judges(tmp_path: Path, count: int) -> list[JudgeConfig]:
+    return [
+        JudgeConfig(
+            name=f"judge-{i}",
+            weight=0.5,
+            model="x-ai/grok-4.1-fast",
+            instructions=f"Judge {i} instructions",
+            file_path=tmp_path / f"judge-{i}.md",
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def _result(judge: JudgeConfig) -> JudgeResult:
+    return JudgeResult(
+        judge_name=judge.name,
+        score=0.8,
+        feedback=f"Feedback from {judge.name}",
+        weight=judge.weight,
     )
 
-    judges = [judge1, judge2]
-    plan_content = "# Test Plan"
-    git_changes = "=== Changes ==="
-    api_key = "test_key"
-    cache_dir = tmp_path / "cache"
 
-    # Mock execute_judge to fail on first judge
-    def mock_execute_judge(judge, plan, changes, key, cache):
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    """Retry immediately instead of sleeping."""
+    monkeypatch.setattr(judge_orchestrator, "backoff_delay", lambda attempt: 0.0)
+
+
+def test_execute_judges_parallel_failure_does_not_cancel_others(tmp_path: Path) -> None:
+    """A failing judge is reported while the others still complete and are cached."""
+    judges = _judges(tmp_path, 2)
+    cache = JudgeCache(tmp_path / "judge_cache")
+
+    async def mock_execute_judge(judge, plan, changes, key, cache_dir):
         if judge.name == "judge-1":
             raise JudgeExecutionError(f"Failed to execute {judge.name}")
-        return JudgeResult(
-            judge_name=judge.name,
-            score=0.8,
-            feedback=f"Feedback from {judge.name}",
-            weight=judge.weight,
-        )
+        await asyncio.sleep(0.01)
+        return _result(judge)
 
-    with patch("weft.judge_orchestrator.execute_judge", side_effect=mock_execute_judge):
+    with patch("weft.judge_orchestrator.execute_judge_async", side_effect=mock_execute_judge):
         with pytest.raises(JudgeOrchestrationError, match="Judge 'judge-1' failed"):
             execute_judges_parallel(
-                judges, plan_content, git_changes, api_key, cache_dir
+                judges, "# Test Plan", "=== Changes ===", "test_key", tmp_path, cache=cache
             )
 
+    keys = judge_orchestrator.judge_input_keys(judges, "# Test Plan", "=== Changes ===")
+    assert cache.get(keys["judge-2"], judges[1]) == _result(judges[1])
+    assert cache.get(keys["judge-1"], judges[0]) is None
+
 
 def test_execute_judges_parallel_no_judges(tmp_path: Path) -> None:
     """Test orchestrator with empty judge list."""
-    plan_content = "# Test Plan"
-    git_changes = "=== Changes ==="
-    api_key = "test_key"
-    cache_dir = tmp_path / "cache"
-
     with pytest.raises(JudgeOrchestrationError, match="No judges to execute"):
-        execute_judges_parallel([], plan_content, git_changes, api_key, cache_dir)
+        execute_judges_parallel([], "# Test Plan", "=== Changes ===", "test_key", tmp_path)
 
 
 def test_execute_judges_parallel_unexpected_error(tmp_path: Path) -> None:
     """Test orchestrator handles unexpected errors."""
-    judge1 = JudgeConfig(
-        name="judge-1",
-        weight=0.5,
-        model="x-ai/grok-4.1-fast",
-        instructions="Judge 1 instructions",
-        file_path=tmp_path / "judge-1.md",
-    )
-
-    judges = [judge1]
-    plan_content = "# Test Plan"
-    git_changes = "=== Changes ==="
-    api_key = "test_key"
-    cache_dir = tmp_path / "cache"
-
-    # Mock execute_judge to raise unexpected exception
-    def mock_execute_judge(judge, plan, changes, key, cache):
+    async def mock_execute_judge(judge, plan, changes, key, cache_dir):
         raise RuntimeError("Unexpected error")
 
-    with patch("weft.judge_orchestrator.execute_judge", side_effect=mock_execute_judge):
+    with patch("weft.judge_orchestrator.execute_judge_async", side_effect=mock_execute_judge):
         with pytest.raises(JudgeOrchestrationError, match="Unexpected error"):
             execute_judges_parallel(
-                judges, plan_content, git_changes, api_key, cache_dir
+                _judges(tmp_path, 1), "# Test Plan", "=== Changes ===", "test_key", tmp_path
             )
+
+
+def test_execute_judges_parallel_retries_transient_errors(tmp_path: Path) -> None:
+    """Rate limits are retried; client errors fail without retrying."""
+    judges = _judges(tmp_path, 2)
+    attempts = {"judge-1": 0, "judge-2": 0}
+
+    async def mock_execute_judge(judge, plan, changes, key, cache_dir):
+        attempts[judge.name] += 1
+        if judge.name == "judge-1" and attempts[judge.name] < 3:
+            raise JudgeExecutionError("rate limited") from _StatusError(429)
+        if judge.name == "judge-2":
+            raise JudgeExecutionError("bad request") from _StatusError(400)
+        return _result(judge)
+
+    with patch("weft.judge_orchestrator.execute_judge_async", side_effect=mock_execute_judge):
+        with pytest.raises(JudgeOrchestrationError, match="Judge 'judge-2' failed"):
+            execute_judges_parallel(judges, "# Plan", "diff", "key", tmp_path, max_retries=3)
+
+    assert attempts == {"judge-1": 3, "judge-2": 1}
+
+
+def test_execute_judges_parallel_times_out_slow_judge(tmp_path: Path) -> None:
+    """Each attempt is bounded by the per-judge timeout."""
+    async def mock_execute_judge(judge, plan, changes, key, cache_dir):
+        await asyncio.sleep(5)
+        return _result(judge)
+
+    with patch("weft.judge_orchestrator.execute_judge_async", side_effect=mock_execute_judge):
+        with pytest.raises(JudgeOrchestrationError, match="Timed out"):
+            execute_judges_parallel(
+                _judges(tmp_path, 1), "# Plan", "diff", "key", tmp_path,
+                timeout=0.05, max_retries=1,
+            )
+
+
+def test_execute_judges_parallel_total_timeout_bounds_retries(tmp_path: Path, monkeypatch) -> None:
+    """A judge that keeps timing out cannot retry past the batch deadline."""
+    monkeypatch.setattr(judge_orchestrator, "backoff_delay", lambda attempt: 0.2)
+    attempts = 0
+
+    async def mock_execute_judge(judge, plan, changes, key, cache_dir):
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(5)
+
+    start = time.monotonic()
+    with patch("weft.judge_orchestrator.execute_judge_async", side_effect=mock_execute_judge):
+        with pytest.raises(JudgeOrchestrationError, match="did not finish within"):
+            execute_judges_parallel(
+                _judges(tmp_path, 1), "# Plan", "diff", "key", tmp_path,
+                timeout=0.05, max_retries=10, total_timeout=0.5,
+            )
+
+    assert time.monotonic() - start < 2
+    assert 1 < attempts < 10
+
+
+def test_execute_judges_parallel_limits_concurrency(tmp_path: Path) -> None:
+    """No more than max_concurrent judges run at once."""
+    running = 0
+    peak = 0
+
+    async def mock_execute_judge(judge, plan, changes, key, cache_dir):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return _result(judge)
+
+    with patch("weft.judge_orchestrator.execute_judge_async", side_effect=mock_execute_judge):
+        results = execute_judges_parallel(
+            _judges(tmp_path, 5), "# Plan", "diff", "key", tmp_path, max_concurrent=2
+        )
+
+    assert peak == 2
+    assert [r.judge_name for r in results] == [f"judge-{i}" for i in range(1, 6)]
+
+
+def test_execute_judges_parallel_uses_cache(tmp_path: Path) -> None:
+    """Judges with cached results for the same inputs make no LM call."""
+    judges = _judges(tmp_path, 2)
+    cache = JudgeCache(tmp_path / "judge_cache")
+    called = []
+
+    async def mock_execute_judge(judge, plan, changes, key, cache_dir):
+        called.append(judge.name)
+        return _result(judge)
+
+    with patch("weft.judge_orchestrator.execute_judge_async", side_effect=mock_execute_judge):
+        execute_judges_parallel(judges[:1], "# Plan", "diff", "key", tmp_path, cache=cache)
+        results = execute_judges_parallel(judges, "# Plan", "diff", "key", tmp_path, cache=cache)
+        execute_judges_parallel(judges[:1], "# Plan", "new diff", "key", tmp_path, cache=cache)
+
+    assert called == ["judge-1", "judge-2", "judge-1"]
+    assert [r.judge_name for r in results] == ["judge-1", "judge-2"]
+
+
+def test_is_retryable() -> None:
+    """Timeouts, 408, 429 and 5xx anywhere in the chain are transient."""
+    def wrapped(cause: BaseException) -> JudgeExecutionError:
+        try:
+            raise JudgeExecutionError("failed") from cause
+        except JudgeExecutionError as e:
+            return e
+
+    assert is_retryable(wrapped(_StatusError(429)))
+    assert is_retryable(wrapped(_StatusError(503)))
+    assert is_retryable(wrapped(TimeoutError()))
+    assert not is_retryable(wrapped(_StatusError(401)))
+    assert not is_retryable(wrapped(ValueError("bad score")))
+
+
+def test_execute_judges_parallel_reports_each_outcome_on_completion(tmp_path: Path) -> None:
+    """Results and failures are reported as each judge finishes, not at the end."""
+    judges = _judges(tmp_path, 3)
+    events = []
+
+    async def mock_execute_judge(judge, plan, changes, key, cache_dir):
+        if judge.name == "judge-2":
+            raise JudgeExecutionError("bad request") from _StatusError(400)
+        if judge.name == "judge-3":
+            await asyncio.sleep(0.05)
+            events.append("judge-3 finished")
+        return _result(judge)
+
+    with patch("weft.judge_orchestrator.execute_judge_async", side_effect=mock_execute_judge):
+        with pytest.raises(JudgeOrchestrationError, match="judge-2"):
+            execute_judges_parallel(
+                judges, "# Plan", "diff", "key", tmp_path,
+                cache=JudgeCache(tmp_path / "judge_cache"),
+                on_result=lambda r: events.append(f"saved {r.judge_name}"),
+                on_failure=lambda j, e: events.append(f"failed {j.name}"),
+            )
+
+    assert events.index("saved judge-1") < events.index("judge-3 finished")
+    assert events.index("failed judge-2") < events.index("judge-3 finished")
+    assert events[-1] == "saved judge-3"
@@ -0,0 +1,59 @@
+"""Unit tests for lm_pool module."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from weft import lm_pool
+from weft.lm_pool import configure_dspy_cache, get_lm
+
+
+@pytest.fixture(autouse=True)
+def empty_pool(monkeypatch):
+    """Start each test with an empty pool and unconfigured cache."""
+    monkeypatch.setattr(lm_pool, "_pool", {})
+    monkeypatch.setattr(lm_pool, "_configured_cache_dir", None)
+
+
+def test_get_lm_shares_instances_with_same_settings() -> None:
+    """Callers with identical settings share one LM; any difference gets its own."""
+    lm = get_lm("test/model", "key", max_tokens=100, extra_body={"seed": 1})
+
+    assert get_lm("test/model", "key", extra_body={"seed": 1}, max_tokens=100) is lm
+    assert get_lm("test/model", "key", max_tokens=100, extra_body={"seed": 2}) is not lm
+    assert get_lm("test/model", "other-key", max_tokens=100, extra_body={"seed": 1}) is not lm
+    assert get_lm("test/other", "key", max_tokens=100, extra_body={"seed": 1}) is not lm
+
+
+def test_get_lm_is_thread_safe() -> None:
+    """Concurrent first requests still create a single LM."""
+    lms = []
+    barrier = threading.Barrier(8)
+
+    def request() -> None:
+        barrier.wait()
+        lms.append(get_lm("test/model", "key", max_tokens=100))
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(lm) for lm in lms}) == 1
+
+
+def test_configure_dspy_cache_once_per_directory(tmp_path: Path, monkeypatch) -> None:
+    """The global DSPy cache is only reconfigured for a new directory."""
+    calls = []
+    monkeypatch.setattr(lm_pool.dspy, "configure_cache", lambda **kwargs: calls.append(kwargs))
+
+    configure_dspy_cache(tmp_path / "a")
+    configure_dspy_cache(tmp_path / "a")
+    configure_dspy_cache(tmp_path / "b")
+
+    assert [c["disk_cache_dir"] for c in calls] == [str(tmp_path / "a"), str(tmp_path / "b")]
+    assert (tmp_path / "a").is_dir()
@@ -0,0 +1,72 @@
+"""Tests for object_store module."""
+
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+from weft.object_store import (
+    blob_path,
+    dedupe_sample,
+    garbage_collect,
+    get_objects_dir,
+    hash_file,
+)
+
+
+def _create_sample(repo_root: Path, plan_id: str, prompt: str, feedback: str) -> Path:
+    sample_dir = repo_root / ".weft" / "training_data" / plan_id
+    (sample_dir / "prompts").mkdir(parents=True)
+    (sample_dir / "prompts" / "main.md").write_text(prompt)
+    (sample_dir / "human_feedback.md").write_text(feedback)
+    return sample_dir
+
+
+def test_identical_artifacts_share_one_blob(tmp_path: Path) -> None:
+    """Samples with the same prompts end up hardlinked to a single blob."""
+    first = _create_sample(tmp_path, "plan-a", "# Shared prompt", "Feedback A")
+    second = _create_sample(tmp_path, "plan-b", "# Shared prompt", "Feedback B")
+
+    assert dedupe_sample(tmp_path, first) == 1
+    assert dedupe_sample(tmp_path, second) == 1
+
+    first_prompt = first / "prompts" / "main.md"
+    second_prompt = second / "prompts" / "main.md"
+    blob = blob_path(tmp_path, hash_file(first_prompt))
+    assert first_prompt.samefile(blob)
+    assert second_prompt.samefile(blob)
+    assert second_prompt.read_text() == "# Shared prompt"
+    # Per-sample files are never stored
+    assert (first / "human_feedback.md").stat().st_nlink == 1
+    assert len(list(get_objects_dir(tmp_path).glob("*/*"))) == 1
+
+
+def test_dedupe_is_idempotent(tmp_path: Path) -> None:
+    """Deduplicating an already stored sample changes nothing."""
+    sample = _create_sample(tmp_path, "plan-a", "# Prompt", "Feedback")
+    dedupe_sample(tmp_path, sample)
+
+    dedupe_sample(tmp_path, sample)
+
+    assert (sample / "prompts" / "main.md").stat().st_nlink == 2
+    assert not list(sample.glob("prompts/.*"))
+
+
+def test_garbage_collect_removes_unreferenced_blobs(tmp_path: Path) -> None:
+    """Blobs are kept while referenced and removed after the last sample goes."""
+    first = _create_sample(tmp_path, "plan-a", "# Shared prompt", "A")
+    second = _create_sample(tmp_path, "plan-b", "# Shared prompt", "B")
+    only_first = first / "prompts" / "extra.md"
+    only_first.write_text("# Only in plan-a")
+    dedupe_sample(tmp_path, first)
+    dedupe_sample(tmp_path, second)
+
+    shutil.rmtree(first)
+
+    assert garbage_collect(tmp_path) == (1, len("# Only in plan-a"))
+    assert (second / "prompts" / "main.md").read_text() == "# Shared prompt"
+
+    shutil.rmtree(second)
+
+    assert garbage_collect(tmp_path)[0] == 1
+    assert not list(get_objects_dir(tmp_path).glob("*/*"))
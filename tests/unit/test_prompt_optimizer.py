@@ -0,0 +1,239 @@
+"""Tests for prompt_optimizer module (replays are covered by integration use)."""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+from tests.helpers import GitRepo
+from weft import prompt_optimizer
+from weft.judge_executor import JudgeResult
+from weft.prompt_optimizer import (
+    CandidateEvaluation,
+    HeldOutPlan,
+    PlanEvaluation,
+    combine_scores,
+    evaluate_on_plan,
+    evaluate_population,
+    find_holdout_plans,
+    pareto_front,
+    run_optimization,
+)
+from weft.training_types import PromptSnapshot
+
+
+def _candidate(name: str, score: float, seconds: float) -> CandidateEvaluation:
+    candidate = CandidateEvaluation(name=name, prompts=PromptSnapshot(main_prompt=name), generation=1)
+    candidate.plans = [PlanEvaluation(plan_id="p", score=score, execution_seconds=seconds)]
+    return candidate
+
+
+def test_pareto_front_keeps_non_dominated() -> None:
+    """Only candidates not beaten on both score and time survive."""
+    candidates = [
+        _candidate("best", 0.9, 300),
+        _candidate("fast", 0.6, 100),
+        _candidate("dominated", 0.5, 200),
+        _candidate("slow-tie", 0.9, 400),
+    ]
+
+    assert [c.name for c in pareto_front(candidates)] == ["best", "fast"]
+
+
+def test_pareto_front_leaves_out_failed_replays() -> None:
+    """A replay that failed at once is not on the front despite its zero time."""
+    failed = _candidate("failed", 0.0, 0)
+    failed.plans[0].error = "Failed to create worktree"
+
+    assert [c.name for c in pareto_front([_candidate("active", 0.8, 600), failed])] == ["active"]
+    assert pareto_front([failed]) == []
+
+
+def test_combine_scores_weighs_judges_and_tests() -> None:
+    """Weighted judge score and pass rate count equally."""
+    judges = [
+        JudgeResult("a", score=1.0, feedback="", weight=3.0),
+        JudgeResult("b", score=0.0, feedback="", weight=1.0),
+    ]
+
+    assert combine_scores(judges, {"total_tests": 4, "passed_tests": 2}) == (0.75, 0.625)
+    assert combine_scores(judges, {"total_tests": 0}) == (0.75, 0.75)
+
+
+def test_find_holdout_plans_needs_valid_git_sha(git_repo: GitRepo) -> None:
+    """Only samples whose plan records an existing commit are held out, newest first."""
+    sha = git_repo.run("rev-parse", "HEAD").stdout.strip()
+    training_dir = git_repo.path / ".weft" / "training_data"
+    for plan_id, git_sha in [("old", sha), ("new", sha), ("unknown", "0" * 40), ("bare", None)]:
+        (training_dir / plan_id).mkdir(parents=True)
+        front_matter = f"---\ngit_sha: {git_sha}\n---\n" if git_sha else ""
+        (training_dir / plan_id / "plan.md").write_text(f"{front_matter}# {plan_id}\n")
+    entries = [
+        {"plan_id": "old", "created_at": "2024-01-01"},
+        {"plan_id": "new", "created_at": "2024-02-01"},
+        {"plan_id": "unknown", "created_at": "2024-03-01"},
+        {"plan_id": "bare", "created_at": "2024-04-01"},
+    ]
+
+    plans = find_holdout_plans(git_repo.path, entries, count=5)
+
+    assert [p.plan_id for p in plans] == ["new", "old"]
+    assert plans[0].git_sha == sha
+
+
+def _stub_replay(monkeypatch, tmp_path: Path, judge_seconds: float, test_timeouts: list) -> None:
+    async def fake_session(**kwargs):
+        return "session"
+
+    def fake_judges(**kwargs):
+        assert kwargs["total_timeout"] >= kwargs["timeout"]
+        time.sleep(judge_seconds)
+        return [JudgeResult("a", score=1.0, feedback="", weight=1.0)]
+
+    def fake_tests(worktree_path, output_file, model, timeout=None):
+        test_timeouts.append(timeout)
+        return {"total_tests": 2, "passed_tests": 2}
+
+    worktree = tmp_path / "worktree"
+    worktree.mkdir(exist_ok=True)
+    monkeypatch.setattr(prompt_optimizer, "_create_replay_worktree", lambda repo_root, sha: worktree)
+    monkeypatch.setattr(prompt_optimizer, "_remove_replay_worktree", lambda repo_root, path: None)
+    monkeypatch.setattr(prompt_optimizer, "sync_files_to_worktree", lambda *args: None)
+    monkeypatch.setattr(prompt_optimizer, "run_sdk_session", fake_session)
+    monkeypatch.setattr(prompt_optimizer, "get_weft_src_dir", lambda: tmp_path)
+    monkeypatch.setattr(prompt_optimizer, "gather_git_changes", lambda path: "changes")
+    monkeypatch.setattr(prompt_optimizer, "get_judge_settings", lambda: {})
+    monkeypatch.setattr(prompt_optimizer, "execute_judges_parallel", fake_judges)
+    monkeypatch.setattr(prompt_optimizer, "run_tests_via_sdk", fake_tests)
+
+
+def test_evaluate_on_plan_bounds_whole_replay(tmp_path: Path, monkeypatch) -> None:
+    """The test run gets what is left of the timeout; none left fails the replay."""
+    plan = HeldOutPlan(plan_id="p", plan_content="# Plan", git_sha="abc1234")
+    prompts = PromptSnapshot(main_prompt="m")
+    test_timeouts: list = []
+
+    _stub_replay(monkeypatch, tmp_path, 0.0, test_timeouts)
+    evaluation = evaluate_on_plan(tmp_path, prompts, plan, "sonnet", [], "key", tmp_path, timeout=60)
+
+    assert evaluation.error is None
+    assert evaluation.score == 1.0
+    assert 0 < test_timeouts[0] <= 60
+
+    _stub_replay(monkeypatch, tmp_path, 0.2, test_timeouts)
+    evaluation = evaluate_on_plan(tmp_path, prompts, plan, "sonnet", [], "key", tmp_path, timeout=0.1)
+
+    assert evaluation.error == "timed out"
+    assert evaluation.score == 0.0
+    assert len(test_timeouts) == 1
+
+
+def test_evaluate_on_plan_checks_deadline_before_session(tmp_path: Path, monkeypatch) -> None:
+    """With no time left after setup, the session coroutine is never created."""
+    sessions = []
+    _stub_replay(monkeypatch, tmp_path, 0.0, [])
+    monkeypatch.setattr(prompt_optimizer, "run_sdk_session", lambda **kwargs: sessions.append(kwargs))
+    monkeypatch.setattr(prompt_optimizer, "sync_files_to_worktree", lambda *args: time.sleep(0.1))
+
+    evaluation = evaluate_on_plan(
+        tmp_path, PromptSnapshot(main_prompt="m"),
+        HeldOutPlan(plan_id="p", plan_content="# Plan", git_sha="abc1234"),
+        "sonnet", [], "key", tmp_path, timeout=0.05,
+    )
+
+    assert evaluation.error == "timed out"
+    assert sessions == []
+
+
+def test_evaluate_population_caps_concurrency(tmp_path: Path, monkeypatch) -> None:
+    """Replays of all candidates share one pool of max_concurrent workers."""
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_evaluate(repo_root, prompts, plan, *args):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return PlanEvaluation(plan_id=plan.plan_id, score=0.5, execution_seconds=1.0)
+
+    monkeypatch.setattr(prompt_optimizer, "evaluate_on_plan", fake_evaluate)
+    candidates = [
+        CandidateEvaluation(name=f"c{i}", prompts=PromptSnapshot(main_prompt="m"), generation=1)
+        for i in range(3)
+    ]
+    plans = [HeldOutPlan(plan_id=f"p{i}", plan_content="# Plan", git_sha="abc1234") for i in range(3)]
+
+    evaluate_population(tmp_path, candidates, plans, "sonnet", [], "key", tmp_path, max_concurrent=2)
+
+    assert peak == 2
+    assert all([p.plan_id for p in c.plans] == ["p0", "p1", "p2"] for c in candidates)
+
+
+def test_run_optimization_breeds_from_front(tmp_path: Path, monkeypatch) -> None:
+    """Each generation breeds from the current front and keeps the new front."""
+    bred_from = []
+
+    def fake_breed(repo_root, parents, count, generation, *args):
+        bred_from.append([p.name for p in parents])
+        return [
+            CandidateEvaluation(
+                name=f"g{generation}-{i}", prompts=PromptSnapshot(main_prompt="m"), generation=generation
+            )
+            for i in range(count)
+        ]
+
+    scores = {"active": (0.5, 100), "g1-0": (0.8, 100), "g1-1": (0.4, 50), "g2-0": (0.7, 200), "g2-1": (0.3, 300)}
+
+    def fake_evaluate(repo_root, candidates, plans, *args, **kwargs):
+        for candidate in candidates:
+            score, seconds = scores[candidate.name]
+            candidate.plans = [PlanEvaluation(plan_id="p", score=score, execution_seconds=seconds)]
+
+    monkeypatch.setattr(prompt_optimizer, "breed_children", fake_breed)
+    monkeypatch.setattr(prompt_optimizer, "evaluate_population", fake_evaluate)
+
+    front, evaluated = run_optimization(
+        tmp_path, PromptSnapshot(main_prompt="m"), [], [], [], "key", tmp_path,
+        variant="sonnet", trainer_model="test/model", generations=2, population=2,
+        max_subagents=3, token_budget=None,
+    )
+
+    assert bred_from == [["active"], ["g1-0", "g1-1"]]
+    assert [c.name for c in front] == ["g1-0", "g1-1"]
+    assert len(evaluated) == 5
+
+
+def test_run_optimization_keeps_parents_when_all_replays_fail(tmp_path: Path, monkeypatch) -> None:
+    """Failed children are never bred from; without any success the parents stay."""
+    bred_from = []
+
+    def fake_breed(repo_root, parents, count, generation, *args):
+        bred_from.append([p.name for p in parents])
+        return [
+            CandidateEvaluation(name=f"g{generation}", prompts=PromptSnapshot(main_prompt="m"), generation=generation)
+        ]
+
+    def fake_evaluate(repo_root, candidates, plans, *args, **kwargs):
+        for candidate in candidates:
+            error = None if candidate.name == "active" else "timed out"
+            candidate.plans = [
+                PlanEvaluation(plan_id="p", score=0.5, execution_seconds=100, error=error)
+            ]
+
+    monkeypatch.setattr(prompt_optimizer, "breed_children", fake_breed)
+    monkeypatch.setattr(prompt_optimizer, "evaluate_population", fake_evaluate)
+
+    front, _ = run_optimization(
+        tmp_path, PromptSnapshot(main_prompt="m"), [], [], [], "key", tmp_path,
+        variant="sonnet", trainer_model="test/model", generations=2, population=1,
+        max_subagents=3, token_budget=None,
+    )
+
+    assert bred_from == [["active"], ["active"]]
+    assert [c.name for c in front] == ["active"]
@@ -0,0 +1,128 @@
+"""Tests for prompt_trainer serialization and candidate fan-out (LLM calls are covered by integration tests)."""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from weft import prompt_trainer
+from weft.prompt_trainer import (
+    PromptTrainerError,
+    _serialize_training_samples,
+    run_prompt_trainer_candidates,
+)
+from weft.training_batch import estimate_tokens
+from weft.training_types import CandidatePrompts, PromptSnapshot, TrainingSample
+
+
+def _sample(plan_id: str, trace_chars: int) -> TrainingSample:
+    return TrainingSample(
+        plan_id=plan_id,
+        plan_content="# Plan",
+        code_trace="t" * trace_chars,
+        human_feedback="Keep this feedback intact.",
+        judge_results="## Judge: code-reuse\nScore: 0.9",
+        test_results_after='{"passed": 10}',
+    )
+
+
+def test_serialize_without_budget_is_unchanged() -> None:
+    """Without a budget every field is serialized in full."""
+    samples = [_sample("a", 1000)]
+
+    assert json.loads(_serialize_training_samples(samples))[0]["code_trace"] == "t" * 1000
+
+
+def test_serialize_trims_longest_traces_to_fit() -> None:
+    """Over budget, the longest traces are cut first and feedback is kept."""
+    samples = [_sample("long", 40_000), _sample("short", 2_000)]
+
+    serialized = _serialize_training_samples(samples, token_budget=5_000)
+
+    assert estimate_tokens(serialized) <= 5_000
+    dumped = json.loads(serialized)
+    assert "truncated to fit token budget" in dumped[0]["code_trace"]
+    assert dumped[1]["code_trace"] == "t" * 2_000
+    assert all(d["human_feedback"] == "Keep this feedback intact." for d in dumped)
+
+
+def _candidate_run(tmp_path: Path, monkeypatch, generate, num_candidates: int, **kwargs):
+    monkeypatch.setattr(prompt_trainer, "get_openrouter_api_key", lambda: "key")
+    monkeypatch.setattr(prompt_trainer, "configure_dspy_cache", lambda cache_dir: None)
+    monkeypatch.setattr(prompt_trainer, "_generate_candidate", generate)
+    return run_prompt_trainer_candidates(
+        [_sample("a", 100)],
+        PromptSnapshot(main_prompt="# Main"),
+        max_subagents=3,
+        model="test/model",
+        cache_dir=tmp_path,
+        num_candidates=num_candidates,
+        **kwargs,
+    )
+
+
+def test_candidates_run_concurrently_with_shared_input(tmp_path: Path, monkeypatch) -> None:
+    """All candidate calls are in flight together, each with its own seed."""
+    barrier = threading.Barrier(3)
+    inputs = []
+
+    def generate(lm, samples_json, prompts_json, max_subagents):
+        inputs.append(samples_json)
+        barrier.wait(timeout=5)
+        seed = lm.kwargs["extra_body"]["seed"]
+        return CandidatePrompts(main_prompt=f"seed {seed}", analysis_summary=""), {"total_tokens": 1}
+
+    written = []
+    results = _candidate_run(
+        tmp_path, monkeypatch, generate, 3,
+        on_candidate=lambda index, candidate, usage: written.append(index),
+    )
+
+    assert [c.main_prompt for c, _ in results] == ["seed 0", "seed 1", "seed 2"]
+    assert len(set(inputs)) == 1
+    assert sorted(written) == [0, 1, 2]
+
+
+def test_failed_candidates_are_skipped(tmp_path: Path, monkeypatch) -> None:
+    """A failed call drops that candidate; if all fail, training fails."""
+    def generate(lm, samples_json, prompts_json, max_subagents):
+        if lm.kwargs["extra_body"]["seed"] == 1:
+            raise RuntimeError("rate limited")
+        return CandidatePrompts(main_prompt="ok", analysis_summary=""), {}
+
+    assert len(_candidate_run(tmp_path, monkeypatch, generate, 2)) == 1
+
+    def failing(lm, samples_json, prompts_json, max_subagents):
+        raise RuntimeError("down")
+
+    with pytest.raises(PromptTrainerError, match="all 2 candidate"):
+        _candidate_run(tmp_path, monkeypatch, failing, 2)
+
+
+def test_repeated_calls_report_only_their_own_token_usage(monkeypatch) -> None:
+    """Each trainer call is billed for its own LM call, not earlier ones."""
+    class FakePredict:
+        def __init__(self, signature) -> None:
+            pass
+
+        def __call__(self, **kwargs):
+            prompt_trainer.dspy.settings.lm.history.append(
+                {"usage": {"prompt_tokens": 100, "completion_tokens": 10}}
+            )
+            return prompt_trainer.dspy.Prediction(
+                main_prompt="# Main", subagents=[], analysis_summary="done"
+            )
+
+    monkeypatch.setattr(prompt_trainer.dspy, "Predict", FakePredict)
+
+    usages = [
+        prompt_trainer._generate_candidate(
+            prompt_trainer._create_trainer_lm("m", "k"), "[]", "{}", max_subagents=3
+        )[1]
+        for _ in range(2)
+    ]
+
+    assert [(u["input_tokens"], u["output_tokens"]) for u in usages] == [(100, 10), (100, 10)]
@@ -6,6 +6,7 @@ These tests verify internal logic using mocks and make no external API calls.
 from __future__ import annotations
 
 import asyncio
+import json
 import os
 from pathlib import Path
 
@@ -202,3 +203,102 @@ def test_agents_parameter_optional(tmp_path: Path, monkeypatch):
     assert "agents" in captured_options
     assert captured_options["agents"] is None
     assert session_id == "test-session-456"
+
+
+def test_trace_path_records_conversation_live(tmp_path: Path, monkeypatch):
+    """Messages streamed by the SDK should be appended to the live trace."""
+    from claude_agent_sdk import (
+        AssistantMessage,
+        TextBlock,
+        ToolResultBlock,
+        ToolUseBlock,
+        UserMessage,
+    )
+
+    from weft.trace_capture import render_live_trace
+
+    settings_path = tmp_path / "sdk_settings.json"
+    settings_path.write_text('{"sandbox": {"enabled": true}}')
+    trace_path = tmp_path / "sdk_trace.ndjson"
+
+    messages = [
+        AssistantMessage(
+            content=[
+                TextBlock(text="Reviewing the plan"),
+                ToolUseBlock(id="toolu_1", name="Task", input={"description": "review"}),
+            ],
+            model="haiku",
+        ),
+        UserMessage(
+            content=[ToolResultBlock(tool_use_id="toolu_2", content="sub result")],
+            parent_tool_use_id="toolu_1",
+        ),
+        ResultMessage(
+            subtype="result",
+            duration_ms=100,
+            duration_api_ms=50,
+            is_error=False,
+            num_turns=2,
+            session_id="live-session",
+            total_cost_usd=0.001,
+            result="",
+        ),
+    ]
+
+    class MockSDKClient:
+        def __init__(self, options):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            pass
+
+        async def query(self, prompt):
+            pass
+
+        async def receive_response(self):
+            for message in messages:
+                yield message
+
+    monkeypatch.setattr("weft.sdk_runner.ClaudeSDKClient", MockSDKClient)
+
+    session_id = run_sdk_session_sync(
+        worktree_path=tmp_path,
+        prompt_content="Implement the plan",
+        model="haiku",
+        sdk_settings_path=settings_path,
+        trace_path=trace_path,
+    )
+
+    assert session_id == "live-session"
+    records = [json.loads(line) for line in trace_path.read_text().splitlines()]
+    assert [r["type"] for r in records] == ["user", "assistant", "user", "result"]
+    assert records[0]["message"]["content"] == "Implement the plan"
+    assert records[1]["message"]["content"][1]["name"] == "Task"
+    assert records[2]["agentId"] == "toolu_1"
+
+    trace_file = render_live_trace(trace_path, tmp_path, "code", tmp_path, 0.0)
+    content = trace_file.read_text()
+    assert "- **Session ID**: live-session" in content
+    assert "**Tool: Task**" in content
+    assert "## Subagent: agent-toolu_1" in content
+    assert "sub result" in content
+
+
+def test_run_sdk_session_sync_times_out(tmp_path: Path, monkeypatch) -> None:
+    """A session running past its timeout is cancelled with TimeoutError."""
+    async def slow_session(**kwargs):
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr("weft.sdk_runner.run_sdk_session", slow_session)
+
+    with pytest.raises(TimeoutError):
+        run_sdk_session_sync(
+            worktree_path=tmp_path,
+            prompt_content="Test prompt",
+            model="haiku",
+            sdk_settings_path=tmp_path / "settings.json",
+            timeout=0.05,
+        )
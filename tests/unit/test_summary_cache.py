@@ -0,0 +1,74 @@
+"""Unit tests for summary_cache module."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+from weft.summary_cache import (
+    SummaryCache,
+    content_hash,
+    read_summary_metadata,
+    summary_cache_key,
+    write_summary_metadata,
+)
+
+
+def test_key_depends_on_every_input() -> None:
+    """Changing the trace, prompt or model yields a different key."""
+    trace_hash = content_hash("trace")
+    key = summary_cache_key(trace_hash, "prompt", "model-a")
+
+    assert key == summary_cache_key(trace_hash, "prompt", "model-a")
+    assert key != summary_cache_key(content_hash("other trace"), "prompt", "model-a")
+    assert key != summary_cache_key(trace_hash, "other prompt", "model-a")
+    assert key != summary_cache_key(trace_hash, "prompt", "model-b")
+
+
+def test_get_and_put_round_trip(tmp_path: Path) -> None:
+    """Stored summaries are returned by key; unknown keys miss."""
+    cache = SummaryCache(tmp_path)
+    key = summary_cache_key(content_hash("trace"), "prompt", "model")
+
+    assert cache.get(key) is None
+    cache.put(key, "# Trace Summary")
+
+    assert cache.get(key) == "# Trace Summary"
+    assert cache.discard(key) is True
+    assert cache.get(key) is None
+
+
+def test_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Entries not read recently are evicted first once over the size bound."""
+    cache = SummaryCache(tmp_path, max_bytes=250)
+    keys = [summary_cache_key(content_hash(str(i)), "p", "m") for i in range(3)]
+
+    cache.put(keys[0], "a" * 100)
+    cache.put(keys[1], "b" * 100)
+    old = time.time() - 60
+    for key in keys[:2]:
+        path = tmp_path / key[:2] / f"{key}.md"
+        os.utime(path, (old, old))
+    # Reading refreshes the first entry, so the second is now the oldest
+    assert cache.get(keys[0]) == "a" * 100
+
+    cache.put(keys[2], "c" * 100)
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+
+
+def test_summary_metadata_round_trip(tmp_path: Path) -> None:
+    """Provenance is written next to the summary and read back."""
+    summary_path = tmp_path / "code_trace_summary.md"
+    assert read_summary_metadata(summary_path) is None
+
+    write_summary_metadata(summary_path, "key", "hash", "prompt", "model")
+
+    metadata = read_summary_metadata(summary_path)
+    assert metadata["cache_key"] == "key"
+    assert metadata["trace_sha256"] == "hash"
+    assert metadata["prompt_sha256"] == content_hash("prompt")
+    assert (tmp_path / "code_trace_summary.json").exists()
@@ -11,6 +11,7 @@ from weft.trace_capture import (
     clean_tool_results,
     generate_markdown,
     parse_jsonl_file,
+    iter_session_messages,
     match_session_files,
 )
 
@@ -126,6 +127,35 @@ def test_clean_tool_results_preserves_small():
     assert tool_result == small_content
 
 
+def test_clean_tool_results_does_not_copy_untouched_messages():
+    """Messages without oversized tool results are returned without copying."""
+    small = {
+        "type": "user",
+        "message": {"content": [{"type": "tool_result", "tool_use_id": "1", "content": "ok"}]},
+    }
+    large = {
+        "type": "user",
+        "message": {"content": [{"type": "tool_result", "tool_use_id": "2", "content": "x" * 300}]},
+    }
+    result = clean_tool_results([small, large])
+    assert result[0] is small
+    assert result[1] is not large
+    assert large["message"]["content"][0]["content"] == "x" * 300
+
+
+def test_generate_markdown_truncates_tool_results_lazily():
+    """Rendering truncates large tool results without modifying the messages."""
+    message = {
+        "type": "user",
+        "timestamp": "2025-01-01T00:00:00Z",
+        "message": {"content": [{"type": "tool_result", "tool_use_id": "1", "content": "x" * 300}]},
+    }
+    result = generate_markdown({"main": [message]}, {})
+    assert "[... 100 chars truncated ...]" in result
+    assert "x" * 300 not in result
+    assert message["message"]["content"][0]["content"] == "x" * 300
+
+
 def test_markdown_generation_basic():
     """Basic markdown output should have correct structure."""
     grouped_messages = {
@@ -242,6 +272,40 @@ def test_parse_jsonl_handles_invalid_lines(tmp_path):
     assert result[1]["type"] == "assistant"
 
 
+def test_iter_session_messages_filters_by_session(tmp_path):
+    """Only messages from the target session should be yielded, in file order."""
+    first = tmp_path / "a.jsonl"
+    second = tmp_path / "b.jsonl"
+    first.write_text(
+        '{"sessionId": "target", "type": "user", "n": 1}\n'
+        '{"sessionId": "other", "type": "user", "n": 2}\n'
+    )
+    second.write_text(
+        '{"sessionId": "other", "type": "assistant", "n": 3}\n'
+        '{"sessionId": "target", "type": "assistant", "n": 4}\n'
+    )
+
+    result = list(iter_session_messages([first, second], "target"))
+
+    assert [m["n"] for m in result] == [1, 4]
+
+
+def test_iter_session_messages_skips_other_sessions_before_decoding(tmp_path, caplog):
+    """Lines without the session ID should be rejected without JSON parsing."""
+    jsonl_file = tmp_path / "test.jsonl"
+    jsonl_file.write_text(
+        'not json from another session\n'
+        '{"sessionId": "target-not-quite", "type": "user"}\n'
+        '{"sessionId": "target", "type": "user"}\n'
+    )
+
+    with caplog.at_level("WARNING"):
+        result = list(iter_session_messages([jsonl_file], "target"))
+
+    assert len(result) == 1
+    assert "Invalid JSON" not in caplog.text
+
+
 def test_match_session_finds_correct_cwd(tmp_path):
     """Session matching by cwd field should work."""
     jsonl_file = tmp_path / "session.jsonl"
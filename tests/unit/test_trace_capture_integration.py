@@ -18,6 +18,8 @@ from weft.trace_capture import (
     create_plan_trace_directory,
     prune_old_plan_traces,
 )
+from weft.trace_parser import ErrorScanner, load_trace_sidecar, parse_subagent_sections, parse_trace
+from weft.trace_storage import read_trace_text
 
 
 def create_mock_jsonl_file(file_path: Path, cwd: str, session_id: str, messages: list[dict]):
@@ -377,6 +379,290 @@ def test_project_folder_discovery_time_window(tmp_path, monkeypatch):
     assert result is None
 
 
+def _text_message(text: str, agent_id: str | None = None) -> dict:
+    """Build a minimal user message, optionally belonging to a subagent."""
+    message = {
+        "type": "user",
+        "timestamp": "2025-01-01T00:00:00Z",
+        "isSidechain": agent_id is not None,
+        "gitBranch": "main",
+        "message": {"content": [{"type": "text", "text": text}]},
+    }
+    if agent_id is not None:
+        message["agentId"] = agent_id
+    return message
+
+
+def test_recapture_appends_only_new_messages(tmp_path, monkeypatch):
+    """Re-capture should splice new lines into trace.md, matching a full capture."""
+    mock_projects = tmp_path / ".claude" / "projects"
+    worktree = tmp_path / "worktree"
+    worktree.mkdir()
+    project_folder = mock_projects / ("-" + str(worktree.resolve()).replace("/", "-"))
+    project_folder.mkdir(parents=True)
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+
+    session_id = "resume-test"
+    cwd = str(worktree.resolve())
+    jsonl_file = project_folder / f"{session_id}.jsonl"
+    create_mock_jsonl_file(
+        jsonl_file, cwd, session_id,
+        [_text_message("first main"), _text_message("first sub", "aaa")],
+    )
+
+    now = time.time()
+    capture_kwargs = dict(
+        worktree_path=worktree, command="code", run_dir=run_dir,
+        execution_start=now, execution_end=now, session_id=session_id,
+    )
+    trace_file = capture_session_trace(**capture_kwargs)
+    assert (run_dir / "trace_state.json").exists()
+
+    # Simulate a resumed session appending to the JSONL file, ending with a
+    # line that is still being written
+    with jsonl_file.open("a", encoding="utf-8") as f:
+        for message in [
+            _text_message("second main"),
+            _text_message("second sub", "aaa"),
+            _text_message("new sub", "bbb"),
+        ]:
+            message.update(cwd=cwd, sessionId=session_id)
+            f.write(json.dumps(message) + "\n")
+        f.write('{"type": "user", "sessionId": "' + session_id + '", "mess')
+
+    capture_session_trace(**capture_kwargs)
+    incremental = trace_file.read_bytes()
+
+    # The unterminated line is left for the next capture
+    state = json.loads((run_dir / "trace_state.json").read_text())
+    complete_size = jsonl_file.read_bytes().rindex(b"\n") + 1
+    assert state["files"][str(jsonl_file)]["offset"] == complete_size
+
+    # A fresh full capture must produce the same document
+    (run_dir / "trace_state.json").unlink()
+    capture_session_trace(**capture_kwargs)
+    assert trace_file.read_bytes() == incremental
+
+    content = incremental.decode("utf-8")
+    assert content.index("second main") < content.index("## Subagent: agent-aaa")
+    assert content.index("second sub") < content.index("## Subagent: agent-bbb")
+    assert content.count("first main") == 1
+
+
+def test_recapture_falls_back_when_trace_modified(tmp_path, monkeypatch):
+    """An edited trace.md invalidates the checkpoint and forces a full capture."""
+    mock_projects = tmp_path / ".claude" / "projects"
+    worktree = tmp_path / "worktree"
+    worktree.mkdir()
+    project_folder = mock_projects / ("-" + str(worktree.resolve()).replace("/", "-"))
+    project_folder.mkdir(parents=True)
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+
+    session_id = "modified-test"
+    create_mock_jsonl_file(
+        project_folder / f"{session_id}.jsonl", str(worktree.resolve()), session_id,
+        [_text_message("hello")],
+    )
+    now = time.time()
+    capture_kwargs = dict(
+        worktree_path=worktree, command="code", run_dir=run_dir,
+        execution_start=now, execution_end=now, session_id=session_id,
+    )
+    trace_file = capture_session_trace(**capture_kwargs)
+    original = trace_file.read_text()
+    trace_file.write_text("edited by hand")
+
+    capture_session_trace(**capture_kwargs)
+
+    assert trace_file.read_text() == original
+
+
+def _tool_messages(tool_id: str, command: str, output: str, agent_id: str | None = None) -> list[dict]:
+    """Build an assistant Bash tool call and the user message carrying its result."""
+    sidechain = {"isSidechain": agent_id is not None, "gitBranch": "main"}
+    if agent_id is not None:
+        sidechain["agentId"] = agent_id
+    return [
+        {
+            "type": "assistant",
+            "timestamp": "2025-01-01T00:00:01Z",
+            "message": {"content": [
+                {"type": "tool_use", "id": tool_id, "name": "Bash", "input": {"command": command}},
+            ]},
+            **sidechain,
+        },
+        {
+            "type": "user",
+            "timestamp": "2025-01-01T00:00:02Z",
+            "message": {"content": [
+                {"type": "tool_result", "tool_use_id": tool_id, "content": output},
+            ]},
+            **sidechain,
+        },
+    ]
+
+
+def test_sidecar_matches_markdown_parse(tmp_path, monkeypatch):
+    """The structured sidecar yields what parsing trace.md would, before and after re-capture."""
+    mock_projects = tmp_path / ".claude" / "projects"
+    worktree = tmp_path / "worktree"
+    worktree.mkdir()
+    project_folder = mock_projects / ("-" + str(worktree.resolve()).replace("/", "-"))
+    project_folder.mkdir(parents=True)
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+
+    session_id = "sidecar-test"
+    cwd = str(worktree.resolve())
+    jsonl_file = project_folder / f"{session_id}.jsonl"
+    create_mock_jsonl_file(
+        jsonl_file, cwd, session_id,
+        [_text_message("start")]
+        + _tool_messages("t1", "pytest", "Error: something went wrong in the test run")
+        + _tool_messages("t6", "python x.py", "Traceback (most recent call last):\n  File x\nValueError")
+        + _tool_messages("t7", "cat big", "y" * 500)
+        + _tool_messages("t2", "ls", "## Subagent: agent-fake", agent_id="aaa"),
+    )
+
+    now = time.time()
+    capture_kwargs = dict(
+        worktree_path=worktree, command="code", run_dir=run_dir,
+        execution_start=now, execution_end=now, session_id=session_id,
+    )
+    trace_file = capture_session_trace(**capture_kwargs)
+    assert (run_dir / "trace.ndjson").exists()
+    assert (run_dir / "trace.index.json").exists()
+
+    def assert_sidecar_matches():
+        sidecar = load_trace_sidecar(trace_file)
+        content = trace_file.read_text(encoding="utf-8")
+        assert sidecar is not None
+        assert sidecar == parse_trace(content)
+        assert parse_subagent_sections("", trace_path=trace_file) == sidecar.subagent_sections
+
+    assert_sidecar_matches()
+    assert load_trace_sidecar(trace_file).errors
+
+    with jsonl_file.open("a", encoding="utf-8") as f:
+        for message in (
+            _tool_messages("t3", "make", "FAILED tests/test_x.py::test_y")
+            + _tool_messages("t4", "cat", "done", agent_id="aaa")
+            + _tool_messages("t5", "git status", "clean", agent_id="bbb")
+        ):
+            message.update(cwd=cwd, sessionId=session_id)
+            f.write(json.dumps(message) + "\n")
+
+    capture_session_trace(**capture_kwargs)
+    assert set(load_trace_sidecar(trace_file).subagent_sections) == {"aaa", "bbb"}
+    assert_sidecar_matches()
+
+    # A trace edited after capture no longer matches its sidecar
+    trace_file.write_text("edited by hand")
+    assert load_trace_sidecar(trace_file) is None
+
+
+def test_sidecar_append_scans_only_new_records(tmp_path, monkeypatch):
+    """Re-capture resumes the error scan instead of re-scanning the whole trace."""
+    mock_projects = tmp_path / ".claude" / "projects"
+    worktree = tmp_path / "worktree"
+    worktree.mkdir()
+    project_folder = mock_projects / ("-" + str(worktree.resolve()).replace("/", "-"))
+    project_folder.mkdir(parents=True)
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+
+    session_id = "scan-test"
+    cwd = str(worktree.resolve())
+    jsonl_file = project_folder / f"{session_id}.jsonl"
+    create_mock_jsonl_file(
+        jsonl_file, cwd, session_id,
+        [_text_message("old main")]
+        + _tool_messages("t1", "pytest", "Error: old failure")
+        + _tool_messages("t2", "ls", "old subagent output", agent_id="aaa"),
+    )
+
+    now = time.time()
+    capture_kwargs = dict(
+        worktree_path=worktree, command="code", run_dir=run_dir,
+        execution_start=now, execution_end=now, session_id=session_id,
+    )
+    trace_file = capture_session_trace(**capture_kwargs)
+
+    scanned = []
+
+    class RecordingScanner(ErrorScanner):
+        def feed_text(self, text: str) -> None:
+            scanned.append(text)
+            super().feed_text(text)
+
+    monkeypatch.setattr("weft.trace_capture.ErrorScanner", RecordingScanner)
+    with jsonl_file.open("a", encoding="utf-8") as f:
+        for message in _tool_messages("t3", "make", "Error: new failure", agent_id="bbb"):
+            message.update(cwd=cwd, sessionId=session_id)
+            f.write(json.dumps(message) + "\n")
+
+    capture_session_trace(**capture_kwargs)
+    scanned_text = "\n".join(scanned)
+    assert "new failure" in scanned_text
+    assert "old main" not in scanned_text
+    assert "old subagent output" not in scanned_text
+
+    sidecar = load_trace_sidecar(trace_file)
+    assert sidecar == parse_trace(trace_file.read_text(encoding="utf-8"))
+    assert any("old failure" in error for error in sidecar.errors)
+    assert any("new failure" in error for error in sidecar.errors)
+
+
+def test_compressed_trace_recapture_and_sidecar(tmp_path, monkeypatch):
+    """Compressed traces support incremental re-capture and sidecar reads."""
+    mock_projects = tmp_path / ".claude" / "projects"
+    worktree = tmp_path / "worktree"
+    worktree.mkdir()
+    project_folder = mock_projects / ("-" + str(worktree.resolve()).replace("/", "-"))
+    project_folder.mkdir(parents=True)
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    monkeypatch.setattr("weft.trace_capture.get_trace_compression", lambda: "gzip")
+
+    session_id = "gzip-test"
+    cwd = str(worktree.resolve())
+    jsonl_file = project_folder / f"{session_id}.jsonl"
+    create_mock_jsonl_file(
+        jsonl_file, cwd, session_id,
+        [_text_message("first main")] + _tool_messages("t1", "ls", "ok", agent_id="aaa"),
+    )
+
+    now = time.time()
+    capture_kwargs = dict(
+        worktree_path=worktree, command="code", run_dir=run_dir,
+        execution_start=now, execution_end=now, session_id=session_id,
+    )
+    trace_file = capture_session_trace(**capture_kwargs)
+    assert not trace_file.exists()
+    assert (run_dir / "trace.md.gz").exists()
+
+    with jsonl_file.open("a", encoding="utf-8") as f:
+        message = _text_message("second main")
+        message.update(cwd=cwd, sessionId=session_id)
+        f.write(json.dumps(message) + "\n")
+
+    capture_session_trace(**capture_kwargs)
+    incremental = read_trace_text(trace_file)
+    assert incremental.index("second main") < incremental.index("## Subagent: agent-aaa")
+    assert load_trace_sidecar(trace_file) == parse_trace(incremental)
+
+    (run_dir / "trace_state.json").unlink()
+    capture_session_trace(**capture_kwargs)
+    assert read_trace_text(trace_file) == incremental
+
+
 def test_create_plan_trace_directory(tmp_path):
     """Test creating timestamped plan trace directory."""
     repo_root = tmp_path / "repo"
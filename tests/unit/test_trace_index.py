@@ -0,0 +1,139 @@
+"""Unit tests for trace_index module."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from weft import trace_index
+from weft.trace_index import ProjectIndex, expected_folder_name, read_jsonl_header
+
+
+def _write_session(folder: Path, name: str, cwd: str, session_id: str) -> Path:
+    folder.mkdir(parents=True, exist_ok=True)
+    jsonl_file = folder / name
+    jsonl_file.write_text(
+        json.dumps({"type": "user", "cwd": cwd, "sessionId": session_id}) + "\n",
+        encoding="utf-8",
+    )
+    return jsonl_file
+
+
+def _age_dirs(*paths: Path) -> None:
+    """Push directory mtimes outside the racy window so they are trusted."""
+    old = time.time() - 60
+    for path in paths:
+        os.utime(path, (old, old))
+
+
+@pytest.fixture
+def projects(tmp_path: Path) -> Path:
+    projects_dir = tmp_path / ".claude" / "projects"
+    projects_dir.mkdir(parents=True)
+    return projects_dir
+
+
+@pytest.fixture
+def worktree(tmp_path: Path) -> Path:
+    worktree_path = tmp_path / "worktree"
+    worktree_path.mkdir()
+    return worktree_path
+
+
+def test_find_folder_exact_match(tmp_path, projects, worktree):
+    """Folder named after the worktree path is found without a full scan."""
+    folder = projects / expected_folder_name(worktree)
+    _write_session(folder, "s1.jsonl", str(worktree.resolve()), "s1")
+
+    index = ProjectIndex.load(projects, tmp_path / "index.json")
+
+    assert index.find_folder(worktree) == folder
+
+
+def test_find_folder_by_cwd_and_session(tmp_path, projects, worktree):
+    """Folders with non-standard names are matched by header cwd or session ID."""
+    folder = projects / "renamed-folder"
+    _write_session(folder, "s1.jsonl", str(worktree.resolve()), "s1")
+    _write_session(projects / "other", "s2.jsonl", "/elsewhere", "s2")
+
+    index = ProjectIndex.load(projects, tmp_path / "index.json")
+
+    assert index.find_folder(worktree) == folder
+    assert index.find_folder(tmp_path / "unrelated", session_id="s2") == projects / "other"
+    assert index.find_folder(tmp_path / "unrelated", session_id="missing") is None
+
+
+def test_index_persists_and_skips_unchanged_folders(tmp_path, projects, worktree, monkeypatch):
+    """A reloaded index reuses headers instead of reopening JSONL files."""
+    folder = projects / "renamed-folder"
+    _write_session(folder, "s1.jsonl", str(worktree.resolve()), "s1")
+    _age_dirs(folder, projects)
+    index_path = tmp_path / "index.json"
+
+    index = ProjectIndex.load(projects, index_path)
+    assert index.find_folder(worktree) == folder
+    index.save()
+    assert index_path.exists()
+
+    reads = []
+    original = trace_index.read_jsonl_header
+    monkeypatch.setattr(
+        trace_index, "read_jsonl_header", lambda path: reads.append(path) or original(path)
+    )
+
+    reloaded = ProjectIndex.load(projects, index_path)
+    assert reloaded.find_folder(worktree) == folder
+    assert reloaded.match_session(folder, worktree) == "s1"
+    assert reads == []
+
+
+def test_new_file_invalidates_folder(tmp_path, projects, worktree):
+    """Adding a JSONL file changes the directory mtime and triggers a rescan."""
+    folder = projects / expected_folder_name(worktree)
+    first = _write_session(folder, "s1.jsonl", "/elsewhere", "s1")
+    _age_dirs(folder)
+    index_path = tmp_path / "index.json"
+
+    index = ProjectIndex.load(projects, index_path)
+    assert index.session_files(folder) == [first]
+    index.save()
+
+    second = _write_session(folder, "s2.jsonl", str(worktree.resolve()), "s2")
+    os.utime(second, (time.time() + 10, time.time() + 10))
+
+    reloaded = ProjectIndex.load(projects, index_path)
+    assert reloaded.session_files(folder) == [first, second]
+    assert reloaded.match_session(folder, worktree) == "s2"
+
+
+def test_incomplete_header_is_reread(tmp_path, projects, worktree):
+    """A first line still being written is not cached as a header."""
+    folder = projects / "renamed-folder"
+    folder.mkdir()
+    jsonl_file = folder / "s1.jsonl"
+    jsonl_file.write_text('{"cwd": "', encoding="utf-8")
+    assert read_jsonl_header(jsonl_file) is None
+
+    index = ProjectIndex.load(projects, tmp_path / "index.json")
+    assert index.find_folder(worktree) is None
+
+    _write_session(folder, "s1.jsonl", str(worktree.resolve()), "s1")
+    assert index.find_folder(worktree) == folder
+
+
+def test_corrupt_index_is_discarded(tmp_path, projects, worktree):
+    """An unreadable index file is replaced instead of raising."""
+    folder = projects / expected_folder_name(worktree)
+    _write_session(folder, "s1.jsonl", str(worktree.resolve()), "s1")
+    index_path = tmp_path / "index.json"
+    index_path.write_text("{not json", encoding="utf-8")
+
+    index = ProjectIndex.load(projects, index_path)
+    assert index.find_folder(worktree) == folder
+    index.save()
+
+    assert json.loads(index_path.read_text(encoding="utf-8"))["version"] == trace_index.INDEX_VERSION
@@ -15,6 +15,7 @@ from weft.trace_parser import (
     extract_file_paths,
     parse_subagent_sections,
     parse_tool_calls,
+    parse_trace,
     parse_trace_metadata,
 )
 
@@ -347,3 +348,66 @@ Starting the work...
 
         errors = detect_errors(content)
         assert errors == []  # No errors
+
+
+class TestParseTrace:
+    """Tests for the single-pass parse_trace function."""
+
+    def test_matches_individual_parsers(self, real_trace_content: str) -> None:
+        """One pass yields the same data as the per-field wrappers."""
+        parsed = parse_trace(real_trace_content)
+
+        assert parsed.metadata == parse_trace_metadata(real_trace_content)
+        assert parsed.tool_calls == parse_tool_calls(real_trace_content)
+        assert parsed.subagent_sections == parse_subagent_sections(real_trace_content)
+        assert parsed.errors == detect_errors(real_trace_content)
+
+    def test_subagent_section_keeps_inner_headings(self) -> None:
+        """Markdown headings written by a subagent do not end its section."""
+        content = """## Main Conversation
+
+## Subagent: agent-abc123
+
+### Assistant
+
+## Issues Found
+- something
+
+## Subagent: agent-def456
+
+done
+"""
+        sections = parse_trace(content).subagent_sections
+
+        assert set(sections) == {"abc123", "def456"}
+        assert "## Issues Found" in sections["abc123"]
+        assert "## Subagent: agent-def456" not in sections["abc123"]
+
+    def test_headers_inside_tool_results_ignored(self) -> None:
+        """Subagent and tool headers quoted inside a fenced result are not parsed."""
+        content = """**Tool Result** (ID: toolu_1)
+```
+## Subagent: agent-fake
+**Tool: Bash**
+```
+"""
+        parsed = parse_trace(content)
+
+        assert parsed.subagent_sections == {}
+        assert parsed.tool_calls == []
+        assert len(parsed.tool_results) == 1
+
+    def test_repeated_tool_calls_all_counted(self) -> None:
+        """Identical consecutive tool calls are each recorded with their timestamp."""
+        call = """**Tool: Bash**
+```json
+{
+  "command": "pytest"
+}
+```
+"""
+        content = "### [2025-01-01T00:00:00Z] Assistant\n\n" + call + call
+        tool_calls = parse_trace(content).tool_calls
+
+        assert len(tool_calls) == 2
+        assert all(tc.timestamp == "2025-01-01T00:00:00Z" for tc in tool_calls)
@@ -0,0 +1,107 @@
+"""Unit tests for trace_storage module."""
+
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+
+import pytest
+
+from weft import trace_storage
+from weft.trace_storage import (
+    TraceStorageError,
+    content_size,
+    copy_trace,
+    find_trace,
+    read_trace_text,
+    stored_compression,
+    trace_exists,
+    trace_writer,
+    write_trace_bytes,
+)
+
+
+def test_write_and_read_gzip_trace(tmp_path: Path) -> None:
+    """A gzip-stored trace is read back transparently through its logical path."""
+    trace = tmp_path / "trace.md"
+    content = "# Conversation Trace\n" + "line\n" * 1000
+
+    stored = write_trace_bytes(trace, content.encode("utf-8"), "gzip")
+
+    assert stored == tmp_path / "trace.md.gz"
+    assert not trace.exists()
+    assert stored.stat().st_size < len(content)
+    assert read_trace_text(trace) == content
+    assert content_size(trace) == len(content)
+    assert stored_compression(trace) == "gzip"
+
+
+def test_write_replaces_other_variants(tmp_path: Path) -> None:
+    """Only one stored form of a trace exists after a write."""
+    trace = tmp_path / "trace.md"
+    write_trace_bytes(trace, b"old", "gzip")
+
+    write_trace_bytes(trace, b"new", None)
+
+    assert find_trace(trace) == trace
+    assert not (tmp_path / "trace.md.gz").exists()
+    assert read_trace_text(trace) == "new"
+
+
+def test_copy_trace_converts_format(tmp_path: Path) -> None:
+    """Copying recompresses when the destination format differs."""
+    source = tmp_path / "trace.md"
+    source.write_text("hello trace", encoding="utf-8")
+    dest_dir = tmp_path / "staging"
+    dest_dir.mkdir()
+
+    stored = copy_trace(source, dest_dir / "code_trace.md", "gzip")
+
+    assert stored.name == "code_trace.md.gz"
+    assert gzip.decompress(stored.read_bytes()) == b"hello trace"
+    assert read_trace_text(dest_dir / "code_trace.md") == "hello trace"
+
+
+def test_missing_and_corrupt_traces(tmp_path: Path) -> None:
+    """Missing traces raise FileNotFoundError; corrupt ones TraceStorageError."""
+    trace = tmp_path / "trace.md"
+    assert not trace_exists(trace)
+    with pytest.raises(FileNotFoundError):
+        read_trace_text(trace)
+
+    (tmp_path / "trace.md.gz").write_bytes(b"not gzip")
+    with pytest.raises(TraceStorageError):
+        read_trace_text(trace)
+
+    # A valid gzip header followed by a mangled deflate stream
+    payload = bytearray(gzip.compress(b"hello trace " * 200, mtime=0))
+    for i in range(12, len(payload) - 8):
+        payload[i] ^= 0xFF
+    (tmp_path / "trace.md.gz").write_bytes(bytes(payload))
+    with pytest.raises(TraceStorageError):
+        read_trace_text(trace)
+
+
+def test_unknown_compression_rejected(tmp_path: Path) -> None:
+    """An unsupported format name is an error rather than a silent plain write."""
+    with pytest.raises(TraceStorageError):
+        write_trace_bytes(tmp_path / "trace.md", b"data", "lz4")
+
+
+def test_streamed_zstd_trace_size_without_decompressing(tmp_path: Path, monkeypatch) -> None:
+    """A streamed zstd trace records its size, so measuring it reads no content."""
+    pytest.importorskip("zstandard")
+    trace = tmp_path / "trace.md"
+    content = b"# Conversation Trace\n" + b"line\n" * 10_000
+
+    with trace_writer(trace, "zstd") as f:
+        for start in range(0, len(content), 4096):
+            f.write(content[start:start + 4096])
+
+    assert read_trace_text(trace).encode("utf-8") == content
+
+    def no_decompress(path):
+        raise AssertionError("content_size decompressed the trace")
+
+    monkeypatch.setattr(trace_storage, "open_trace", no_decompress)
+    assert content_size(trace) == len(content)
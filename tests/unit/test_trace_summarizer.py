@@ -8,11 +8,28 @@ Uses the real_trace_content fixture from conftest.py.
 
 from __future__ import annotations
 
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
+from weft import trace_summarizer
+from weft.summary_cache import (
+    SummaryCache,
+    content_hash,
+    read_summary_metadata,
+    write_summary_metadata,
+)
 from weft.trace_summarizer import (
+    _chunk_text,
     _format_structural_section,
+    _plan_chunks,
+    _summary_prompts,
+    EXTRACTIVE_MODEL,
+    EXTRACTIVE_TARGET_CHARS,
+    create_trace_summary,
     extract_structural_data,
     needs_regeneration,
 )
@@ -220,6 +237,123 @@ class TestFormatStructuralSection:
         assert "10 more" in section
 
 
+class TestPlanChunks:
+    """Tests for hierarchical summarization chunking."""
+
+    def test_chunk_text_splits_at_message_boundaries(self) -> None:
+        """Chunks stay under the limit and only break before message headers."""
+        messages = [f"### [2025-01-01T00:00:0{i}] Assistant\n\n{'x' * 40}\n\n" for i in range(5)]
+        text = "# Conversation Trace\n\n" + "".join(messages)
+
+        chunks = _chunk_text(text, max_chars=120)
+
+        assert "".join(chunks) == text
+        assert all(len(chunk) <= 120 for chunk in chunks)
+        assert all(chunk.startswith("### [") for chunk in chunks[1:])
+
+    def test_chunk_text_splits_oversized_message(self) -> None:
+        """A single message larger than the limit is split mid-message."""
+        text = "### [ts] User\n\n" + "y" * 250
+
+        chunks = _chunk_text(text, max_chars=100)
+
+        assert "".join(chunks) == text
+        assert all(len(chunk) <= 100 for chunk in chunks)
+
+    def test_plan_chunks_separates_subagent_sections(self) -> None:
+        """Main conversation and each subagent section become separate chunks."""
+        main = "# Conversation Trace\n\n## Main Conversation\n\n### [ts] User\n\nDo it\n"
+        review = "### [ts] Assistant\n\nHIGH SEVERITY: missing test\n"
+        trace = main + "\n## Subagent: agent-abc\n\n" + review
+
+        main_chunks, subagent_chunks = _plan_chunks(trace, {"abc": review})
+
+        assert main_chunks == [("Main conversation, part 1 of 1", main)]
+        assert subagent_chunks == [("abc", "Subagent agent-abc", review)]
+
+    def test_hierarchical_summary_reduces_chunk_summaries(self, monkeypatch) -> None:
+        """Every chunk is summarized, and the partial summaries feed the reduce call."""
+        mapped = []
+        reduced = []
+
+        class FakePredict:
+            def __init__(self, signature) -> None:
+                pass
+
+            def __call__(self, **kwargs):
+                if "chunk_content" in kwargs:
+                    mapped.append(kwargs["chunk_label"])
+                    return trace_summarizer.dspy.Prediction(
+                        partial_summary=f"partial of {kwargs['chunk_label']}"
+                    )
+                reduced.append(kwargs)
+                return trace_summarizer.dspy.Prediction(narrative_summary="final narrative")
+
+        monkeypatch.setattr(trace_summarizer.dspy, "Predict", FakePredict)
+        messages = [
+            f"### [ts{i}] Assistant\n\n{'x' * (trace_summarizer.MAP_CHUNK_CHARS // 2)}\n\n"
+            for i in range(3)
+        ]
+        main = "# Conversation Trace\n\n## Main Conversation\n\n" + "".join(messages)
+        review = "### [ts] Assistant\n\nHIGH SEVERITY: missing test\n"
+        trace = main + "\n## Subagent: agent-abc\n\n" + review
+        main_chunks, _ = _plan_chunks(trace, {"abc": review})
+
+        narrative = trace_summarizer._generate_hierarchical_summary(
+            trace, {"abc": review}, lm=None, structural_json="{}", instructions="Summarize."
+        )
+
+        assert narrative == "final narrative"
+        assert len(main_chunks) > 1
+        assert sorted(mapped) == sorted([label for label, _ in main_chunks] + ["Subagent agent-abc"])
+        assert len(reduced) == 1
+        for label, _ in main_chunks:
+            assert f"## {label}\n\npartial of {label}" in reduced[0]["trace_content"]
+        assert "partial of Subagent agent-abc" in reduced[0]["subagent_sections"]
+        assert reduced[0]["structural_data"] == "{}"
+
+    def test_concurrent_summaries_share_lm_call_limit(self, monkeypatch) -> None:
+        """Map calls from several traces summarized at once stay within one limit."""
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        class FakePredict:
+            def __init__(self, signature) -> None:
+                pass
+
+            def __call__(self, **kwargs):
+                nonlocal running, peak
+                with lock:
+                    running += 1
+                    peak = max(peak, running)
+                time.sleep(0.02)
+                with lock:
+                    running -= 1
+                return trace_summarizer.dspy.Prediction(
+                    partial_summary="partial", narrative_summary="final narrative"
+                )
+
+        monkeypatch.setattr(trace_summarizer.dspy, "Predict", FakePredict)
+        monkeypatch.setattr(trace_summarizer, "_LM_CALL_SLOTS", threading.BoundedSemaphore(3))
+        messages = [
+            f"### [ts{i}] Assistant\n\n{'x' * (trace_summarizer.MAP_CHUNK_CHARS // 2)}\n\n"
+            for i in range(6)
+        ]
+        trace = "# Conversation Trace\n\n## Main Conversation\n\n" + "".join(messages)
+
+        def summarize(_: int) -> str:
+            return trace_summarizer._generate_hierarchical_summary(
+                trace, {}, lm=None, structural_json="{}", instructions="Summarize."
+            )
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            narratives = list(executor.map(summarize, range(4)))
+
+        assert narratives == ["final narrative"] * 4
+        assert peak == 3
+
+
 class TestNeedsRegeneration:
     """Tests for needs_regeneration function."""
 
@@ -257,6 +391,127 @@ class TestNeedsRegeneration:
 
         assert needs_regeneration(trace_path, summary_path) is True
 
+    def test_needs_regeneration_uses_content_hash(self, tmp_path: Path) -> None:
+        """With provenance recorded, touching the trace does not force regeneration."""
+        trace_path = tmp_path / "code_trace.md"
+        summary_path = tmp_path / "code_trace_summary.md"
+        summary_path.write_text("summary")
+        trace_path.write_text("content")
+        write_summary_metadata(
+            summary_path,
+            "key",
+            content_hash("content"),
+            _summary_prompts(),
+            "model",
+        )
+
+        future = time.time() + 60
+        os.utime(trace_path, (future, future))
+        assert needs_regeneration(trace_path, summary_path) is False
+
+        trace_path.write_text("changed content")
+        assert needs_regeneration(trace_path, summary_path) is True
+
+
+class TestCreateTraceSummary:
+    """Tests for summary caching in create_trace_summary."""
+
+    def test_identical_traces_are_summarized_once(
+        self, tmp_path: Path, monkeypatch
+    ) -> None:
+        """A second trace with the same content reuses the cached summary."""
+        calls = []
+
+        def fake_build(trace_path: Path, trace_content: str, model: str) -> str:
+            calls.append(trace_path)
+            return "# Trace Summary\n"
+
+        monkeypatch.setattr(trace_summarizer, "_build_summary", fake_build)
+        cache = SummaryCache(tmp_path / "cache")
+
+        for name in ("sample-a", "sample-b"):
+            sample_dir = tmp_path / name
+            sample_dir.mkdir()
+            (sample_dir / "code_trace.md").write_text("same trace")
+            summary_path = create_trace_summary(sample_dir / "code_trace.md", "model", cache=cache)
+            assert summary_path.read_text() == "# Trace Summary\n"
+            assert not needs_regeneration(sample_dir / "code_trace.md", summary_path)
+
+        assert calls == [tmp_path / "sample-a" / "code_trace.md"]
+
+
+class TestExtractiveSummary:
+    """Tests for the LM-free extractive summary."""
+
+    def test_extractive_summary_from_real_trace(
+        self, real_trace_content: str, tmp_path: Path
+    ) -> None:
+        """The extractive summary fits the target and keeps subagent reports."""
+        trace_path = tmp_path / "code_trace.md"
+        trace_path.write_text(real_trace_content)
+
+        summary_path = create_trace_summary(trace_path, None, cache=SummaryCache(tmp_path / "cache"))
+
+        summary = summary_path.read_text()
+        assert len(summary) <= EXTRACTIVE_TARGET_CHARS * 1.1
+        assert "## Tool Usage" in summary
+        assert "#### agent-" in summary
+        assert "### Final Assistant Turns" in summary
+        # Deterministic: the same trace always yields the same summary
+        assert create_trace_summary(trace_path, None, cache=SummaryCache(tmp_path / "cache2")).read_text() == summary
+
+    def test_extractive_summary_keeps_verbatim_feedback(self, tmp_path: Path) -> None:
+        """A subagent's final report is quoted exactly; tool JSON is dropped."""
+        trace = (
+            "# Conversation Trace\n\n## Main Conversation\n\n"
+            "### [ts] Assistant\n\nFixed the review findings.\n\n"
+            "**Tool: Bash**\n```json\n{\"command\": \"pytest\"}\n```\n\n"
+            "\n## Subagent: agent-abc\n\n"
+            "### [ts] Assistant\n\nHIGH SEVERITY: missing test in foo.py:42\n"
+        )
+        trace_path = tmp_path / "code_trace.md"
+        trace_path.write_text(trace)
+
+        summary = create_trace_summary(trace_path, None, cache=SummaryCache(tmp_path / "cache")).read_text()
+
+        assert "> HIGH SEVERITY: missing test in foo.py:42" in summary
+        assert "Fixed the review findings." in summary
+        assert '"command"' not in summary
+
+    def test_extractive_summary_survives_large_structural_section(
+        self, tmp_path: Path, monkeypatch
+    ) -> None:
+        """A structural section over the target still leaves room for extracted text."""
+        monkeypatch.setattr(
+            trace_summarizer, "_format_structural_section",
+            lambda data: "## Files Accessed\n\n" + "- src/file.py\n" * 1_000,
+        )
+        trace = (
+            "# Conversation Trace\n\n## Main Conversation\n\n"
+            "### [ts] Assistant\n\nFixed the review findings.\n\n"
+            "\n## Subagent: agent-abc\n\n"
+            "### [ts] Assistant\n\nHIGH SEVERITY: missing test in foo.py:42\n"
+        )
+        trace_path = tmp_path / "code_trace.md"
+        trace_path.write_text(trace)
+
+        summary = create_trace_summary(trace_path, None, cache=SummaryCache(tmp_path / "cache")).read_text()
+
+        assert "> HIGH SEVERITY: missing test in foo.py:42" in summary
+        assert "Fixed the review findings." in summary
+        assert "[... truncated]" not in summary
+
+    def test_extractive_summary_is_replaced_when_model_given(self, tmp_path: Path) -> None:
+        """An extractive summary is fresh without a model but stale with one."""
+        trace_path = tmp_path / "code_trace.md"
+        trace_path.write_text("### [ts] Assistant\n\nDone.\n")
+
+        summary_path = create_trace_summary(trace_path, None, cache=SummaryCache(tmp_path / "cache"))
+
+        assert read_summary_metadata(summary_path)["model"] == EXTRACTIVE_MODEL
+        assert needs_regeneration(trace_path, summary_path) is False
+        assert needs_regeneration(trace_path, summary_path, model="some/model") is True
+
 
 class TestLoadSummarizationPrompt:
     """Tests for _load_summarization_prompt function."""
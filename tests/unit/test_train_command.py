@@ -53,3 +53,36 @@ class TestRunTrainCommand:
             result = run_train_command(variant="sonnet", batch_size=3, max_subagents=5)
 
             assert result == 1
+
+    def test_train_all_variants_shares_training_batch(self, tmp_path: Path) -> None:
+        """Variant 'all' loads the batch once and writes candidates for each variant."""
+        from weft.training_types import CandidatePrompts, PromptSnapshot, TrainingSample
+
+        batch = [TrainingSample(
+            plan_id="p", plan_content="# Plan", code_trace="", human_feedback="ok",
+            judge_results="", test_results_after="{}",
+        )]
+        trained = []
+
+        def fake_trainer(training_samples, current_prompts, on_candidate, **kwargs):
+            assert training_samples is batch
+            trained.append(current_prompts.main_prompt)
+            candidate = CandidatePrompts(main_prompt="new", analysis_summary="done")
+            on_candidate(0, candidate, {"total_tokens": 10})
+            return [(candidate, {"total_tokens": 10})]
+
+        with patch("weft.train_command.find_repo_root", return_value=tmp_path), \
+                patch("weft.train_command.load_training_batch", return_value=batch) as load_batch, \
+                patch(
+                    "weft.train_command.load_current_prompts_for_training",
+                    side_effect=lambda repo_root, tool, model: PromptSnapshot(main_prompt=model),
+                ), \
+                patch("weft.train_command.run_prompt_trainer_candidates", side_effect=fake_trainer):
+            result = run_train_command(variant="all")
+
+        assert result == 0
+        load_batch.assert_called_once()
+        assert sorted(trained) == ["haiku", "opus", "sonnet"]
+        candidates_dir = tmp_path / ".weft" / "prompts" / "candidates" / "claude-code-cli"
+        for variant in ("sonnet", "opus", "haiku"):
+            assert (candidates_dir / variant / "candidate-001" / "main.md").read_text() == "new"
@@ -0,0 +1,87 @@
+"""Tests for training_batch module."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from weft.training_batch import estimate_sample_tokens, select_batch
+
+
+def _entry(plan_id: str, score: float, **fields) -> dict:
+    entry = {
+        "plan_id": plan_id,
+        "judge_scores": {"judge": score},
+        "tests_failed": 0,
+        "prompt_fingerprint": plan_id,
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "trace_size": None,
+    }
+    entry.update(fields)
+    return entry
+
+
+def _write_sample(training_dir: Path, plan_id: str, feedback_chars: int = 400) -> None:
+    sample_dir = training_dir / plan_id
+    sample_dir.mkdir(parents=True)
+    (sample_dir / "human_feedback.md").write_text("x" * feedback_chars)
+
+
+def test_estimate_sample_tokens_uses_file_sizes(tmp_path: Path) -> None:
+    """Estimates count sample files, and the summary target for unsummarized traces."""
+    _write_sample(tmp_path, "plan", feedback_chars=4000)
+
+    assert estimate_sample_tokens(tmp_path / "plan", {"trace_size": None}) == 1000
+    assert estimate_sample_tokens(tmp_path / "plan", {"trace_size": 50_000}) == 3500
+
+    (tmp_path / "plan" / "code_trace_summary.md").write_text("s" * 2000)
+    assert estimate_sample_tokens(tmp_path / "plan", {"trace_size": 50_000}) == 1500
+
+
+def test_select_batch_prefers_informative_samples(tmp_path: Path) -> None:
+    """Low judge scores and failing tests rank first."""
+    entries = [
+        _entry("good", 0.95),
+        _entry("bad-judges", 0.3),
+        _entry("failing-tests", 0.9, tests_failed=2),
+    ]
+    for entry in entries:
+        _write_sample(tmp_path, entry["plan_id"])
+
+    selected = select_batch(entries, tmp_path, batch_size=2, token_budget=None)
+
+    assert [e["plan_id"] for e in selected] == ["bad-judges", "failing-tests"]
+
+
+def test_select_batch_penalizes_duplicate_fingerprints(tmp_path: Path) -> None:
+    """Samples from the same prompts give way to a different fingerprint."""
+    entries = [
+        _entry("a1", 0.4, prompt_fingerprint="same"),
+        _entry("a2", 0.4, prompt_fingerprint="same"),
+        _entry("b", 0.5, prompt_fingerprint="other"),
+    ]
+    for entry in entries:
+        _write_sample(tmp_path, entry["plan_id"])
+
+    selected = select_batch(entries, tmp_path, batch_size=2, token_budget=None)
+
+    assert [e["plan_id"] for e in selected] == ["a1", "b"]
+
+
+def test_select_batch_respects_token_budget(tmp_path: Path) -> None:
+    """Samples that do not fit are skipped in favor of smaller ones."""
+    entries = [_entry("big", 0.1), _entry("medium", 0.2), _entry("small", 0.3)]
+    _write_sample(tmp_path, "big", feedback_chars=4000)  # ~1000 tokens
+    _write_sample(tmp_path, "medium", feedback_chars=4000)
+    _write_sample(tmp_path, "small", feedback_chars=400)  # ~100 tokens
+
+    selected = select_batch(entries, tmp_path, batch_size=3, token_budget=1200)
+
+    assert [e["plan_id"] for e in selected] == ["big", "small"]
+
+
+def test_select_batch_always_takes_best_sample(tmp_path: Path) -> None:
+    """A single sample over budget is still selected."""
+    entries = [_entry("huge", 0.1)]
+    _write_sample(tmp_path, "huge", feedback_chars=40_000)
+
+    assert len(select_batch(entries, tmp_path, batch_size=3, token_budget=1000)) == 1
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import json
+import os
+import time
 from pathlib import Path
 
 import pytest
@@ -14,6 +16,8 @@ from weft.training_data_exporter import (
     copy_judge_results,
     copy_plan_file,
     copy_test_results,
+    STALE_STAGING_SECONDS,
+    cleanup_abandoned_staging,
     create_training_data,
     validate_training_data,
 )
@@ -69,6 +73,21 @@ class TestCopyCodeTrace:
         assert copied.exists()
         assert "Code Trace" in copied.read_text()
 
+    def test_copies_structured_sidecar(self, tmp_path: Path) -> None:
+        """Copies the trace's NDJSON sidecar and index alongside it."""
+        code_dir = tmp_path / ".weft" / "sessions" / "test-plan" / "code"
+        code_dir.mkdir(parents=True)
+        (code_dir / "trace.md").write_text("# Code Trace")
+        (code_dir / "trace.ndjson").write_text("{}\n")
+        (code_dir / "trace.index.json").write_text("{}")
+
+        staging = tmp_path / "staging"
+        staging.mkdir()
+
+        assert copy_code_trace("test-plan", tmp_path, staging) is None
+        assert (staging / "code_trace.ndjson").read_text() == "{}\n"
+        assert (staging / "code_trace.index.json").read_text() == "{}"
+
     def test_returns_warning_when_trace_missing(self, tmp_path: Path) -> None:
         """Returns warning message when trace file doesn't exist."""
         staging = tmp_path / "staging"
@@ -323,6 +342,19 @@ class TestCreateTrainingData:
         assert (result / "human_feedback.md").exists()
         assert (result / "metadata.json").exists()
 
+        manifest = [
+            json.loads(line)
+            for line in (result.parent / "index.jsonl").read_text().splitlines()
+        ]
+        assert manifest[0]["plan_id"] == "test-plan"
+        assert manifest[0]["eval_fingerprint"] == "ab123456"
+        assert manifest[0]["judge_scores"] == {"test": 0.85}
+        # Shareable artifacts are stored in the object store
+        assert (result / "plan.md").stat().st_nlink == 2
+        assert (tmp_path / ".weft" / "objects").is_dir()
+        # Staging is committed by rename, leaving nothing behind
+        assert list((result.parent / ".staging").iterdir()) == []
+
     def test_skips_when_already_exists(self, tmp_path: Path) -> None:
         """Returns existing directory when training data already exists."""
         training_dir = tmp_path / ".weft" / "training_data" / "test-plan"
@@ -349,8 +381,9 @@ class TestCreateTrainingData:
         with pytest.raises(TrainingDataExportError):
             create_training_data("test-plan", tmp_path, eval_fingerprint="ab123456")
 
-        # Training data directory should not exist
+        # Training data directory should not exist, nor should staging leftovers
         assert not training_dir.exists()
+        assert list((training_dir.parent / ".staging").iterdir()) == []
 
     def test_warns_on_missing_code_trace(self, tmp_path: Path, monkeypatch) -> None:
         """Warns but continues when code trace is missing."""
@@ -386,6 +419,45 @@ class TestCreateTrainingData:
         assert (result / "metadata.json").exists()
 
 
+class TestCleanupAbandonedStaging:
+    """Tests for cleanup_abandoned_staging function."""
+
+    def test_removes_staging_of_dead_process(self, tmp_path: Path, monkeypatch) -> None:
+        """Removes staging directories whose process has exited."""
+        staging_root = tmp_path / ".weft" / "training_data" / ".staging"
+        abandoned = staging_root / "plan-a.4242.abc123"
+        abandoned.mkdir(parents=True)
+        (abandoned / "plan.md").write_text("# Plan")
+        running = staging_root / "plan-b.4343.def456"
+        running.mkdir()
+
+        monkeypatch.setattr(
+            "weft.training_data_exporter._process_alive", lambda pid: pid == 4343
+        )
+
+        assert cleanup_abandoned_staging(tmp_path) == 1
+        assert not abandoned.exists()
+        assert running.exists()
+
+    def test_removes_old_staging(self, tmp_path: Path) -> None:
+        """Removes unrecognized staging directories once they are stale."""
+        staging_root = tmp_path / ".weft" / "training_data" / ".staging"
+        fresh = staging_root / "unknown-fresh"
+        fresh.mkdir(parents=True)
+        old = staging_root / "unknown-old"
+        old.mkdir()
+        old_time = time.time() - STALE_STAGING_SECONDS - 60
+        os.utime(old, (old_time, old_time))
+
+        assert cleanup_abandoned_staging(tmp_path) == 1
+        assert fresh.exists()
+        assert not old.exists()
+
+    def test_no_staging_directory(self, tmp_path: Path) -> None:
+        """Returns 0 when nothing was ever staged."""
+        assert cleanup_abandoned_staging(tmp_path) == 0
+
+
 class TestPruningBehavior:
     """Tests to verify training_data is never pruned."""
 
@@ -3,18 +3,32 @@
 from __future__ import annotations
 
 import json
+import threading
 from pathlib import Path
 
 import pytest
 
+from weft.training_batch import select_batch
 from weft.training_data_loader import (
     TrainingDataLoadError,
     _get_or_create_summary,
     delete_trace_summaries,
     discover_training_samples,
+    list_training_samples,
     load_training_batch,
     load_training_sample,
+    open_training_sample,
 )
+from weft.training_manifest import load_manifest
+
+
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path: Path, monkeypatch) -> Path:
+    """Keep the summary cache (~/.weft/summary_cache) inside the test directory."""
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setattr(Path, "home", lambda: home)
+    return home
 
 
 @pytest.fixture
@@ -101,7 +115,7 @@ class TestLoadTrainingSample:
 
         assert sample.plan_id == "test-sample"
         assert sample.plan_content == "# Test Plan\n\nObjectives..."
-        assert sample.code_trace == "## Tool calls\n\n..."
+        assert sample.code_trace.startswith("# Trace Summary")
         assert sample.human_feedback == "Agent performed well."
         assert "code-reuse" in sample.judge_results
         assert sample.test_results_before == '{"passed": 9, "failed": 1}'
@@ -162,6 +176,49 @@ class TestLoadTrainingSample:
         assert "Training sample directory not found" in str(exc_info.value)
 
 
+class TestLazyTrainingSample:
+    """Tests for on-demand loading of training samples."""
+
+    def test_open_training_sample_reads_content_on_access(self, training_data_dir: Path, tmp_path: Path) -> None:
+        """Content is read when first accessed, not when the sample is opened."""
+        sample_dir = create_complete_sample(training_data_dir, "lazy-sample")
+
+        sample = open_training_sample(tmp_path, "lazy-sample")
+        (sample_dir / "human_feedback.md").write_text("Edited after opening.")
+
+        assert sample.human_feedback == "Edited after opening."
+        (sample_dir / "human_feedback.md").write_text("Edited again.")
+        assert sample.human_feedback == "Edited after opening."
+        assert sample.load() == load_training_sample(tmp_path, "lazy-sample").model_copy(
+            update={"human_feedback": "Edited after opening."}
+        )
+
+    def test_open_training_sample_validates_required_files(self, training_data_dir: Path, tmp_path: Path) -> None:
+        """Missing required files are reported when opening, unreadable ones on access."""
+        sample_dir = create_complete_sample(training_data_dir, "broken-sample")
+        (sample_dir / "test_results_after.json").unlink()
+
+        with pytest.raises(TrainingDataLoadError, match="Required file missing"):
+            open_training_sample(tmp_path, "broken-sample")
+
+        (sample_dir / "test_results_after.json").write_text("{}")
+        sample = open_training_sample(tmp_path, "broken-sample")
+        (sample_dir / "human_feedback.md").unlink()
+        with pytest.raises(TrainingDataLoadError, match="Failed to read human_feedback.md"):
+            _ = sample.human_feedback
+
+    def test_list_training_samples_filters_by_manifest(self, training_data_dir: Path, tmp_path: Path) -> None:
+        """Samples are listed and filtered from manifest metadata."""
+        for plan_id, model in (("opus-sample", "opus"), ("sonnet-sample", "sonnet")):
+            sample_dir = create_complete_sample(training_data_dir, plan_id)
+            (sample_dir / "metadata.json").write_text(json.dumps({"model": model}))
+
+        samples = list_training_samples(tmp_path, model="sonnet")
+
+        assert [s.plan_id for s in samples] == ["sonnet-sample"]
+        assert samples[0].model == "sonnet"
+
+
 class TestLoadTrainingBatch:
     """Tests for load_training_batch function."""
 
@@ -184,6 +241,15 @@ class TestLoadTrainingBatch:
 
         assert len(samples) == 2
 
+    def test_load_training_batch_excludes_plans(self, training_data_dir: Path, tmp_path: Path) -> None:
+        """Excluded (held-out) plans are never selected."""
+        create_complete_sample(training_data_dir, "sample-001")
+        create_complete_sample(training_data_dir, "sample-002")
+
+        samples = load_training_batch(tmp_path, batch_size=5, exclude={"sample-002"})
+
+        assert [s.plan_id for s in samples] == ["sample-001"]
+
     def test_load_training_batch_empty_directory(self, training_data_dir: Path, tmp_path: Path) -> None:
         """Raises error when no samples."""
         with pytest.raises(TrainingDataLoadError) as exc_info:
@@ -215,6 +281,38 @@ class TestLoadTrainingBatch:
 
         assert len(samples) == 3
 
+    def test_load_training_batch_summarizes_concurrently(
+        self, training_data_dir: Path, tmp_path: Path, monkeypatch
+    ) -> None:
+        """Missing summaries for the batch are generated at the same time."""
+        from weft import trace_summarizer
+
+        for i in range(3):
+            create_complete_sample(training_data_dir, f"sample-{i:03d}")
+        # All three summaries must be in flight together to pass the barrier
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_summary(trace_path: Path, model: str) -> Path:
+            barrier.wait()
+            if trace_path.parent.name == "sample-001":
+                raise trace_summarizer.TraceSummarizationError("LLM failed")
+            summary_path = trace_path.parent / "code_trace_summary.md"
+            summary_path.write_text(f"summary of {trace_path.parent.name}")
+            return summary_path
+
+        monkeypatch.setattr(trace_summarizer, "create_trace_summary", fake_summary)
+
+        samples = load_training_batch(tmp_path, batch_size=3, model="test-model")
+
+        # The failed sample is skipped; the rest keep the selection order
+        selected = [
+            e["plan_id"]
+            for e in select_batch(load_manifest(tmp_path), training_data_dir, 3)
+            if e["plan_id"] != "sample-001"
+        ]
+        assert [s.plan_id for s in samples] == selected
+        assert samples[selected.index("sample-002")].code_trace == "summary of sample-002"
+
 
 class TestSummaryHandling:
     """Tests for trace summary handling in training data loader."""
@@ -240,18 +338,35 @@ class TestSummaryHandling:
 
         assert result == "# Trace Summary\n\nCompressed content."
 
-    def test_get_or_create_summary_falls_back_to_trace(self, training_data_dir: Path, tmp_path: Path) -> None:
-        """Falls back to full trace when no model provided and no summary."""
+    def test_get_or_create_summary_extracts_without_model(self, training_data_dir: Path, tmp_path: Path) -> None:
+        """Builds and writes an extractive summary when no model is provided."""
         sample_dir = training_data_dir / "test-sample"
         sample_dir.mkdir()
 
         trace_path = sample_dir / "code_trace.md"
-        trace_path.write_text("# Full Trace\n\nAll the content.")
+        trace_path.write_text(
+            "# Conversation Trace\n\n## Main Conversation\n\n"
+            "### [ts] Assistant\n\nAll tests pass now.\n"
+        )
+
+        result = _get_or_create_summary(sample_dir, model=None)
+
+        assert "# Trace Summary" in result
+        assert "All tests pass now." in result
+        assert (sample_dir / "code_trace_summary.md").read_text() == result
+
+    def test_get_or_create_summary_reads_compressed_trace(self, training_data_dir: Path, tmp_path: Path) -> None:
+        """A gzip-stored code_trace.md is decompressed transparently."""
+        import gzip
+
+        sample_dir = training_data_dir / "test-sample"
+        sample_dir.mkdir()
+        (sample_dir / "code_trace.md.gz").write_bytes(gzip.compress(b"# Full Trace\n\nCompressed."))
 
-        # No summary exists, no model provided - should return full trace
         result = _get_or_create_summary(sample_dir, model=None)
 
-        assert result == "# Full Trace\n\nAll the content."
+        assert "# Trace Summary" in result
+        assert (sample_dir / "code_trace_summary.md").exists()
 
     def test_get_or_create_summary_returns_empty_when_no_trace(self, training_data_dir: Path, tmp_path: Path) -> None:
         """Returns empty string when neither trace nor summary exists."""
@@ -262,8 +377,8 @@ class TestSummaryHandling:
 
         assert result == ""
 
-    def test_get_or_create_summary_uses_stale_summary_when_no_model(self, training_data_dir: Path, tmp_path: Path) -> None:
-        """When summary is stale and no model provided, falls back to full trace."""
+    def test_get_or_create_summary_replaces_stale_summary_when_no_model(self, training_data_dir: Path, tmp_path: Path) -> None:
+        """When summary is stale and no model provided, extracts a fresh summary."""
         sample_dir = training_data_dir / "test-sample"
         sample_dir.mkdir()
 
@@ -277,10 +392,11 @@ class TestSummaryHandling:
         trace_path = sample_dir / "code_trace.md"
         trace_path.write_text("# New Trace Content")
 
-        # Summary is stale, no model - should return full trace
+        # Summary is stale, no model - should extract a new summary
         result = _get_or_create_summary(sample_dir, model=None)
 
-        assert result == "# New Trace Content"
+        assert "# Old Summary" not in result
+        assert "extractive summary" in result
 
     def test_load_training_sample_prefers_summary(self, training_data_dir: Path, tmp_path: Path) -> None:
         """load_training_sample uses summary when available."""
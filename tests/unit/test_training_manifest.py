@@ -0,0 +1,159 @@
+"""Tests for training_manifest module."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from weft import training_manifest
+from weft.trace_storage import write_trace_bytes
+from weft.training_manifest import (
+    filter_manifest,
+    get_manifest_path,
+    load_manifest,
+    update_manifest_entry,
+)
+
+
+def _create_sample(repo_root: Path, plan_id: str, score: float = 0.9, model: str = "opus") -> Path:
+    sample_dir = repo_root / ".weft" / "training_data" / plan_id
+    sample_dir.mkdir(parents=True)
+    (sample_dir / "metadata.json").write_text(json.dumps({
+        "tool": "claude-code",
+        "model": model,
+        "prompt_fingerprint": "16b06dd1",
+        "eval_fingerprint": "3d55fe1e",
+    }))
+    (sample_dir / "judge_code-reuse.json").write_text(
+        json.dumps({"judge_name": "code-reuse", "score": score})
+    )
+    (sample_dir / "test_results_after.json").write_text(
+        json.dumps({"total_tests": 10, "passed_tests": 9, "failed_tests": 1})
+    )
+    (sample_dir / "code_trace.md").write_text("# Trace\n")
+    return sample_dir
+
+
+def test_load_manifest_indexes_existing_samples(tmp_path: Path) -> None:
+    """A missing manifest is built from the sample directories and saved."""
+    _create_sample(tmp_path, "plan-b")
+    _create_sample(tmp_path, "plan-a")
+
+    entries = load_manifest(tmp_path)
+
+    assert [e["plan_id"] for e in entries] == ["plan-a", "plan-b"]
+    assert entries[0]["model"] == "opus"
+    assert entries[0]["judge_scores"] == {"code-reuse": 0.9}
+    assert entries[0]["tests_passed"] == 9
+    assert entries[0]["trace_size"] == len("# Trace\n")
+    assert get_manifest_path(tmp_path).exists()
+
+
+def test_load_manifest_skips_staging(tmp_path: Path) -> None:
+    """In-progress exports under .staging/ are not samples."""
+    _create_sample(tmp_path, "plan-a")
+    (tmp_path / ".weft" / "training_data" / ".staging" / "plan-b.1.x").mkdir(parents=True)
+
+    assert [e["plan_id"] for e in load_manifest(tmp_path)] == ["plan-a"]
+
+
+def test_load_manifest_reads_only_new_samples(tmp_path: Path, monkeypatch) -> None:
+    """Indexed samples are not reopened; added and removed ones are reconciled."""
+    _create_sample(tmp_path, "plan-a")
+    removed = _create_sample(tmp_path, "plan-b")
+    load_manifest(tmp_path)
+
+    for path in removed.iterdir():
+        path.unlink()
+    removed.rmdir()
+    _create_sample(tmp_path, "plan-c")
+
+    built = []
+    original = training_manifest.build_manifest_entry
+    monkeypatch.setattr(
+        training_manifest,
+        "build_manifest_entry",
+        lambda sample_dir: built.append(sample_dir.name) or original(sample_dir),
+    )
+
+    entries = load_manifest(tmp_path)
+
+    assert [e["plan_id"] for e in entries] == ["plan-a", "plan-c"]
+    assert built == ["plan-c"]
+
+
+def test_load_manifest_reindexes_changed_samples(tmp_path: Path) -> None:
+    """A sample whose judge results were rewritten is indexed again."""
+    sample_dir = _create_sample(tmp_path, "plan-a", score=0.5)
+    load_manifest(tmp_path)
+
+    judge_file = sample_dir / "judge_code-reuse.json"
+    judge_file.write_text(json.dumps({"judge_name": "code-reuse", "score": 0.75}))
+    os.utime(judge_file, ns=(judge_file.stat().st_atime_ns, judge_file.stat().st_mtime_ns + 10**9))
+
+    assert load_manifest(tmp_path)[0]["judge_scores"] == {"code-reuse": 0.75}
+
+
+def test_load_manifest_reindexes_recompressed_trace(tmp_path: Path) -> None:
+    """A re-exported compressed trace changes the stamp and the trace size."""
+    sample_dir = _create_sample(tmp_path, "plan-a")
+    (sample_dir / "code_trace.md").unlink()
+    write_trace_bytes(sample_dir / "code_trace.md", b"# Trace\n", "gzip")
+    assert load_manifest(tmp_path)[0]["trace_size"] == len("# Trace\n")
+
+    write_trace_bytes(sample_dir / "code_trace.md", b"# Longer trace\n", "gzip")
+
+    assert load_manifest(tmp_path)[0]["trace_size"] == len("# Longer trace\n")
+
+
+def test_created_at_is_the_recording_time(tmp_path: Path) -> None:
+    """created_at comes from the sample's metadata, not from the checkout."""
+    sample_dir = _create_sample(tmp_path, "plan-a")
+    metadata = json.loads((sample_dir / "metadata.json").read_text())
+    metadata["recorded_at"] = "2024-12-10T00:00:00Z"
+    (sample_dir / "metadata.json").write_text(json.dumps(metadata))
+
+    assert load_manifest(tmp_path)[0]["created_at"] == "2024-12-10T00:00:00Z"
+
+
+def test_update_manifest_entry_replaces_entry(tmp_path: Path) -> None:
+    """Re-indexing a sample replaces its previous entry."""
+    sample_dir = _create_sample(tmp_path, "plan-a", score=0.5)
+    load_manifest(tmp_path)
+
+    (sample_dir / "judge_code-reuse.json").write_text(
+        json.dumps({"judge_name": "code-reuse", "score": 0.8})
+    )
+    update_manifest_entry(tmp_path, "plan-a")
+
+    lines = get_manifest_path(tmp_path).read_text().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["judge_scores"] == {"code-reuse": 0.8}
+
+
+def test_load_manifest_without_training_data(tmp_path: Path) -> None:
+    """No training data directory means an empty manifest."""
+    assert load_manifest(tmp_path) == []
+
+
+@pytest.mark.parametrize(
+    ("criteria", "expected"),
+    [
+        ({}, ["low", "high", "sonnet"]),
+        ({"model": "sonnet"}, ["sonnet"]),
+        ({"min_score": 0.7}, ["high", "sonnet"]),
+        ({"eval_fingerprint": "other"}, []),
+    ],
+)
+def test_filter_manifest(tmp_path: Path, criteria: dict, expected: list[str]) -> None:
+    """Entries are selected by metadata and judge scores."""
+    entries = [
+        {"plan_id": "low", "model": "opus", "eval_fingerprint": "e1", "judge_scores": {"a": 0.4}},
+        {"plan_id": "high", "model": "opus", "eval_fingerprint": "e1", "judge_scores": {"a": 0.9}},
+        {"plan_id": "sonnet", "model": "sonnet", "eval_fingerprint": "e1", "judge_scores": {"a": 0.8}},
+    ]
+
+    assert [e["plan_id"] for e in filter_manifest(entries, **criteria)] == expected
@@ -20,6 +20,8 @@ from unittest.mock import MagicMock
 import pytest
 
 from weft.cli import main
+from weft.optimize_command import OptimizeCommandError
+from weft.optimize_command import _validate_parameters as _validate_optimize_parameters
 from weft.train_command import TrainCommandError, _validate_parameters
 
 
@@ -88,6 +90,48 @@ class TestTrainCommandValidation:
         # Should not raise
         _validate_parameters(variant=variant, batch_size=batch_size, max_subagents=max_subagents)
 
+    def test_train_command_rejects_small_token_budget(self) -> None:
+        """A token budget too small for any sample is rejected."""
+        with pytest.raises(TrainCommandError, match="Invalid token_budget"):
+            _validate_parameters(variant="sonnet", batch_size=3, max_subagents=5, token_budget=10)
+
+    @pytest.mark.parametrize("candidates", [0, 11])
+    def test_train_command_rejects_invalid_candidates(self, candidates: int) -> None:
+        """--candidates must be between 1 and 10."""
+        with pytest.raises(TrainCommandError, match="Invalid candidates"):
+            _validate_parameters(
+                variant="sonnet", batch_size=3, max_subagents=5, candidates=candidates
+            )
+
+
+class TestOptimizeCommandValidation:
+    """Parametrized tests for optimize command parameter validation."""
+
+    @pytest.mark.parametrize(
+        ("overrides", "expected_error"),
+        [
+            pytest.param({"generations": 0}, "Invalid generations.*at least 1", id="no_generations"),
+            pytest.param({"population": 11}, "Invalid population.*Maximum is 10", id="population_above_max"),
+            pytest.param({"holdout": 0}, "Invalid holdout", id="no_holdout"),
+            pytest.param({"max_concurrent": 17}, "Invalid max_concurrent", id="concurrency_above_max"),
+            pytest.param({"eval_timeout": 10}, "Invalid eval_timeout", id="timeout_too_short"),
+            pytest.param({"variant": "gpt"}, "Invalid variant", id="invalid_variant"),
+        ],
+    )
+    def test_optimize_command_rejects_invalid_parameters(
+        self, overrides: dict, expected_error: str
+    ) -> None:
+        """Out-of-range optimize parameters are rejected."""
+        params = {
+            "variant": "sonnet", "generations": 3, "population": 4, "holdout": 2,
+            "max_concurrent": 4, "eval_timeout": 1800, "batch_size": 3,
+            "max_subagents": 5, "token_budget": 100_000,
+        }
+        params.update(overrides)
+
+        with pytest.raises(OptimizeCommandError, match=expected_error):
+            _validate_optimize_parameters(**params)
+
 
 class TestCodeCommandValidation:
     """Parametrized tests for code command parameter validation."""